@@ -3,6 +3,8 @@ from django.core.management.base import BaseCommand
 from django.core.management import call_command
 from io import StringIO
 
+from utils.profiling import ProfileCommandMixin
+
 logger = logging.getLogger(__name__)
 
 SYNC_COMMANDS = [
@@ -16,7 +18,7 @@ SYNC_COMMANDS = [
 ]
 
 
-class Command(BaseCommand):
+class Command(ProfileCommandMixin, BaseCommand):
     help = 'Run all Administrate sync commands in dependency order'
 
     def add_arguments(self, parser):
@@ -1,5 +1,4 @@
 import sys
-import pandas as pd
 from pathlib import Path
 import os
 import validators
@@ -58,6 +57,8 @@ def validate_and_process_event_excel(file_path, debug=False):
     Returns:
         tuple: (valid_data, error_data) - Lists of dictionaries containing valid rows and error rows
     """
+    import pandas as pd
+
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Excel file not found: {file_path}")
     
@@ -693,7 +694,8 @@ def validate_and_format_datetime(date_value, time_value):
     Returns:
         str: ISO formatted datetime or None if invalid
     """
-    
+    import pandas as pd
+
     if pd.isna(date_value) or pd.isna(time_value):
         return None
                
@@ -1680,6 +1682,8 @@ def generate_error_report(results, output_path=None):
     Returns:
         str: Path to the generated report
     """
+    import pandas as pd
+
     if output_path is None:
         output_path = 'event_upload_errors.xlsx'
 
@@ -1760,7 +1764,25 @@ from administrate.utils.event_dual_write import (  # noqa: E402
 )
 
 if __name__ == "__main__":
-    result = bulk_upload_events_from_excel(file_path,debug=True,dry_run=False)
+    # python administrate/utils/event_importer.py events.xlsx [--profile [PATH]]
+    import argparse
+    from utils.profiling import EXTENSIONS, profiled
+
+    parser = argparse.ArgumentParser(description='Bulk upload events from an Excel file to Administrate')
+    parser.add_argument('file_path')
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='PATH',
+                        help='Profile the upload and write a flamegraph-ready file to PATH')
+    args = parser.parse_args()
+
+    if args.profile is None:
+        result = bulk_upload_events_from_excel(args.file_path, debug=True, dry_run=False)
+    else:
+        with profiled('bulk_upload_events_from_excel') as run:
+            result = bulk_upload_events_from_excel(args.file_path, debug=True, dry_run=False)
+        profile_path = args.profile or f'profile-bulk_upload_events_from_excel.{EXTENSIONS[run.profile.format]}'
+        with open(profile_path, 'wb') as handle:
+            handle.write(run.profile.content)
+        print(f'Profile: {run.profile.samples} samples written to {profile_path}')
     
     # Note: For event management operations like setting websale or deleting events,
     # use the Django management command:
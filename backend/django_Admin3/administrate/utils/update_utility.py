@@ -1,7 +1,6 @@
 import sys
 import csv
 import base64
-import pandas as pd
 from pathlib import Path
 import os
 import validators
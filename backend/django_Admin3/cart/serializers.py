@@ -1,6 +1,7 @@
 import logging
 from rest_framework import serializers
 from store.serializers import PurchasableSerializer
+from userprofile.user_context import get_user_countries
 from .models import Cart, CartItem, CartFee, ActedOrder, ActedOrderItem
 
 logger = logging.getLogger(__name__)
@@ -298,34 +299,9 @@ class CartSerializer(serializers.ModelSerializer):
             }
 
             # Get user address information
-            try:
-                from userprofile.models import UserProfile
-                from userprofile.models.address import UserProfileAddress
-
-                user_profile = UserProfile.objects.get(user=request.user)
-
-                # Get home address country
-                try:
-                    home_address = UserProfileAddress.objects.get(
-                        user_profile=user_profile,
-                        address_type='HOME'
-                    )
-                    user_context['home_country'] = home_address.country
-                except UserProfileAddress.DoesNotExist:
-                    pass
-
-                # Get work address country
-                try:
-                    work_address = UserProfileAddress.objects.get(
-                        user_profile=user_profile,
-                        address_type='WORK'
-                    )
-                    user_context['work_country'] = work_address.country
-                except UserProfileAddress.DoesNotExist:
-                    pass
-
-            except UserProfile.DoesNotExist:
-                pass
+            countries = get_user_countries(request.user)
+            user_context['home_country'] = countries.home_country
+            user_context['work_country'] = countries.work_country
 
             # Get session-based acknowledgments from session storage
             # This supports acknowledgments that persist across the session
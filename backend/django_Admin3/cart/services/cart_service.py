@@ -7,6 +7,7 @@ from cart.models import Cart, CartItem
 from store.models import Product as StoreProduct
 from catalog.models import ProductProductVariation
 from marking.models import MarkingPaper
+from userprofile.user_context import get_user_countries
 
 logger = logging.getLogger(__name__)
 
@@ -721,21 +722,11 @@ class CartService:
         return {'id': user_id, 'country_code': country}
 
     def _resolve_user_country(self, user):
-        """Resolve user's country from their HOME address profile."""
+        """Resolve user's country code from their HOME address profile."""
         try:
-            if hasattr(user, 'userprofile') and user.userprofile:
-                profile = user.userprofile
-                if hasattr(profile, 'addresses'):
-                    home = profile.addresses.filter(address_type='HOME').first()
-                    if home and home.country:
-                        from country.models import Country
-                        from django.db.models import Q
-                        country_obj = Country.objects.filter(
-                            Q(name=home.country) | Q(iso_code=home.country)
-                        ).first()
-                        if country_obj:
-                            return country_obj.iso_code
-                        return home.country
+            countries = get_user_countries(user)
+            if countries.home_country:
+                return countries.home_country_code or countries.home_country
         except Exception:
             pass
         return 'GB'
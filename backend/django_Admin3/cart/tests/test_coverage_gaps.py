@@ -1728,8 +1728,8 @@ class TriggerVatCalculationErrorTest(TestCase, CartTestDataMixin):
 @override_settings(USE_DUMMY_PAYMENT_GATEWAY=True)
 class ResolveUserCountryCoverageTest(TestCase, CartTestDataMixin):
     """
-    Cover cart_service.py lines 506-515: _resolve_user_country resolves
-    country from HOME address via the Country model lookup.
+    Cover _resolve_user_country: resolves the country code from the HOME
+    address via the UtilsCountrys lookup.
     """
 
     @classmethod
@@ -1744,52 +1744,37 @@ class ResolveUserCountryCoverageTest(TestCase, CartTestDataMixin):
         )
 
     def test_resolve_country_via_country_model_iso_code(self):
-        """Lines 506-512: Country object found by iso_code returns iso_code.
-
-        The 'country' app is not in INSTALLED_APPS, so the import inside
-        _resolve_user_country will fail.  We mock the entire Country lookup
-        path to exercise lines 506-512.
-        """
+        """Country found in UtilsCountrys by code returns the code."""
         from userprofile.models import UserProfile
         from userprofile.models.address import UserProfileAddress
+        from utils.models import UtilsCountrys
 
+        UtilsCountrys.objects.update_or_create(code='US', defaults={'name': 'United States'})
         profile = UserProfile.objects.get(user=self.user)
         UserProfileAddress.objects.create(
             user_profile=profile, address_type='HOME', country='US',
         )
-        mock_country = MagicMock()
-        mock_country.iso_code = 'US'
-        mock_qs = MagicMock()
-        mock_qs.first.return_value = mock_country
-        mock_country_cls = MagicMock()
-        mock_country_cls.objects.filter.return_value = mock_qs
 
-        with patch.dict('sys.modules', {'country': MagicMock(), 'country.models': MagicMock(Country=mock_country_cls)}):
-            result = self.service._resolve_user_country(self.user)
+        result = self.service._resolve_user_country(self.user)
         self.assertEqual(result, 'US')
 
     def test_resolve_country_via_country_model_name(self):
-        """Lines 508-512: Country object found by name returns iso_code."""
+        """Country found in UtilsCountrys by name returns its code."""
         from userprofile.models import UserProfile
         from userprofile.models.address import UserProfileAddress
+        from utils.models import UtilsCountrys
 
+        UtilsCountrys.objects.update_or_create(code='DE', defaults={'name': 'Germany'})
         profile = UserProfile.objects.get(user=self.user)
         UserProfileAddress.objects.create(
             user_profile=profile, address_type='HOME', country='Germany',
         )
-        mock_country = MagicMock()
-        mock_country.iso_code = 'DE'
-        mock_qs = MagicMock()
-        mock_qs.first.return_value = mock_country
-        mock_country_cls = MagicMock()
-        mock_country_cls.objects.filter.return_value = mock_qs
 
-        with patch.dict('sys.modules', {'country': MagicMock(), 'country.models': MagicMock(Country=mock_country_cls)}):
-            result = self.service._resolve_user_country(self.user)
+        result = self.service._resolve_user_country(self.user)
         self.assertEqual(result, 'DE')
 
     def test_resolve_country_no_country_model_match(self):
-        """Line 513: Country not in DB -> return raw address country string."""
+        """Country not in DB -> return raw address country string."""
         from userprofile.models import UserProfile
         from userprofile.models.address import UserProfileAddress
 
@@ -1797,25 +1782,15 @@ class ResolveUserCountryCoverageTest(TestCase, CartTestDataMixin):
         UserProfileAddress.objects.create(
             user_profile=profile, address_type='HOME', country='Atlantis',
         )
-        mock_qs = MagicMock()
-        mock_qs.first.return_value = None  # No match
-        mock_country_cls = MagicMock()
-        mock_country_cls.objects.filter.return_value = mock_qs
 
-        with patch.dict('sys.modules', {'country': MagicMock(), 'country.models': MagicMock(Country=mock_country_cls)}):
-            result = self.service._resolve_user_country(self.user)
+        result = self.service._resolve_user_country(self.user)
         self.assertEqual(result, 'Atlantis')
 
     def test_resolve_country_exception_returns_gb(self):
-        """Lines 514-515: exception in lookup returns default 'GB'."""
-        with patch('cart.services.cart_service.CartService._resolve_user_country',
-                   wraps=self.service._resolve_user_country):
-            # Simulate an error by mocking the user's profile access
-            mock_user = MagicMock()
-            mock_user.userprofile = MagicMock()
-            mock_user.userprofile.addresses = MagicMock()
-            mock_user.userprofile.addresses.filter.side_effect = RuntimeError("DB error")
-            result = self.service._resolve_user_country(mock_user)
+        """An error resolving countries returns default 'GB'."""
+        with patch('cart.services.cart_service.get_user_countries',
+                   side_effect=RuntimeError("DB error")):
+            result = self.service._resolve_user_country(self.user)
         self.assertEqual(result, 'GB')
 
     def test_resolve_country_no_home_address(self):
@@ -13,6 +13,11 @@ class CopyProductsRequestSerializer(serializers.Serializer):
     previous_exam_session_id = serializers.IntegerField(
         help_text="ID of the previous exam session to copy from"
     )
+    dry_run = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Plan the copy and return the diff without writing",
+    )
 
     def validate_new_exam_session_id(self, value):
         if not ExamSession.objects.filter(id=value).exists():
@@ -43,6 +48,8 @@ class CopyProductsResponseSerializer(serializers.Serializer):
     bundle_products_created = serializers.IntegerField()
     skipped_subjects = serializers.ListField(child=serializers.CharField())
     message = serializers.CharField()
+    dry_run = serializers.BooleanField(required=False)
+    diff = serializers.DictField(required=False)
 
 
 class SessionDataCountsSerializer(serializers.Serializer):
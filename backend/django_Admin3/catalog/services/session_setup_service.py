@@ -5,13 +5,22 @@ Orchestrates the Step 3 atomic copy/create operation:
 - Copy prices for each copied product
 - Create bundles from catalog templates
 - Populate bundle products by matching PPVs
+
+All rows are planned in memory and written set-based (one insert per
+table), so a full session rollover stays well inside the request timeout.
+The copied products' search cards are refreshed once the copy commits.
 """
 import logging
+from collections import defaultdict
 
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Prefetch
 
 from catalog.models import ExamSessionSubject, ProductBundle, ProductBundleProduct
+from store.models.purchasable import Purchasable
 from store.models.product import Product
+from store.models.material_product import MaterialProduct
+from store.models.marking_product import MarkingProduct
 from store.models.price import Price
 from store.models.bundle import Bundle
 from store.models.bundle_product import BundleProduct
@@ -19,32 +28,120 @@ from store.models.bundle_product import BundleProduct
 logger = logging.getLogger(__name__)
 
 
+# Rows per multi-row INSERT statement when writing MTI subclass tables.
+INSERT_CHUNK_SIZE = 1000
+
+
+def _insert_rows(model, columns, rows):
+    """Insert ``rows`` into ``model``'s own table with multi-row INSERTs.
+
+    ``bulk_create`` refuses multi-table-inheritance children, so the
+    store.Product / MaterialProduct / MarkingProduct tables are written
+    directly once the parent Purchasable rows (and their PKs) exist.
+    """
+    if not rows:
+        return
+    column_sql = ', '.join(connection.ops.quote_name(c) for c in columns)
+    row_sql = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + INSERT_CHUNK_SIZE]
+            cursor.execute(
+                f'INSERT INTO {model._meta.db_table} ({column_sql}) '
+                f'VALUES {", ".join([row_sql] * len(chunk))}',
+                [value for row in chunk for value in row],
+            )
+
+
+def _copy_prices(product_id_map):
+    """Copy every price of the old products onto the new ones in one statement.
+
+    Args:
+        product_id_map: dict of previous product PK → new product PK
+
+    Returns:
+        Number of price rows inserted
+    """
+    if not product_id_map:
+        return 0
+    old_ids = list(product_id_map.keys())
+    new_ids = [product_id_map[old_id] for old_id in old_ids]
+    price_table = Price._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {price_table} '
+            '(purchasable_id, price_type, amount, currency, is_active, created_at, updated_at) '
+            'SELECT id_map.new_id, p.price_type, p.amount, p.currency, TRUE, NOW(), NOW() '
+            f'FROM {price_table} p '
+            'JOIN unnest(%s::int[], %s::int[]) AS id_map(old_id, new_id) '
+            'ON p.purchasable_id = id_map.old_id',
+            [old_ids, new_ids],
+        )
+        return cursor.rowcount
+
+
+def _refresh_search(store_product_ids):
+    """Bring search up to date with the copied products.
+
+    The raw INSERTs bypass search.signals, so do what its receivers would:
+    drop any card embedding the new products now, then rebuild their cards
+    and start a new catalogue generation (typeahead) once the copy commits.
+    """
+    from search.services.product_cards import invalidate_product_cards
+    from search.services.typeahead import bump_catalog_generation
+    from search.tasks import refresh_product_cards_task
+
+    ids = sorted(store_product_ids)
+    invalidate_product_cards(ids)
+    transaction.on_commit(bump_catalog_generation)
+    if ids:
+        # Cards still missing are rebuilt by the next read.
+        transaction.on_commit(lambda: refresh_product_cards_task.enqueue(ids), robust=True)
+
+
 class SessionSetupService:
     """Service for copying products and bundles from a previous exam session."""
 
     @staticmethod
     @transaction.atomic
-    def copy_products_and_bundles(new_session_id, previous_session_id):
+    def copy_products_and_bundles(new_session_id, previous_session_id,
+                                  dry_run=False, progress=None):
         """
         Copy active non-tutorial products and prices from the previous session,
         then create bundles from catalog templates for the new session.
 
+        The copy is set-based: the new rows are planned in memory with the
+        old → new ID mapping, then written with one bulk insert per table
+        (Purchasable, Product, Material/Marking subclass, Bundle,
+        BundleProduct) and a single INSERT ... SELECT for prices.
+
         Args:
             new_session_id: ID of the newly created exam session
             previous_session_id: ID of the previous exam session to copy from
+            dry_run: If True, plan the copy and return the diff without writing
+            progress: Optional callable(stage, count) invoked after each stage
 
         Returns:
-            dict with counts of created records and skipped subjects
+            dict with counts of created records and skipped subjects. Dry
+            runs also include ``dry_run`` and a ``diff`` of the rows that
+            would be created.
 
         Raises:
             ValueError: If no ESS records exist for the new session
         """
+        def report(stage, count):
+            logger.info("Session setup %s: %s", stage, count)
+            if progress is not None:
+                progress(stage, count)
+
         # 1. Build subject → new_ess mapping for the new session
-        new_ess_records = ExamSessionSubject.objects.filter(
-            exam_session_id=new_session_id
-        ).select_related('subject')
+        new_ess_records = list(
+            ExamSessionSubject.objects.filter(
+                exam_session_id=new_session_id
+            ).select_related('subject', 'exam_session')
+        )
 
-        if not new_ess_records.exists():
+        if not new_ess_records:
             raise ValueError(
                 f"No exam session subjects found for session {new_session_id}. "
                 "Complete Step 2 first."
@@ -63,16 +160,15 @@ class SessionSetupService:
             kind='tutorial',
         ).select_related(
             'exam_session_subject__subject',
+            'materialproduct__product_product_variation__product',
             'materialproduct__product_product_variation__product_variation',
-        )
+            'markingproduct__marking_template',
+        ).order_by('pk')
 
-        products_created = 0
-        prices_created = 0
+        # 3. Plan the new products in memory. Unsaved subclass instances
+        # generate their product_code exactly as save() would.
         skipped_subjects = set()
-        # Track new products for bundle creation: (new_ess_id, ppv_id) → new_product
-        new_product_lookup = {}
-
-        # 3. Copy each product to the new session
+        planned_products = []  # (prev_product, new_product)
         for prev_product in previous_products:
             subject_id = prev_product.exam_session_subject.subject_id
             new_ess = subject_to_new_ess.get(subject_id)
@@ -81,13 +177,9 @@ class SessionSetupService:
                 skipped_subjects.add(prev_product.exam_session_subject.subject.code)
                 continue
 
-            # Create new product (product_code auto-generates on save).
             # Phase 5 Task 4b: PPV is on MaterialProduct, marking_template
-            # is on MarkingProduct. Dispatch to the subclass so the new
-            # row owns the correct subclass-local fields. Tutorial is
-            # excluded above (by kind filter), so only Material and
-            # Marking are handled here.
-            from store.models import MaterialProduct, MarkingProduct
+            # is on MarkingProduct. Tutorial is excluded above (by kind
+            # filter), so only Material and Marking are handled here.
             if prev_product.kind == 'marking':
                 # Inherit marking_template from the previous MarkingProduct row.
                 prev_marking_template = getattr(
@@ -97,91 +189,181 @@ class SessionSetupService:
                 new_product = MarkingProduct(
                     exam_session_subject=new_ess,
                     marking_template=prev_marking_template,
+                    kind=Purchasable.Kind.MARKING,
                     is_active=True,
                 )
+                new_product.product_code = new_product._generate_marking_product_code()
             else:
-                # Default: treat as MaterialProduct (PPV is required). The
-                # previous-session row is polymorphic; fetch its PPV via the
-                # explicit subclass accessor (None for non-material rows is
-                # not expected here because the queryset excludes tutorials
-                # and the marking branch above handles markings).
-                prev_ppv = prev_product.get_material_ppv()
+                # Default: treat as MaterialProduct (PPV is required).
                 new_product = MaterialProduct(
                     exam_session_subject=new_ess,
-                    product_product_variation=prev_ppv,
+                    product_product_variation=prev_product.get_material_ppv(),
+                    kind=Purchasable.Kind.MATERIAL,
                     is_active=True,
                 )
-            new_product.save()
-            products_created += 1
-            # Phase 5 Task 4b: prev_product is a Product (parent); the PPV id
-            # lives on the materialproduct subclass now. Use getattr fallback
-            # for non-material rows (None) — they don't participate in the
-            # bundle template match anyway.
+                new_product.product_code = new_product._generate_material_code()
+            new_product.code = new_product.product_code
+            planned_products.append((prev_product, new_product))
+
+        report('products_planned', len(planned_products))
+
+        # 4. Plan bundles from catalog templates (one query for all subjects)
+        ppv_by_new_product = {}  # (new_ess_id, ppv_id) → planned product
+        for prev_product, new_product in planned_products:
+            # Phase 5 Task 4b: the PPV id lives on the materialproduct
+            # subclass. Non-material rows (None) don't participate in the
+            # bundle template match.
             prev_ppv_id = getattr(
                 getattr(prev_product, 'materialproduct', None),
                 'product_product_variation_id',
                 None,
             )
-            new_product_lookup[(new_ess.id, prev_ppv_id)] = new_product
-
-            # 4. Copy prices for this product (Task 23: Price is keyed by
-            # purchasable; Product is an MTI subclass so PK is shared).
-            prev_prices = Price.objects.filter(purchasable_id=prev_product.pk)
-            for prev_price in prev_prices:
-                Price.objects.create(
-                    purchasable_id=new_product.pk,
-                    price_type=prev_price.price_type,
-                    amount=prev_price.amount,
-                    currency=prev_price.currency,
-                )
-                prices_created += 1
+            ppv_by_new_product[(new_product.exam_session_subject_id, prev_ppv_id)] = new_product
 
-        # 5. Create bundles from catalog templates
-        bundles_created = 0
-        bundle_products_created = 0
+        templates_by_subject = defaultdict(list)
+        bundle_templates = ProductBundle.objects.filter(
+            subject_id__in=subject_to_new_ess.keys(),
+            is_active=True,
+        ).prefetch_related(
+            Prefetch(
+                'bundle_products',
+                queryset=ProductBundleProduct.objects.filter(is_active=True),
+                to_attr='active_template_products',
+            )
+        ).order_by('pk')
+        for template in bundle_templates:
+            templates_by_subject[template.subject_id].append(template)
 
+        planned_bundles = []  # (new_bundle, [(template_product, new_product)])
         for new_ess in new_ess_records:
-            # Find active catalog bundle templates for this subject
-            bundle_templates = ProductBundle.objects.filter(
-                subject=new_ess.subject,
-                is_active=True,
-            ).prefetch_related('bundle_products__product_product_variation')
-
-            for template in bundle_templates:
-                # Create store Bundle from template
-                new_bundle = Bundle.objects.create(
+            for template in templates_by_subject.get(new_ess.subject_id, []):
+                new_bundle = Bundle(
                     bundle_template=template,
                     exam_session_subject=new_ess,
                     is_active=True,
                     display_order=template.display_order,
                 )
-                bundles_created += 1
+                members = []
+                for tbp in template.active_template_products:
+                    new_product = ppv_by_new_product.get(
+                        (new_ess.id, tbp.product_product_variation_id)
+                    )
+                    if new_product:
+                        members.append((tbp, new_product))
+                planned_bundles.append((new_bundle, members))
+
+        report('bundles_planned', len(planned_bundles))
+
+        if dry_run:
+            prev_ids = [prev.pk for prev, _ in planned_products]
+            planned_codes = [new.product_code for _, new in planned_products]
+            return {
+                'products_created': len(planned_products),
+                'prices_created': Price.objects.filter(purchasable_id__in=prev_ids).count(),
+                'bundles_created': len(planned_bundles),
+                'bundle_products_created': sum(len(m) for _, m in planned_bundles),
+                'skipped_subjects': sorted(skipped_subjects),
+                'dry_run': True,
+                'diff': {
+                    'products': [
+                        {
+                            'source_code': prev.product_code,
+                            'new_code': new.product_code,
+                            'kind': new.kind,
+                        }
+                        for prev, new in planned_products
+                    ],
+                    'existing_codes': sorted(
+                        Purchasable.objects.filter(code__in=planned_codes)
+                        .values_list('code', flat=True)
+                    ),
+                    'bundles': [
+                        {
+                            'subject': bundle.exam_session_subject.subject.code,
+                            'bundle_name': bundle.bundle_template.bundle_name,
+                            'product_codes': [new.product_code for _, new in members],
+                        }
+                        for bundle, members in planned_bundles
+                    ],
+                },
+            }
+
+        # 5. Write products: parent rows via bulk_create (returns PKs), then
+        # the MTI child tables keyed on the shared PK.
+        parents = Purchasable.objects.bulk_create([
+            Purchasable(
+                kind=new_product.kind,
+                code=new_product.code,
+                name=new_product.name,
+                is_active=True,
+            )
+            for _, new_product in planned_products
+        ])
+        for (_, new_product), parent in zip(planned_products, parents):
+            new_product.pk = parent.pk
+            new_product.purchasable_ptr_id = parent.pk
+            new_product.product_ptr_id = parent.pk
+
+        _insert_rows(
+            Product,
+            ['purchasable_ptr_id', 'exam_session_subject_id', 'product_code'],
+            [
+                (p.pk, p.exam_session_subject_id, p.product_code)
+                for _, p in planned_products
+            ],
+        )
+        _insert_rows(
+            MaterialProduct,
+            ['product_ptr_id', 'product_product_variation_id'],
+            [
+                (p.pk, p.product_product_variation_id)
+                for _, p in planned_products if isinstance(p, MaterialProduct)
+            ],
+        )
+        _insert_rows(
+            MarkingProduct,
+            ['product_ptr_id', 'marking_template_id'],
+            [
+                (p.pk, p.marking_template_id)
+                for _, p in planned_products if isinstance(p, MarkingProduct)
+            ],
+        )
+        products_created = len(planned_products)
+        report('products_created', products_created)
 
-                # Populate bundle products by matching PPVs
-                template_products = ProductBundleProduct.objects.filter(
-                    bundle=template,
-                    is_active=True,
-                )
-                for tbp in template_products:
-                    ppv_id = tbp.product_product_variation_id
-                    new_product = new_product_lookup.get((new_ess.id, ppv_id))
+        # 6. Copy prices (Task 23: Price is keyed by purchasable; Product is
+        # an MTI subclass so PK is shared).
+        prices_created = _copy_prices(
+            {prev.pk: new.pk for prev, new in planned_products}
+        )
+        report('prices_created', prices_created)
 
-                    if new_product:
-                        BundleProduct.objects.create(
-                            bundle=new_bundle,
-                            product=new_product,
-                            default_price_type=tbp.default_price_type,
-                            quantity=tbp.quantity,
-                            sort_order=tbp.sort_order,
-                            is_active=True,
-                        )
-                        bundle_products_created += 1
+        # 7. Create bundles and bundle products
+        new_bundles = Bundle.objects.bulk_create(
+            [bundle for bundle, _ in planned_bundles]
+        )
+        bundle_products = BundleProduct.objects.bulk_create([
+            BundleProduct(
+                bundle=bundle,
+                product_id=new_product.pk,
+                default_price_type=tbp.default_price_type,
+                quantity=tbp.quantity,
+                sort_order=tbp.sort_order,
+                is_active=True,
+            )
+            for bundle, (_, members) in zip(new_bundles, planned_bundles)
+            for tbp, new_product in members
+        ])
+        report('bundles_created', len(new_bundles))
+
+        # 8. Product cards and typeahead index
+        _refresh_search(new.pk for _, new in planned_products)
 
         return {
             'products_created': products_created,
             'prices_created': prices_created,
-            'bundles_created': bundles_created,
-            'bundle_products_created': bundle_products_created,
+            'bundles_created': len(new_bundles),
+            'bundle_products_created': len(bundle_products),
             'skipped_subjects': sorted(skipped_subjects),
         }
 
@@ -3,6 +3,8 @@
 Tests SessionSetupService (copy, deactivation, data counts) and the
 /api/catalog/session-setup/ endpoints.
 """
+from unittest.mock import patch
+
 from django.utils import timezone
 from datetime import timedelta
 
@@ -247,6 +249,125 @@ class TestSessionSetupService(CatalogAPITestCase):
             price_type='standard').amount)
         self.assertEqual(std_price.currency, 'GBP')
 
+    def test_copied_rows_are_full_subclass_instances(self):
+        """Bulk-inserted products load through their MTI subclasses."""
+        from store.models import MarkingProduct as StoreMarkingProduct
+        SessionSetupService.copy_products_and_bundles(
+            self.session_sept.id, self.session_april.id
+        )
+        new_ebook = StoreMaterialProduct.objects.get(
+            exam_session_subject=self.ess_new_cm2,
+            product_product_variation=self.ppv_core_ebook,
+        )
+        self.assertEqual(new_ebook.kind, 'material')
+        self.assertEqual(new_ebook.code, new_ebook.product_code)
+        self.assertTrue(new_ebook.product_code.endswith(self.session_sept.session_code))
+        new_marking = StoreMarkingProduct.objects.get(
+            exam_session_subject=self.ess_new_cm2,
+        )
+        self.assertEqual(new_marking.marking_template, self._marking_template)
+        self.assertEqual(new_marking.kind, 'marking')
+
+    def test_dry_run_writes_nothing_and_returns_diff(self):
+        """Dry run reports planned rows without creating any."""
+        result = SessionSetupService.copy_products_and_bundles(
+            self.session_sept.id, self.session_april.id, dry_run=True
+        )
+        self.assertTrue(result['dry_run'])
+        self.assertEqual(result['products_created'], 3)
+        self.assertEqual(result['prices_created'], 3)
+        self.assertEqual(len(result['diff']['products']), 3)
+        self.assertEqual(result['diff']['existing_codes'], [])
+        self.assertEqual(len(result['diff']['bundles']), 1)
+        self.assertFalse(StoreProduct.objects.filter(
+            exam_session_subject__exam_session=self.session_sept
+        ).exists())
+        self.assertFalse(Bundle.objects.filter(
+            exam_session_subject__exam_session=self.session_sept
+        ).exists())
+
+    def test_progress_callback_reports_stages(self):
+        """The progress callback receives each stage and its count."""
+        stages = []
+        SessionSetupService.copy_products_and_bundles(
+            self.session_sept.id, self.session_april.id,
+            progress=lambda stage, count: stages.append((stage, count)),
+        )
+        self.assertIn(('products_created', 3), stages)
+        self.assertIn(('prices_created', 3), stages)
+        self.assertIn(('bundles_created', 1), stages)
+
+    def test_query_count_independent_of_product_count(self):
+        """Copy cost does not grow with the number of products."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as baseline:
+            SessionSetupService.copy_products_and_bundles(
+                self.session_sept.id, self.session_april.id, dry_run=True
+            )
+        extra = StoreMaterialProduct.objects.create(
+            exam_session_subject=self.ess_prev_cm2,
+            product_product_variation=self.ppv_marking_hub,
+            is_active=True,
+            product_code='CM2/HUB2/2026-04',
+        )
+        Price.objects.create(product=extra, price_type='standard', amount=10)
+        with CaptureQueriesContext(connection) as more:
+            SessionSetupService.copy_products_and_bundles(
+                self.session_sept.id, self.session_april.id, dry_run=True
+            )
+        self.assertEqual(len(baseline), len(more))
+
+    def _count_copy_queries(self):
+        """Queries of a real (written) copy, rolled back afterwards."""
+        from django.db import connection, transaction
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                SessionSetupService.copy_products_and_bundles(
+                    self.session_sept.id, self.session_april.id
+                )
+                transaction.set_rollback(True)
+        return len(queries)
+
+    def test_write_query_count_independent_of_product_count(self):
+        """Writing the copy, search refresh included, costs the same
+        number of queries for one more product and price."""
+        baseline = self._count_copy_queries()
+        extra = StoreMaterialProduct.objects.create(
+            exam_session_subject=self.ess_prev_cm2,
+            product_product_variation=self.ppv_marking_hub,
+            is_active=True,
+            product_code='CM2/HUB2/2026-04',
+        )
+        Price.objects.create(product=extra, price_type='standard', amount=10)
+        self.assertEqual(self._count_copy_queries(), baseline)
+
+    def test_copy_refreshes_search_on_commit(self):
+        """Copied products get their cards rebuilt and the typeahead
+        generation moves on once the copy commits."""
+        from search.services.typeahead import get_catalog_generation
+
+        generation = get_catalog_generation()
+        with patch('search.tasks.refresh_product_cards_task') as refresh_task:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                SessionSetupService.copy_products_and_bundles(
+                    self.session_sept.id, self.session_april.id
+                )
+            self.assertEqual(get_catalog_generation(), generation)
+            refresh_task.enqueue.assert_not_called()
+
+            for callback in callbacks:
+                callback()
+
+        new_ids = sorted(StoreProduct.objects.filter(
+            exam_session_subject__exam_session=self.session_sept,
+        ).values_list('pk', flat=True))
+        refresh_task.enqueue.assert_called_once_with(new_ids)
+        self.assertNotEqual(get_catalog_generation(), generation)
+
 
 class TestSessionSetupEndpoint(CatalogAPITestCase):
     """Integration tests for POST /api/catalog/session-setup/copy-products/."""
@@ -325,6 +446,22 @@ class TestSessionSetupEndpoint(CatalogAPITestCase):
         })
         self.assertEqual(response.status_code, 400)
 
+    def test_dry_run_returns_200_without_writing(self):
+        """dry_run=true returns the diff and creates nothing."""
+        self.authenticate_superuser()
+        response = self.client.post(self.URL, {
+            'new_exam_session_id': self.session_sept.id,
+            'previous_exam_session_id': self.session_april.id,
+            'dry_run': True,
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['dry_run'])
+        self.assertEqual(len(data['diff']['products']), 1)
+        self.assertFalse(StoreProduct.objects.filter(
+            exam_session_subject=self.ess_new
+        ).exists())
+
     def test_response_shape(self):
         """Response contains all expected fields."""
         self.authenticate_superuser()
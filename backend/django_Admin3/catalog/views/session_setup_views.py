@@ -35,10 +35,11 @@ class SessionSetupViewSet(viewsets.ViewSet):
 
         new_session_id = serializer.validated_data['new_exam_session_id']
         previous_session_id = serializer.validated_data['previous_exam_session_id']
+        dry_run = serializer.validated_data['dry_run']
 
         try:
             result = SessionSetupService.copy_products_and_bundles(
-                new_session_id, previous_session_id
+                new_session_id, previous_session_id, dry_run=dry_run
             )
         except ValueError as e:
             return Response(
@@ -62,14 +63,18 @@ class SessionSetupViewSet(viewsets.ViewSet):
         from catalog.models import ExamSession
         new_session = ExamSession.objects.get(id=new_session_id)
         result['message'] = (
-            f"Successfully created {result['products_created']} products, "
+            f"{'Dry run: would create' if dry_run else 'Successfully created'} "
+            f"{result['products_created']} products, "
             f"{result['prices_created']} prices, "
             f"and {result['bundles_created']} bundles "
             f"for session {new_session.session_code}."
         )
 
         response_serializer = CopyProductsResponseSerializer(result)
-        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+        return Response(
+            response_serializer.data,
+            status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED,
+        )
 
     @action(detail=False, methods=['get'],
             url_path=r'session-data-counts/(?P<session_id>[0-9]+)')
@@ -0,0 +1,19 @@
+"""Cache warmers for the catalogue (see utils.warmup)."""
+from utils.warmup import register_warmer, warm_url
+
+
+@register_warmer('catalog.navigation')
+def navigation():
+    """The navigation menu payload (navigation_data)."""
+    warm_url('/api/catalog/navigation-data/')
+
+
+@register_warmer('catalog.subjects')
+def subjects():
+    """Subject lists: unfiltered and per subject type."""
+    from catalog.models import Subject
+
+    warm_url('/api/catalog/subjects/')
+    for code, _ in Subject.SubjectType.choices:
+        warm_url(f'/api/catalog/subjects/?subject_type={code}')
+    return f'{len(Subject.SubjectType.choices) + 1} lists'
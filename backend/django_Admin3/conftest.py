@@ -2,8 +2,11 @@
 
 All tests run against PostgreSQL. SQLite is no longer supported.
 """
+import pytest
 from django.conf import settings
 
+pytest_plugins = ['utils.pytest_query_budget']
+
 
 def pytest_configure(config):
     """Verify PostgreSQL is being used for tests."""
@@ -14,3 +17,11 @@ def pytest_configure(config):
             "Use DJANGO_SETTINGS_MODULE=django_Admin3.settings.test "
             "which configures PostgreSQL."
         )
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_stores():
+    """Reset the per-process stores before each test, as the test runner does."""
+    from django_Admin3.test_runner import reset_process_stores
+
+    reset_process_stores()
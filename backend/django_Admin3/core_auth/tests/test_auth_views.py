@@ -5,7 +5,9 @@ This module tests the AuthViewSet endpoints including login, register, logout,
 password reset, account activation, and email verification.
 """
 
-from django.test import TestCase
+import json
+
+from django.test import RequestFactory, TestCase
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -15,6 +17,7 @@ from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from unittest.mock import patch, MagicMock
 
+from core_auth.views import password_reset_request_async
 from students.models import Student
 
 
@@ -1321,3 +1324,60 @@ class CoverageGapTestCase(APITestCase):
         # Verify default email was used
         call_args = mock_email_service.send_order_confirmation.call_args
         self.assertEqual(call_args[0][0], 'eugenelo1030@gmail.com')
+
+
+class AsyncPasswordResetRequestTestCase(TestCase):
+    """Test cases for the async password reset view used under ASGI."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(
+            username='asyncreset',
+            email='asyncreset@example.com',
+            password='oldpassword123'
+        )
+
+    def _post(self, data):
+        return self.factory.post(
+            '/api/auth/password_reset_request/', json.dumps(data), content_type='application/json'
+        )
+
+    @patch('core_auth.views.email_service.send_password_reset')
+    @patch('core_auth.views.averify_recaptcha_v3')
+    @patch('core_auth.views.is_recaptcha_enabled')
+    async def test_verified_request_sends_email(self, mock_enabled, mock_verify, mock_send_email):
+        """reCAPTCHA is awaited, then the reset email is queued."""
+        mock_enabled.return_value = True
+        mock_verify.return_value = {'success': True}
+        mock_send_email.return_value = True
+
+        response = await password_reset_request_async(
+            self._post({'email': 'asyncreset@example.com', 'recaptcha_token': 'token'})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_verify.assert_awaited_once()
+        mock_send_email.assert_called_once()
+
+    @patch('core_auth.views.averify_recaptcha_v3')
+    @patch('core_auth.views.is_recaptcha_enabled')
+    async def test_failed_recaptcha_is_rejected(self, mock_enabled, mock_verify):
+        """A failed verification returns 400 without touching the user."""
+        mock_enabled.return_value = True
+        mock_verify.return_value = {'success': False, 'error': 'score-too-low'}
+
+        response = await password_reset_request_async(
+            self._post({'email': 'asyncreset@example.com', 'recaptcha_token': 'token'})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch('core_auth.views.is_recaptcha_enabled')
+    async def test_missing_email(self, mock_enabled):
+        """Email is required."""
+        mock_enabled.return_value = False
+
+        response = await password_reset_request_async(self._post({}))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,6 +1,7 @@
 # backend/django_Admin3/core_auth/urls.py
+from django.conf import settings
 from django.urls import path
-from .views import AuthViewSet, send_test_email
+from .views import AuthViewSet, password_reset_request_async, send_test_email
 from rest_framework_simplejwt.views import TokenRefreshView
 
 auth_viewset = AuthViewSet.as_view({
@@ -28,6 +29,11 @@ auth_password_reset_request = AuthViewSet.as_view({
     'post': 'password_reset_request'
 })
 
+# Under the ASGI deployment, reCAPTCHA verification is awaited instead of
+# holding a worker thread for the round-trip to Google.
+if getattr(settings, 'ASYNC_UPSTREAM_VIEWS', False):
+    auth_password_reset_request = password_reset_request_async
+
 auth_password_reset_confirm = AuthViewSet.as_view({
     'post': 'password_reset_confirm'
 })
@@ -8,10 +8,14 @@ from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
 from django.middleware.csrf import get_token
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from asgiref.sync import sync_to_async
 from users.serializers import UserRegistrationSerializer
 from cart.services import cart_service
 from email_system.services.email_service import email_service
-from utils.recaptcha_utils import verify_recaptcha_v3, is_recaptcha_enabled, get_client_ip
+from utils.recaptcha_utils import verify_recaptcha_v3, averify_recaptcha_v3, is_recaptcha_enabled, get_client_ip
 from core_auth.models import MachineToken
 from core_auth.utils import hash_token, is_trusted_ip
 # Token configuration - now using Django settings directly
@@ -21,6 +25,7 @@ from django.utils.encoding import force_bytes, force_str
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
+import json
 import logging
 from students.models import Student
 from django.db import transaction
@@ -53,6 +58,136 @@ def serialize_user_for_email(user):
     }
 
 
+def issue_password_reset(email):
+    """
+    Send password reset instructions to ``email`` if an account exists.
+
+    Shared by AuthViewSet.password_reset_request and its async variant;
+    callers verify reCAPTCHA first.
+
+    Returns:
+        tuple: (response payload, HTTP status code)
+    """
+    try:
+        user = User.objects.get(email=email)
+
+        # Generate reset token using Django's built-in token generator (secure)
+        token = default_token_generator.make_token(user)
+
+        # Create URL-safe user ID
+        uid = urlsafe_base64_encode(force_bytes(user.pk))
+
+        # Create reset URL
+        frontend_url = getattr(settings, 'FRONTEND_URL', 'http://127.0.0.1:3000')
+        reset_url = f"{frontend_url}/auth/reset-password?uid={uid}&token={token}"
+
+        # Set expiry time with proper priority: Database setting > Django setting > Default
+        try:
+            from email_system.models import EmailSettings
+            expiry_hours = EmailSettings.get_setting('password_reset_timeout_hours') or getattr(settings, 'PASSWORD_RESET_TIMEOUT_HOURS', 24)
+        except Exception:
+            # Fallback if database is not available or models not accessible
+            expiry_hours = getattr(settings, 'PASSWORD_RESET_TIMEOUT_HOURS', 24)
+
+        # Prepare email data
+        reset_data = {
+            'user': serialize_user_for_email(user),
+            'reset_url': reset_url,
+            'expiry_hours': expiry_hours
+        }
+
+        # Send password reset email using existing email service
+        success = email_service.send_password_reset(
+            user_email=user.email,
+            reset_data=reset_data,
+            use_mjml=True,
+            enhance_outlook=True,
+            use_queue=True,  # Queue for better performance
+            user=user
+        )
+
+        if success:
+            return {
+                'success': True,
+                'message': f'Password reset instructions have been sent to {email}. The link will expire in {expiry_hours} hours.',
+                'expiry_hours': expiry_hours
+            }, status.HTTP_200_OK
+
+        logger.error(f"Failed to queue password reset email for user {user.email}")
+        return (
+            {'error': 'Failed to send password reset email. Please try again later.'},
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    except User.DoesNotExist:
+        # For security, don't reveal if email exists or not
+        # Return success message anyway
+        logger.warning(f"Password reset requested for non-existent email: {email}")
+        return {
+            'success': True,
+            'message': f'If an account with email {email} exists, password reset instructions have been sent.',
+            'expiry_hours': 24  # Default expiry
+        }, status.HTTP_200_OK
+    except Exception as e:
+        logger.error(f"Error during password reset request: {str(e)}")
+        return (
+            {'error': 'An error occurred. Please try again later.'},
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@csrf_exempt
+@require_POST
+async def password_reset_request_async(request):
+    """
+    Async variant of AuthViewSet.password_reset_request for the ASGI deployment.
+
+    Awaits reCAPTCHA verification on the shared async HTTP client; the user
+    lookup and email queueing run via sync_to_async. Routed in place of the
+    DRF action when settings.ASYNC_UPSTREAM_VIEWS is enabled.
+    """
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'Invalid JSON body'}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(data, dict):
+            data = {}
+    else:
+        data = request.POST
+
+    email = data.get('email')
+    recaptcha_token = data.get('recaptcha_token')
+
+    if not email:
+        return JsonResponse({'error': 'Email is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Verify reCAPTCHA v3 if enabled
+    if is_recaptcha_enabled():
+        if not recaptcha_token:
+            return JsonResponse(
+                {'error': 'reCAPTCHA verification is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        verification_result = await averify_recaptcha_v3(
+            recaptcha_response=recaptcha_token,
+            expected_action='password_reset',
+            min_score=getattr(settings, 'RECAPTCHA_DEFAULT_MIN_SCORE', 0.5),
+            user_ip=get_client_ip(request)
+        )
+
+        if not verification_result['success']:
+            logger.warning(f"reCAPTCHA verification failed for password reset: {verification_result.get('error', 'Unknown error')}")
+            return JsonResponse(
+                {'error': 'reCAPTCHA verification failed. Please try again.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    payload, http_status = await sync_to_async(issue_password_reset)(email)
+    return JsonResponse(payload, status=http_status)
+
+
 class AuthViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
     
@@ -328,72 +463,8 @@ class AuthViewSet(viewsets.ViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        try:
-            user = User.objects.get(email=email)
-            
-            # Generate reset token using Django's built-in token generator (secure)
-            token = default_token_generator.make_token(user)
-            
-            # Create URL-safe user ID
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
-            
-            # Create reset URL
-            frontend_url = getattr(settings, 'FRONTEND_URL', 'http://127.0.0.1:3000')
-            reset_url = f"{frontend_url}/auth/reset-password?uid={uid}&token={token}"
-            
-            # Set expiry time with proper priority: Database setting > Django setting > Default
-            try:
-                from email_system.models import EmailSettings
-                expiry_hours = EmailSettings.get_setting('password_reset_timeout_hours') or getattr(settings, 'PASSWORD_RESET_TIMEOUT_HOURS', 24)
-            except Exception:
-                # Fallback if database is not available or models not accessible
-                expiry_hours = getattr(settings, 'PASSWORD_RESET_TIMEOUT_HOURS', 24)
-            
-            # Prepare email data
-            reset_data = {
-                'user': serialize_user_for_email(user),
-                'reset_url': reset_url,
-                'expiry_hours': expiry_hours
-            }
-            
-            # Send password reset email using existing email service
-            success = email_service.send_password_reset(
-                user_email=user.email,
-                reset_data=reset_data,
-                use_mjml=True,
-                enhance_outlook=True,
-                use_queue=True,  # Queue for better performance
-                user=user
-            )
-            
-            if success:
-                return Response({
-                    'success': True,
-                    'message': f'Password reset instructions have been sent to {email}. The link will expire in {expiry_hours} hours.',
-                    'expiry_hours': expiry_hours
-                })
-            else:
-                logger.error(f"Failed to queue password reset email for user {user.email}")
-                return Response(
-                    {'error': 'Failed to send password reset email. Please try again later.'}, 
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-                
-        except User.DoesNotExist:
-            # For security, don't reveal if email exists or not
-            # Return success message anyway
-            logger.warning(f"Password reset requested for non-existent email: {email}")
-            return Response({
-                'success': True,
-                'message': f'If an account with email {email} exists, password reset instructions have been sent.',
-                'expiry_hours': 24  # Default expiry
-            })
-        except Exception as e:
-            logger.error(f"Error during password reset request: {str(e)}")
-            return Response(
-                {'error': 'An error occurred. Please try again later.'}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        payload, http_status = issue_password_reset(email)
+        return Response(payload, status=http_status)
 
     @action(detail=False, methods=['post'])
     def password_reset_confirm(self, request):
@@ -0,0 +1,110 @@
+"""
+Database connection pooling and per-route statement timeouts.
+
+Pooling uses Django's native psycopg 3 pool (``OPTIONS['pool']``). Each
+server process gets its own pool, sized from the concurrency it runs
+with, as configured by railway-start.sh:
+
+  - WSGI: ``GUNICORN_THREADS`` threads per worker (default 4), so at most
+    that many connections are checked out at once. One spare covers
+    connections held briefly outside a request thread.
+  - ASGI: sync views run in a thread per in-flight request, so the pool
+    size itself is the cap. Requests beyond it wait up to
+    ``DB_POOL_TIMEOUT`` seconds for a connection instead of opening more.
+
+Database-wide connections are WEB_CONCURRENCY x max_size; keep that
+under the server's ``max_connections``. ``DB_POOL_MIN_SIZE``,
+``DB_POOL_MAX_SIZE`` and ``DB_POOL_TIMEOUT`` override the defaults, and
+``DB_POOL=false`` turns pooling off.
+
+Statement timeouts are set per request by
+utils.middleware.StatementTimeoutMiddleware from ``STATEMENT_TIMEOUTS``
+(see ``statement_timeout_for``). Management commands and worker
+processes never pass through it and keep the server default (unlimited).
+
+This module is imported by settings; keep it free of model imports.
+"""
+import os
+
+ASGI_DEFAULT_POOL_SIZE = 10
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    return value.lower() in ('true', '1', 'yes')
+
+
+def pool_options():
+    """Return ``OPTIONS['pool']`` kwargs sized for this process."""
+    if os.environ.get('SERVER_MODE') == 'asgi':
+        default_max = ASGI_DEFAULT_POOL_SIZE
+    else:
+        default_max = _env_int('GUNICORN_THREADS', 4) + 1
+
+    max_size = _env_int('DB_POOL_MAX_SIZE', default_max)
+    return {
+        'min_size': min(_env_int('DB_POOL_MIN_SIZE', 2), max_size),
+        'max_size': max_size,
+        'timeout': _env_int('DB_POOL_TIMEOUT', 10),  # seconds to wait for a free connection
+        'max_idle': 300,  # close connections idle for 5 minutes (down to min_size)
+        'name': 'admin3',
+    }
+
+
+def with_pool(database, enabled=None):
+    """
+    Return a copy of a DATABASES entry configured for the psycopg pool.
+
+    Non-PostgreSQL entries (e.g. the build-time SQLite fallback) are
+    returned unchanged. Django's pool does not support persistent
+    connections, so CONN_MAX_AGE is forced to 0; CONN_HEALTH_CHECKS makes
+    the pool check connections before handing them out.
+    """
+    if enabled is None:
+        enabled = _env_bool('DB_POOL', True)
+    if not enabled or 'postgresql' not in database.get('ENGINE', ''):
+        return database
+
+    database = dict(database)
+    options = dict(database.get('OPTIONS') or {})
+    options['pool'] = pool_options()
+    database['OPTIONS'] = options
+    database['CONN_MAX_AGE'] = 0
+    database['CONN_HEALTH_CHECKS'] = True
+    return database
+
+
+def statement_timeout_for(path, timeouts):
+    """
+    Return the statement timeout in milliseconds for a request path.
+
+    ``timeouts`` is ``settings.STATEMENT_TIMEOUTS``: a ``default`` for
+    storefront routes plus ``routes``, a list of (path prefix, timeout)
+    checked in order. 0 means unlimited.
+    """
+    for prefix, timeout in timeouts.get('routes', ()):
+        if path.startswith(prefix):
+            return timeout
+    return timeouts.get('default', 0)
+
+
+def pool_stats():
+    """Return psycopg pool counters for each pooled connection alias.
+
+    Covers only the calling process's pool (one per gunicorn worker).
+    """
+    from django.db import connections
+
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is not None:
+            stats[alias] = pool.get_stats()
+    return stats
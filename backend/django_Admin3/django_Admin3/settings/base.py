@@ -18,6 +18,8 @@ from pathlib import Path
 import sys
 import environ
 
+from django_Admin3.db_pool import with_pool
+
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 # Initialize environ
@@ -158,14 +160,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'utils.middleware.RequestMetricsMiddleware',  # First, so every query is counted
     'corsheaders.middleware.CorsMiddleware',  # Must be before CommonMiddleware
     'django.middleware.security.SecurityMiddleware',
+    'utils.middleware.StatementTimeoutMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     # Scheduled for removal 2026-06-12 (30 days post-deploy of filter redesign)
     'filtering.middleware.legacy_url_alias.LegacyFilterURLAliasMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'utils.middleware.ProfilingMiddleware',  # On-demand profiles; needs request.user
+    'userprofile.middleware.UserContextMiddleware',
     'django.contrib.admindocs.middleware.XViewMiddleware',  # For admindocs view documentation
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware'
@@ -210,6 +216,80 @@ DATABASES = {
         },
     }
 }
+# Pooling is opt-in locally (DB_POOL=true); deployed settings enable it.
+# See django_Admin3/db_pool.py for sizing.
+DATABASES['default'] = with_pool(DATABASES['default'], enabled=env.bool('DB_POOL', default=False))
+
+# statement_timeout per route class in milliseconds (0 = unlimited), applied
+# by utils.middleware.StatementTimeoutMiddleware. Storefront routes get the
+# short default; admin routes (exports, bulk edits, reports) are matched by
+# prefix, first match wins. Management commands and workers are never limited.
+ADMIN_STATEMENT_TIMEOUT_MS = env.int('ADMIN_STATEMENT_TIMEOUT_MS', default=60000)
+STATEMENT_TIMEOUTS = {
+    'default': env.int('STOREFRONT_STATEMENT_TIMEOUT_MS', default=5000),
+    'routes': [
+        (prefix, ADMIN_STATEMENT_TIMEOUT_MS)
+        for prefix in (
+            '/admin/',
+            '/api/email/',
+            '/api/administrate/',
+            '/api/orders/admin/',
+            '/api/tutorials/admin/',
+            '/api/markings/',
+            '/api/store/admin-products/',
+            '/api/store/admin-bundles/',
+            '/api/legacy/admin-orders/',
+            '/api/catalog/session-setup/',
+            '/api/students/admin-students/',
+            '/api/users/',
+        )
+    ],
+}
+# Per-request query/cache metrics from utils.middleware.RequestMetricsMiddleware:
+# Server-Timing header, a 'request_metrics' log line per request, and the
+# full SQL of a sample of requests slower than slow_request_ms.
+REQUEST_METRICS = {
+    'enabled': env.bool('REQUEST_METRICS_ENABLED', default=True),
+    'server_timing': env.bool('REQUEST_METRICS_SERVER_TIMING', default=True),
+    'slow_request_ms': env.int('REQUEST_METRICS_SLOW_MS', default=1000),
+    'slow_sample_rate': env.float('REQUEST_METRICS_SLOW_SAMPLE_RATE', default=0.1),
+}
+
+# Query budgets per request path (see utils.request_metrics). Exceeding one
+# logs a warning; test/CI settings set QUERY_BUDGETS_ENFORCED so the test
+# making the request fails instead.
+QUERY_BUDGETS = {
+    '/api/search/unified/': 40,
+    '/api/cart/': 20,
+    '/api/catalog/navigation-data/': 40,
+    '/api/rules/engine/execute/': 25,
+}
+QUERY_BUDGETS_ENFORCED = False
+
+# On-demand sampling profiles (utils.profiling, utils.middleware.ProfilingMiddleware).
+# Requests with a signed X-Profile-Token header (manage.py profile_token) or a
+# staff ?_profile=1 are profiled, at most max_per_window per window seconds;
+# profiles stay downloadable from /api/utils/profiles/<id>/ for ttl seconds.
+PROFILING = {
+    'enabled': env.bool('PROFILING_ENABLED', default=True),
+    'backend': env('PROFILING_BACKEND', default='auto'),
+    'interval_ms': env.float('PROFILING_INTERVAL_MS', default=5),
+    'ttl': env.int('PROFILING_TTL', default=3600),
+    'max_per_window': env.int('PROFILING_MAX_PER_WINDOW', default=10),
+    'window': env.int('PROFILING_WINDOW', default=600),
+    'token_max_age': env.int('PROFILING_TOKEN_MAX_AGE', default=900),
+}
+
+# Cache warm-up (utils.warmup): apps' warmers.py run in each gunicorn worker
+# after boot (gunicorn.conf.py) and from manage.py warm_caches. While the
+# worker answering /api/health/ still warms, it answers 503 when
+# gate_health_check is set.
+WARMUP = {
+    'enabled': env.bool('WARMUP_ENABLED', default=True),
+    'gate_health_check': env.bool('WARMUP_GATE_HEALTH_CHECK', default=True),
+    'lock_timeout': env.int('WARMUP_LOCK_TIMEOUT', default=120),
+}
+
 # if 'test' in sys.argv:
 #     DATABASES = {
 #         'default': {
@@ -348,6 +428,11 @@ SIMPLE_JWT = {
 }
 
 
+# Product search ranking engine (search.services.backends):
+# 'fuzzy' scores in Python with fuzzywuzzy, 'postgres' ranks in SQL over
+# search.ProductSearchDocument (tsvector + pg_trgm).
+SEARCH_BACKEND = env('SEARCH_BACKEND', default='fuzzy')
+
 # GraphQL Template Settings
 GRAPHQL_TEMPLATES_DIR = os.path.join(
     BASE_DIR, 'administrate/templates/graphql')
@@ -362,6 +447,9 @@ EMAIL_HOST_PASSWORD = os.environ.get(
     'EMAIL_HOST_PASSWORD', '')  # Your app password
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@acted.com')
 
+# Sent-email snapshots unused for this long are deleted by prune_email_snapshots
+EMAIL_SNAPSHOT_RETENTION_DAYS = env.int('EMAIL_SNAPSHOT_RETENTION_DAYS', default=365)
+
 # For development, you can use console backend for testing
 # DISABLED: Uncomment below to print emails to console instead of sending
 # if DEBUG:
@@ -387,6 +475,18 @@ RECAPTCHA_ACTIONS = {
     'contact_form': 'contact'
 }
 
+# Upstream-bound views (address lookup, reCAPTCHA). ASYNC_UPSTREAM_VIEWS routes
+# them to their async variants; enable it when serving django_Admin3.asgi
+# (railway-start.sh sets it for SERVER_MODE=asgi). UPSTREAM_HTTP sets the
+# per-upstream timeout and concurrency cap used by utils.http_client.
+ASYNC_UPSTREAM_VIEWS = env.bool('ASYNC_UPSTREAM_VIEWS', default=False)
+UPSTREAM_HTTP = {
+    'postcoder': {'timeout': 10.0, 'max_concurrency': 20},
+    'getaddress': {'timeout': 10.0, 'max_concurrency': 20},
+    'recaptcha': {'timeout': 10.0, 'max_concurrency': 30},
+}
+POSTCODER_API_URL = env('POSTCODER_API_URL', default='https://ws.postcoder.com/pcw')
+
 # Migration behavior for conditional operations (IF EXISTS checks).
 # When True (CI/test): raise exceptions if expected tables not found.
 # When False (production): log warnings and skip gracefully.
@@ -406,6 +506,12 @@ TASKS = {
     },
 }
 
+# Checkout side effects (orders.services.checkout_side_effects) are enqueued
+# once the order commits; with ImmediateBackend they run right then. False
+# leaves them to the process_checkout_side_effects command, which must then
+# be scheduled (it is not part of the Railway deployment).
+CHECKOUT_SIDE_EFFECTS_ENQUEUE = env.bool('CHECKOUT_SIDE_EFFECTS_ENQUEUE', default=True)
+
 # Administrate webhook settings — never commit real values, only read from env
 ADMINISTRATE_WEBHOOK_ROUTE_TOKEN = env('ADMINISTRATE_WEBHOOK_ROUTE_TOKEN', default='')
 ADMINISTRATE_WEBHOOK_SECRET = env('ADMINISTRATE_WEBHOOK_SECRET', default='')
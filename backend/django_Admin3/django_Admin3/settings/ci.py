@@ -23,6 +23,9 @@ MIGRATION_ASSERT_MODE = True
 # Use PostgreSQLTestRunner for reliable test DB management
 TEST_RUNNER = 'django_Admin3.test_runner.PostgreSQLTestRunner'
 
+# Fail the test making a request that exceeds settings.QUERY_BUDGETS
+QUERY_BUDGETS_ENFORCED = True
+
 # Disable password hashers for faster tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
@@ -1,6 +1,7 @@
 # backend/django_Admin3/django_Admin3/settings/production.py
 import os
 from .base import *
+from django_Admin3.db_pool import with_pool
 
 DEBUG = False
 ALLOWED_HOSTS = ['your-domain.com', 'www.your-domain.com']
@@ -27,16 +28,10 @@ DATABASES = {
             'sslmode': 'require',
             'options': '-c default_transaction_isolation=read committed'
         },
-        'CONN_MAX_AGE': 600,  # 10 minutes
-        'CONN_HEALTH_CHECKS': True,
     }
 }
-# Database connection pooling
-DATABASE_POOL_CLASS = 'django_db_pool.pools.postgresql.DatabasePool'
-DATABASE_POOL_PARAMS = {
-    'max_connections': 20,
-    'min_connections': 5,
-}
+# Native psycopg pool sized from the gunicorn threads (see django_Admin3/db_pool.py)
+DATABASES['default'] = with_pool(DATABASES['default'])
 CACHES = {
     'default': {
         'BACKEND': 'django_redis.cache.RedisCache',
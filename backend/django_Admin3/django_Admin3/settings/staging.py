@@ -11,6 +11,7 @@ import dj_database_url
 import environ
 
 from .base import *  # noqa: F401, F403
+from django_Admin3.db_pool import with_pool
 
 env = environ.Env(
     DEBUG=(bool, False),
@@ -62,6 +63,10 @@ else:
         }
     }
 
+# Native psycopg pool sized from the gunicorn threads (see django_Admin3/db_pool.py).
+# Replaces CONN_MAX_AGE persistent connections; DB_POOL=false opts out.
+DATABASES['default'] = with_pool(DATABASES['default'])
+
 # --- Cache (Redis) ---
 CACHES = {
     'default': {
@@ -78,13 +83,17 @@ CACHES = {
 # WhiteNoise after SecurityMiddleware (serves Django admin/DRF statics)
 MIDDLEWARE = [
     'utils.middleware.HealthCheckMiddleware',
+    'utils.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'utils.middleware.StatementTimeoutMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'utils.middleware.ProfilingMiddleware',  # On-demand profiles; needs request.user
+    'userprofile.middleware.UserContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -23,6 +23,9 @@ TEST_RUNNER = 'django_Admin3.test_runner.PostgreSQLTestRunner'
 # Enable assertion mode for migrations in test
 MIGRATION_ASSERT_MODE = True
 
+# Fail the test making a request that exceeds settings.QUERY_BUDGETS
+QUERY_BUDGETS_ENFORCED = True
+
 # Disable password hashers for faster tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
@@ -1,5 +1,6 @@
 # uat.py - Railway UAT Environment Settings
 from .base import *
+from django_Admin3.db_pool import with_pool
 import dj_database_url
 from django.core.exceptions import ImproperlyConfigured
 
@@ -7,13 +8,17 @@ from django.core.exceptions import ImproperlyConfigured
 # MUST be placed before SecurityMiddleware to exempt health checks from SSL redirect
 MIDDLEWARE = [
     'utils.middleware.HealthCheckMiddleware',  # MUST be first - exempts /api/health/ from SSL redirect
+    'utils.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files in production
+    'utils.middleware.StatementTimeoutMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'utils.middleware.ProfilingMiddleware',  # On-demand profiles; needs request.user
+    'userprofile.middleware.UserContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware'
 ]
@@ -78,6 +83,10 @@ else:
         }
     }
 
+# Native psycopg pool sized from the gunicorn threads (see django_Admin3/db_pool.py).
+# Replaces CONN_MAX_AGE persistent connections; DB_POOL=false opts out.
+DATABASES['default'] = with_pool(DATABASES['default'])
+
 # CORS Configuration - Must match frontend domain
 # Using env.list() from django-environ which correctly handles single and comma-separated values
 CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[])
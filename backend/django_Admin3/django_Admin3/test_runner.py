@@ -1,12 +1,52 @@
 """Custom test runner for Admin3.
 
 PostgreSQLTestRunner terminates lingering database connections before
-dropping/creating the test database. Used by all test settings
-(settings.test, settings.development, settings.ci).
+dropping/creating the test database, and resets the per-process stores
+before every test. Used by all test settings (settings.test,
+settings.development, settings.ci).
 """
 import sys
+import unittest
 
-from django.test.runner import DiscoverRunner
+from django.test.runner import (
+    DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner,
+)
+from django.utils.module_loading import import_string
+
+# Per-process stores reload when a committed save bumps their version.
+# TestCase never commits, so without a reset a test would read the rows
+# of whichever test loaded the store before it.
+PROCESS_STORES = [
+    'rules_engine.services.template_store.template_store',
+    'email_system.services.content_rule_store.content_rule_store',
+]
+
+
+def reset_process_stores():
+    """Drop every per-process store so the next lookup reloads."""
+    for path in PROCESS_STORES:
+        import_string(path).clear()
+
+
+class ResetProcessStoresMixin:
+    """Test result mixin that resets the per-process stores before each test."""
+
+    def startTest(self, test):
+        reset_process_stores()
+        super().startTest(test)
+
+
+class ResetProcessStoresRemoteResult(ResetProcessStoresMixin, RemoteTestResult):
+    pass
+
+
+class ResetProcessStoresRemoteRunner(RemoteTestRunner):
+    resultclass = ResetProcessStoresRemoteResult
+
+
+class ResetProcessStoresParallelSuite(ParallelTestSuite):
+    """Parallel suite whose workers reset the per-process stores too."""
+    runner_class = ResetProcessStoresRemoteRunner
 
 
 class PostgreSQLTestRunner(DiscoverRunner):
@@ -19,7 +59,15 @@ class PostgreSQLTestRunner(DiscoverRunner):
     (not through the overridable _destroy_test_db method), so monkey-patching
     won't help. Instead, we pre-emptively terminate connections and drop the
     test DB ourselves, so Django's CREATE DATABASE succeeds on first try.
+
+    It also resets the per-process stores before each test, in serial and
+    parallel runs alike.
     """
+    parallel_test_suite = ResetProcessStoresParallelSuite
+
+    def get_resultclass(self):
+        resultclass = super().get_resultclass() or unittest.TextTestResult
+        return type(resultclass.__name__, (ResetProcessStoresMixin, resultclass), {})
 
     def setup_databases(self, **kwargs):
         if not self.keepdb:
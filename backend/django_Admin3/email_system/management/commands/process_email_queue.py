@@ -4,11 +4,12 @@ from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 from django.utils import timezone
 from email_system.services.queue_service import email_queue_service
+from utils.profiling import ProfileCommandMixin
 
 logger = logging.getLogger(__name__)
 
 
-class Command(BaseCommand):
+class Command(ProfileCommandMixin, BaseCommand):
     help = 'Process pending emails from the email queue'
 
     def add_arguments(self, parser):
@@ -0,0 +1,55 @@
+"""
+Management command to delete sent-email content snapshots past retention.
+
+Snapshots are deleted once no send has stored or reused them for
+EMAIL_SNAPSHOT_RETENTION_DAYS (or --days). Their logs are kept; the FK is
+set to NULL and the email viewer falls back to re-rendering.
+
+Usage:
+    python manage.py prune_email_snapshots
+    python manage.py prune_email_snapshots --days 90 --dry-run
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from email_system.models import EmailContentSnapshot
+
+
+class Command(BaseCommand):
+    help = 'Delete email content snapshots not used within the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Retention in days (default: EMAIL_SNAPSHOT_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be deleted without deleting',
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is None:
+            days = getattr(settings, 'EMAIL_SNAPSHOT_RETENTION_DAYS', 365)
+        if days < 1:
+            raise CommandError('--days must be at least 1.')
+
+        cutoff = timezone.now() - timedelta(days=days)
+        expired = EmailContentSnapshot.objects.filter(last_used_at__lt=cutoff)
+        count = expired.count()
+
+        if options['dry_run']:
+            self.stdout.write(f'{count} snapshot(s) unused since {cutoff:%Y-%m-%d} would be deleted')
+            return
+
+        expired.delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {count} snapshot(s) unused since {cutoff:%Y-%m-%d}'
+        ))
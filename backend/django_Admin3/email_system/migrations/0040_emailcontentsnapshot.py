@@ -0,0 +1,93 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("email_system", "0039_seed_tutorial_attendance_mjml"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailContentSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="SHA-256 of the HTML and text bodies.",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "compression",
+                    models.CharField(
+                        choices=[("zstd", "zstd"), ("gzip", "gzip")], max_length=10
+                    ),
+                ),
+                ("html_blob", models.BinaryField(help_text="Compressed final HTML body.")),
+                ("text_blob", models.BinaryField(help_text="Compressed plain-text body.")),
+                (
+                    "raw_size_bytes",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Uncompressed size of both bodies."
+                    ),
+                ),
+                (
+                    "stored_size_bytes",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Compressed size of both bodies."
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_used_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        default=django.utils.timezone.now,
+                        help_text="Last time a send stored or reused this snapshot (drives pruning).",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Email Content Snapshot",
+                "verbose_name_plural": "Email Content Snapshots",
+                "db_table": "utils_email_content_snapshot",
+                "ordering": ["-last_used_at"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="emaillog",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                help_text="Content hash for deduplication (SHA-256 snapshot key once sent)",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="emaillog",
+            name="content_snapshot",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Compressed final HTML/text as sent",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="logs",
+                to="email_system.emailcontentsnapshot",
+            ),
+        ),
+    ]
@@ -4,6 +4,7 @@ from .template_version import EmailTemplateVersion
 from .master_component import EmailMasterComponent
 from .queue import EmailQueue
 from .queue_attachment import EmailQueueAttachment
+from .content_snapshot import EmailContentSnapshot
 from .log import EmailLog
 from .settings import EmailSettings
 from .content_rule import EmailContentRule, EmailTemplateContentRule
@@ -22,6 +23,7 @@ __all__ = [
     'EmailMasterComponent',
     'EmailQueue',
     'EmailQueueAttachment',
+    'EmailContentSnapshot',
     'EmailLog',
     'EmailSettings',
     'EmailContentRule',
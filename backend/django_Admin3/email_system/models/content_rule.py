@@ -1,12 +1,74 @@
 from django.db import models
 from django.contrib.auth.models import User
 import logging
+import re
 
 from .template import EmailTemplate
 
 logger = logging.getLogger(__name__)
 
 
+def _resolve_path(context, keys):
+    """Extract a value from nested dicts/lists following pre-split ``keys``."""
+    value = context
+
+    for key in keys:
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit():
+            index = int(key)
+            value = value[index] if 0 <= index < len(value) else None
+        else:
+            return None
+
+    return value
+
+
+def _compile_operator(operator, condition_value):
+    """Return a one-argument test ``field_value -> bool`` for a condition."""
+    if operator == 'equals':
+        return lambda field_value: field_value == condition_value
+    elif operator == 'not_equals':
+        return lambda field_value: field_value != condition_value
+    elif operator == 'in':
+        if not isinstance(condition_value, list):
+            return lambda field_value: False
+        return lambda field_value: field_value in condition_value
+    elif operator == 'not_in':
+        if not isinstance(condition_value, list):
+            return lambda field_value: True
+        return lambda field_value: field_value not in condition_value
+    elif operator == 'greater_than':
+        return lambda field_value: field_value > condition_value if field_value is not None else False
+    elif operator == 'less_than':
+        return lambda field_value: field_value < condition_value if field_value is not None else False
+    elif operator == 'greater_equal':
+        return lambda field_value: field_value >= condition_value if field_value is not None else False
+    elif operator == 'less_equal':
+        return lambda field_value: field_value <= condition_value if field_value is not None else False
+    elif operator == 'contains':
+        expected = str(condition_value)
+        return lambda field_value: expected in str(field_value) if field_value is not None else False
+    elif operator == 'not_contains':
+        expected = str(condition_value)
+        return lambda field_value: expected not in str(field_value) if field_value is not None else True
+    elif operator == 'starts_with':
+        expected = str(condition_value)
+        return lambda field_value: str(field_value).startswith(expected) if field_value is not None else False
+    elif operator == 'ends_with':
+        expected = str(condition_value)
+        return lambda field_value: str(field_value).endswith(expected) if field_value is not None else False
+    elif operator == 'exists':
+        return lambda field_value: field_value is not None
+    elif operator == 'not_exists':
+        return lambda field_value: field_value is None
+    elif operator == 'regex_match':
+        pattern = re.compile(str(condition_value))
+        return lambda field_value: bool(pattern.match(str(field_value))) if field_value is not None else False
+    else:
+        return lambda field_value: False
+
+
 class EmailContentRule(models.Model):
     """Rules for triggering dynamic content insertion. Focuses purely on conditions and triggering logic."""
 
@@ -91,105 +153,71 @@ class EmailContentRule(models.Model):
         Returns:
             bool: True if condition matches, False otherwise
         """
-        try:
-            # Extract field value from context using dot notation
-            field_value = self._get_nested_field_value(context, self.condition_field)
+        return self.compile_condition()(context)
+
+    def compile_condition(self):
+        """
+        Compile this rule's conditions into a predicate ``context -> bool``.
 
-            # Handle special case for product-based rules where we need to check items
-            if self.rule_type == 'product_based' and 'items' in context:
-                return self._evaluate_product_condition(context['items'])
+        Field paths are split and operators resolved once, so the predicate
+        can be cached (see email_system.services.content_rule_store) and
+        called per email. Behaves exactly like evaluate_condition: errors,
+        at compile or call time, are logged and evaluate to False.
+        """
+        name = self.name
+        try:
+            main = _compile_operator(self.condition_operator, self.condition_value)
+            path = self.condition_field.split('.')
+
+            # Product-based rules test every order item
+            product_field = None
+            if self.rule_type == 'product_based':
+                field_parts = self.condition_field.split('.')
+                if len(field_parts) > 1 and field_parts[0] == 'items':
+                    product_field = field_parts[1]
+                else:
+                    product_field = 'product_id'  # default fallback
+
+            additional = [
+                (condition['field'].split('.'),
+                 _compile_operator(condition['operator'], condition['value']),
+                 condition.get('logic', 'AND'))
+                for condition in self.additional_conditions or []
+            ]
+        except Exception as e:
+            logger.error(f"Error evaluating content rule {name}: {str(e)}")
+            return lambda context: False
 
-            # Evaluate the main condition
-            result = self._evaluate_operator(field_value, self.condition_operator, self.condition_value)
+        def predicate(context):
+            try:
+                if product_field is not None and 'items' in context:
+                    return any(main(item.get(product_field)) for item in context['items'])
 
-            # Evaluate additional conditions if present
-            if self.additional_conditions:
-                for additional_condition in self.additional_conditions:
-                    additional_result = self._evaluate_additional_condition(context, additional_condition)
+                result = main(_resolve_path(context, path))
+                for additional_path, additional_test, logic in additional:
+                    additional_result = additional_test(_resolve_path(context, additional_path))
 
                     # Handle AND/OR logic
-                    if additional_condition.get('logic', 'AND') == 'AND':
+                    if logic == 'AND':
                         result = result and additional_result
                     else:  # OR
                         result = result or additional_result
 
-            return result
+                return result
 
-        except Exception as e:
-            logger.error(f"Error evaluating content rule {self.name}: {str(e)}")
-            return False
+            except Exception as e:
+                logger.error(f"Error evaluating content rule {name}: {str(e)}")
+                return False
+
+        return predicate
 
     def _get_nested_field_value(self, context, field_path):
         """Extract value from nested dictionary using dot notation."""
-        keys = field_path.split('.')
-        value = context
-
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-            elif isinstance(value, list) and key.isdigit():
-                index = int(key)
-                value = value[index] if 0 <= index < len(value) else None
-            else:
-                return None
-
-        return value
-
-    def _evaluate_product_condition(self, items):
-        """Evaluate product-based conditions against order items."""
-        # Extract the field name from condition_field (e.g., 'items.product_code' -> 'product_code')
-        field_parts = self.condition_field.split('.')
-        if len(field_parts) > 1 and field_parts[0] == 'items':
-            field_name = field_parts[1]
-        else:
-            field_name = 'product_id'  # default fallback
-
-        for item in items:
-            field_value = item.get(field_name)
-            if self._evaluate_operator(field_value, self.condition_operator, self.condition_value):
-                return True
-        return False
+        return _resolve_path(context, field_path.split('.'))
 
     def _evaluate_operator(self, field_value, operator, condition_value):
         """Evaluate a single condition using the specified operator."""
-        if operator == 'equals':
-            return field_value == condition_value
-        elif operator == 'not_equals':
-            return field_value != condition_value
-        elif operator == 'in':
-            return field_value in condition_value if isinstance(condition_value, list) else False
-        elif operator == 'not_in':
-            return field_value not in condition_value if isinstance(condition_value, list) else True
-        elif operator == 'greater_than':
-            return field_value > condition_value if field_value is not None else False
-        elif operator == 'less_than':
-            return field_value < condition_value if field_value is not None else False
-        elif operator == 'greater_equal':
-            return field_value >= condition_value if field_value is not None else False
-        elif operator == 'less_equal':
-            return field_value <= condition_value if field_value is not None else False
-        elif operator == 'contains':
-            return str(condition_value) in str(field_value) if field_value is not None else False
-        elif operator == 'not_contains':
-            return str(condition_value) not in str(field_value) if field_value is not None else True
-        elif operator == 'starts_with':
-            return str(field_value).startswith(str(condition_value)) if field_value is not None else False
-        elif operator == 'ends_with':
-            return str(field_value).endswith(str(condition_value)) if field_value is not None else False
-        elif operator == 'exists':
-            return field_value is not None
-        elif operator == 'not_exists':
-            return field_value is None
-        elif operator == 'regex_match':
-            import re
-            return bool(re.match(str(condition_value), str(field_value))) if field_value is not None else False
-        else:
-            return False
-
-    def _evaluate_additional_condition(self, context, condition):
-        """Evaluate an additional condition."""
-        field_value = self._get_nested_field_value(context, condition['field'])
-        return self._evaluate_operator(field_value, condition['operator'], condition['value'])
+        return _compile_operator(operator, condition_value)(field_value)
 
     def render_content(self, context):
         """
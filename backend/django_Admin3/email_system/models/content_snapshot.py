@@ -0,0 +1,121 @@
+"""Compressed snapshot of a sent email's final HTML and text bodies.
+
+Written by the queue worker after a successful send and read by the
+email viewer and by resends, so neither re-renders the template (master
+template, MJML compile, premailer) and both show exactly what was sent.
+
+Rows are keyed by ``content_hash`` (SHA-256 of the bodies), which
+``EmailLog.content_hash`` carries once the email is sent: batch sends of
+identical content share one row. Bodies are zstd-compressed where the
+runtime provides ``compression.zstd`` (Python 3.14+) and gzip otherwise;
+``compression`` records which, per row.
+
+Retention: ``prune_email_snapshots`` deletes rows not used for
+``EMAIL_SNAPSHOT_RETENTION_DAYS``. Logs keep their metadata (the FK is
+SET_NULL) and the viewer falls back to re-rendering.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+
+from django.db import models
+from django.utils import timezone
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:  # pragma: no cover - depends on the runtime
+    zstd = None
+
+
+def _compress(data: bytes) -> tuple[str, bytes]:
+    if zstd is not None:
+        return 'zstd', zstd.compress(data)
+    return 'gzip', gzip.compress(data, compresslevel=6)
+
+
+def _decompress(compression: str, blob) -> bytes:
+    blob = bytes(blob)
+    if compression == 'zstd':
+        if zstd is None:
+            raise RuntimeError('zstd snapshot cannot be read: compression.zstd is unavailable')
+        return zstd.decompress(blob)
+    return gzip.decompress(blob)
+
+
+class EmailContentSnapshot(models.Model):
+    """Deduplicated, compressed final bodies of a sent email."""
+
+    COMPRESSION_CHOICES = [
+        ('zstd', 'zstd'),
+        ('gzip', 'gzip'),
+    ]
+
+    content_hash = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text='SHA-256 of the HTML and text bodies.',
+    )
+    compression = models.CharField(max_length=10, choices=COMPRESSION_CHOICES)
+    html_blob = models.BinaryField(help_text='Compressed final HTML body.')
+    text_blob = models.BinaryField(help_text='Compressed plain-text body.')
+    raw_size_bytes = models.PositiveIntegerField(default=0, help_text='Uncompressed size of both bodies.')
+    stored_size_bytes = models.PositiveIntegerField(default=0, help_text='Compressed size of both bodies.')
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        help_text='Last time a send stored or reused this snapshot (drives pruning).',
+    )
+
+    class Meta:
+        db_table = 'utils_email_content_snapshot'
+        ordering = ['-last_used_at']
+        verbose_name = 'Email Content Snapshot'
+        verbose_name_plural = 'Email Content Snapshots'
+
+    def __str__(self) -> str:
+        return f'{self.content_hash[:12]} ({self.stored_size_bytes}/{self.raw_size_bytes} bytes)'
+
+    @staticmethod
+    def hash_content(html_content: str, text_content: str) -> str:
+        digest = hashlib.sha256(html_content.encode())
+        digest.update(b'\0')
+        digest.update(text_content.encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def store(cls, html_content: str, text_content: str) -> 'EmailContentSnapshot':
+        """Return the snapshot for these bodies, creating it on first use."""
+        html_content = html_content or ''
+        text_content = text_content or ''
+        content_hash = cls.hash_content(html_content, text_content)
+
+        existing = cls.objects.filter(content_hash=content_hash).first()
+        if existing is not None:
+            now = timezone.now()
+            cls.objects.filter(pk=existing.pk).update(last_used_at=now)
+            existing.last_used_at = now
+            return existing
+
+        compression, html_blob = _compress(html_content.encode())
+        _, text_blob = _compress(text_content.encode())
+        snapshot, _ = cls.objects.get_or_create(
+            content_hash=content_hash,
+            defaults={
+                'compression': compression,
+                'html_blob': html_blob,
+                'text_blob': text_blob,
+                'raw_size_bytes': len(html_content.encode()) + len(text_content.encode()),
+                'stored_size_bytes': len(html_blob) + len(text_blob),
+            },
+        )
+        return snapshot
+
+    @property
+    def html_content(self) -> str:
+        return _decompress(self.compression, self.html_blob).decode()
+
+    @property
+    def text_content(self) -> str:
+        return _decompress(self.compression, self.text_blob).decode()
@@ -6,6 +6,7 @@ import logging
 
 from .template import EmailTemplate
 from .queue import EmailQueue
+from .content_snapshot import EmailContentSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +38,14 @@ class EmailLog(models.Model):
     subject = models.CharField(max_length=300, help_text="Email subject")
 
     # Content tracking
-    content_hash = models.CharField(max_length=64, blank=True, help_text="MD5 hash of content for deduplication")
+    content_hash = models.CharField(
+        max_length=64, blank=True,
+        help_text="Content hash for deduplication (SHA-256 snapshot key once sent)",
+    )
+    content_snapshot = models.ForeignKey(
+        EmailContentSnapshot, on_delete=models.SET_NULL, null=True, blank=True, related_name='logs',
+        help_text="Compressed final HTML/text as sent",
+    )
 
     # Attachments
     attachment_info = models.JSONField(default=list, blank=True, help_text="Information about email attachments")
@@ -140,10 +148,22 @@ class EmailLog(models.Model):
         Regenerate email content from stored context and template information.
         Useful for resending emails or debugging email content.
 
+        Returns the stored snapshot of the sent bodies when there is one
+        (``from_snapshot`` True); otherwise re-renders from the template.
+
         Returns:
             dict: Contains 'html_content', 'text_content', and 'success' status
         """
         try:
+            if self.content_snapshot_id:
+                snapshot = self.content_snapshot
+                return {
+                    'success': True,
+                    'html_content': snapshot.html_content,
+                    'text_content': snapshot.text_content,
+                    'from_snapshot': True,
+                }
+
             if not self.template:
                 return {
                     'success': False,
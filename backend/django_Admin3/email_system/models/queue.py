@@ -121,6 +121,22 @@ class EmailQueue(models.Model):
             recipients += f" (and {len(self.to_emails) - 2} more)"
         return f"{self.subject} → {recipients} ({self.status})"
 
+    def get_sent_snapshot(self):
+        """Snapshot of the bodies from the last successful send, or None.
+
+        None when nothing was snapshotted or the item was edited after that
+        send, so the viewer and resends pick up the edit.
+        """
+        log = self.logs.filter(
+            content_snapshot__isnull=False,
+            sent_at__isnull=False,
+        ).select_related('content_snapshot').order_by('-sent_at').first()
+        if log is None:
+            return None
+        if self.edited_at and self.edited_at > log.sent_at:
+            return None
+        return log.content_snapshot
+
     def can_retry(self):
         """Check if email can be retried."""
         return self.status in ['failed', 'retry'] and self.attempts < self.max_attempts
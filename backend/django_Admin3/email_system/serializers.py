@@ -397,7 +397,13 @@ class EmailQueueListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_can_view_email(self, obj):
-        return bool(obj.html_content) or bool(obj.template_version_id) or bool(obj.content_override_mjml)
+        if obj.html_content or obj.template_version_id or obj.content_override_mjml:
+            return True
+        # Annotated by EmailQueueViewSet for lists; one lookup otherwise
+        has_snapshot = getattr(obj, 'has_sent_snapshot', None)
+        if has_snapshot is None:
+            has_snapshot = obj.get_sent_snapshot() is not None
+        return has_snapshot
 
     def get_is_edited(self, obj):
         return bool(obj.edited_at)
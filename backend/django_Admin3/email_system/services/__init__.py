@@ -2,6 +2,7 @@
 from .email_service import EmailService, email_service
 from .queue_service import EmailQueueService, email_queue_service
 from .content_insertion import EmailContentInsertionService, content_insertion_service
+from .content_rule_store import ContentRuleStore, content_rule_store
 from .batch_service import EmailBatchService, email_batch_service
 
 __all__ = [
@@ -11,6 +12,8 @@ __all__ = [
     'email_queue_service',
     'EmailContentInsertionService',
     'content_insertion_service',
+    'ContentRuleStore',
+    'content_rule_store',
     'EmailBatchService',
     'email_batch_service',
 ]
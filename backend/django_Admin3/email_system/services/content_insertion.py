@@ -3,6 +3,7 @@ import re
 from typing import Dict, List
 from django.template import Template, Context
 from email_system.models import EmailContentRule, EmailTemplateContentRule, EmailContentPlaceholder
+from email_system.services.content_rule_store import content_rule_store
 
 logger = logging.getLogger(__name__)
 
@@ -37,15 +38,13 @@ class EmailContentInsertionService:
             if not placeholders:
                 return content
 
-            # Get content rules for this template
-            rules = self._get_template_content_rules(template_name)
+            # Compiled rules for this template (cached per content rules version)
+            rule_set = content_rule_store.get(template_name)
 
             # Process each placeholder
             processed_content = content
             for placeholder_name in placeholders:
-                dynamic_content = self._generate_dynamic_content(
-                    placeholder_name, rules, context
-                )
+                dynamic_content = rule_set.generate_content(placeholder_name, context)
 
                 # Replace placeholder with generated content
                 placeholder_pattern = f'{{{{{placeholder_name}}}}}'
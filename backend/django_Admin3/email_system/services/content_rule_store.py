@@ -0,0 +1,253 @@
+"""
+Per-process, versioned store of compiled email content-insertion rules.
+
+EmailContentInsertionService.process_template_content runs for every
+email sent. Instead of querying the template's rules and each
+placeholder's configuration, evaluating rule conditions from the model
+fields and building a Django ``Template`` per snippet on every call, it
+asks this store for a ``CompiledRuleSet``:
+
+  - every active placeholder's configuration, keyed by name
+  - per placeholder, the template's applicable rules already sorted by
+    effective priority, each with a compiled condition predicate
+    (EmailContentRule.compile_condition) and a compiled snippet template
+
+Placeholder configurations are loaded once per version; rule sets are
+compiled lazily per template name.
+
+Invalidation: email_system.signals bumps a version token in the Django
+cache when saves or deletes of rules, template-rule associations,
+placeholders or templates commit. Lookups compare the token with the one the store
+was loaded under and start over on mismatch, so every process sharing
+the cache picks up edits on its next email. Queue processing runs a
+whole batch inside ``content_rule_store.pinned()``, which checks the
+token on the first email only. Queryset ``update()``
+bypasses signals; call ``bump_content_rules_version()`` after bulk edits.
+"""
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.core.cache import cache
+from django.template import Context, Template
+
+logger = logging.getLogger(__name__)
+
+CONTENT_RULES_VERSION_CACHE_KEY = "email:content_rules:version"
+
+
+def bump_content_rules_version() -> str:
+    """Invalidate every process's compiled content rules."""
+    token = uuid.uuid4().hex
+    cache.set(CONTENT_RULES_VERSION_CACHE_KEY, token, timeout=None)
+    logger.debug(f"Bumped email content rules version to {token}")
+    return token
+
+
+def _current_version() -> str:
+    token = cache.get(CONTENT_RULES_VERSION_CACHE_KEY)
+    if token is None:
+        # First use (or evicted): publish a token so processes agree on it.
+        cache.add(CONTENT_RULES_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        token = cache.get(CONTENT_RULES_VERSION_CACHE_KEY)
+    return token
+
+
+@dataclass(frozen=True)
+class CompiledPlaceholder:
+    """Snapshot of the EmailContentPlaceholder fields used when inserting content."""
+    name: str
+    content_variables: Dict[str, Any]
+    allow_multiple_rules: bool
+    content_separator: str
+
+    @classmethod
+    def from_model(cls, placeholder) -> 'CompiledPlaceholder':
+        return cls(
+            name=placeholder.name,
+            content_variables=dict(placeholder.content_variables or {}),
+            allow_multiple_rules=placeholder.allow_multiple_rules,
+            content_separator=placeholder.content_separator,
+        )
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """One template-rule association with its condition and snippet compiled.
+
+    ``template`` is None when the snippet failed to compile; ``error`` then
+    holds the message rendered in its place, as the uncompiled path does.
+    """
+    name: str
+    priority: int
+    is_exclusive: bool
+    predicate: Callable[[Dict], bool]
+    template: Optional[Template]
+    error: Optional[str] = None
+
+    @classmethod
+    def from_association(cls, rule_association) -> 'CompiledRule':
+        rule = rule_association.content_rule
+        template, error = None, None
+        try:
+            template = Template(rule_association.get_content_template())
+        except Exception as e:
+            logger.error(f"Error rendering content template: {str(e)}")
+            error = f"<!-- Error rendering content: {str(e)} -->"
+        return cls(
+            name=rule.name,
+            priority=rule_association.effective_priority,
+            is_exclusive=rule.is_exclusive,
+            predicate=rule.compile_condition(),
+            template=template,
+            error=error,
+        )
+
+    def render(self, context: Dict, variables: Dict) -> str:
+        if self.template is None:
+            return self.error
+        try:
+            return self.template.render(Context({**context, **variables}))
+        except Exception as e:
+            logger.error(f"Error rendering content template: {str(e)}")
+            return f"<!-- Error rendering content: {str(e)} -->"
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    """Everything needed to fill one template's placeholders."""
+    template_name: str
+    placeholders: Dict[str, CompiledPlaceholder]
+    rules: Dict[str, Tuple[CompiledRule, ...]]
+
+    def generate_content(self, placeholder_name: str, context: Dict) -> str:
+        """Content for ``placeholder_name``; same semantics as
+        EmailContentInsertionService._generate_dynamic_content."""
+        placeholder = self.placeholders.get(placeholder_name)
+        if placeholder is None:
+            logger.warning(f"Placeholder configuration not found for: {placeholder_name}")
+            return ''
+
+        contents = []
+        for rule in self.rules.get(placeholder_name, ()):
+            if not rule.predicate(context):
+                continue
+            logger.debug(f"Rule '{rule.name}' matched for placeholder '{placeholder_name}'")
+
+            rendered_content = rule.render(context, placeholder.content_variables)
+            if rendered_content:
+                contents.append(rendered_content)
+
+            # Stop if rule is exclusive
+            if rule.is_exclusive:
+                break
+
+        if not contents:
+            return ''
+        if not placeholder.allow_multiple_rules and len(contents) > 1:
+            # Use only the first (highest priority) content
+            return contents[0]
+        return placeholder.content_separator.join(contents)
+
+
+class ContentRuleStore:
+    """Lazily compiled, version-checked content rule sets per template."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._placeholders: Dict[str, CompiledPlaceholder] = {}
+        self._rule_sets: Dict[str, CompiledRuleSet] = {}
+        self._pin = threading.local()
+
+    @contextmanager
+    def pinned(self):
+        """Check the version at most once for lookups made in this block.
+
+        Nested blocks share the outer block's check. The pin is per
+        thread; edits committed meanwhile are seen on the next block.
+        """
+        depth = getattr(self._pin, 'depth', 0)
+        self._pin.depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._pin.depth = depth
+            if not depth:
+                self._pin.checked = False
+
+    def get(self, template_name: str) -> CompiledRuleSet:
+        """Return the compiled rule set for ``template_name``."""
+        if getattr(self._pin, 'checked', False) and self._version is not None:
+            version = self._version
+        else:
+            version = _current_version()
+        rule_set = self._rule_sets.get(template_name) if version == self._version else None
+        if rule_set is None:
+            rule_set = self._load(template_name, version)
+        if getattr(self._pin, 'depth', 0):
+            self._pin.checked = True
+        return rule_set
+
+    def _load(self, template_name: str, version: str) -> CompiledRuleSet:
+        with self._lock:
+            if version != self._version:
+                self._placeholders = self._load_placeholders()
+                self._rule_sets = {}
+                self._version = version
+            rule_set = self._rule_sets.get(template_name)
+            if rule_set is None:
+                rule_set = self._compile(template_name)
+                # Copy-on-write so lock-free readers never see a dict mid-update
+                self._rule_sets = {**self._rule_sets, template_name: rule_set}
+            return rule_set
+
+    def clear(self) -> None:
+        """Drop this process's copy; the next lookup recompiles."""
+        with self._lock:
+            self._version = None
+            self._placeholders = {}
+            self._rule_sets = {}
+        self._pin.checked = False
+
+    @staticmethod
+    def _load_placeholders() -> Dict[str, CompiledPlaceholder]:
+        from email_system.models import EmailContentPlaceholder
+
+        return {
+            placeholder.name: CompiledPlaceholder.from_model(placeholder)
+            for placeholder in EmailContentPlaceholder.objects.filter(is_active=True)
+        }
+
+    def _compile(self, template_name: str) -> CompiledRuleSet:
+        from email_system.models import EmailTemplateContentRule
+
+        associations = EmailTemplateContentRule.objects.filter(
+            template__name=template_name,
+            template__is_active=True,
+            content_rule__is_active=True,
+            is_enabled=True,
+        ).select_related('content_rule__placeholder')
+
+        by_placeholder: Dict[str, list] = {}
+        for association in associations:
+            by_placeholder.setdefault(association.content_rule.placeholder.name, []).append(association)
+
+        rules = {}
+        for placeholder_name, placeholder_associations in by_placeholder.items():
+            placeholder_associations.sort(key=lambda x: x.effective_priority, reverse=True)
+            rules[placeholder_name] = tuple(
+                CompiledRule.from_association(association) for association in placeholder_associations
+            )
+
+        logger.debug(
+            f"Compiled {sum(len(r) for r in rules.values())} content rules for template "
+            f"{template_name} (version {self._version})"
+        )
+        return CompiledRuleSet(template_name=template_name, placeholders=self._placeholders, rules=rules)
+
+
+content_rule_store = ContentRuleStore()
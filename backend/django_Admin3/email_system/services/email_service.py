@@ -3,8 +3,6 @@ import os
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.conf import settings
-from premailer import transform
-from mjml import mjml2html
 from typing import Dict, List, Optional
 from django.utils import timezone
 
@@ -15,6 +13,20 @@ logging.getLogger('cssutils').setLevel(logging.CRITICAL)
 logging.getLogger('premailer').setLevel(logging.WARNING)
 
 
+# mjml (a compiled renderer) and premailer (lxml + cssutils) are imported on
+# first use, so web workers that never send mail don't load them at boot.
+def mjml2html(mjml_content: str) -> str:
+    from mjml import mjml2html as render_mjml
+
+    return render_mjml(mjml_content)
+
+
+def transform(html: str, **options) -> str:
+    from premailer import transform as inline_css
+
+    return inline_css(html, **options)
+
+
 class EmailService:
     """
     Email service with responsive template support and cross-client compatibility.
@@ -270,7 +282,43 @@ class EmailService:
 
         Returns:
             Dict: Contains 'success', 'response_code', 'response_message', 'esp_response', 'esp_message_id'
+            (plus 'html_content' / 'text_content' on success)
+        """
+        def render():
+            # Convert MJML to HTML (no include_loader needed — all components pre-assembled)
+            # Strip trailing whitespace per line — mrml parser rejects it after />
+            html_content = mjml2html('\n'.join(line.rstrip() for line in mjml_content.splitlines()))
+
+            # Enhanced Outlook compatibility: Apply Premailer post-processing to MJML output
+            if enhance_outlook_compatibility:
+                html_content = self._enhance_outlook_compatibility(html_content)
+
+            # Create simple text version
+            return html_content, self._html_to_text(html_content)
+
+        return self._send_rendered_email(render, context, to_emails, subject, from_email, attachments)
+
+    def send_stored_content(
+        self,
+        html_content: str,
+        text_content: str,
+        context: Dict,
+        to_emails: List[str],
+        subject: str,
+        from_email: Optional[str] = None,
+        attachments: List[Dict] = None
+    ) -> Dict:
+        """
+        Send already-rendered bodies (e.g. an EmailContentSnapshot) without re-rendering.
+
+        Returns the same response dict as _send_mjml_email_from_content.
         """
+        return self._send_rendered_email(
+            lambda: (html_content, text_content), context, to_emails, subject, from_email, attachments
+        )
+
+    def _send_rendered_email(self, render, context, to_emails, subject, from_email=None, attachments=None) -> Dict:
+        """Build and send the message; ``render()`` returns the (html, text) bodies."""
         response_data = {
             'success': False,
             'response_code': None,
@@ -284,17 +332,7 @@ class EmailService:
             # Handle development email override
             actual_recipients = self._handle_dev_email_override(to_emails, context)
 
-            # Convert MJML to HTML (no include_loader needed — all components pre-assembled)
-            # Strip trailing whitespace per line — mrml parser rejects it after />
-            mjml_content = '\n'.join(line.rstrip() for line in mjml_content.splitlines())
-            html_content = mjml2html(mjml_content)
-
-            # Enhanced Outlook compatibility: Apply Premailer post-processing to MJML output
-            if enhance_outlook_compatibility:
-                html_content = self._enhance_outlook_compatibility(html_content)
-
-            # Create simple text version
-            text_content = self._html_to_text(html_content)
+            html_content, text_content = render()
 
             # Get BCC monitoring recipients if enabled
             bcc_recipients = self._get_bcc_recipients()
@@ -328,6 +366,7 @@ class EmailService:
                 if send_result > 0:
                     # Email sent successfully
                     response_data['html_content'] = html_content
+                    response_data['text_content'] = text_content
                     response_data.update({
                         'success': True,
                         'response_code': '250',  # Standard SMTP success code
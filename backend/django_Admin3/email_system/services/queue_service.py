@@ -7,8 +7,9 @@ from django.db import transaction
 
 from email_system.models import (
     EmailTemplate, EmailQueue, EmailQueueAttachment, EmailLog,
-    EmailAttachment, EmailTemplateAttachment, EmailSettings,
+    EmailAttachment, EmailTemplateAttachment, EmailSettings, EmailContentSnapshot,
 )
+from email_system.services.content_rule_store import content_rule_store
 from email_system.services.email_service import EmailService
 
 logger = logging.getLogger(__name__)
@@ -430,12 +431,8 @@ class EmailQueueService:
                     email_log.esp_response = esp_response
                     email_log.save()
 
-                    # Persist rendered HTML back to the queue item so the
-                    # View Email action works for sent items.
-                    rendered_html = response_data.get('html_content')
-                    if rendered_html and not queue_item.html_content:
-                        queue_item.html_content = rendered_html
-                        queue_item.save(update_fields=['html_content'])
+                    # Keep the sent bodies for the View Email action and resends
+                    self._store_content_snapshot(email_log, response_data)
                 else:
                     email_log.status = 'failed'
                     email_log.error_message = response_message
@@ -489,9 +486,35 @@ class EmailQueueService:
             logger.error(f"Failed to send email to {to_email}: {str(e)}")
             return False
 
+    def _store_content_snapshot(self, email_log: EmailLog, response_data: Dict) -> None:
+        """Link the log to a (deduplicated) snapshot of the bodies just sent."""
+        html_content = response_data.get('html_content')
+        if not html_content:
+            return
+        try:
+            snapshot = EmailContentSnapshot.store(html_content, response_data.get('text_content') or '')
+            email_log.content_snapshot = snapshot
+            email_log.content_hash = snapshot.content_hash
+            email_log.save(update_fields=['content_snapshot', 'content_hash'])
+        except Exception as e:
+            logger.warning(f"Failed to store content snapshot for {email_log.to_email}: {str(e)}")
+
     def _send_with_master_template(self, queue_item: EmailQueue, to_email: str, attachments: List) -> Dict:
         """Send email using DB-driven master template system and return detailed response."""
         try:
+            # Resend of an already-sent item: send exactly what went out before
+            snapshot = queue_item.get_sent_snapshot()
+            if snapshot is not None:
+                return self.email_service.send_stored_content(
+                    html_content=snapshot.html_content,
+                    text_content=snapshot.text_content,
+                    context=queue_item.email_context,
+                    to_emails=[to_email],
+                    subject=queue_item.subject,
+                    from_email=queue_item.from_email,
+                    attachments=attachments
+                )
+
             # Use per-item content override if present, otherwise standard template
             if queue_item.content_override_mjml:
                 mjml_content = self.email_service.render_with_override_content(
@@ -730,20 +753,22 @@ class EmailQueueService:
             'errors': []
         }
 
-        for queue_item in pending_items:
-            try:
-                success = self.process_queue_item(queue_item)
-                results['processed'] += 1
+        # One content rules version check for the whole batch
+        with content_rule_store.pinned():
+            for queue_item in pending_items:
+                try:
+                    success = self.process_queue_item(queue_item)
+                    results['processed'] += 1
 
-                if success:
-                    results['successful'] += 1
-                else:
-                    results['failed'] += 1
+                    if success:
+                        results['successful'] += 1
+                    else:
+                        results['failed'] += 1
 
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append(f"Queue item {queue_item.queue_id}: {str(e)}")
-                logger.error(f"Failed to process queue item {queue_item.queue_id}: {str(e)}")
+                except Exception as e:
+                    results['failed'] += 1
+                    results['errors'].append(f"Queue item {queue_item.queue_id}: {str(e)}")
+                    logger.error(f"Failed to process queue item {queue_item.queue_id}: {str(e)}")
 
         return results
 
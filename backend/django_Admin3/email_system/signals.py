@@ -0,0 +1,38 @@
+"""
+Django signals for email content rule cache invalidation.
+
+Saving or deleting a content rule, a template-rule association, a
+placeholder or a template bumps the content rules version once the
+writing transaction commits, so every process recompiles its rule sets
+from committed rows (see email_system.services.content_rule_store).
+"""
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender='email_system.EmailContentRule')
+@receiver(post_delete, sender='email_system.EmailContentRule')
+@receiver(post_save, sender='email_system.EmailTemplateContentRule')
+@receiver(post_delete, sender='email_system.EmailTemplateContentRule')
+@receiver(post_save, sender='email_system.EmailContentPlaceholder')
+@receiver(post_delete, sender='email_system.EmailContentPlaceholder')
+@receiver(post_save, sender='email_system.EmailTemplate')
+@receiver(post_delete, sender='email_system.EmailTemplate')
+def invalidate_content_rules(sender, instance, **kwargs):
+    """
+    Bump the content rules version so every process recompiles.
+
+    Args:
+        sender: The model class that changed
+        instance: The instance being saved or deleted
+        **kwargs: Additional keyword arguments
+    """
+    from email_system.services.content_rule_store import bump_content_rules_version
+
+    logger.debug(f"{sender.__name__} {instance.pk} changed, bumping email content rules version on commit")
+    transaction.on_commit(bump_content_rules_version)
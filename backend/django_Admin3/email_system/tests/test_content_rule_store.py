@@ -0,0 +1,192 @@
+"""
+Tests for the compiled email content rule store.
+Covers: ContentRuleStore, CompiledRuleSet, EmailContentRule.compile_condition
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from email_system.models import (
+    EmailContentPlaceholder, EmailContentRule, EmailTemplateContentRule,
+)
+from email_system.services.content_insertion import EmailContentInsertionService
+from email_system.services import content_rule_store as content_rule_store_module
+from email_system.services.content_rule_store import content_rule_store
+from email_system.tests.factories import make_template
+
+TUTORIAL_CONTEXT = {'items': [{'product_type': 'tutorial'}], 'user': {'country': 'UK'}}
+
+
+class ContentRuleStoreTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        content_rule_store.clear()
+        self.template = make_template(name='order_confirmation', is_active=True)
+        self.placeholder = EmailContentPlaceholder.objects.create(
+            name='TUTORIAL_CONTENT',
+            display_name='Tutorial Content',
+            default_content_template='<p>Tutorial: {{ tutorial_type }}</p>',
+            content_variables={'tutorial_type': 'online'},
+            allow_multiple_rules=True,
+            content_separator='<hr>',
+        )
+        self.rule = self._add_rule('Tutorial Rule', priority=10)
+
+    def tearDown(self):
+        cache.clear()
+        content_rule_store.clear()
+
+    def _add_rule(self, name, priority, content_override='', **rule_fields):
+        fields = {
+            'rule_type': 'product_based',
+            'condition_field': 'items.product_type',
+            'condition_operator': 'equals',
+            'condition_value': 'tutorial',
+            **rule_fields,
+        }
+        rule = EmailContentRule.objects.create(
+            name=name, placeholder=self.placeholder, priority=priority, **fields,
+        )
+        EmailTemplateContentRule.objects.create(
+            template=self.template, content_rule=rule, content_override=content_override,
+        )
+        return rule
+
+    def test_lookups_do_not_query_after_compile(self):
+        content_rule_store.get('order_confirmation')
+
+        with self.assertNumQueries(0):
+            rule_set = content_rule_store.get('order_confirmation')
+            content = rule_set.generate_content('TUTORIAL_CONTENT', TUTORIAL_CONTEXT)
+
+        self.assertEqual(content, '<p>Tutorial: online</p>')
+
+    def test_rules_sorted_by_effective_priority(self):
+        self._add_rule('Urgent', priority=50, content_override='<p>First</p>')
+
+        content = content_rule_store.get('order_confirmation').generate_content(
+            'TUTORIAL_CONTENT', TUTORIAL_CONTEXT,
+        )
+
+        self.assertEqual(content, '<p>First</p><hr><p>Tutorial: online</p>')
+
+    def test_rule_save_recompiles(self):
+        content_rule_store.get('order_confirmation')
+
+        self.rule.condition_value = 'material'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rule.save()
+
+        content = content_rule_store.get('order_confirmation').generate_content(
+            'TUTORIAL_CONTENT', TUTORIAL_CONTEXT,
+        )
+        self.assertEqual(content, '')
+
+    def test_placeholder_save_recompiles(self):
+        content_rule_store.get('order_confirmation')
+
+        self.placeholder.content_variables = {'tutorial_type': 'face-to-face'}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.placeholder.save()
+
+        content = content_rule_store.get('order_confirmation').generate_content(
+            'TUTORIAL_CONTENT', TUTORIAL_CONTEXT,
+        )
+        self.assertEqual(content, '<p>Tutorial: face-to-face</p>')
+
+    def test_rule_change_recompiles_only_on_commit(self):
+        content_rule_store.get('order_confirmation')
+
+        self.rule.condition_value = 'material'
+        with self.captureOnCommitCallbacks(execute=False):
+            self.rule.save()
+
+        content = content_rule_store.get('order_confirmation').generate_content(
+            'TUTORIAL_CONTENT', TUTORIAL_CONTEXT,
+        )
+        self.assertEqual(content, '<p>Tutorial: online</p>')
+
+    def test_pinned_batch_reads_version_once(self):
+        make_template(name='password_reset', is_active=True)
+
+        with mock.patch.object(
+            content_rule_store_module, '_current_version',
+            wraps=content_rule_store_module._current_version,
+        ) as current_version:
+            with content_rule_store.pinned():
+                content_rule_store.get('order_confirmation')
+                content_rule_store.get('password_reset')
+                content_rule_store.get('order_confirmation')
+
+        self.assertEqual(current_version.call_count, 1)
+
+    def test_commit_during_pinned_batch_is_seen_by_next_batch(self):
+        with content_rule_store.pinned():
+            content_rule_store.get('order_confirmation')
+            self.rule.condition_value = 'material'
+            with self.captureOnCommitCallbacks(execute=True):
+                self.rule.save()
+
+        with content_rule_store.pinned():
+            content = content_rule_store.get('order_confirmation').generate_content(
+                'TUTORIAL_CONTENT', TUTORIAL_CONTEXT,
+            )
+        self.assertEqual(content, '')
+
+    def test_invalid_snippet_renders_error_comment(self):
+        self._add_rule('Broken', priority=50, content_override='{% invalid_tag %}')
+
+        content = content_rule_store.get('order_confirmation').generate_content(
+            'TUTORIAL_CONTENT', TUTORIAL_CONTEXT,
+        )
+
+        self.assertIn('Error rendering content', content)
+        self.assertIn('Tutorial: online', content)
+
+    def test_matches_uncompiled_service_path(self):
+        self._add_rule(
+            'UK only', priority=5, rule_type='user_attribute',
+            condition_field='user.country', condition_value='UK',
+            content_override='<p>UK</p>', is_exclusive=True,
+        )
+        self._add_rule(
+            'Never', priority=1, rule_type='user_attribute',
+            condition_field='user.country', condition_value='US',
+            content_override='<p>US</p>',
+        )
+        service = EmailContentInsertionService()
+        rules = list(service._get_template_content_rules('order_confirmation'))
+
+        expected = service._generate_dynamic_content('TUTORIAL_CONTENT', rules, TUTORIAL_CONTEXT)
+        compiled = content_rule_store.get('order_confirmation').generate_content(
+            'TUTORIAL_CONTENT', TUTORIAL_CONTEXT,
+        )
+
+        self.assertEqual(compiled, expected)
+        self.assertEqual(compiled, '<p>Tutorial: online</p><hr><p>UK</p>')
+
+
+class CompileConditionTest(TestCase):
+
+    def setUp(self):
+        placeholder = EmailContentPlaceholder.objects.create(name='REGIONAL', display_name='Regional')
+        self.rule = EmailContentRule(
+            name='Regional', rule_type='user_attribute', placeholder=placeholder,
+            condition_field='user.country', condition_operator='in', condition_value=['UK', 'IE'],
+        )
+
+    def test_predicate_matches_evaluate_condition(self):
+        predicate = self.rule.compile_condition()
+        for context in ({'user': {'country': 'UK'}}, {'user': {'country': 'US'}}, {}):
+            self.assertEqual(predicate(context), self.rule.evaluate_condition(context))
+
+    def test_invalid_regex_compiles_to_false(self):
+        self.rule.condition_operator = 'regex_match'
+        self.rule.condition_value = '(['
+        self.assertFalse(self.rule.compile_condition()({'user': {'country': 'UK'}}))
+
+    def test_malformed_additional_condition_compiles_to_false(self):
+        self.rule.additional_conditions = [{'operator': 'equals', 'value': 'x'}]
+        self.assertFalse(self.rule.compile_condition()({'user': {'country': 'UK'}}))
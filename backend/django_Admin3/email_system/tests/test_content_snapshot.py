@@ -0,0 +1,179 @@
+"""
+Tests for stored email content snapshots.
+Covers: EmailContentSnapshot, EmailQueue.get_sent_snapshot, snapshot use on
+send/resend/regenerate/duplicate and in the queue list,
+prune_email_snapshots command
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from email_system.models import EmailContentSnapshot, EmailLog, EmailQueue
+from email_system.services.queue_service import EmailQueueService
+from email_system.tests.factories import make_template
+
+HTML = '<html><body><p>Order confirmed</p></body></html>'
+TEXT = 'Order confirmed'
+
+
+class EmailContentSnapshotTest(TestCase):
+
+    def test_round_trip(self):
+        snapshot = EmailContentSnapshot.store(HTML, TEXT)
+        snapshot = EmailContentSnapshot.objects.get(pk=snapshot.pk)
+
+        self.assertEqual(snapshot.html_content, HTML)
+        self.assertEqual(snapshot.text_content, TEXT)
+        self.assertEqual(snapshot.content_hash, EmailContentSnapshot.hash_content(HTML, TEXT))
+        self.assertEqual(snapshot.raw_size_bytes, len(HTML) + len(TEXT))
+
+    def test_identical_bodies_share_one_row(self):
+        first = EmailContentSnapshot.store(HTML, TEXT)
+        second = EmailContentSnapshot.store(HTML, TEXT)
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(EmailContentSnapshot.objects.count(), 1)
+        self.assertGreaterEqual(second.last_used_at, first.last_used_at)
+
+    def test_text_is_part_of_the_key(self):
+        first = EmailContentSnapshot.store(HTML, TEXT)
+        second = EmailContentSnapshot.store(HTML, 'Different text')
+        self.assertNotEqual(first.pk, second.pk)
+
+
+class SnapshotSendTest(TestCase):
+
+    def setUp(self):
+        self.service = EmailQueueService()
+        self.template = make_template(name='snapshot_tpl', use_master_template=True, is_active=True)
+        self.queue_item = EmailQueue.objects.create(
+            template=self.template,
+            to_emails=['snap@example.com'],
+            from_email='sender@example.com',
+            subject='Snapshot Test',
+            email_context={'order': 1},
+            status='processing',
+        )
+
+    def _send(self):
+        return self.service._send_single_email(self.queue_item, 'snap@example.com', timezone.now())
+
+    @patch.object(EmailQueueService, '_get_template_attachments', return_value=[])
+    @patch.object(EmailQueueService, '_send_with_master_template', return_value={
+        'success': True, 'response_code': '250', 'response_message': 'OK',
+        'esp_response': {}, 'esp_message_id': 'msg-1',
+        'html_content': HTML, 'text_content': TEXT,
+    })
+    def test_successful_send_links_snapshot(self, mock_send, mock_attach):
+        self.assertTrue(self._send())
+
+        log = EmailLog.objects.get(to_email='snap@example.com')
+        self.assertIsNotNone(log.content_snapshot)
+        self.assertEqual(log.content_hash, log.content_snapshot.content_hash)
+        self.assertEqual(self.queue_item.get_sent_snapshot().html_content, HTML)
+
+    def _sent_log(self, sent_at=None):
+        return EmailLog.objects.create(
+            queue_item=self.queue_item,
+            template=self.template,
+            to_email='snap@example.com',
+            from_email='sender@example.com',
+            subject='Snapshot Test',
+            status='sent',
+            sent_at=sent_at or timezone.now(),
+            content_snapshot=EmailContentSnapshot.store(HTML, TEXT),
+        )
+
+    def test_resend_sends_stored_bodies(self):
+        self._sent_log()
+
+        with patch.object(self.service.email_service, 'send_stored_content', return_value={'success': True}) as stored, \
+                patch.object(self.service.email_service, '_send_mjml_email_from_content') as render:
+            self.service._send_with_master_template(self.queue_item, 'snap@example.com', [])
+
+        stored.assert_called_once()
+        self.assertEqual(stored.call_args.kwargs['html_content'], HTML)
+        self.assertEqual(stored.call_args.kwargs['text_content'], TEXT)
+        render.assert_not_called()
+
+    def test_edit_after_send_ignores_snapshot(self):
+        self._sent_log(sent_at=timezone.now() - timedelta(hours=1))
+        self.queue_item.edited_at = timezone.now()
+        self.queue_item.save()
+
+        self.assertIsNone(self.queue_item.get_sent_snapshot())
+
+    def test_queue_list_can_view_sent_snapshot(self):
+        from django.contrib.auth.models import User
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_superuser('snap_admin', 'snap_admin@example.com', 'pass'))
+        self.assertFalse(client.get('/api/email/queue/').data['results'][0]['can_view_email'])
+
+        self._sent_log()
+
+        self.assertTrue(client.get('/api/email/queue/').data['results'][0]['can_view_email'])
+
+    def _admin_client(self):
+        from django.contrib.auth.models import User
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_superuser('snap_admin', 'snap_admin@example.com', 'pass'))
+        return client
+
+    def test_queue_list_ignores_snapshot_after_edit(self):
+        self._sent_log(sent_at=timezone.now() - timedelta(hours=1))
+        self.queue_item.edited_at = timezone.now()
+        self.queue_item.save()
+
+        self.assertFalse(self._admin_client().get('/api/email/queue/').data['results'][0]['can_view_email'])
+
+    def test_duplicate_copies_sent_bodies(self):
+        self._sent_log()
+
+        response = self._admin_client().post(f'/api/email/queue/{self.queue_item.pk}/duplicate/', {}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        duplicate = EmailQueue.objects.get(duplicated_from=self.queue_item)
+        self.assertEqual(duplicate.html_content, HTML)
+        self.assertEqual(duplicate.text_content, TEXT)
+
+    def test_regenerate_uses_snapshot(self):
+        log = self._sent_log()
+
+        result = log.regenerate_email_content()
+
+        self.assertTrue(result['success'])
+        self.assertTrue(result['from_snapshot'])
+        self.assertEqual(result['html_content'], HTML)
+
+
+class PruneEmailSnapshotsCommandTest(TestCase):
+
+    def setUp(self):
+        self.old = EmailContentSnapshot.store('<p>old</p>', 'old')
+        EmailContentSnapshot.objects.filter(pk=self.old.pk).update(
+            last_used_at=timezone.now() - timedelta(days=400),
+        )
+        self.recent = EmailContentSnapshot.store('<p>recent</p>', 'recent')
+
+    def test_deletes_expired_snapshots(self):
+        out = StringIO()
+        call_command('prune_email_snapshots', days=365, stdout=out)
+
+        self.assertFalse(EmailContentSnapshot.objects.filter(pk=self.old.pk).exists())
+        self.assertTrue(EmailContentSnapshot.objects.filter(pk=self.recent.pk).exists())
+        self.assertIn('Deleted 1 snapshot(s)', out.getvalue())
+
+    def test_dry_run_keeps_rows(self):
+        out = StringIO()
+        call_command('prune_email_snapshots', days=365, dry_run=True, stdout=out)
+
+        self.assertEqual(EmailContentSnapshot.objects.count(), 2)
+        self.assertIn('would be deleted', out.getvalue())
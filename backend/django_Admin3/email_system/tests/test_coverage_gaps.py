@@ -593,7 +593,7 @@ class RegenerateEmailContentSuccessTest(TestCase):
 
 
 # ============================================================================
-# content_rule.py coverage - lines 118-120 (evaluate_condition exception)
+# content_rule.py coverage - evaluate_condition / compile_condition exceptions
 # ============================================================================
 
 class ContentRuleEvaluateExceptionTest(TestCase):
@@ -619,26 +619,26 @@ class ContentRuleEvaluateExceptionTest(TestCase):
         )
 
     def test_evaluate_condition_none_context(self):
-        """Test evaluate_condition with None context returns False (lines 118-120)."""
-        # None context triggers AttributeError in _get_nested_field_value
+        """Test evaluate_condition with None context returns False."""
+        # None context triggers AttributeError when the compiled predicate
+        # resolves the field path
         result = self.rule.evaluate_condition(None)
         self.assertFalse(result)
 
     def test_evaluate_condition_with_broken_nested_access(self):
-        """Test evaluate_condition with context that causes exception (lines 118-120)."""
-        # Patch _get_nested_field_value to raise
-        with patch.object(self.rule, '_get_nested_field_value', side_effect=RuntimeError('Broken')):
+        """Test evaluate_condition with context that causes exception."""
+        # The compiled predicate resolves field paths with _resolve_path
+        with patch('email_system.models.content_rule._resolve_path', side_effect=RuntimeError('Broken')):
             result = self.rule.evaluate_condition({'user': {'country': 'UK'}})
             self.assertFalse(result)
 
     def test_evaluate_condition_with_additional_conditions_exception(self):
-        """Test evaluate_condition with broken additional conditions (lines 118-120)."""
+        """Test evaluate_condition with broken additional conditions."""
+        # An additional condition without an operator fails to compile
         self.rule.additional_conditions = [
-            {'field': 'missing.path', 'operator': 'equals', 'value': 'X', 'logic': 'AND'}
+            {'field': 'missing.path', 'value': 'X', 'logic': 'AND'}
         ]
         self.rule.save()
 
-        # Patch _evaluate_additional_condition to raise
-        with patch.object(self.rule, '_evaluate_additional_condition', side_effect=KeyError('bad key')):
-            result = self.rule.evaluate_condition({'user': {'country': 'UK'}})
-            self.assertFalse(result)
+        result = self.rule.evaluate_condition({'user': {'country': 'UK'}})
+        self.assertFalse(result)
@@ -1,6 +1,7 @@
 import os
 import mimetypes
 from django.conf import settings
+from django.db.models import Exists, F, OuterRef, Q
 from django.utils import timezone
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
@@ -12,7 +13,7 @@ from rest_framework.views import APIView
 from email_system.models import (
     EmailSettings, EmailTemplate, EmailAttachment, EmailTemplateAttachment,
     EmailMasterComponent,
-    EmailQueue, EmailContentPlaceholder, EmailContentRule, EmailTemplateContentRule,
+    EmailQueue, EmailLog, EmailContentPlaceholder, EmailContentRule, EmailTemplateContentRule,
     ClosingSalutation,
     EmailMjmlElement,
     EmailVariable,
@@ -292,6 +293,16 @@ class EmailQueueViewSet(
         to_email = self.request.query_params.get('to_email')
         if to_email:
             qs = qs.filter(to_emails__icontains=to_email)
+        if self.action == 'list':
+            # can_view_email: a sent snapshot is viewable without re-rendering
+            # (ignored once the item is edited after that send, as in
+            # EmailQueue.get_sent_snapshot)
+            qs = qs.annotate(has_sent_snapshot=Exists(EmailLog.objects.filter(
+                Q(queue_item__edited_at__isnull=True) | Q(sent_at__gte=F('queue_item__edited_at')),
+                queue_item=OuterRef('pk'),
+                content_snapshot__isnull=False,
+                sent_at__isnull=False,
+            )))
         return qs
 
     @action(detail=True, methods=['post'])
@@ -302,6 +313,12 @@ class EmailQueueViewSet(
         input_serializer.is_valid(raise_exception=True)
         overrides = input_serializer.validated_data
 
+        # Copy the bodies that actually went out when the original was sent
+        html_content, text_content = original.html_content, original.text_content
+        snapshot = original.get_sent_snapshot()
+        if snapshot is not None:
+            html_content, text_content = snapshot.html_content, snapshot.text_content
+
         new_item = EmailQueue.objects.create(
             template=original.template,
             to_emails=overrides.get('to_emails', original.to_emails),
@@ -311,8 +328,8 @@ class EmailQueueViewSet(
             reply_to_email=overrides.get('reply_to_email', original.reply_to_email),
             subject=overrides.get('subject', original.subject),
             email_context=original.email_context,
-            html_content=original.html_content,
-            text_content=original.text_content,
+            html_content=html_content,
+            text_content=text_content,
             priority=original.priority,
             tags=original.tags,
             duplicated_from=original,
@@ -362,11 +379,18 @@ class EmailQueueViewSet(
 
     @action(detail=True, methods=['get'], url_path='view-email')
     def view_email(self, request, pk=None):
-        """Render the email using override content, versioned template, or HTML snapshot."""
+        """Show the email as sent (stored snapshot), else render it from override
+        content, the HTML snapshot or the versioned template."""
         item = self.get_object()
 
         try:
             from email_system.services.email_service import EmailService
+
+            # Priority 0: stored snapshot of the last send (no re-render)
+            snapshot = item.get_sent_snapshot()
+            if snapshot is not None:
+                return Response({'html': snapshot.html_content})
+
             email_service = EmailService()
 
             # Priority 1: Per-item content override
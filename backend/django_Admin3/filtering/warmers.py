@@ -0,0 +1,17 @@
+"""Warmers for the filter system (see utils.warmup)."""
+from utils.warmup import register_warmer
+
+
+@register_warmer('filtering.configuration', per_process=True)
+def configuration():
+    """Build the filter configuration once in this worker.
+
+    The configuration is not cached (it is built per request), so this
+    only primes the process-wide part of the first request's cost: the
+    handler registry import and ORM metadata. The database connection it
+    uses belongs to the warm-up thread and is closed afterwards, so
+    requests still open their own.
+    """
+    from filtering.services.filter_service import get_filter_service
+
+    return f'{len(get_filter_service().get_filter_configuration())} filters'
@@ -0,0 +1,22 @@
+"""
+Gunicorn settings hooks, loaded with --config by railway-start.sh.
+
+Server flags (bind, workers, threads, timeout) stay on the command line
+there; this file only adds hooks.
+"""
+
+
+def post_worker_init(worker):
+    """Warm caches in each new worker (deploys and worker recycles).
+
+    Runs after the worker has loaded the Django app and before it accepts
+    requests. The per-process warmers (in-memory state) finish here, so
+    this worker never serves a request without them. The shared warmers
+    then run in a background thread while the worker is already serving;
+    until they finish, /api/health/ answers 503 when the request lands on
+    this worker (see utils.warmup).
+    """
+    from utils.warmup import start_background_warmup
+
+    if start_background_warmup() is not None:
+        worker.log.info('Per-process warm-up done, shared cache warm-up started')
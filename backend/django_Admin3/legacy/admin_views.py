@@ -5,17 +5,17 @@ Resolves student names and emails via subquery annotations from
 acted.students → auth_user.
 """
 from rest_framework import mixins, viewsets
-from rest_framework.pagination import PageNumberPagination
 from django.db.models import Q, OuterRef, Subquery, Value
 from django.db.models.functions import Coalesce
 
 from catalog.permissions import IsSuperUser
 from students.models import Student
+from utils.pagination import AdminListPagination
 from .models import LegacyOrder
 from .admin_serializers import LegacyOrderSerializer
 
 
-class LegacyOrderPagination(PageNumberPagination):
+class LegacyOrderPagination(AdminListPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -84,16 +84,20 @@ class LegacyOrderAdminViewSet(
         if ref:
             qs = qs.filter(student_ref=ref)
 
+        # Match students first (trigram-indexed auth_user columns) rather
+        # than filtering on the per-row name/email subquery annotations.
         name = params.get('name', '').strip()
         if name:
-            qs = qs.filter(
-                Q(first_name__icontains=name)
-                | Q(last_name__icontains=name)
-            )
+            qs = qs.filter(student_ref__in=Student.objects.filter(
+                Q(user__first_name__icontains=name)
+                | Q(user__last_name__icontains=name)
+            ).values('student_ref'))
 
         email = params.get('email', '').strip()
         if email:
-            qs = qs.filter(email__icontains=email)
+            qs = qs.filter(student_ref__in=Student.objects.filter(
+                user__email__icontains=email,
+            ).values('student_ref'))
 
         session = params.get('session', '').strip()
         if session:
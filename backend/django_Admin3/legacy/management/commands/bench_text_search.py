@@ -0,0 +1,237 @@
+"""Benchmark substring search: trigram indexes vs a denormalized search column.
+
+Generates a synthetic dataset (default 500k rows) in a scratch schema and
+times the staff-search query shapes against three layouts:
+
+  - seqscan:       no index, as before the trigram migrations
+  - trigram:       one GIN gin_trgm_ops index per searched column on
+                   UPPER(col), queried with the ORed icontains the views use
+  - search_column: a trigger-maintained UPPER(concat_ws(...)) column with a
+                   single trigram index, queried with one LIKE
+
+Two scenarios mirror the views: "products" (legacy product search over
+normalized_name / legacy_product_name / full_code) and "people" (student
+name and email searches behind the marking and legacy order admin lists).
+
+Reported per scenario and layout: index build time and size, p50/p95 of
+COUNT(*) per search term, the plan's scan node, and the time to insert
+--write-rows more rows (write overhead of indexes / trigger).
+
+Note: the search column also matches terms that span two columns
+("NOTES CM2"), so its counts can be slightly higher than the OR query.
+
+Usage:
+    python manage.py bench_text_search
+    python manage.py bench_text_search --rows 100000 --repeat 3
+    python manage.py bench_text_search --json search_bench.json --keep
+"""
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+SCHEMA = 'bench_text_search'
+
+SCENARIOS = {
+    'products': {
+        'columns': ['normalized_name', 'legacy_product_name', 'full_code'],
+        'generate': """
+            SELECT g,
+                   w1 || ' ' || w2,
+                   w1 || ' ' || w2 || CASE WHEN mod(g, 3) = 0 THEN ' eBook' ELSE '' END,
+                   'C' || chr(65 + mod(g, 7)) || mod(g, 9) || '/P' || chr(65 + mod(g, 26)) || '/' || lpad(mod(g, 30)::text, 2, '0')
+            FROM (
+                SELECT g,
+                       (ARRAY['Course','Revision','Mock','Combined','Series','Online','Flashcards',
+                              'Assignment','Marking','Tutorial','Question','Exam'])[1 + floor(random() * 12)::int] AS w1,
+                       (ARRAY['Notes','Pack','Exam','Materials','Kit','Classroom','Bank','Vouchers',
+                              'Recording','Summary','Booklet','Solutions'])[1 + floor(random() * 12)::int] AS w2
+                FROM generate_series(1, %s) AS g
+            ) src
+        """,
+        'terms': ['notes', 'ebook', 'flash', 'CB7/PK', 'mock exam', 'zzz-no-match'],
+    },
+    'people': {
+        'columns': ['first_name', 'last_name', 'email'],
+        'generate': """
+            SELECT g, f, l, lower(f) || '.' || lower(l) || g || '@example.com'
+            FROM (
+                SELECT g,
+                       (ARRAY['Anna','Ben','Chloe','David','Emma','Farid','Grace','Hiro','Isla','Jack',
+                              'Kira','Liam','Maya','Noah','Olivia','Priya'])[1 + floor(random() * 16)::int] AS f,
+                       (ARRAY['Smith','Jones','Patel','Brown','Taylor','Wilson','Khan','Evans','Thomas',
+                              'Roberts','Walker','Wright','Nguyen','Okafor'])[1 + floor(random() * 14)::int] AS l
+                FROM generate_series(1, %s) AS g
+            ) src
+        """,
+        'terms': ['smith', 'pri', 'okafor', 'emma.tay', '12345@', 'zzz-no-match'],
+    },
+}
+
+LAYOUTS = ['seqscan', 'trigram', 'search_column']
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _scan_nodes(plan):
+    """Names of the scan nodes in an EXPLAIN (FORMAT JSON) plan tree."""
+    nodes = []
+    if 'Scan' in plan['Node Type']:
+        nodes.append(plan['Node Type'])
+    for child in plan.get('Plans', []):
+        nodes.extend(_scan_nodes(child))
+    return nodes
+
+
+class Command(BaseCommand):
+    help = 'Benchmark trigram indexes against a denormalized search column on generated data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500_000, help='Rows per scenario table')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per search term')
+        parser.add_argument('--write-rows', type=int, default=10_000,
+                            help='Rows inserted after indexing to measure write overhead')
+        parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append',
+                            help='Limit to one scenario (repeatable)')
+        parser.add_argument('--json', dest='json_path', help='Write the report as JSON to this path')
+        parser.add_argument('--keep', action='store_true', help=f'Keep the {SCHEMA} schema afterwards')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('bench_text_search needs PostgreSQL with pg_trgm.')
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError('--rows and --repeat must be positive.')
+
+        report = {'rows': options['rows'], 'scenarios': {}}
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+            cursor.execute(f'CREATE SCHEMA {SCHEMA}')
+            cursor.execute('SELECT setseed(0.42)')
+            try:
+                for name in options['scenario'] or sorted(SCENARIOS):
+                    report['scenarios'][name] = self._run_scenario(cursor, name, SCENARIOS[name], options)
+            finally:
+                if not options['keep']:
+                    cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Report written to {options['json_path']}")
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+
+    # ── scenario ─────────────────────────────────────────────────────────
+    def _run_scenario(self, cursor, name, scenario, options):
+        columns = scenario['columns']
+        source = f'{SCHEMA}.{name}_source'
+        column_defs = ', '.join(f'{column} text NOT NULL' for column in columns)
+        cursor.execute(f'CREATE TABLE {source} (id bigint PRIMARY KEY, {column_defs})')
+        cursor.execute(
+            f"INSERT INTO {source} (id, {', '.join(columns)}) {scenario['generate']}",
+            [options['rows'] + options['write_rows']],
+        )
+
+        self.stdout.write(f"\n{name} ({options['rows']} rows)")
+        self.stdout.write(f"  {'layout':<14} {'build':>8} {'index':>9} {'p50':>8} {'p95':>8} {'insert':>8}  scan")
+        results = {}
+        for layout in LAYOUTS:
+            results[layout] = stats = self._run_layout(cursor, name, layout, scenario, options)
+            self.stdout.write(
+                f"  {layout:<14} {stats['build_ms']:>6.0f}ms {stats['index_mb']:>7.1f}MB "
+                f"{stats['p50_ms']:>6.1f}ms {stats['p95_ms']:>6.1f}ms {stats['insert_ms']:>6.0f}ms  "
+                f"{', '.join(sorted(set(stats['scans'])))}"
+            )
+        return results
+
+    def _run_layout(self, cursor, name, layout, scenario, options):
+        columns = scenario['columns']
+        table = f'{SCHEMA}.{name}_{layout}'
+        cursor.execute(
+            f'CREATE TABLE {table} AS SELECT * FROM {SCHEMA}.{name}_source WHERE id <= %s',
+            [options['rows']],
+        )
+        cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
+
+        started = time.perf_counter()
+        if layout == 'trigram':
+            for column in columns:
+                cursor.execute(f'CREATE INDEX ON {table} USING gin (UPPER({column}) gin_trgm_ops)')
+        elif layout == 'search_column':
+            self._add_search_column(cursor, table, columns)
+        build_ms = (time.perf_counter() - started) * 1000
+        cursor.execute(f'ANALYZE {table}')
+
+        cursor.execute(
+            "SELECT COALESCE(SUM(pg_relation_size(indexrelid)), 0) FROM pg_index "
+            "WHERE indrelid = %s::regclass AND NOT indisprimary",
+            [table],
+        )
+        index_mb = cursor.fetchone()[0] / (1024 * 1024)
+
+        timings, counts, scans = [], {}, []
+        for term in scenario['terms']:
+            sql, params = self._search_sql(table, layout, columns, term)
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scans.extend(_scan_nodes(plan[0]['Plan']))
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                cursor.execute(sql, params)
+                counts[term] = cursor.fetchone()[0]
+                timings.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        cursor.execute(
+            f'INSERT INTO {table} (id, {", ".join(columns)}) '
+            f'SELECT id, {", ".join(columns)} FROM {SCHEMA}.{name}_source WHERE id > %s',
+            [options['rows']],
+        )
+        insert_ms = (time.perf_counter() - started) * 1000
+
+        return {
+            'build_ms': round(build_ms, 1),
+            'index_mb': round(index_mb, 2),
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(_percentile(timings, 95), 2),
+            'insert_ms': round(insert_ms, 1),
+            'scans': scans,
+            'counts': counts,
+        }
+
+    @staticmethod
+    def _add_search_column(cursor, table, columns):
+        """Add a trigger-maintained search_text column with a trigram index."""
+        function = f'{table}_search_text'
+        expression = f"UPPER(concat_ws(' ', {', '.join(f'NEW.{column}' for column in columns)}))"
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN search_text text')
+        cursor.execute(f"""
+            CREATE FUNCTION {function}() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_text := {expression};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        cursor.execute(
+            f'CREATE TRIGGER search_text BEFORE INSERT OR UPDATE ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION {function}()'
+        )
+        cursor.execute(f"UPDATE {table} SET search_text = UPPER(concat_ws(' ', {', '.join(columns)}))")
+        cursor.execute(f'CREATE INDEX ON {table} USING gin (search_text gin_trgm_ops)')
+
+    @staticmethod
+    def _search_sql(table, layout, columns, term):
+        pattern = f'%{term}%'
+        if layout == 'search_column':
+            return f'SELECT COUNT(*) FROM {table} WHERE search_text LIKE UPPER(%s)', [pattern]
+        # Same predicate Django emits for col__icontains on PostgreSQL
+        where = ' OR '.join(f'UPPER({column}::text) LIKE UPPER(%s)' for column in columns)
+        return f'SELECT COUNT(*) FROM {table} WHERE {where}', [pattern] * len(columns)
@@ -0,0 +1,44 @@
+"""Trigram GIN indexes for the legacy product search view.
+
+Built CONCURRENTLY so the import-sized table stays writable; the
+migration is therefore non-atomic. pg_trgm is enabled by
+catalog.0005_enable_pg_trgm.
+"""
+import django.db.models.functions.text
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('catalog', '0005_enable_pg_trgm'),
+        ('legacy', '0003_refactor_order_items_product_fk'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='legacyproduct',
+            index=GinIndex(
+                OpClass(django.db.models.functions.text.Upper('normalized_name'), name='gin_trgm_ops'),
+                name='legacy_prod_norm_name_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='legacyproduct',
+            index=GinIndex(
+                OpClass(django.db.models.functions.text.Upper('legacy_product_name'), name='gin_trgm_ops'),
+                name='legacy_prod_name_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='legacyproduct',
+            index=GinIndex(
+                OpClass(django.db.models.functions.text.Upper('full_code'), name='gin_trgm_ops'),
+                name='legacy_prod_code_trgm',
+            ),
+        ),
+    ]
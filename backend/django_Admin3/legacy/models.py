@@ -9,7 +9,9 @@ Tables:
   legacy.orders       — order headers grouped by student + date + delivery
   legacy.order_items  — individual order line items
 """
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class LegacyProduct(models.Model):
@@ -71,6 +73,20 @@ class LegacyProduct(models.Model):
                 fields=['normalized_name'],
                 name='legacy_prod_norm_name_idx',
             ),
+            # Trigram indexes on UPPER(col) serve the search view's
+            # icontains lookups (UPPER(col) LIKE UPPER('%q%')).
+            GinIndex(
+                OpClass(Upper('normalized_name'), name='gin_trgm_ops'),
+                name='legacy_prod_norm_name_trgm',
+            ),
+            GinIndex(
+                OpClass(Upper('legacy_product_name'), name='gin_trgm_ops'),
+                name='legacy_prod_name_trgm',
+            ),
+            GinIndex(
+                OpClass(Upper('full_code'), name='gin_trgm_ops'),
+                name='legacy_prod_code_trgm',
+            ),
         ]
 
     def __str__(self):
@@ -0,0 +1,52 @@
+"""Tests for the trigram search indexes and the bench_text_search command."""
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+
+class TrigramIndexesTest(TestCase):
+    """The migrations create UPPER(col) gin_trgm_ops indexes for icontains."""
+
+    EXPECTED = {
+        'legacy_prod_norm_name_trgm',
+        'legacy_prod_name_trgm',
+        'legacy_prod_code_trgm',
+        'products_code_trgm',
+        'auth_user_first_name_trgm',
+        'auth_user_last_name_trgm',
+        'auth_user_email_trgm',
+    }
+
+    def test_indexes_exist(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes WHERE indexname = ANY(%s)",
+                [list(self.EXPECTED)],
+            )
+            indexes = dict(cursor.fetchall())
+
+        self.assertEqual(set(indexes), self.EXPECTED)
+        for definition in indexes.values():
+            self.assertIn('gin_trgm_ops', definition)
+            self.assertIn('upper(', definition)
+
+
+class BenchTextSearchCommandTest(TestCase):
+
+    def test_small_run_reports_all_layouts(self):
+        out = StringIO()
+        call_command(
+            'bench_text_search', rows=300, repeat=1, write_rows=20,
+            scenario=['people'], stdout=out,
+        )
+
+        output = out.getvalue()
+        for layout in ('seqscan', 'trigram', 'search_column'):
+            self.assertIn(layout, output)
+        self.assertIn('Benchmark complete', output)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_namespace WHERE nspname = 'bench_text_search'")
+            self.assertIsNone(cursor.fetchone())
@@ -1,8 +1,8 @@
-"""Tests for the legacy product search API endpoint."""
+"""Tests for the legacy archive API endpoints."""
 from django.test import TestCase
 from rest_framework.test import APIClient
 
-from legacy.models import LegacyProduct
+from legacy.models import LegacyOrder, LegacyProduct
 
 
 class LegacyProductSearchViewTest(TestCase):
@@ -153,3 +153,41 @@ class LegacyProductSearchViewTest(TestCase):
         results = response.data['results']
         codes = [(r['subject_code'], r['session_code']) for r in results]
         self.assertEqual(codes, sorted(codes))
+
+
+class LegacyOrderAdminListTest(TestCase):
+    """Tests for GET /api/legacy/admin-orders/ pagination."""
+
+    url = '/api/legacy/admin-orders/'
+
+    @classmethod
+    def setUpTestData(cls):
+        from datetime import date
+
+        from django.contrib.auth.models import User
+
+        cls.admin_user = User.objects.create_superuser(
+            username='legacy_admin', email='legacy_admin@example.com', password='testpass123',
+        )
+        LegacyOrder.objects.bulk_create([
+            LegacyOrder(student_ref=1000 + i, order_date=date(2020, 1, 1 + i), delivery_pref='H')
+            for i in range(3)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_page_number_response_reports_count_is_estimate(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['count'], 3)
+        self.assertFalse(response.data['count_is_estimate'])
+
+    def test_cursor_walks_newest_first(self):
+        first = self.client.get(self.url, {'cursor': '', 'page_size': 2})
+        second = self.client.get(first.data['next'])
+
+        refs = [r['student_ref'] for r in first.data['results'] + second.data['results']]
+        self.assertEqual(refs, [1002, 1001, 1000])
+        self.assertIsNone(second.data['next'])
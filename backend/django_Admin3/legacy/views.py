@@ -11,6 +11,8 @@ from rest_framework import generics, filters
 from rest_framework.permissions import AllowAny
 from django.db.models import Q
 
+from utils.pagination import AdminListPagination
+
 from .models import LegacyProduct
 from .serializers import LegacyProductSerializer
 
@@ -24,18 +26,20 @@ class LegacyProductSearchView(generics.ListAPIView):
         session — filter by session_code (exact match)
         delivery — filter by delivery_format (P/C/M/T)
 
-    Results are paginated (default 20, max 100) and ordered by
-    subject_code, session_code.
+    Results are paginated (50 per page) and ordered by subject_code,
+    session_code. Unfiltered listings report an estimated count; pass
+    ``cursor`` for keyset pagination through the whole archive.
     """
 
     serializer_class = LegacyProductSerializer
+    pagination_class = AdminListPagination
     permission_classes = [AllowAny]
 
     def get_queryset(self):
         qs = LegacyProduct.objects.all()
         params = self.request.query_params
 
-        # Text search
+        # Text search (served by the UPPER(col) trigram indexes on LegacyProduct)
         q = params.get('q', '').strip()
         if q:
             qs = qs.filter(
@@ -12,7 +12,6 @@ from django.contrib.auth.models import User
 from django.db.models import Q
 from rest_framework import mixins, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 from catalog.models import Subject
@@ -22,9 +21,12 @@ from marking.models import (
     MarkingPaperSubmission,
 )
 from marking.admin_list_serializers import MarkingSubmissionListSerializer
+from store.models import Product
+from students.models import Student
+from utils.pagination import AdminListPagination
 
 
-class MarkingSubmissionListPagination(PageNumberPagination):
+class MarkingSubmissionListPagination(AdminListPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 200
@@ -93,22 +95,25 @@ class MarkingSubmissionListAdminViewSet(
         elif ref:
             qs = qs.filter(student__student_ref__icontains=ref)
 
+        # Substring filters match the small side first (auth_user /
+        # products, via their trigram indexes) and semi-join the result,
+        # rather than filtering across the submission joins.
         name = params.get('student_name', '').strip()
         if name:
-            qs = qs.filter(
-                Q(student__user__first_name__icontains=name)
-                | Q(student__user__last_name__icontains=name)
-            )
+            qs = qs.filter(student__in=Student.objects.filter(
+                Q(user__first_name__icontains=name)
+                | Q(user__last_name__icontains=name)
+            ))
 
         email = params.get('student_email', '').strip()
         if email:
-            qs = qs.filter(student__user__email__icontains=email)
+            qs = qs.filter(student__in=Student.objects.filter(user__email__icontains=email))
 
         product_code = params.get('product_code', '').strip()
         if product_code:
-            qs = qs.filter(
-                marking_paper__purchasable__product__product_code__icontains=product_code
-            )
+            qs = qs.filter(marking_paper__purchasable_id__in=Product.objects.filter(
+                product_code__icontains=product_code,
+            ).values('pk'))
 
         return qs
 
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
     Order, OrderItem, Payment, OrderAcknowledgment,
-    OrderPreference, OrderContact, OrderDelivery,
+    OrderPreference, OrderContact, OrderDelivery, CheckoutSideEffect,
 )
 
 
@@ -116,3 +116,18 @@ class OrderDeliveryAdmin(admin.ModelAdmin):
                     'invoice_address_type', 'created_at')
     list_filter = ('delivery_address_type', 'invoice_address_type')
     raw_id_fields = ('order',)
+
+
+@admin.register(CheckoutSideEffect)
+class CheckoutSideEffectAdmin(admin.ModelAdmin):
+    list_display = ('id', 'order', 'effect_type', 'status', 'attempts',
+                    'created_at', 'completed_at')
+    list_filter = ('status', 'effect_type')
+    search_fields = ('idempotency_key', 'order__user__username')
+    raw_id_fields = ('order',)
+    # Only `status` is writable so operators can flip dead -> pending and
+    # let process_checkout_side_effects pick the row up again.
+    readonly_fields = (
+        'order', 'effect_type', 'idempotency_key', 'payload', 'attempts',
+        'error_message', 'created_at', 'last_attempted_at', 'completed_at',
+    )
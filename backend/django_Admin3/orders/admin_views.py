@@ -1,3 +1,5 @@
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
 from django.db.models import Prefetch, Q
 from rest_framework import viewsets
 from rest_framework.decorators import action
@@ -5,7 +7,7 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 from catalog.permissions import IsSuperUser
-from orders.models import Order, OrderItem
+from orders.models import Order, OrderedPurchasable, OrderItem, OrderSearch
 from orders.serializers.admin_order_serializer import (
     AdminOrderListSerializer,
     AdminOrderDetailSerializer,
@@ -57,24 +59,14 @@ class AdminOrderViewSet(viewsets.ReadOnlyModelViewSet):
     def _apply_filters(self, qs):
         params = self.request.query_params
 
+        search = {}
         student_ref = params.get('student_ref')
         if student_ref:
             try:
-                qs = qs.filter(user__student__student_ref=int(student_ref))
+                search['student_ref'] = int(student_ref)
             except (TypeError, ValueError):
                 return qs.none()
 
-        name = params.get('name')
-        if name:
-            qs = qs.filter(
-                Q(user__first_name__icontains=name)
-                | Q(user__last_name__icontains=name)
-            )
-
-        email = params.get('email')
-        if email:
-            qs = qs.filter(user__email__icontains=email)
-
         order_no = params.get('order_no')
         if order_no:
             try:
@@ -84,19 +76,38 @@ class AdminOrderViewSet(viewsets.ReadOnlyModelViewSet):
 
         product_code = params.get('product_code')
         if product_code:
-            qs = qs.filter(items__purchasable__code=product_code).distinct()
+            search['purchasable_codes__contains'] = [product_code]
 
-        # Date filters use the database timezone (UTC) for date extraction.
-        # An order created at 23:30 UTC on day X falls under date_from=X.
-        # If admins need their local-timezone calendar, this needs adjustment
-        # via TruncDate(..., tzinfo=...).
-        date_from = params.get('date_from')
-        if date_from:
-            qs = qs.filter(created_at__date__gte=date_from)
+        email = params.get('email')
+        if email:
+            search['email__icontains'] = email
 
-        date_to = params.get('date_to')
-        if date_to:
-            qs = qs.filter(created_at__date__lte=date_to)
+        # Customer and product filters run against the order-search read
+        # model (trigram / GIN indexed, one row per order) and reach the
+        # orders through a single pk subquery — no joins, no DISTINCT.
+        name = params.get('name')
+        if search or name:
+            rows = OrderSearch.objects.filter(**search)
+            if name:
+                rows = rows.filter(
+                    Q(first_name__icontains=name) | Q(last_name__icontains=name)
+                )
+            qs = qs.filter(pk__in=rows.values('order_id'))
+
+        # Date filters are half-open created_at ranges in the database
+        # timezone (UTC), so they can use orders_created_at_idx. An order
+        # created at 23:30 UTC on day X falls under date_from=X. If admins
+        # need their local-timezone calendar, shift the bounds here.
+        for param, lookup, days in (('date_from', 'created_at__gte', 0),
+                                    ('date_to', 'created_at__lt', 1)):
+            value = params.get(param)
+            if value:
+                try:
+                    day = date.fromisoformat(value)
+                except ValueError:
+                    return qs.none()
+                start = datetime.combine(day + timedelta(days=days), time.min, tzinfo=dt_timezone.utc)
+                qs = qs.filter(**{lookup: start})
 
         ordering = params.get('ordering')
         if ordering and ordering in ALLOWED_ORDERING:
@@ -115,13 +126,12 @@ class AdminOrderViewSet(viewsets.ReadOnlyModelViewSet):
 
         Used by the admin order filter combobox. Returns codes from products
         AND voucher/fee purchasables — anything that has actually been
-        purchased — rather than the full catalog.
+        purchased — rather than the full catalog. Reads the materialised
+        OrderedPurchasable list instead of scanning every order item.
         """
         rows = (
-            OrderItem.objects
-            .filter(purchasable__isnull=False)
+            OrderedPurchasable.objects
             .values_list('purchasable__code', 'purchasable__name')
-            .distinct()
             .order_by('purchasable__code')
         )
         return Response([
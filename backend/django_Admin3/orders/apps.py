@@ -5,3 +5,7 @@ class OrdersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'orders'
     verbose_name = 'Orders'
+
+    def ready(self):
+        """Import signals when Django starts"""
+        import orders.signals  # noqa: F401
@@ -33,8 +33,9 @@ Behaviour:
         python manage.py import_orders_from_csv --csv <path>
             → validate only, writes import_report.csv
         python manage.py import_orders_from_csv --csv <path> --commit
-            → after validation passes, inserts data inside a single
-              transaction (batched).
+            → after validation passes, inserts data in fixed-size
+              transactions of --batch-size orders, each written with
+              one bulk insert per table.
 
 Usage:
     python manage.py import_orders_from_csv --csv ../../docs/misc/orders_26.csv
@@ -53,7 +54,8 @@ from decimal import Decimal
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
-from orders.models import Order, OrderItem
+from orders.models import Order
+from orders.services.order_writer import BulkOrderWriter
 from store.models import Price, Purchasable
 from students.models import Student
 
@@ -483,8 +485,8 @@ class Command(BaseCommand):
 
     @transaction.atomic
     def _commit_batch(self, batch):
-        created_orders = 0
-        created_items = 0
+        """Write one batch of orders with a single bulk insert per table."""
+        writer = BulkOrderWriter()
         for (user_id, order_date), items in batch:
             # Compute order subtotal from per-item actual_price * quantity
             # so the summed line totals match the order header. VAT and
@@ -499,13 +501,12 @@ class Command(BaseCommand):
                 timezone.make_aware(datetime.combine(order_date, time.min))
                 if order_date else None
             )
-            order = Order.objects.create(
+            order = writer.add_order(
                 user_id=user_id,
                 subtotal=subtotal,
                 total_amount=subtotal,
                 order_date=order_date_dt,
             )
-            created_orders += 1
             for rec in items:
                 metadata = {"orderno": rec["orderno"]}
                 if rec["is_cancelled"]:
@@ -515,8 +516,8 @@ class Command(BaseCommand):
                     )
                     metadata["cancel_by"] = rec["cancel_by"]
 
-                OrderItem.objects.create(
-                    order=order,
+                writer.add_item(
+                    order,
                     purchasable_id=rec["purchasable_id"],
                     quantity=rec["quantity"],
                     price_type=rec["price_type"],
@@ -525,8 +526,8 @@ class Command(BaseCommand):
                     is_foc=rec["is_foc"],
                     metadata=metadata,
                 )
-                created_items += 1
-        return created_orders, created_items
+        orders, order_items = writer.flush()
+        return len(orders), len(order_items)
 
     # ──────────────────────────────────────────────────────────────────
     # reporting
@@ -0,0 +1,86 @@
+"""
+Drive checkout side effects that were not applied after checkout.
+
+Checkout enqueues each CheckoutSideEffect once the order commits, and
+this command is the safety net for rows the task never picked up (enqueue
+failed, worker restarted) or left behind. With
+``CHECKOUT_SIDE_EFFECTS_ENQUEUE = False`` checkout does not enqueue at
+all, and this command is what applies the rows: schedule it every minute
+with ``--stale-minutes 0``.
+
+    pending     -> older than --stale-minutes (never picked up)
+    failed      -> retried until MAX_ATTEMPTS, then marked dead
+    processing  -> older than --stale-minutes (crashed worker)
+
+Only rows of orders with an accepted payment (completed card payment or
+pending invoice) are picked up: rows of an order whose checkout died
+before payment are never applied.
+
+Usage:
+    python manage.py process_checkout_side_effects
+    python manage.py process_checkout_side_effects --stale-minutes 0
+    python manage.py process_checkout_side_effects --stale-minutes 30 --limit 500
+    python manage.py process_checkout_side_effects --dry-run
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from orders.models import CheckoutSideEffect, Payment
+from orders.services.checkout_side_effects import dispatch_side_effect_task
+
+ACCEPTED_PAYMENT_STATUSES = ('completed', 'pending')
+
+
+class Command(BaseCommand):
+    help = "Re-enqueue stale or failed checkout side effects."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale-minutes", type=int, default=10,
+            help="Pick up pending/processing rows older than this (default: 10).",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=200,
+            help="Maximum rows to re-enqueue in one run (default: 200).",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="List the rows that would be re-enqueued without enqueuing.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options["stale_minutes"])
+        qs = (
+            CheckoutSideEffect.objects
+            .filter(Exists(Payment.objects.filter(
+                order=OuterRef('order'), status__in=ACCEPTED_PAYMENT_STATUSES,
+            )))
+            .filter(
+                Q(status=CheckoutSideEffect.STATUS_FAILED)
+                | Q(status=CheckoutSideEffect.STATUS_PENDING, created_at__lt=cutoff)
+                | Q(status=CheckoutSideEffect.STATUS_PROCESSING, last_attempted_at__lt=cutoff)
+            )
+            .order_by("created_at")[:options["limit"]]
+        )
+
+        rows = list(qs)
+        if options["dry_run"]:
+            for row in rows:
+                self.stdout.write(
+                    f"{row.id}\t{row.idempotency_key}\t{row.status}\tattempts={row.attempts}"
+                )
+            self.stdout.write(f"Dry run: {len(rows)} side effect(s) would be re-enqueued.")
+            return
+
+        for row in rows:
+            if row.status == CheckoutSideEffect.STATUS_PROCESSING:
+                # apply_side_effect short-circuits processing rows.
+                CheckoutSideEffect.objects.filter(pk=row.pk).update(
+                    status=CheckoutSideEffect.STATUS_PENDING,
+                )
+            dispatch_side_effect_task(row.id)
+
+        self.stdout.write(self.style.SUCCESS(f"Re-enqueued {len(rows)} checkout side effect(s)."))
@@ -0,0 +1,41 @@
+"""Management command to rebuild the order-search read model.
+
+Rebuilds orders.OrderSearch and orders.OrderedPurchasable from the order,
+item, user and student tables. Run after QuerySet.update() calls or raw
+SQL against those tables, which bypass the signals and BulkOrderWriter
+hooks that keep the rows current.
+
+Usage:
+    python manage.py rebuild_order_search
+    python manage.py rebuild_order_search --order-ids 101 102
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from orders.services.order_search import rebuild_order_search, refresh_order_search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the admin order-search read model'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--order-ids',
+            type=int,
+            nargs='+',
+            help='Only refresh the rows for these order ids',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            if options['order_ids']:
+                written = refresh_order_search(options['order_ids'])
+            else:
+                written = rebuild_order_search()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} order search row(s) in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,82 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0011_order_order_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CheckoutSideEffect",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "effect_type",
+                    models.CharField(
+                        choices=[
+                            ("notification", "Order confirmation email"),
+                            ("acknowledgments", "Acknowledgment persistence"),
+                            ("preferences", "Preference persistence"),
+                            ("analytics", "Checkout analytics"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("idempotency_key", models.CharField(max_length=100, unique=True)),
+                ("payload", models.JSONField(blank=True, default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                            ("dead", "Dead"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("error_message", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_attempted_at", models.DateTimeField(blank=True, null=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="side_effects",
+                        to="orders.order",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Checkout Side Effect",
+                "verbose_name_plural": "Checkout Side Effects",
+                "db_table": '"acted"."order_checkout_side_effects"',
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "created_at"],
+                        name="order_check_status_3ef6b7_idx",
+                    )
+                ],
+            },
+        ),
+    ]
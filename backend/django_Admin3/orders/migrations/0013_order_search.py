@@ -0,0 +1,138 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:00
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_SEARCH_SQL = """
+    INSERT INTO "acted"."order_search"
+        (order_id, user_id, first_name, last_name, email, student_ref, purchasable_codes)
+    SELECT o.id, o.user_id, u.first_name, u.last_name, u.email, s.student_ref,
+           ARRAY(
+               SELECT DISTINCT p.code
+               FROM "acted"."order_items" i JOIN "acted"."purchasables" p ON p.id = i.purchasable_id
+               WHERE i.order_id = o.id
+               ORDER BY p.code
+           )
+    FROM "acted"."orders" o
+    JOIN auth_user u ON u.id = o.user_id
+    LEFT JOIN "acted"."students" s ON s.user_id = o.user_id
+"""
+
+BACKFILL_ORDERED_SQL = """
+    INSERT INTO "acted"."order_purchasable_codes" (purchasable_id, first_ordered_at)
+    SELECT i.purchasable_id, MIN(o.created_at)
+    FROM "acted"."order_items" i JOIN "acted"."orders" o ON o.id = i.order_id
+    GROUP BY i.purchasable_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("catalog", "0005_enable_pg_trgm"),
+        ("orders", "0012_checkoutsideeffect"),
+        ("store", "0026_product_code_trigram_index"),
+        ("students", "0003_auth_user_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderSearch",
+            fields=[
+                (
+                    "order",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_row",
+                        serialize=False,
+                        to="orders.order",
+                    ),
+                ),
+                ("first_name", models.CharField(blank=True, max_length=150)),
+                ("last_name", models.CharField(blank=True, max_length=150)),
+                ("email", models.CharField(blank=True, max_length=254)),
+                ("student_ref", models.IntegerField(blank=True, null=True)),
+                (
+                    "purchasable_codes",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=64),
+                        blank=True,
+                        default=list,
+                        help_text="Distinct purchasable codes across the order items",
+                        size=None,
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Order Search Row",
+                "verbose_name_plural": "Order Search Rows",
+                "db_table": '"acted"."order_search"',
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("first_name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="order_search_first_trgm",
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("last_name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="order_search_last_trgm",
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("email"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="order_search_email_trgm",
+                    ),
+                    models.Index(
+                        fields=["student_ref"], name="order_search_student_ref"
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["purchasable_codes"], name="order_search_codes_gin"
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="OrderedPurchasable",
+            fields=[
+                (
+                    "purchasable",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="store.purchasable",
+                    ),
+                ),
+                ("first_ordered_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Ordered Purchasable",
+                "verbose_name_plural": "Ordered Purchasables",
+                "db_table": '"acted"."order_purchasable_codes"',
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(BACKFILL_ORDERED_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
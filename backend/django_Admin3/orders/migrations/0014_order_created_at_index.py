@@ -0,0 +1,23 @@
+"""Index on orders.created_at for the admin order console.
+
+Backs the default ``-created_at`` ordering and the half-open date range
+filters. Non-atomic so the index can be built CONCURRENTLY.
+"""
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('orders', '0013_order_search'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['created_at'], name='orders_created_at_idx'),
+        ),
+    ]
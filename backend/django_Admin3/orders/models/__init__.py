@@ -5,6 +5,8 @@ from .acknowledgment import OrderAcknowledgment
 from .preference import OrderPreference
 from .contact import OrderContact
 from .delivery import OrderDelivery
+from .checkout_side_effect import CheckoutSideEffect
+from .order_search import OrderSearch, OrderedPurchasable
 
 __all__ = [
     'Order',
@@ -14,4 +16,7 @@ __all__ = [
     'OrderPreference',
     'OrderContact',
     'OrderDelivery',
+    'CheckoutSideEffect',
+    'OrderSearch',
+    'OrderedPurchasable',
 ]
@@ -0,0 +1,79 @@
+from django.db import models
+
+from .order import Order
+
+
+class CheckoutSideEffect(models.Model):
+    """Durable record of a non-critical checkout step run after commit.
+
+    Checkout writes one row per step (confirmation email, acknowledgment
+    and preference persistence, analytics) inside the order transaction;
+    after payment the rows are applied by ``orders.tasks.run_checkout_side_effect``
+    (see orders.services.checkout_side_effects for how it is dispatched).
+    ``idempotency_key`` ("order:<id>:<effect_type>") makes both the insert
+    and the apply step safe to repeat. Lifecycle:
+
+        pending -> processing -> done
+                              \\-> failed -> processing (retry) -> done
+                                          \\-> dead (manual replay required)
+    """
+
+    EFFECT_NOTIFICATION = 'notification'
+    EFFECT_ACKNOWLEDGMENTS = 'acknowledgments'
+    EFFECT_PREFERENCES = 'preferences'
+    EFFECT_ANALYTICS = 'analytics'
+
+    EFFECT_CHOICES = [
+        (EFFECT_NOTIFICATION, 'Order confirmation email'),
+        (EFFECT_ACKNOWLEDGMENTS, 'Acknowledgment persistence'),
+        (EFFECT_PREFERENCES, 'Preference persistence'),
+        (EFFECT_ANALYTICS, 'Checkout analytics'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_DEAD = 'dead'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_DEAD, 'Dead'),
+    ]
+
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name='side_effects',
+    )
+    effect_type = models.CharField(max_length=30, choices=EFFECT_CHOICES)
+    idempotency_key = models.CharField(max_length=100, unique=True)
+    payload = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        db_index=True,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error_message = models.TextField(blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_attempted_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = '"acted"."order_checkout_side_effects"'
+        verbose_name = 'Checkout Side Effect'
+        verbose_name_plural = 'Checkout Side Effects'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"CheckoutSideEffect #{self.pk}: {self.idempotency_key} [{self.status}]"
@@ -34,6 +34,9 @@ class Order(models.Model):
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='orders_created_at_idx'),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} by {self.user.username} ({self.total_amount})"
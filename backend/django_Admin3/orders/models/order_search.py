@@ -0,0 +1,91 @@
+"""Order-search read model for the admin order console.
+
+``OrderSearch`` holds one row per order with the columns the console
+filters on — customer name, email, student ref and the distinct
+purchasable codes on the order — so a search is an index lookup on one
+narrow table instead of a join across auth_user, students, order items
+and purchasables. ``OrderedPurchasable`` is the materialised list of
+every purchasable that has ever been ordered, which backs the product
+code combobox.
+
+Both tables are derived data, maintained by
+orders.services.order_search (see there for what keeps them current).
+
+Tables: acted.order_search, acted.order_purchasable_codes
+"""
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models
+from django.db.models.functions import Upper
+
+
+class OrderSearch(models.Model):
+    """Denormalised search row for one order."""
+
+    order = models.OneToOneField(
+        'orders.Order',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_row',
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    first_name = models.CharField(max_length=150, blank=True)
+    last_name = models.CharField(max_length=150, blank=True)
+    email = models.CharField(max_length=254, blank=True)
+    student_ref = models.IntegerField(null=True, blank=True)
+    purchasable_codes = ArrayField(
+        models.CharField(max_length=64),
+        default=list,
+        blank=True,
+        help_text='Distinct purchasable codes across the order items',
+    )
+
+    class Meta:
+        db_table = '"acted"."order_search"'
+        verbose_name = 'Order Search Row'
+        verbose_name_plural = 'Order Search Rows'
+        indexes = [
+            # icontains compiles to UPPER(col) LIKE UPPER('%term%').
+            GinIndex(
+                OpClass(Upper('first_name'), name='gin_trgm_ops'),
+                name='order_search_first_trgm',
+            ),
+            GinIndex(
+                OpClass(Upper('last_name'), name='gin_trgm_ops'),
+                name='order_search_last_trgm',
+            ),
+            GinIndex(
+                OpClass(Upper('email'), name='gin_trgm_ops'),
+                name='order_search_email_trgm',
+            ),
+            models.Index(fields=['student_ref'], name='order_search_student_ref'),
+            GinIndex(fields=['purchasable_codes'], name='order_search_codes_gin'),
+        ]
+
+    def __str__(self):
+        return f"Search row for order #{self.order_id}"
+
+
+class OrderedPurchasable(models.Model):
+    """A purchasable that appears on at least one order item."""
+
+    purchasable = models.OneToOneField(
+        'store.Purchasable',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+    )
+    first_ordered_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = '"acted"."order_purchasable_codes"'
+        verbose_name = 'Ordered Purchasable'
+        verbose_name_plural = 'Ordered Purchasables'
+
+    def __str__(self):
+        return str(self.purchasable_id)
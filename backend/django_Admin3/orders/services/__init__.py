@@ -2,3 +2,4 @@ from .checkout_orchestrator import CheckoutOrchestrator
 from .payment_gateway import get_payment_gateway, PaymentGateway, PaymentResult
 from .order_builder import OrderBuilder
 from .order_notification import send_order_confirmation
+from .order_writer import BulkOrderWriter, get_fee_purchasable
@@ -1,17 +1,25 @@
 import logging
+import time
+from contextlib import contextmanager
 from decimal import Decimal
 
-from orders.models import OrderAcknowledgment, OrderPreference, OrderContact, OrderDelivery
+from orders.models import CheckoutSideEffect, OrderContact, OrderDelivery
+from orders.services.checkout_side_effects import enqueue_side_effects
 from orders.services.confirmation import confirm_order
 from orders.services.order_builder import OrderBuilder
-from orders.services.order_notification import send_order_confirmation
 from orders.services.payment_gateway import get_payment_gateway, PaymentResult
 
 logger = logging.getLogger(__name__)
 
 
 class CheckoutOrchestrator:
-    """Orchestrates the checkout pipeline: validate → VAT → build → acks → payment → notify → clear.
+    """Orchestrates the checkout pipeline: validate → VAT → build → payment → vouchers → clear.
+
+    The confirmation email, acknowledgment/preference persistence and
+    analytics are not run in the request: they are recorded as
+    CheckoutSideEffect rows in the order-build transaction and applied
+    by a task after a successful payment
+    (see orders.services.checkout_side_effects).
 
     This replaces the monolithic checkout() method in CartViewSet.
     """
@@ -21,41 +29,60 @@ class CheckoutOrchestrator:
         self.user = user
         self.request_data = request_data
         self.request = request
+        self.timings = {}
+
+    @contextmanager
+    def _timed(self, step: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[step] = round((time.perf_counter() - start) * 1000, 2)
 
     def execute(self) -> dict:
         """Execute the full checkout pipeline.
 
         Returns:
-            dict with 'order', 'payment_result', and 'success' keys.
+            dict with 'order', 'payment_result', 'success' and 'timings'
+            (per-step wall time in milliseconds) keys.
 
         Raises:
             CheckoutValidationError: If validation fails.
             CheckoutBlockedError: If blocking rules prevent checkout.
             PaymentFailedError: If payment processing fails.
         """
+        try:
+            return self._execute()
+        finally:
+            logger.info(
+                f"Checkout timings for user {self.user.id}: "
+                + ', '.join(f"{step}={ms}ms" for step, ms in self.timings.items())
+            )
+
+    def _execute(self) -> dict:
         # Step 1: Validate cart and payment data
-        self._validate()
+        with self._timed('validate'):
+            self._validate()
 
         # Step 2: Check blocking rules
-        self._check_blocking_rules()
+        with self._timed('blocking_rules'):
+            self._check_blocking_rules()
 
         # Step 3: Calculate VAT
-        vat_result = self._calculate_vat()
-
-        # Step 4: Build order (atomic)
-        order = self._build_order(vat_result)
+        with self._timed('vat'):
+            vat_result = self._calculate_vat()
 
-        # Step 5: Save acknowledgments
-        self._save_acknowledgments(order)
+        # Step 4: Build order and record its side effects (atomic)
+        with self._timed('build_order'):
+            order = self._build_order(vat_result, self._side_effects())
 
-        # Step 6: Save preferences
-        self._save_preferences(order)
+        # Step 5: Save contact and delivery info (needed for fulfilment)
+        with self._timed('contact_delivery'):
+            self._save_contact_and_delivery(order)
 
-        # Step 7: Save contact and delivery info
-        self._save_contact_and_delivery(order)
-
-        # Step 8: Process payment
-        payment_result = self._process_payment(order)
+        # Step 6: Process payment
+        with self._timed('payment'):
+            payment_result = self._process_payment(order)
 
         if not payment_result.success:
             order.delete()
@@ -64,24 +91,32 @@ class CheckoutOrchestrator:
                 payment_result.error_code,
             )
 
-        # Step 8b: Run order-confirmation side-effects (issue vouchers, etc.)
-        try:
-            confirm_order(order)
-        except Exception as e:
-            logger.exception(
-                f"confirm_order failed for order {order.id}: {str(e)}"
-            )
+        # Step 7: Run order-confirmation side-effects (issue vouchers, etc.)
+        with self._timed('confirm_order'):
+            try:
+                confirm_order(order)
+            except Exception as e:
+                logger.exception(
+                    f"confirm_order failed for order {order.id}: {str(e)}"
+                )
 
-        # Step 9: Send notification
-        self._send_notification(order)
+        # Step 8: Clear cart
+        with self._timed('clear_cart'):
+            self._clear_cart()
 
-        # Step 10: Clear cart
-        self._clear_cart()
+        # Step 9: Hand notification, acks, preferences and analytics to a worker
+        with self._timed('schedule_side_effects'):
+            try:
+                enqueue_side_effects(order)
+            except Exception as e:
+                # The rows are committed; the cron command picks them up.
+                logger.warning(f"Failed to enqueue side effects for order {order.id}: {str(e)}")
 
         return {
             'order': order,
             'payment_result': payment_result,
             'success': True,
+            'timings': dict(self.timings),
         }
 
     def _validate(self):
@@ -155,54 +190,43 @@ class CheckoutOrchestrator:
                 'fallback': True,
             }
 
-    def _build_order(self, vat_result: dict):
-        builder = OrderBuilder(cart=self.cart, user=self.user, vat_result=vat_result)
+    def _build_order(self, vat_result: dict, side_effects: dict):
+        builder = OrderBuilder(
+            cart=self.cart, user=self.user, vat_result=vat_result, side_effects=side_effects,
+        )
         return builder.build()
 
-    def _save_acknowledgments(self, order):
-        try:
-            client_ip = self._get_client_ip()
-            user_agent = self.request.META.get('HTTP_USER_AGENT', '')
-
-            general_terms = self.request_data.get(
-                'general_terms_accepted',
-                self.request_data.get('terms_acceptance', {}).get('general_terms_accepted', False)
-            )
+    def _side_effects(self) -> dict:
+        client_ip = self._get_client_ip()
+        user_agent = self.request.META.get('HTTP_USER_AGENT', '')
 
-            OrderAcknowledgment.objects.create(
-                order=order,
-                acknowledgment_type='terms_conditions',
-                title='Terms & Conditions',
-                content_summary='General terms accepted at checkout',
-                is_accepted=general_terms,
-                ip_address=client_ip,
-                user_agent=user_agent,
-            )
-        except Exception as e:
-            logger.warning(f"Failed to save acknowledgments for order {order.id}: {str(e)}")
+        general_terms = self.request_data.get(
+            'general_terms_accepted',
+            self.request_data.get('terms_acceptance', {}).get('general_terms_accepted', False)
+        )
+        effects = {
+            CheckoutSideEffect.EFFECT_ACKNOWLEDGMENTS: {
+                'general_terms_accepted': general_terms,
+                'ip_address': client_ip,
+                'user_agent': user_agent,
+            },
+            CheckoutSideEffect.EFFECT_NOTIFICATION: {},
+            CheckoutSideEffect.EFFECT_ANALYTICS: {
+                'payment_method': self.request_data.get('payment_method', 'card'),
+                # Steps up to the order build; execute() logs the full set.
+                'timings': dict(self.timings),
+            },
+        }
 
-    def _save_preferences(self, order):
         user_preferences = self.request_data.get('user_preferences', {})
-        if not user_preferences:
-            return
-
-        try:
-            client_ip = self._get_client_ip()
-            user_agent = self.request.META.get('HTTP_USER_AGENT', '')
+        if user_preferences:
+            effects[CheckoutSideEffect.EFFECT_PREFERENCES] = {
+                'user_preferences': user_preferences,
+                'ip_address': client_ip,
+                'user_agent': user_agent,
+            }
 
-            for key, value in user_preferences.items():
-                OrderPreference.objects.create(
-                    order=order,
-                    preference_type='custom',
-                    preference_key=key,
-                    preference_value=value if isinstance(value, dict) else {'value': value},
-                    title=key.replace('_', ' ').title(),
-                    is_submitted=True,
-                    ip_address=client_ip,
-                    user_agent=user_agent,
-                )
-        except Exception as e:
-            logger.warning(f"Failed to save preferences for order {order.id}: {str(e)}")
+        return effects
 
     def _save_contact_and_delivery(self, order):
         contact_data = self.request_data.get('contact', {})
@@ -245,12 +269,6 @@ class CheckoutOrchestrator:
 
         return gateway.process(order, payment_data, client_ip, user_agent)
 
-    def _send_notification(self, order):
-        try:
-            send_order_confirmation(order, self.user)
-        except Exception as e:
-            logger.warning(f"Failed to send notification for order {order.id}: {str(e)}")
-
     def _clear_cart(self):
         self.cart.items.all().delete()
         self.cart.fees.all().delete()
@@ -0,0 +1,252 @@
+"""Post-commit side effects for checkout.
+
+The customer's checkout request only validates, builds the order, takes
+payment and issues vouchers. Everything else — the confirmation email,
+acknowledgment and preference persistence, analytics — is recorded as a
+CheckoutSideEffect row inside the order-build transaction and applied by
+``orders.tasks.run_checkout_side_effect`` outside the request.
+
+Dispatch:
+  - ``record_side_effects`` writes the rows; ``OrderBuilder.build`` calls
+    it inside its ``atomic()`` so the rows commit (or roll back) with the
+    order. A failed payment deletes the order, and its rows with it.
+  - ``enqueue_side_effects`` runs once payment succeeded and enqueues the
+    order's pending rows on commit. With ``ImmediateBackend`` the tasks
+    run right after the order commits, still in the checkout request;
+    with a deferred backend a worker applies them. Setting
+    ``settings.CHECKOUT_SIDE_EFFECTS_ENQUEUE`` to False leaves the rows
+    pending for ``process_checkout_side_effects`` instead — only where
+    that command is scheduled.
+
+Responsibilities:
+  - Idempotent scheduling: one row per (order, effect_type), keyed by
+    ``order:<id>:<effect_type>``; re-scheduling the same order is a no-op.
+  - Row-locking via SELECT FOR UPDATE so two workers can't apply the same row.
+  - Failure classification:
+      * Unknown effect type              -> dead (no retry possible)
+      * Handler raised, attempts < MAX   -> failed, re-raise (task retries)
+      * Handler raised, attempts >= MAX  -> dead, swallow
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from orders.models import CheckoutSideEffect, OrderAcknowledgment, OrderPreference
+
+logger = logging.getLogger(__name__)
+analytics_logger = logging.getLogger('orders.analytics')
+
+MAX_ATTEMPTS = 5
+
+# PROCESSING is terminal from the dispatcher's perspective for the same
+# reason as administrate.services.webhook_dispatch: the handler runs after
+# the status update commits, so a second worker must not pick the row up.
+# Crashed-worker rows are recovered by `process_checkout_side_effects`.
+TERMINAL_STATES = {
+    CheckoutSideEffect.STATUS_DONE,
+    CheckoutSideEffect.STATUS_DEAD,
+    CheckoutSideEffect.STATUS_PROCESSING,
+}
+
+
+def idempotency_key(order_id, effect_type: str) -> str:
+    return f"order:{order_id}:{effect_type}"
+
+
+def record_side_effects(order, effects: dict) -> list:
+    """Write a pending CheckoutSideEffect row per entry of ``effects``.
+
+    Call inside the transaction that creates ``order``.
+
+    Args:
+        order: Saved Order instance.
+        effects: Mapping of effect_type -> JSON-serialisable payload.
+
+    Returns:
+        List of pending CheckoutSideEffect ids for those effect types.
+    """
+    keys = {
+        idempotency_key(order.pk, effect_type): effect_type
+        for effect_type in effects
+    }
+    CheckoutSideEffect.objects.bulk_create(
+        [
+            CheckoutSideEffect(
+                order=order,
+                effect_type=effect_type,
+                idempotency_key=key,
+                payload=effects[effect_type],
+            )
+            for key, effect_type in keys.items()
+        ],
+        ignore_conflicts=True,
+    )
+    return list(
+        CheckoutSideEffect.objects
+        .filter(idempotency_key__in=keys, status=CheckoutSideEffect.STATUS_PENDING)
+        .values_list('id', flat=True)
+    )
+
+
+def enqueue_enabled() -> bool:
+    """Whether checkout enqueues side-effect tasks itself (see module doc)."""
+    return getattr(settings, 'CHECKOUT_SIDE_EFFECTS_ENQUEUE', True)
+
+
+def enqueue_side_effects(order) -> list:
+    """Enqueue ``order``'s pending side effects once the transaction commits.
+
+    Returns:
+        List of CheckoutSideEffect ids that will be enqueued on commit;
+        empty when the rows are left for ``process_checkout_side_effects``.
+    """
+    if not enqueue_enabled():
+        return []
+    effect_ids = list(
+        CheckoutSideEffect.objects
+        .filter(order=order, status=CheckoutSideEffect.STATUS_PENDING)
+        .values_list('id', flat=True)
+    )
+
+    def _enqueue_all():
+        for effect_id in effect_ids:
+            try:
+                dispatch_side_effect_task(effect_id)
+            except Exception as e:
+                # The row stays pending; the cron command picks it up.
+                logger.warning(f"Failed to enqueue checkout side effect {effect_id}: {str(e)}")
+
+    if effect_ids:
+        transaction.on_commit(_enqueue_all)
+    return effect_ids
+
+
+def schedule_side_effects(order, effects: dict) -> list:
+    """``record_side_effects`` then ``enqueue_side_effects`` for ``order``."""
+    record_side_effects(order, effects)
+    return enqueue_side_effects(order)
+
+
+def dispatch_side_effect_task(effect_id: int):
+    """Enqueue the worker task for a side-effect row."""
+    from orders.tasks import run_checkout_side_effect
+
+    return run_checkout_side_effect.enqueue(effect_id)
+
+
+def apply_side_effect(effect_id: int) -> None:
+    """Apply a single CheckoutSideEffect row.
+
+    Re-raises the handler exception on transient failure so the task
+    backend can reschedule; swallows once MAX_ATTEMPTS is reached.
+    """
+    with transaction.atomic():
+        try:
+            effect = (
+                CheckoutSideEffect.objects
+                .select_for_update()
+                .select_related('order', 'order__user')
+                .get(id=effect_id)
+            )
+        except CheckoutSideEffect.DoesNotExist:
+            logger.warning(f"Checkout side effect {effect_id} no longer exists")
+            return
+
+        if effect.status in TERMINAL_STATES:
+            return
+
+        effect.status = CheckoutSideEffect.STATUS_PROCESSING
+        effect.attempts = (effect.attempts or 0) + 1
+        effect.last_attempted_at = timezone.now()
+        effect.save(update_fields=['status', 'attempts', 'last_attempted_at'])
+
+    handler = SIDE_EFFECT_HANDLERS.get(effect.effect_type)
+    if handler is None:
+        _mark(effect, CheckoutSideEffect.STATUS_DEAD, f"No handler for effect_type={effect.effect_type!r}")
+        return
+
+    try:
+        with transaction.atomic():
+            handler(effect.order, effect.payload)
+    except Exception as e:
+        message = f"{type(e).__name__}: {e}"
+        if effect.attempts >= MAX_ATTEMPTS:
+            _mark(effect, CheckoutSideEffect.STATUS_DEAD, message)
+            return
+        _mark(effect, CheckoutSideEffect.STATUS_FAILED, message)
+        raise
+
+    effect.completed_at = timezone.now()
+    _mark(effect, CheckoutSideEffect.STATUS_DONE, '')
+
+
+def _mark(effect, status: str, message: str) -> None:
+    effect.status = status
+    effect.error_message = message
+    effect.save(update_fields=['status', 'error_message', 'completed_at'])
+    if status != CheckoutSideEffect.STATUS_DONE:
+        logger.error(
+            f"Checkout side effect {effect.idempotency_key} {status} "
+            f"after {effect.attempts} attempt(s): {message}"
+        )
+
+
+# ─── Handlers ────────────────────────────────────────────────────────────────
+
+def _send_notification(order, payload):
+    from orders.services.order_notification import send_order_confirmation
+
+    send_order_confirmation(order, order.user)
+
+
+def _save_acknowledgments(order, payload):
+    if order.user_acknowledgments.filter(acknowledgment_type='terms_conditions').exists():
+        return
+    OrderAcknowledgment.objects.create(
+        order=order,
+        acknowledgment_type='terms_conditions',
+        title='Terms & Conditions',
+        content_summary='General terms accepted at checkout',
+        is_accepted=payload.get('general_terms_accepted', False),
+        ip_address=payload.get('ip_address'),
+        user_agent=payload.get('user_agent', ''),
+    )
+
+
+def _save_preferences(order, payload):
+    existing = set(order.user_preferences.values_list('preference_key', flat=True))
+    for key, value in payload.get('user_preferences', {}).items():
+        if key in existing:
+            continue
+        OrderPreference.objects.create(
+            order=order,
+            preference_type='custom',
+            preference_key=key,
+            preference_value=value if isinstance(value, dict) else {'value': value},
+            title=key.replace('_', ' ').title(),
+            is_submitted=True,
+            ip_address=payload.get('ip_address'),
+            user_agent=payload.get('user_agent', ''),
+        )
+
+
+def _record_analytics(order, payload):
+    analytics_logger.info(
+        'checkout.completed',
+        extra={
+            'order_id': order.pk,
+            'user_id': order.user_id,
+            'total_amount': str(order.total_amount),
+            **payload,
+        },
+    )
+
+
+SIDE_EFFECT_HANDLERS = {
+    CheckoutSideEffect.EFFECT_NOTIFICATION: _send_notification,
+    CheckoutSideEffect.EFFECT_ACKNOWLEDGMENTS: _save_acknowledgments,
+    CheckoutSideEffect.EFFECT_PREFERENCES: _save_preferences,
+    CheckoutSideEffect.EFFECT_ANALYTICS: _record_analytics,
+}
@@ -3,7 +3,9 @@ from decimal import Decimal
 
 from django.db import transaction
 
-from orders.models import Order, OrderItem
+from orders.models import Order
+from orders.services.checkout_side_effects import record_side_effects
+from orders.services.order_writer import BulkOrderWriter, get_fee_purchasable
 
 logger = logging.getLogger(__name__)
 
@@ -12,21 +14,27 @@ class OrderBuilder:
     """Builds an Order from a Cart within an atomic transaction.
 
     Transfers cart items and fees into order items, applying VAT from the
-    calculation result.
+    calculation result. Items, fees and tutorial choices are each written
+    with a single bulk insert to keep the checkout critical section short.
+    ``side_effects`` (effect_type -> payload) are recorded as
+    CheckoutSideEffect rows in the same transaction.
     """
 
-    def __init__(self, cart, user, vat_result: dict):
+    def __init__(self, cart, user, vat_result: dict, side_effects: dict = None):
         self.cart = cart
         self.user = user
         self.vat_result = vat_result
+        self.side_effects = side_effects or {}
 
     def build(self) -> Order:
-        """Create order with items and fees within a transaction."""
+        """Create order with items, fees and side-effect rows within a transaction."""
         self._enforce_tutorial_auth_gate()
         with transaction.atomic():
             order = self._create_order()
             self._transfer_items(order)
             self._transfer_fees(order)
+            if self.side_effects:
+                record_side_effects(order, self.side_effects)
             return order
 
     def _enforce_tutorial_auth_gate(self):
@@ -71,7 +79,12 @@ class OrderBuilder:
         vat_items = self.vat_result.get('items', [])
         vat_by_item_id = {str(item.get('id')): item for item in vat_items}
 
-        for item in self.cart.items.all():
+        writer = BulkOrderWriter()
+        writer.add_order(order)
+        cart_items = list(self.cart.items.prefetch_related(
+            'tutorial_choices__student', 'tutorial_choices__tutorial_event'))
+        order_items = []
+        for item in cart_items:
             vat_info = vat_by_item_id.get(str(item.id), {})
             item_net = (item.actual_price or Decimal('0.00')) * item.quantity
             vat_amount = Decimal(str(vat_info.get('vat_amount', '0.00')))
@@ -88,8 +101,8 @@ class OrderBuilder:
             # Task 23 (Release B): legacy product/marking_voucher/item_type
             # columns are gone. Carry the unified `purchasable` FK across
             # cart → order instead.
-            order_item = OrderItem.objects.create(
-                order=order,
+            order_items.append(writer.add_item(
+                order,
                 purchasable_id=item.purchasable_id,
                 quantity=item.quantity,
                 price_type=item.price_type,
@@ -100,44 +113,48 @@ class OrderBuilder:
                 vat_rate=vat_rate,
                 is_vat_exempt=(vat_rate == Decimal('0.0000')),
                 metadata=item.metadata,
-            )
-            self._transfer_tutorial_choices(item, order_item)
-
-    def _transfer_tutorial_choices(self, cart_item, order_item):
-        """If the cart line has CartTutorialChoice rows, copy them into
-        TutorialChoice rows on the new order_item. Validation already
-        ran at add-to-cart time; rely on DB constraints here."""
+            ))
+        writer.flush()
+        self._transfer_tutorial_choices(zip(cart_items, order_items))
+
+    def _transfer_tutorial_choices(self, item_pairs):
+        """Copy CartTutorialChoice rows into TutorialChoice rows on the
+        new order items, in one bulk insert. ``item_pairs`` yields
+        (cart_item, order_item) with the cart item's choices prefetched.
+        Validation already ran at add-to-cart time; rely on DB constraints
+        here."""
         from tutorials.models import TutorialChoice
 
-        cart_choices = list(cart_item.tutorial_choices.select_related(
-            'student', 'tutorial_event'))
-        if not cart_choices:
-            return
-        TutorialChoice.objects.bulk_create([
+        choices = [
             TutorialChoice(
                 order_item=order_item,
                 student=c.student,
                 tutorial_event=c.tutorial_event,
                 choice_rank=c.choice_rank,
             )
-            for c in cart_choices
-        ])
+            for cart_item, order_item in item_pairs
+            for c in cart_item.tutorial_choices.all()
+        ]
+        if choices:
+            TutorialChoice.objects.bulk_create(choices)
 
     def _transfer_fees(self, order: Order):
         # Task 23: fee lines point at the singleton FEE_GENERIC Purchasable
-        # (created in store.0009 + ensured by store.0015). Resolve once.
-        if not self.cart.fees.exists():
+        # (created in store.0009 + ensured by store.0015), cached per process.
+        fees = list(self.cart.fees.all())
+        if not fees:
             return
-        from store.models import Purchasable
-        fee_purchasable = Purchasable.objects.filter(code='FEE_GENERIC').first()
+        fee_purchasable = get_fee_purchasable()
         if fee_purchasable is None:
             raise RuntimeError(
                 "Missing FEE_GENERIC Purchasable row — run "
                 "`manage.py migrate store` to create it."
             )
-        for fee in self.cart.fees.all():
-            OrderItem.objects.create(
-                order=order,
+        writer = BulkOrderWriter()
+        writer.add_order(order)
+        for fee in fees:
+            writer.add_item(
+                order,
                 purchasable=fee_purchasable,
                 quantity=1,
                 actual_price=fee.amount,
@@ -154,3 +171,4 @@ class OrderBuilder:
                     'fee_id': fee.id,
                 },
             )
+        writer.flush()
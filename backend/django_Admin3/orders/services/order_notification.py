@@ -1,5 +1,7 @@
 import logging
 
+from userprofile.user_context import get_user_countries
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,10 +61,9 @@ def _product_display_name(product) -> str:
 
 def _get_user_country(user) -> str:
     try:
-        if hasattr(user, 'userprofile'):
-            home_address = user.userprofile.addresses.filter(address_type='HOME').first()
-            if home_address:
-                return home_address.country
+        home_country = get_user_countries(user).home_country
+        if home_country:
+            return home_country
     except Exception as e:
         logger.warning(f"Could not get user country: {str(e)}")
     return "United Kingdom"
@@ -0,0 +1,139 @@
+"""Maintenance of the order-search read model (orders.OrderSearch and
+orders.OrderedPurchasable).
+
+Rows are rebuilt set-based, with one ``INSERT ... SELECT ... ON CONFLICT``
+per table, so refreshing a whole import batch costs the same number of
+statements as refreshing one order.
+
+What keeps the tables current:
+  - ``BulkOrderWriter.flush()`` refreshes the orders it wrote, which
+    covers OrderBuilder (checkout) and both order importers.
+  - orders.signals refreshes on single-row Order / OrderItem saves and
+    deletes, and copies auth user name/email and student ref changes
+    onto that user's rows.
+  - ``manage.py rebuild_order_search`` rebuilds both tables, e.g. after
+    ``QuerySet.update()`` calls or raw SQL that bypass the above.
+"""
+import logging
+from typing import Iterable, Optional
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from orders.models import Order, OrderedPurchasable, OrderItem, OrderSearch
+
+logger = logging.getLogger(__name__)
+
+
+def _tables():
+    from store.models import Purchasable
+    from students.models import Student
+
+    return {
+        'search': OrderSearch._meta.db_table,
+        'ordered': OrderedPurchasable._meta.db_table,
+        'orders': Order._meta.db_table,
+        'items': OrderItem._meta.db_table,
+        'purchasables': Purchasable._meta.db_table,
+        'users': get_user_model()._meta.db_table,
+        'students': Student._meta.db_table,
+    }
+
+
+_UPSERT_SEARCH_SQL = """
+    INSERT INTO {search}
+        (order_id, user_id, first_name, last_name, email, student_ref, purchasable_codes)
+    SELECT o.id, o.user_id, u.first_name, u.last_name, u.email, s.student_ref,
+           ARRAY(
+               SELECT DISTINCT p.code
+               FROM {items} i JOIN {purchasables} p ON p.id = i.purchasable_id
+               WHERE i.order_id = o.id
+               ORDER BY p.code
+           )
+    FROM {orders} o
+    JOIN {users} u ON u.id = o.user_id
+    LEFT JOIN {students} s ON s.user_id = o.user_id
+    {where}
+    ON CONFLICT (order_id) DO UPDATE SET
+        user_id = EXCLUDED.user_id,
+        first_name = EXCLUDED.first_name,
+        last_name = EXCLUDED.last_name,
+        email = EXCLUDED.email,
+        student_ref = EXCLUDED.student_ref,
+        purchasable_codes = EXCLUDED.purchasable_codes
+"""
+
+_UPDATE_CODES_SQL = """
+    UPDATE {search} r SET purchasable_codes = ARRAY(
+        SELECT DISTINCT p.code
+        FROM {items} i JOIN {purchasables} p ON p.id = i.purchasable_id
+        WHERE i.order_id = r.order_id
+        ORDER BY p.code
+    )
+    WHERE r.order_id = ANY(%s)
+"""
+
+_INSERT_ORDERED_SQL = """
+    INSERT INTO {ordered} (purchasable_id, first_ordered_at)
+    SELECT i.purchasable_id, MIN(o.created_at)
+    FROM {items} i JOIN {orders} o ON o.id = i.order_id
+    {where}
+    GROUP BY i.purchasable_id
+    ON CONFLICT (purchasable_id) DO NOTHING
+"""
+
+
+def refresh_order_search(order_ids: Optional[Iterable[int]] = None) -> int:
+    """Upsert the search rows for ``order_ids`` (every order when None)
+    and record their purchasables as ordered. Returns rows written."""
+    params = []
+    search_where = ordered_where = ''
+    if order_ids is not None:
+        ids = sorted(set(order_ids))
+        if not ids:
+            return 0
+        search_where = 'WHERE o.id = ANY(%s)'
+        ordered_where = 'WHERE i.order_id = ANY(%s)'
+        params = [ids]
+
+    tables = _tables()
+    with connection.cursor() as cursor:
+        cursor.execute(_UPSERT_SEARCH_SQL.format(where=search_where, **tables), params)
+        written = cursor.rowcount
+        cursor.execute(_INSERT_ORDERED_SQL.format(where=ordered_where, **tables), params)
+    return written
+
+
+def refresh_order_search_codes(order_ids: Iterable[int]) -> int:
+    """Recompute the codes on existing rows only.
+
+    Used after item deletes: when the whole order is being deleted its
+    row may already be gone, and an upsert would resurrect it.
+    """
+    ids = sorted(set(order_ids))
+    if not ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(_UPDATE_CODES_SQL.format(**_tables()), [ids])
+        return cursor.rowcount
+
+
+def update_user_search_rows(user) -> int:
+    """Copy ``user``'s name and email onto their rows."""
+    return OrderSearch.objects.filter(user_id=user.pk).update(
+        first_name=user.first_name,
+        last_name=user.last_name,
+        email=user.email,
+    )
+
+
+def rebuild_order_search() -> int:
+    """Rebuild both tables from scratch; returns search rows written."""
+    written = refresh_order_search()
+    # Rows for deleted orders cascade away with the order; purchasables
+    # only drop off the ordered list once no item references them.
+    removed, _ = OrderedPurchasable.objects.exclude(
+        purchasable_id__in=OrderItem.objects.values('purchasable_id'),
+    ).delete()
+    logger.info("Rebuilt order search: %d rows, %d stale codes removed", written, removed)
+    return written
@@ -0,0 +1,114 @@
+"""Bulk order writer shared by checkout and the order importers.
+
+Orders and their items are accumulated in memory and written with one
+``bulk_create`` per table on ``flush()``. PostgreSQL returns the new
+primary keys, so callers can build follow-on rows (TutorialChoice,
+issued vouchers) against the flushed instances. ``bulk_create`` sends
+no signals, so ``flush()`` refreshes the order-search rows itself.
+
+Also hosts the cached lookup for the singleton FEE_GENERIC purchasable
+that every fee line points at.
+"""
+import logging
+
+from orders.models import Order, OrderItem
+from orders.services.order_search import refresh_order_search
+
+logger = logging.getLogger(__name__)
+
+FEE_GENERIC_CODE = 'FEE_GENERIC'
+
+# Cached FEE_GENERIC purchasable. Cleared by orders.signals whenever the
+# row is saved or deleted; a missing row is never cached.
+_fee_purchasable = None
+
+
+def get_fee_purchasable():
+    """Return the FEE_GENERIC Purchasable, or None if it does not exist.
+
+    The row is created by migrations and practically never changes, so it
+    is loaded once per process instead of once per checkout/import.
+    """
+    global _fee_purchasable
+    if _fee_purchasable is None:
+        from store.models import Purchasable
+        _fee_purchasable = Purchasable.objects.filter(code=FEE_GENERIC_CODE).first()
+    return _fee_purchasable
+
+
+def clear_fee_purchasable_cache():
+    """Drop the cached FEE_GENERIC purchasable."""
+    global _fee_purchasable
+    _fee_purchasable = None
+
+
+class BulkOrderWriter:
+    """Accumulates orders and order items and writes them in bulk.
+
+    Usage::
+
+        writer = BulkOrderWriter()
+        order = writer.add_order(user_id=user_id, subtotal=subtotal)
+        writer.add_item(order, purchasable_id=pid, quantity=1)
+        orders, items = writer.flush()   # all instances now have PKs
+
+    ``add_order`` also accepts an already-saved Order (checkout creates
+    the header itself); only unsaved orders are inserted on flush.
+    ``flush`` must run inside a transaction when atomicity matters.
+    """
+
+    def __init__(self):
+        self._orders = []
+        self._items = []
+
+    def __len__(self):
+        return len(self._orders)
+
+    @property
+    def pending_items(self):
+        return len(self._items)
+
+    def add_order(self, order=None, **fields) -> Order:
+        """Queue an order header (an Order instance or Order field values)."""
+        if order is None:
+            order = Order(**fields)
+        self._orders.append(order)
+        return order
+
+    def add_item(self, order: Order, item=None, **fields) -> OrderItem:
+        """Queue an order item (an OrderItem instance or OrderItem field
+        values) for ``order``; returns the unsaved item."""
+        if item is None:
+            item = OrderItem(order=order, **fields)
+        else:
+            item.order = order
+        self._items.append(item)
+        return item
+
+    def flush(self):
+        """Insert all queued orders and items.
+
+        Returns:
+            (orders, items) — the flushed instances, with primary keys set.
+        """
+        orders, items = self._orders, self._items
+        self._orders, self._items = [], []
+
+        unsaved = [order for order in orders if order.pk is None]
+        if unsaved:
+            Order.objects.bulk_create(unsaved)
+        for item in items:
+            # Items were queued against unsaved orders; pick up their PKs.
+            item.order_id = item.order.pk
+        if items:
+            OrderItem.objects.bulk_create(items)
+        # Items may belong to orders flushed earlier (importers reuse an
+        # order across chunks); their search rows need the new items too.
+        touched = {order.pk for order in orders} | {item.order_id for item in items}
+        if touched:
+            refresh_order_search(touched)
+
+        logger.debug(
+            "BulkOrderWriter flushed %d orders / %d items", len(unsaved), len(items)
+        )
+        return orders, items
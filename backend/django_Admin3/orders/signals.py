@@ -0,0 +1,80 @@
+"""
+Orders signals.
+
+The FEE_GENERIC purchasable is cached per process by
+orders.services.order_writer.get_fee_purchasable(); drop the cache whenever
+that row is saved or deleted.
+
+Single-row Order / OrderItem writes, auth user name and email edits and
+student ref changes are copied into the order-search read model (see
+orders.services.order_search). Bulk writes go through BulkOrderWriter,
+which refreshes the rows itself.
+"""
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from orders.models import OrderSearch
+from orders.services.order_search import (
+    refresh_order_search, refresh_order_search_codes, update_user_search_rows,
+)
+from orders.services.order_writer import FEE_GENERIC_CODE, clear_fee_purchasable_cache
+
+USER_SEARCH_FIELDS = {'first_name', 'last_name', 'email'}
+
+
+@receiver(post_save, sender='store.Purchasable')
+@receiver(post_save, sender='store.GenericItem')
+@receiver(post_delete, sender='store.Purchasable')
+@receiver(post_delete, sender='store.GenericItem')
+def invalidate_fee_purchasable_cache(sender, instance, **kwargs):
+    """Clear the cached FEE_GENERIC purchasable when it changes."""
+    if instance.code == FEE_GENERIC_CODE:
+        clear_fee_purchasable_cache()
+
+
+@receiver(post_save, sender='orders.Order')
+def refresh_order_search_for_order(sender, instance, raw=False, **kwargs):
+    """Upsert the search row of a saved order."""
+    if not raw:
+        refresh_order_search([instance.pk])
+
+
+@receiver(post_save, sender='orders.OrderItem')
+def refresh_order_search_for_item(sender, instance, raw=False, **kwargs):
+    """Recompute the codes on the item's order."""
+    if not raw:
+        refresh_order_search([instance.order_id])
+
+
+@receiver(post_delete, sender='orders.OrderItem')
+def refresh_order_search_codes_for_item(sender, instance, **kwargs):
+    """Drop a deleted item's code from its order's row."""
+    refresh_order_search_codes([instance.order_id])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_order_search_for_user(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Copy name / email edits onto the user's search rows.
+
+    Skips new users (no orders yet) and saves that only touch other
+    columns, e.g. the ``last_login`` update on every login.
+    """
+    if raw or created:
+        return
+    if update_fields is not None and not USER_SEARCH_FIELDS.intersection(update_fields):
+        return
+    update_user_search_rows(instance)
+
+
+@receiver(post_save, sender='students.Student')
+def refresh_order_search_for_student(sender, instance, raw=False, **kwargs):
+    """Copy the student ref onto the user's search rows."""
+    if not raw:
+        OrderSearch.objects.filter(user_id=instance.user_id).update(student_ref=instance.student_ref)
+
+
+@receiver(post_delete, sender='students.Student')
+def clear_order_search_student_ref(sender, instance, **kwargs):
+    """Clear the student ref from the user's search rows."""
+    OrderSearch.objects.filter(user_id=instance.user_id).update(student_ref=None)
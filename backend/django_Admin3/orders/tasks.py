@@ -0,0 +1,13 @@
+from django.tasks import task
+
+from orders.services.checkout_side_effects import apply_side_effect
+
+
+@task()
+def run_checkout_side_effect(effect_id: int) -> None:
+    """Apply a single post-commit checkout side effect.
+
+    Retry / dead-letter handling lives in `apply_side_effect` so it can be
+    unit-tested without the task framework.
+    """
+    apply_side_effect(effect_id)
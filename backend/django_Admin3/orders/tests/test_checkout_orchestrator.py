@@ -203,7 +203,8 @@ class CheckoutOrchestratorTest(TestCase):
             cart=self.cart, user=self.user,
             request_data=request_data, request=request,
         )
-        result = orchestrator.execute()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = orchestrator.execute()
 
         acks = OrderAcknowledgment.objects.filter(order=result['order'])
         self.assertEqual(acks.count(), 1)
@@ -0,0 +1,300 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory, override_settings
+from django.utils import timezone
+
+from cart.models import Cart, CartItem
+from catalog.models import (
+    Subject, ExamSession, ExamSessionSubject,
+    Product as CatalogProduct, ProductVariation, ProductProductVariation,
+)
+from orders.models import CheckoutSideEffect, Order, OrderAcknowledgment, OrderPreference, Payment
+from orders.services import checkout_side_effects
+from orders.services.checkout_orchestrator import CheckoutOrchestrator
+from orders.services.checkout_side_effects import apply_side_effect, schedule_side_effects
+from store.models import MaterialProduct as StoreMaterialProduct
+
+User = get_user_model()
+
+
+class CheckoutSideEffectServiceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='cse_user', email='cse@example.com')
+        self.order = Order.objects.create(user=self.user)
+        Payment.objects.create(order=self.order, amount=Decimal('0.00'), status='completed')
+
+    def _schedule_ack(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            ids = schedule_side_effects(self.order, {
+                CheckoutSideEffect.EFFECT_ACKNOWLEDGMENTS: {
+                    'general_terms_accepted': True,
+                    'ip_address': '10.0.0.1',
+                    'user_agent': 'cse-agent',
+                },
+            })
+        return ids, callbacks
+
+    def test_schedule_creates_pending_row_with_idempotency_key(self):
+        ids, callbacks = self._schedule_ack()
+
+        effect = CheckoutSideEffect.objects.get(pk=ids[0])
+        self.assertEqual(effect.idempotency_key, f'order:{self.order.pk}:acknowledgments')
+        self.assertEqual(effect.status, CheckoutSideEffect.STATUS_PENDING)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_schedule_twice_does_not_duplicate_rows(self):
+        self._schedule_ack()
+        self._schedule_ack()
+
+        self.assertEqual(CheckoutSideEffect.objects.filter(order=self.order).count(), 1)
+
+    def test_apply_persists_acknowledgment_and_marks_done(self):
+        ids, _ = self._schedule_ack()
+
+        apply_side_effect(ids[0])
+
+        effect = CheckoutSideEffect.objects.get(pk=ids[0])
+        self.assertEqual(effect.status, CheckoutSideEffect.STATUS_DONE)
+        self.assertEqual(effect.attempts, 1)
+        self.assertIsNotNone(effect.completed_at)
+        ack = OrderAcknowledgment.objects.get(order=self.order)
+        self.assertTrue(ack.is_accepted)
+        self.assertEqual(ack.ip_address, '10.0.0.1')
+
+    def test_apply_done_row_is_a_no_op(self):
+        ids, _ = self._schedule_ack()
+        apply_side_effect(ids[0])
+
+        apply_side_effect(ids[0])
+
+        self.assertEqual(CheckoutSideEffect.objects.get(pk=ids[0]).attempts, 1)
+        self.assertEqual(OrderAcknowledgment.objects.filter(order=self.order).count(), 1)
+
+    def test_replayed_preferences_are_not_duplicated(self):
+        with self.captureOnCommitCallbacks():
+            ids = schedule_side_effects(self.order, {
+                CheckoutSideEffect.EFFECT_PREFERENCES: {'user_preferences': {'cse_pref': 'yes'}},
+            })
+        apply_side_effect(ids[0])
+        CheckoutSideEffect.objects.filter(pk=ids[0]).update(status=CheckoutSideEffect.STATUS_PENDING)
+
+        apply_side_effect(ids[0])
+
+        self.assertEqual(OrderPreference.objects.filter(order=self.order).count(), 1)
+
+    def test_handler_failure_marks_failed_then_dead(self):
+        ids, _ = self._schedule_ack()
+        failing = {CheckoutSideEffect.EFFECT_ACKNOWLEDGMENTS: self._raise}
+
+        with patch.dict(checkout_side_effects.SIDE_EFFECT_HANDLERS, failing):
+            with self.assertRaises(RuntimeError):
+                apply_side_effect(ids[0])
+            effect = CheckoutSideEffect.objects.get(pk=ids[0])
+            self.assertEqual(effect.status, CheckoutSideEffect.STATUS_FAILED)
+            self.assertIn('RuntimeError: cse boom', effect.error_message)
+
+            CheckoutSideEffect.objects.filter(pk=ids[0]).update(
+                attempts=checkout_side_effects.MAX_ATTEMPTS - 1,
+            )
+            apply_side_effect(ids[0])
+
+        self.assertEqual(
+            CheckoutSideEffect.objects.get(pk=ids[0]).status,
+            CheckoutSideEffect.STATUS_DEAD,
+        )
+
+    def test_command_re_enqueues_stale_processing_row(self):
+        ids, _ = self._schedule_ack()
+        CheckoutSideEffect.objects.filter(pk=ids[0]).update(
+            status=CheckoutSideEffect.STATUS_PROCESSING,
+            last_attempted_at=timezone.now() - timedelta(hours=1),
+        )
+        out = StringIO()
+
+        call_command('process_checkout_side_effects', stdout=out)
+
+        self.assertIn('Re-enqueued 1', out.getvalue())
+        self.assertEqual(
+            CheckoutSideEffect.objects.get(pk=ids[0]).status,
+            CheckoutSideEffect.STATUS_DONE,
+        )
+
+    def test_command_skips_rows_of_unpaid_orders(self):
+        ids, _ = self._schedule_ack()
+        self.order.payments.all().delete()
+        out = StringIO()
+
+        call_command('process_checkout_side_effects', '--stale-minutes', '0', stdout=out)
+
+        self.assertIn('Re-enqueued 0', out.getvalue())
+        self.assertEqual(
+            CheckoutSideEffect.objects.get(pk=ids[0]).status,
+            CheckoutSideEffect.STATUS_PENDING,
+        )
+
+    @override_settings(CHECKOUT_SIDE_EFFECTS_ENQUEUE=False)
+    def test_schedule_without_enqueue_leaves_rows_for_the_command(self):
+        ids, callbacks = self._schedule_ack()
+
+        self.assertEqual(ids, [])
+        self.assertEqual(callbacks, [])
+        call_command('process_checkout_side_effects', '--stale-minutes', '0', stdout=StringIO())
+        self.assertTrue(OrderAcknowledgment.objects.filter(order=self.order).exists())
+
+    @staticmethod
+    def _raise(order, payload):
+        raise RuntimeError('cse boom')
+
+
+@override_settings(USE_DUMMY_PAYMENT_GATEWAY=True)
+class CheckoutOrchestratorDeferredSideEffectsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='cse_checkout', email='cse_checkout@example.com', password='testpass123'
+        )
+        subject = Subject.objects.create(code='CSE')
+        exam_session = ExamSession.objects.create(
+            session_code='CSE-2025', start_date=timezone.now(), end_date=timezone.now()
+        )
+        ess = ExamSessionSubject.objects.create(exam_session=exam_session, subject=subject)
+        cat_product = CatalogProduct.objects.create(fullname='CSE Product', shortname='CSE', code='CSE01')
+        variation = ProductVariation.objects.create(variation_type='eBook', name='CSE eBook')
+        ppv = ProductProductVariation.objects.create(product=cat_product, product_variation=variation)
+        product = StoreMaterialProduct.objects.create(
+            exam_session_subject=ess, product_product_variation=ppv
+        )
+        self.cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(
+            cart=self.cart, product=product, item_type='product', quantity=1,
+            price_type='standard', actual_price=Decimal('100.00'),
+        )
+        self.request_data = {
+            'payment_method': 'card',
+            'card_data': {'card_number': '4111111111111111'},
+            'general_terms_accepted': True,
+            'user_preferences': {'cse_pref': 'yes'},
+        }
+        request = RequestFactory().post('/api/orders/checkout/', {})
+        request.user = self.user
+        request.session = SessionStore()
+        request.META['REMOTE_ADDR'] = '127.0.0.1'
+        self.orchestrator = CheckoutOrchestrator(
+            cart=self.cart, user=self.user,
+            request_data=self.request_data, request=request,
+        )
+
+    @patch('rules_engine.services.rule_engine.rule_engine')
+    @patch('cart.services.cart_service.cart_service.calculate_vat')
+    def test_side_effects_wait_for_commit(self, mock_vat, mock_rules):
+        mock_rules.execute.return_value = {'blocked': False}
+        mock_vat.return_value = {
+            'totals': {'net': '100.00', 'vat': '0.00', 'gross': '100.00'},
+            'items': [], 'region': 'ROW',
+        }
+
+        with self.captureOnCommitCallbacks(execute=False):
+            result = self.orchestrator.execute()
+
+        order = result['order']
+        self.assertFalse(OrderAcknowledgment.objects.filter(order=order).exists())
+        self.assertFalse(OrderPreference.objects.filter(order=order).exists())
+        self.assertEqual(
+            set(CheckoutSideEffect.objects.filter(order=order).values_list('effect_type', flat=True)),
+            {'notification', 'acknowledgments', 'preferences', 'analytics'},
+        )
+        self.assertFalse(self.cart.items.exists())
+
+    @patch('rules_engine.services.rule_engine.rule_engine')
+    @patch('cart.services.cart_service.cart_service.calculate_vat')
+    def test_side_effects_applied_after_commit_and_timings_reported(self, mock_vat, mock_rules):
+        mock_rules.execute.return_value = {'blocked': False}
+        mock_vat.return_value = {
+            'totals': {'net': '100.00', 'vat': '0.00', 'gross': '100.00'},
+            'items': [], 'region': 'ROW',
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = self.orchestrator.execute()
+
+        order = result['order']
+        self.assertTrue(OrderAcknowledgment.objects.filter(order=order).exists())
+        self.assertTrue(OrderPreference.objects.filter(order=order, preference_key='cse_pref').exists())
+        self.assertFalse(
+            CheckoutSideEffect.objects.filter(order=order)
+            .exclude(status=CheckoutSideEffect.STATUS_DONE).exists()
+        )
+        for step in ('validate', 'build_order', 'payment', 'confirm_order', 'schedule_side_effects'):
+            self.assertIn(step, result['timings'])
+
+    @patch('rules_engine.services.rule_engine.rule_engine')
+    @patch('cart.services.cart_service.cart_service.calculate_vat')
+    @patch('rules_engine.services.rule_engine.rule_engine')
+    @patch('cart.services.cart_service.cart_service.calculate_vat')
+    def test_rows_are_written_in_the_order_build_transaction(self, mock_vat, mock_rules):
+        mock_rules.execute.return_value = {'blocked': False}
+        mock_vat.return_value = {
+            'totals': {'net': '100.00', 'vat': '0.00', 'gross': '100.00'},
+            'items': [], 'region': 'ROW',
+        }
+
+        with patch('orders.services.order_builder.record_side_effects', side_effect=RuntimeError('cse boom')):
+            with self.assertRaises(RuntimeError):
+                self.orchestrator.execute()
+
+        # The order rolled back with the failed side-effect insert.
+        self.assertFalse(Order.objects.filter(user=self.user).exists())
+        self.assertTrue(self.cart.items.exists())
+
+    @patch('rules_engine.services.rule_engine.rule_engine')
+    @patch('cart.services.cart_service.cart_service.calculate_vat')
+    def test_base_settings_apply_side_effects_after_commit(self, mock_vat, mock_rules):
+        """The deployed configuration (ImmediateBackend, no cron) applies them."""
+        from django_Admin3.settings import base
+
+        mock_rules.execute.return_value = {'blocked': False}
+        mock_vat.return_value = {
+            'totals': {'net': '100.00', 'vat': '0.00', 'gross': '100.00'},
+            'items': [], 'region': 'ROW',
+        }
+
+        with self.settings(TASKS=base.TASKS, CHECKOUT_SIDE_EFFECTS_ENQUEUE=base.CHECKOUT_SIDE_EFFECTS_ENQUEUE):
+            with self.captureOnCommitCallbacks(execute=True):
+                result = self.orchestrator.execute()
+
+        order = result['order']
+        self.assertTrue(OrderAcknowledgment.objects.filter(order=order).exists())
+        self.assertFalse(
+            CheckoutSideEffect.objects.filter(order=order)
+            .exclude(status=CheckoutSideEffect.STATUS_DONE).exists()
+        )
+
+    @override_settings(CHECKOUT_SIDE_EFFECTS_ENQUEUE=False)
+    @patch('rules_engine.services.rule_engine.rule_engine')
+    @patch('cart.services.cart_service.cart_service.calculate_vat')
+    def test_disabled_enqueue_leaves_side_effects_to_the_command(self, mock_vat, mock_rules):
+        mock_rules.execute.return_value = {'blocked': False}
+        mock_vat.return_value = {
+            'totals': {'net': '100.00', 'vat': '0.00', 'gross': '100.00'},
+            'items': [], 'region': 'ROW',
+        }
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            result = self.orchestrator.execute()
+
+        order = result['order']
+        self.assertEqual(callbacks, [])
+        self.assertFalse(OrderAcknowledgment.objects.filter(order=order).exists())
+
+        call_command('process_checkout_side_effects', '--stale-minutes', '0', stdout=StringIO())
+
+        self.assertTrue(OrderAcknowledgment.objects.filter(order=order).exists())
+        self.assertFalse(
+            CheckoutSideEffect.objects.filter(order=order)
+            .exclude(status=CheckoutSideEffect.STATUS_DONE).exists()
+        )
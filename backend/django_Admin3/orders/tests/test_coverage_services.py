@@ -130,7 +130,8 @@ class CheckoutOrchestratorCoverageTest(ORDServiceTestMixin, TestCase):
             cart=self.cart, user=self.user,
             request_data=request_data, request=request,
         )
-        result = orchestrator.execute()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = orchestrator.execute()
 
         prefs = OrderPreference.objects.filter(order=result['order'])
         self.assertEqual(prefs.count(), 1)
@@ -162,7 +163,8 @@ class CheckoutOrchestratorCoverageTest(ORDServiceTestMixin, TestCase):
             cart=self.cart, user=self.user,
             request_data=request_data, request=request,
         )
-        result = orchestrator.execute()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = orchestrator.execute()
 
         prefs = OrderPreference.objects.filter(order=result['order'])
         self.assertEqual(prefs.count(), 1)
@@ -384,7 +386,8 @@ class CheckoutOrchestratorCoverageTest(ORDServiceTestMixin, TestCase):
             cart=self.cart, user=self.user,
             request_data=request_data, request=request,
         )
-        result = orchestrator.execute()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = orchestrator.execute()
 
         # Verify the acknowledgment IP is from X-Forwarded-For
         ack = OrderAcknowledgment.objects.filter(order=result['order']).first()
@@ -412,7 +415,8 @@ class CheckoutOrchestratorCoverageTest(ORDServiceTestMixin, TestCase):
             cart=self.cart, user=self.user,
             request_data=request_data, request=request,
         )
-        result = orchestrator.execute()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = orchestrator.execute()
 
         ack = OrderAcknowledgment.objects.filter(order=result['order']).first()
         self.assertEqual(ack.ip_address, '127.0.0.1')
@@ -524,7 +528,8 @@ class CheckoutOrchestratorCoverageTest(ORDServiceTestMixin, TestCase):
             cart=self.cart, user=self.user,
             request_data=request_data, request=request,
         )
-        result = orchestrator.execute()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = orchestrator.execute()
 
         acks = OrderAcknowledgment.objects.filter(order=result['order'])
         self.assertEqual(acks.count(), 1)
@@ -555,7 +560,8 @@ class CheckoutOrchestratorCoverageTest(ORDServiceTestMixin, TestCase):
             cart=self.cart, user=self.user,
             request_data=request_data, request=request,
         )
-        result = orchestrator.execute()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = orchestrator.execute()
         self.assertTrue(result['success'])
 
     # ---- _save_acknowledgments exception handling ----
@@ -583,7 +589,8 @@ class CheckoutOrchestratorCoverageTest(ORDServiceTestMixin, TestCase):
             cart=self.cart, user=self.user,
             request_data=request_data, request=request,
         )
-        result = orchestrator.execute()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = orchestrator.execute()
         self.assertTrue(result['success'])
 
     # ---- _save_preferences exception handling ----
@@ -612,7 +619,8 @@ class CheckoutOrchestratorCoverageTest(ORDServiceTestMixin, TestCase):
             cart=self.cart, user=self.user,
             request_data=request_data, request=request,
         )
-        result = orchestrator.execute()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = orchestrator.execute()
         self.assertTrue(result['success'])
 
     # ---- _save_contact_and_delivery exception handling ----
@@ -868,11 +876,9 @@ class OrderNotificationCoverageTest(ORDServiceTestMixin, TestCase):
         """_get_user_country returns UK default on exception."""
         from orders.services.order_notification import _get_user_country
 
-        # Create a mock user where accessing userprofile.addresses.filter raises
-        mock_user = MagicMock()
-        mock_user.userprofile.addresses.filter.side_effect = Exception("ORD DB error")
-
-        result = _get_user_country(mock_user)
+        with patch('orders.services.order_notification.get_user_countries',
+                   side_effect=Exception("ORD DB error")):
+            result = _get_user_country(self.user)
         self.assertEqual(result, 'United Kingdom')
 
     def test_build_order_email_data_with_product_items(self):
@@ -0,0 +1,145 @@
+"""Tests for the order-search read model (OrderSearch / OrderedPurchasable)."""
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from orders.models import Order, OrderedPurchasable, OrderItem, OrderSearch
+from orders.services.order_writer import BulkOrderWriter
+from store.models import Purchasable
+from students.models import Student
+
+User = get_user_model()
+
+
+class OrderSearchMaintenanceTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='carol', email='carol@example.com',
+            first_name='Carol', last_name='Clark',
+        )
+        self.cm1 = Purchasable.objects.create(code='OS/CM1', name='CM1 notes', kind='material')
+        self.cp2 = Purchasable.objects.create(code='OS/CP2', name='CP2 notes', kind='material')
+
+    def test_flush_writes_search_rows_with_distinct_codes(self):
+        writer = BulkOrderWriter()
+        order = writer.add_order(user=self.user, subtotal=Decimal('10'))
+        writer.add_item(order, purchasable_id=self.cp2.pk)
+        writer.add_item(order, purchasable_id=self.cm1.pk)
+        writer.add_item(order, purchasable_id=self.cm1.pk)
+        writer.flush()
+
+        row = OrderSearch.objects.get(order=order)
+        self.assertEqual(row.user_id, self.user.pk)
+        self.assertEqual((row.first_name, row.last_name), ('Carol', 'Clark'))
+        self.assertEqual(row.email, 'carol@example.com')
+        self.assertEqual(row.purchasable_codes, ['OS/CM1', 'OS/CP2'])
+        self.assertTrue(OrderedPurchasable.objects.filter(purchasable=self.cm1).exists())
+        self.assertTrue(OrderedPurchasable.objects.filter(purchasable=self.cp2).exists())
+
+    def test_single_row_writes_keep_codes_current(self):
+        order = Order.objects.create(user=self.user)
+        self.assertEqual(OrderSearch.objects.get(order=order).purchasable_codes, [])
+
+        item = OrderItem.objects.create(order=order, purchasable=self.cm1)
+        self.assertEqual(OrderSearch.objects.get(order=order).purchasable_codes, ['OS/CM1'])
+
+        item.delete()
+        self.assertEqual(OrderSearch.objects.get(order=order).purchasable_codes, [])
+        # The combobox keeps codes that were ordered once.
+        self.assertTrue(OrderedPurchasable.objects.filter(purchasable=self.cm1).exists())
+
+    def test_deleting_order_removes_its_row(self):
+        order = Order.objects.create(user=self.user)
+        OrderItem.objects.create(order=order, purchasable=self.cm1)
+
+        order.delete()
+
+        self.assertFalse(OrderSearch.objects.filter(order_id=order.pk).exists())
+
+    def test_user_and_student_changes_reach_rows(self):
+        order = Order.objects.create(user=self.user)
+
+        self.user.last_name = 'Cole'
+        self.user.save()
+        student = Student.objects.create(user=self.user)
+
+        row = OrderSearch.objects.get(order=order)
+        self.assertEqual(row.last_name, 'Cole')
+        self.assertEqual(row.student_ref, student.student_ref)
+
+    def test_rebuild_command_repairs_bypassed_writes(self):
+        order = Order.objects.create(user=self.user)
+        OrderItem.objects.create(order=order, purchasable=self.cm1)
+        User.objects.filter(pk=self.user.pk).update(email='new@example.com')
+
+        out = StringIO()
+        call_command('rebuild_order_search', stdout=out)
+
+        self.assertEqual(OrderSearch.objects.get(order=order).email, 'new@example.com')
+        self.assertIn('order search row', out.getvalue())
+
+
+class AdminOrderSearchFilterTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='os_adm', email='os_adm@x.com', password='p',
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.user = User.objects.create_user(
+            username='dave', email='dave@example.com',
+            first_name='Dave', last_name='Dawson',
+        )
+        self.purchasable = Purchasable.objects.create(
+            code='OS/CB1', name='CB1 notes', kind='material',
+        )
+        self.order = Order.objects.create(user=self.user)
+        OrderItem.objects.create(order=self.order, purchasable=self.purchasable, quantity=1)
+        OrderItem.objects.create(order=self.order, purchasable=self.purchasable, quantity=2)
+
+    def _ids(self, response):
+        return [row['id'] for row in response.data['results']]
+
+    def test_product_code_filter_reads_search_rows_without_distinct(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/orders/admin/', {'product_code': 'OS/CB1'})
+
+        self.assertEqual(self._ids(response).count(self.order.pk), 1)
+        sql = ' '.join(q['sql'] for q in ctx.captured_queries)
+        self.assertIn('order_search', sql)
+        self.assertNotIn('DISTINCT', sql)
+
+    def test_date_to_includes_the_whole_day(self):
+        late = timezone.now().replace(hour=23, minute=30) - timedelta(days=3)
+        Order.objects.filter(pk=self.order.pk).update(created_at=late)
+
+        response = self.client.get('/api/orders/admin/', {
+            'date_to': late.date().isoformat(), 'email': 'dave@',
+        })
+        self.assertEqual(self._ids(response), [self.order.pk])
+
+        response = self.client.get('/api/orders/admin/', {
+            'date_to': (late.date() - timedelta(days=1)).isoformat(), 'email': 'dave@',
+        })
+        self.assertEqual(self._ids(response), [])
+
+    def test_invalid_date_returns_empty(self):
+        response = self.client.get('/api/orders/admin/', {'date_from': 'yesterday'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [])
+
+    def test_product_codes_reads_materialised_list(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/orders/admin/product-codes/')
+
+        self.assertIn({'code': 'OS/CB1', 'name': 'CB1 notes'}, response.data)
+        sql = ' '.join(q['sql'] for q in ctx.captured_queries)
+        self.assertIn('order_purchasable_codes', sql)
+        self.assertNotIn('order_items', sql)
@@ -0,0 +1,86 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from orders.models import Order, OrderItem
+from orders.services.order_writer import (
+    BulkOrderWriter, clear_fee_purchasable_cache, get_fee_purchasable,
+)
+from store.models import Purchasable
+
+User = get_user_model()
+
+
+class BulkOrderWriterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', email='w@t.com')
+        self.purchasable = Purchasable.objects.create(
+            kind='additional_charge', code='WRITER_TEST', name='Writer test',
+        )
+
+    def test_flush_inserts_orders_and_items_with_pks(self):
+        writer = BulkOrderWriter()
+        first = writer.add_order(user=self.user, subtotal=Decimal('10.00'))
+        second = writer.add_order(user=self.user, subtotal=Decimal('5.00'))
+        writer.add_item(first, purchasable_id=self.purchasable.pk, quantity=2)
+        writer.add_item(second, purchasable_id=self.purchasable.pk)
+
+        orders, items = writer.flush()
+
+        self.assertTrue(all(o.pk for o in orders))
+        self.assertTrue(all(i.pk for i in items))
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(first.items.get().quantity, 2)
+        self.assertEqual(second.items.count(), 1)
+
+    def test_flush_attaches_items_to_already_saved_order(self):
+        order = Order.objects.create(user=self.user)
+        writer = BulkOrderWriter()
+        writer.add_order(order)
+        writer.add_item(order, purchasable_id=self.purchasable.pk)
+
+        with self.assertNumQueries(1):
+            writer.flush()
+
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(order.items.count(), 1)
+
+    def test_add_item_accepts_prebuilt_instance(self):
+        writer = BulkOrderWriter()
+        order = writer.add_order(user=self.user)
+        item = OrderItem(purchasable_id=self.purchasable.pk, quantity=3)
+        writer.add_item(order, item=item)
+
+        writer.flush()
+
+        self.assertEqual(OrderItem.objects.get(pk=item.pk).order_id, order.pk)
+
+    def test_flush_empties_the_buffer(self):
+        writer = BulkOrderWriter()
+        writer.add_order(user=self.user)
+        writer.flush()
+
+        self.assertEqual(len(writer), 0)
+        self.assertEqual(writer.flush(), ([], []))
+
+
+class FeePurchasableCacheTests(TestCase):
+    def setUp(self):
+        clear_fee_purchasable_cache()
+        self.addCleanup(clear_fee_purchasable_cache)
+        Purchasable.objects.update_or_create(
+            code='FEE_GENERIC',
+            defaults={'kind': 'additional_charge', 'name': 'Generic Fee',
+                      'dynamic_pricing': True},
+        )
+
+    def test_lookup_is_cached(self):
+        get_fee_purchasable()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_fee_purchasable().code, 'FEE_GENERIC')
+
+    def test_delete_invalidates_cache(self):
+        get_fee_purchasable()
+        Purchasable.objects.filter(code='FEE_GENERIC').delete()
+        self.assertIsNone(get_fee_purchasable())
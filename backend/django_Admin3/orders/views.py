@@ -66,7 +66,7 @@ class CheckoutView(APIView):
         order = result['order']
         payment_result = result['payment_result']
 
-        return Response({
+        response = Response({
             'success': True,
             'order': OrderSerializer(order).data,
             'payment': {
@@ -75,6 +75,11 @@ class CheckoutView(APIView):
                 'message': payment_result.message,
             },
         }, status=status.HTTP_201_CREATED)
+        # Per-step checkout timings, visible in browser devtools / APM.
+        response['Server-Timing'] = ', '.join(
+            f"{step};dur={ms}" for step, ms in result.get('timings', {}).items()
+        )
+        return response
 
 
 class OrderViewSet(viewsets.ReadOnlyModelViewSet):
@@ -1,5 +1,6 @@
 #!/bin/bash
 # Startup script - conditionally runs web or worker based on SERVICE_TYPE
+# Web service runs WSGI by default; SERVER_MODE=asgi switches to uvicorn workers
 
 set -e
 
@@ -11,5 +12,14 @@ else
     find . -type d -name __pycache__ -exec rm -rf {} + 2>/dev/null;
     python manage.py migrate --noinput --skip-checks
     python manage.py createcachetable 2>/dev/null || true
-    exec gunicorn django_Admin3.wsgi:application --bind 0.0.0.0:$PORT --workers 2 --threads 4 --timeout 120
+    # gunicorn.conf.py warms each worker's caches after boot (utils.warmup).
+    # WEB_CONCURRENCY / GUNICORN_THREADS also size the per-worker DB pool
+    # (django_Admin3/db_pool.py), so set them here rather than editing flags.
+    if [ "$SERVER_MODE" = "asgi" ]; then
+        # Async address lookup / reCAPTCHA views await upstreams on the event loop
+        # instead of holding one of the WSGI worker threads per round-trip.
+        export ASYNC_UPSTREAM_VIEWS=true
+        exec gunicorn django_Admin3.asgi:application --bind 0.0.0.0:$PORT --workers ${WEB_CONCURRENCY:-2} --worker-class uvicorn_worker.UvicornWorker --timeout 120 --config gunicorn.conf.py
+    fi
+    exec gunicorn django_Admin3.wsgi:application --bind 0.0.0.0:$PORT --workers ${WEB_CONCURRENCY:-2} --threads ${GUNICORN_THREADS:-4} --timeout 120 --config gunicorn.conf.py
 fi
@@ -0,0 +1,70 @@
+"""
+pytest-benchmark suite that replays stored rule executions.
+
+Not collected by the regular test run. Load a fixture dump into the local
+test database and point the suite at it:
+
+    python manage.py dumpdata rules_engine.actedrule rules_engine.actedrulesfields \
+        rules_engine.messagetemplate rules_engine.actedruleexecution > rules_replay.json
+
+    RULES_REPLAY_FIXTURE=rules_replay.json \
+        pytest rules_engine/benchmarks/bench_replay.py --benchmark-autosave
+
+Later runs gate on the saved benchmark:
+
+    RULES_REPLAY_FIXTURE=rules_replay.json \
+        pytest rules_engine/benchmarks/bench_replay.py \
+        --benchmark-compare --benchmark-compare-fail=median:25%
+
+RULES_REPLAY_SAMPLE caps snapshots per entry point (default 50) and
+RULES_REPLAY_MAX_QUERIES fails the run when any execution exceeds that
+many queries.
+"""
+import os
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from django.core.cache import cache
+from django.core.management import call_command
+
+from rules_engine.services.replay import (
+    DEFAULT_SAMPLE_SIZE, RuleReplayHarness, build_report, check_regressions,
+    sample_executions,
+)
+from rules_engine.services.template_store import template_store
+
+FIXTURES = [path for path in os.environ.get('RULES_REPLAY_FIXTURE', '').split(',') if path]
+SAMPLE_SIZE = int(os.environ.get('RULES_REPLAY_SAMPLE', DEFAULT_SAMPLE_SIZE))
+MAX_QUERIES = int(os.environ['RULES_REPLAY_MAX_QUERIES']) if os.environ.get('RULES_REPLAY_MAX_QUERIES') else None
+
+pytestmark = [pytest.mark.slow, pytest.mark.django_db]
+
+
+@pytest.fixture
+def replay_executions(db):
+    if not FIXTURES:
+        pytest.skip('Set RULES_REPLAY_FIXTURE to a fixture dump to run the replay benchmark')
+    call_command('loaddata', *FIXTURES, verbosity=0)
+    cache.clear()
+    template_store.clear()
+    executions = sample_executions(sample_size=SAMPLE_SIZE)
+    if not executions:
+        pytest.skip('Fixture contains no successful rule executions')
+    yield executions
+    cache.clear()
+    template_store.clear()
+
+
+def test_replay_benchmark(benchmark, replay_executions):
+    harness = RuleReplayHarness()
+
+    stats = benchmark.pedantic(
+        harness.replay, args=(replay_executions,), rounds=5, warmup_rounds=1,
+    )
+
+    report = build_report(stats)
+    benchmark.extra_info['entry_points'] = report['entry_points']
+    assert report['mismatches'] == [], report['mismatches']
+    assert check_regressions(report, max_queries=MAX_QUERIES) == []
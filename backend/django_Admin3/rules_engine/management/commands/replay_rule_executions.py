@@ -0,0 +1,168 @@
+"""
+Replay stored rule executions to benchmark the rules engine and catch
+behaviour changes.
+
+Samples ActedRuleExecution snapshots per entry point, re-runs them through
+RuleEngine.execute and reports p50/p95/p99 latency, queries per execution
+and rules evaluated. Fails (non-zero exit) when a replayed rule's outcome
+differs from the recorded one, or when a threshold is breached.
+
+Usage:
+    # Replay the 50 most recent successful executions per entry point
+    python manage.py replay_rule_executions
+
+    # Specific entry points, 5 timed runs per snapshot
+    python manage.py replay_rule_executions --entry-point=checkout_terms --iterations=5
+
+    # Save a baseline, then compare a later run against it
+    python manage.py replay_rule_executions --output=replay_baseline.json
+    python manage.py replay_rule_executions --baseline=replay_baseline.json
+
+    # Run against a local test database from a fixture dump
+    # (e.g. dumpdata rules_engine.actedrule rules_engine.actedrulesfields
+    #  rules_engine.messagetemplate rules_engine.actedruleexecution)
+    python manage.py replay_rule_executions --fixture=rules_replay.json
+"""
+import json
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from rules_engine.models import ActedRule
+from rules_engine.services.replay import (
+    DEFAULT_SAMPLE_SIZE, RuleReplayHarness, build_report, check_regressions,
+    sample_executions,
+)
+from rules_engine.services.rule_engine import RuleRepository
+from rules_engine.services.template_store import bump_template_version, template_store
+
+
+class Command(BaseCommand):
+    help = 'Replay stored rule execution snapshots and report latency, queries and outcome diffs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entry-point',
+            action='append',
+            dest='entry_points',
+            help='Entry point(s) to replay. Can be specified multiple times (default: all).',
+        )
+        parser.add_argument(
+            '--sample', type=int, default=DEFAULT_SAMPLE_SIZE,
+            help=f'Executions to replay per entry point (default: {DEFAULT_SAMPLE_SIZE}).',
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=3,
+            help='Timed runs per snapshot (default: 3).',
+        )
+        parser.add_argument(
+            '--no-warmup', action='store_true',
+            help='Include the cold first run of each entry point in the measurements.',
+        )
+        parser.add_argument(
+            '--fixture',
+            action='append',
+            dest='fixtures',
+            help='Fixture file(s) to load before replaying; rolled back afterwards.',
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Report JSON from a previous run to check for regressions against.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the report as JSON to this path.',
+        )
+        parser.add_argument(
+            '--max-p95-ms', type=float,
+            help='Fail when any entry point p95 latency exceeds this.',
+        )
+        parser.add_argument(
+            '--max-queries', type=int,
+            help='Fail when any execution issues more queries than this.',
+        )
+        parser.add_argument(
+            '--latency-tolerance', type=float, default=0.25,
+            help='Allowed p95 growth over the baseline, as a fraction (default: 0.25).',
+        )
+        parser.add_argument(
+            '--allow-diffs', action='store_true',
+            help='Report outcome differences without failing.',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as fh:
+                baseline = json.load(fh)
+
+        if options['fixtures']:
+            report = self._replay_with_fixtures(options)
+        else:
+            report = self._replay(options)
+
+        if not report['entry_points']:
+            self.stdout.write(self.style.WARNING('No rule executions found to replay'))
+            return
+
+        self._write_report(report)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2, default=str)
+            self.stdout.write(f"Report written to {options['output']}")
+
+        failures = check_regressions(
+            report,
+            max_p95_ms=options['max_p95_ms'],
+            max_queries=options['max_queries'],
+            baseline=baseline,
+            latency_tolerance=options['latency_tolerance'],
+        )
+        if report['mismatches'] and not options['allow_diffs']:
+            failures.append(f"{len(report['mismatches'])} replayed rule(s) changed outcome")
+        if failures:
+            raise CommandError('Replay regressions:\n  ' + '\n  '.join(failures))
+
+        self.stdout.write(self.style.SUCCESS('Replay passed'))
+
+    def _replay(self, options):
+        executions = sample_executions(options['entry_points'], options['sample'])
+        harness = RuleReplayHarness(
+            iterations=options['iterations'], warmup=not options['no_warmup'],
+        )
+        return build_report(harness.replay(executions))
+
+    def _replay_with_fixtures(self, options):
+        """Load the fixtures, replay, then roll everything back."""
+        with transaction.atomic():
+            call_command('loaddata', *options['fixtures'], verbosity=0)
+            entry_points = set(ActedRule.objects.values_list('entry_point', flat=True))
+            self._reset_caches(entry_points)
+            report = self._replay(options)
+            transaction.set_rollback(True)
+        # Caches may now hold rules and templates that were rolled back.
+        self._reset_caches(entry_points)
+        return report
+
+    def _reset_caches(self, entry_points):
+        repository = RuleRepository()
+        for entry_point in entry_points:
+            repository.invalidate_cache(entry_point)
+        template_store.clear()
+        bump_template_version()
+
+    def _write_report(self, report):
+        for entry_point, stats in report['entry_points'].items():
+            self.stdout.write(
+                f"{entry_point}: {stats['snapshots']} snapshot(s), "
+                f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms, "
+                f"queries mean={stats['mean_queries']} max={stats['max_queries']}, "
+                f"rules evaluated={stats['mean_rules_evaluated']}, "
+                f"mismatches={stats['mismatches']}"
+            )
+        for mismatch in report['mismatches']:
+            self.stdout.write(self.style.WARNING(
+                f"  {mismatch['entry_point']}/{mismatch['rule_code']} "
+                f"({mismatch['execution_seq_no']}): {mismatch['reason']}"
+            ))
@@ -1,4 +1,3 @@
-import jsonschema
 from rest_framework import serializers
 from ..models import ActedRulesFields, RuleEntryPoint
 
@@ -9,6 +8,8 @@ class RuleExecuteSerializer(serializers.Serializer):
     
     def validate(self, data):
         """Validate context against rules fields schema"""
+        import jsonschema
+
         entry_point = data.get('entry_point')
         context = data.get('context')
         
@@ -0,0 +1,104 @@
+"""
+Request-scoped context building for rules engine views.
+
+``RulesEngineViewSet.execute_rules`` and ``validate_comprehensive_checkout``
+both enrich the client context with the authenticated user (including home
+and work address countries), session acknowledgments and request metadata.
+``RequestContextBuilder.for_request`` returns one builder per request so
+those pieces are computed once however many entry points a request
+evaluates. Address countries come from userprofile.user_context, which
+shares them with the cart and order code paths.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from django.utils import timezone
+
+from userprofile.user_context import get_user_countries
+
+logger = logging.getLogger(__name__)
+
+_REQUEST_ATTR = '_rules_context_builder'
+
+
+class RequestContextBuilder:
+    """Builds and memoizes rules engine context pieces for one request."""
+
+    def __init__(self, request):
+        self.request = request
+        self._user_context: Optional[Dict[str, Any]] = None
+        self._request_metadata: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def for_request(cls, request) -> 'RequestContextBuilder':
+        """Return the builder attached to ``request``, creating it if needed.
+
+        DRF ``Request`` objects wrap the Django ``HttpRequest``; the builder
+        is stored on the underlying request so both views share it.
+        """
+        http_request = getattr(request, '_request', request)
+        builder = getattr(http_request, _REQUEST_ATTR, None)
+        if builder is None:
+            builder = cls(request)
+            setattr(http_request, _REQUEST_ATTR, builder)
+        return builder
+
+    def user_context(self) -> Optional[Dict[str, Any]]:
+        """Return a copy of the ``user`` context, or None when anonymous."""
+        user = self.request.user
+        if not user.is_authenticated:
+            return None
+        if self._user_context is None:
+            countries = get_user_countries(user)
+            self._user_context = {
+                'id': user.id,
+                'email': user.email,
+                'is_authenticated': True,
+                'ip': self.request.META.get('REMOTE_ADDR', ''),
+                'home_country': countries.home_country,
+                'work_country': countries.work_country,
+            }
+        return dict(self._user_context)
+
+    def session_acknowledgments(self) -> List[Dict[str, Any]]:
+        """Return the raw acknowledgments recorded in the session."""
+        return self.request.session.get('user_acknowledgments', [])
+
+    def acknowledgments_for(self, entry_point: str) -> Dict[str, Dict[str, Any]]:
+        """Session acknowledgments made at ``entry_point``, keyed by ack_key."""
+        acknowledgments = {}
+        for ack in self.session_acknowledgments():
+            if ack.get('entry_point_location') != entry_point:
+                continue
+            ack_key = ack.get('ack_key')
+            if ack_key:
+                acknowledgments[ack_key] = {
+                    'acknowledged': ack.get('acknowledged', False),
+                    'message_id': ack.get('message_id'),
+                    'timestamp': ack.get('acknowledged_timestamp'),
+                    'entry_point_location': ack.get('entry_point_location'),
+                }
+        return acknowledgments
+
+    def accepted_acknowledgments(self) -> Dict[str, Dict[str, Any]]:
+        """Accepted session acknowledgments from any entry point, keyed by ack_key."""
+        acknowledgments = {}
+        for ack in self.session_acknowledgments():
+            ack_key = ack.get('ack_key')
+            if ack_key and ack.get('acknowledged'):
+                acknowledgments[ack_key] = {
+                    'acknowledged': True,
+                    'timestamp': ack.get('acknowledged_timestamp'),
+                    'entry_point_location': ack.get('entry_point_location'),
+                }
+        return acknowledgments
+
+    def request_metadata(self) -> Dict[str, Any]:
+        """Return a copy of the ``request`` context."""
+        if self._request_metadata is None:
+            self._request_metadata = {
+                'ip_address': self.request.META.get('REMOTE_ADDR'),
+                'user_agent': self.request.META.get('HTTP_USER_AGENT', ''),
+                'timestamp': timezone.now().isoformat(),
+            }
+        return dict(self._request_metadata)
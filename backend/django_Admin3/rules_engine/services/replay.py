@@ -0,0 +1,284 @@
+"""
+Replay stored ActedRuleExecution snapshots through the rules engine.
+
+Every matched rule leaves an ActedRuleExecution row holding the context
+it ran against (``context_snapshot``) and what its actions returned
+(``actions_result``). The replay harness samples those rows per entry
+point, re-runs ``RuleEngine.execute`` on a copy of each snapshot and:
+
+  - measures wall time and database queries per execution, plus the
+    number of rules evaluated;
+  - diffs the replayed rule's outcome and actions_result against the
+    recorded ones, so a rule edit that changes behaviour is visible;
+  - checks the measurements against absolute limits or a previous
+    report (``check_regressions``).
+
+Replays never write execution rows: the engine is given a
+RecordingExecutionStore that keeps records in memory.
+
+Caveat: the snapshot is taken after higher-priority rules in the same run
+have applied their ``update`` actions, so replays of rules that follow
+an ``increment`` see the incremented value again.
+"""
+import copy
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import ActedRuleExecution
+from .rule_engine import ExecutionStore, RuleEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_SIZE = 50
+
+# Keys whose values legitimately change between runs.
+VOLATILE_RESULT_KEYS = frozenset({
+    'timestamp', 'acknowledged_timestamp', 'created_at', 'execution_time_ms',
+})
+
+
+class RecordingExecutionStore(ExecutionStore):
+    """ExecutionStore that keeps records in memory instead of the database."""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    def store_execution(self, rule_id: str, entry_point: str, context: Dict[str, Any],
+                        actions_result: List[Dict[str, Any]], outcome: str,
+                        execution_time_ms: float, error_message: str = "") -> str:
+        self.records.append({
+            'rule_code': rule_id,
+            'entry_point': entry_point,
+            'actions_result': actions_result,
+            'outcome': outcome,
+            'error_message': error_message,
+        })
+        return f"replay_{len(self.records)}"
+
+
+def normalize_result(value: Any) -> Any:
+    """JSON round-trip ``value`` and drop volatile keys, for comparison."""
+    value = json.loads(json.dumps(value, default=str))
+    return _strip_volatile(value)
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _strip_volatile(item)
+            for key, item in value.items()
+            if key not in VOLATILE_RESULT_KEYS
+        }
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class ReplayMismatch:
+    """A replayed rule whose outcome differs from the recorded one."""
+    execution_seq_no: Optional[str]
+    entry_point: str
+    rule_code: str
+    reason: str
+    expected: Any = None
+    actual: Any = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'execution_seq_no': self.execution_seq_no,
+            'entry_point': self.entry_point,
+            'rule_code': self.rule_code,
+            'reason': self.reason,
+            'expected': self.expected,
+            'actual': self.actual,
+        }
+
+
+@dataclass
+class EntryPointStats:
+    """Measurements collected for one entry point."""
+    entry_point: str
+    latencies_ms: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    rules_evaluated: List[int] = field(default_factory=list)
+    snapshots: int = 0
+    mismatches: List[ReplayMismatch] = field(default_factory=list)
+
+    def record(self, latency_ms: float, queries: int, rules_evaluated: int) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.queries.append(queries)
+        self.rules_evaluated.append(rules_evaluated)
+
+    def as_dict(self) -> Dict[str, Any]:
+        executions = len(self.latencies_ms)
+        return {
+            'snapshots': self.snapshots,
+            'executions': executions,
+            'p50_ms': round(percentile(self.latencies_ms, 50), 3),
+            'p95_ms': round(percentile(self.latencies_ms, 95), 3),
+            'p99_ms': round(percentile(self.latencies_ms, 99), 3),
+            'mean_queries': round(sum(self.queries) / executions, 2) if executions else 0,
+            'max_queries': max(self.queries, default=0),
+            'mean_rules_evaluated': (
+                round(sum(self.rules_evaluated) / executions, 2) if executions else 0
+            ),
+            'mismatches': len(self.mismatches),
+        }
+
+
+def sample_executions(entry_points: Optional[Iterable[str]] = None,
+                      sample_size: int = DEFAULT_SAMPLE_SIZE) -> List[ActedRuleExecution]:
+    """Return up to ``sample_size`` recent successful executions per entry point."""
+    base = ActedRuleExecution.objects.filter(outcome='success').order_by('-created_at')
+    if entry_points is None:
+        entry_points = sorted(set(base.values_list('entry_point', flat=True)))
+
+    executions = []
+    for entry_point in entry_points:
+        executions.extend(
+            base.filter(entry_point=entry_point).only(
+                'execution_seq_no', 'rule_code', 'entry_point',
+                'context_snapshot', 'actions_result', 'outcome',
+            )[:sample_size]
+        )
+    return executions
+
+
+class RuleReplayHarness:
+    """Replays execution snapshots and collects per-entry-point stats."""
+
+    def __init__(self, engine: Optional[RuleEngine] = None, iterations: int = 1,
+                 warmup: bool = True):
+        self.engine = engine or RuleEngine()
+        self.iterations = max(1, iterations)
+        self.warmup = warmup
+
+    def replay(self, executions: Iterable[ActedRuleExecution]) -> Dict[str, EntryPointStats]:
+        stats: Dict[str, EntryPointStats] = {}
+        for execution in executions:
+            entry_stats = stats.get(execution.entry_point)
+            if entry_stats is None:
+                entry_stats = stats[execution.entry_point] = EntryPointStats(execution.entry_point)
+                if self.warmup:
+                    # Load rule, schema and template caches outside the measurement.
+                    self._run(execution)
+            entry_stats.snapshots += 1
+
+            for _ in range(self.iterations):
+                store, result, elapsed_ms, query_count = self._run(execution)
+                entry_stats.record(elapsed_ms, query_count, result.get('rules_evaluated', 0))
+
+            mismatch = self._compare(execution, store.records)
+            if mismatch is not None:
+                entry_stats.mismatches.append(mismatch)
+        return stats
+
+    def _run(self, execution: ActedRuleExecution):
+        store = RecordingExecutionStore()
+        self.engine.execution_store = store
+        context = copy.deepcopy(execution.context_snapshot or {})
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            result = self.engine.execute(execution.entry_point, context)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        return store, result, elapsed_ms, len(queries)
+
+    def _compare(self, execution: ActedRuleExecution,
+                 records: List[Dict[str, Any]]) -> Optional[ReplayMismatch]:
+        replayed = next(
+            (record for record in records if record['rule_code'] == execution.rule_code),
+            None,
+        )
+        if replayed is None:
+            return ReplayMismatch(
+                execution.execution_seq_no, execution.entry_point, execution.rule_code,
+                'rule did not match on replay',
+            )
+        if replayed['outcome'] != execution.outcome:
+            return ReplayMismatch(
+                execution.execution_seq_no, execution.entry_point, execution.rule_code,
+                'outcome changed', execution.outcome, replayed['outcome'],
+            )
+        expected = normalize_result(execution.actions_result or [])
+        actual = normalize_result(replayed['actions_result'])
+        if expected != actual:
+            return ReplayMismatch(
+                execution.execution_seq_no, execution.entry_point, execution.rule_code,
+                'actions_result changed', expected, actual,
+            )
+        return None
+
+
+def build_report(stats: Dict[str, EntryPointStats]) -> Dict[str, Any]:
+    """JSON-serialisable summary of a replay run."""
+    return {
+        'entry_points': {
+            entry_point: entry_stats.as_dict()
+            for entry_point, entry_stats in sorted(stats.items())
+        },
+        'mismatches': [
+            mismatch.as_dict()
+            for entry_stats in stats.values()
+            for mismatch in entry_stats.mismatches
+        ],
+    }
+
+
+def check_regressions(report: Dict[str, Any], max_p95_ms: Optional[float] = None,
+                      max_queries: Optional[int] = None,
+                      baseline: Optional[Dict[str, Any]] = None,
+                      latency_tolerance: float = 0.25) -> List[str]:
+    """Return a description of every threshold ``report`` breaches.
+
+    Args:
+        report: Output of ``build_report``.
+        max_p95_ms: Absolute p95 latency limit per entry point.
+        max_queries: Absolute per-execution query limit.
+        baseline: A previous report. p95 may grow by ``latency_tolerance``
+            (a fraction) over it; the per-execution query maximum may not
+            grow at all, since query counts are deterministic.
+    """
+    failures = []
+    baseline_entries = (baseline or {}).get('entry_points', {})
+    for entry_point, current in report.get('entry_points', {}).items():
+        if max_p95_ms is not None and current['p95_ms'] > max_p95_ms:
+            failures.append(
+                f"{entry_point}: p95 {current['p95_ms']}ms exceeds limit {max_p95_ms}ms"
+            )
+        if max_queries is not None and current['max_queries'] > max_queries:
+            failures.append(
+                f"{entry_point}: {current['max_queries']} queries per execution exceeds limit {max_queries}"
+            )
+
+        previous = baseline_entries.get(entry_point)
+        if not previous:
+            continue
+        allowed_p95 = previous['p95_ms'] * (1 + latency_tolerance)
+        if current['p95_ms'] > allowed_p95:
+            failures.append(
+                f"{entry_point}: p95 {current['p95_ms']}ms regressed from baseline "
+                f"{previous['p95_ms']}ms (allowed {allowed_p95:.3f}ms)"
+            )
+        if current['max_queries'] > previous['max_queries']:
+            failures.append(
+                f"{entry_point}: queries per execution regressed from baseline "
+                f"{previous['max_queries']} to {current['max_queries']}"
+            )
+    return failures
@@ -10,10 +10,9 @@ from datetime import datetime
 
 from django.core.cache import cache
 from django.utils import timezone
-import jsonschema
 
 from ..models import ActedRule, ActedRulesFields, ActedRuleExecution
-from .template_processor import TemplateProcessor
+from .template_store import template_store
 
 logger = logging.getLogger(__name__)
 
@@ -66,9 +65,20 @@ class Validator:
     
     def __init__(self):
         self._schema_cache = {}
+
+    def preload_schemas(self) -> int:
+        """Load every active schema into the per-process cache (warm-up)."""
+        schemas = dict(
+            ActedRulesFields.objects.filter(is_active=True).values_list('fields_code', 'schema')
+        )
+        self._schema_cache.update(schemas)
+        return len(schemas)
     
     def validate_context(self, context: Dict[str, Any], rules_fields_code: Optional[str] = None) -> ValidationResult:
         """Validate context against schema and return detailed result"""
+        # Imported on first validation, not when the URLconf loads this module.
+        import jsonschema
+
         if not isinstance(context, dict):
             error_msg = f"Context is not a dict: {type(context)}"
             logger.warning(error_msg)
@@ -116,8 +126,13 @@ class Validator:
 class ConditionEvaluator:
     """JSONLogic condition evaluation"""
     
-    def evaluate(self, condition: Dict[str, Any], context: Dict[str, Any]) -> bool:
-        """Evaluate JSONLogic condition against context"""
+    def evaluate(self, condition: Dict[str, Any], context: Dict[str, Any],
+                 var_cache: Optional[Dict[str, Any]] = None) -> bool:
+        """Evaluate JSONLogic condition against context
+
+        ``var_cache`` memoizes top-level ``var`` lookups across conditions
+        evaluated against the same, unmodified context.
+        """
         try:
             # Handle the special "always" condition for testing
             if condition == {"always": True}:
@@ -141,12 +156,12 @@ class ConditionEvaluator:
                 elif condition_type == "jsonlogic":
                     # Extract the actual JSONLogic expression from the "expr" field
                     actual_condition = condition.get("expr", condition)
-                    result = self._evaluate_jsonlogic(actual_condition, context)
+                    result = self._evaluate_jsonlogic(actual_condition, context, var_cache)
                     logger.debug(f" JSONLogic (type-wrapped) condition evaluated to: {result}")
                     return bool(result)
 
             # Use custom JSONLogic implementation
-            result = self._evaluate_jsonlogic(condition, context)
+            result = self._evaluate_jsonlogic(condition, context, var_cache)
 
             # Ensure we return a boolean
             if isinstance(result, bool):
@@ -163,7 +178,8 @@ class ConditionEvaluator:
             logger.debug(f"Context was: {context}")
             return False
     
-    def _evaluate_jsonlogic(self, logic: Any, data: Dict[str, Any]) -> Any:
+    def _evaluate_jsonlogic(self, logic: Any, data: Dict[str, Any],
+                            var_cache: Optional[Dict[str, Any]] = None) -> Any:
         """Basic JSONLogic implementation"""
         if not isinstance(logic, dict):
             return logic
@@ -173,34 +189,40 @@ class ConditionEvaluator:
                 # Variable access: {"var": "path.to.value"}
                 if operands is None:
                     return data
-                return self._get_nested_value(data, str(operands))
+                path = str(operands)
+                if var_cache is None:
+                    return self._get_nested_value(data, path)
+                if path not in var_cache:
+                    var_cache[path] = self._get_nested_value(data, path)
+                return var_cache[path]
             
             elif operator == "==":
                 # Equality: {"==": [left, right]}
-                left = self._evaluate_jsonlogic(operands[0], data)
-                right = self._evaluate_jsonlogic(operands[1], data)
+                left = self._evaluate_jsonlogic(operands[0], data, var_cache)
+                right = self._evaluate_jsonlogic(operands[1], data, var_cache)
                 return left == right
             
             elif operator == "!=":
                 # Inequality: {"!=": [left, right]}
-                left = self._evaluate_jsonlogic(operands[0], data)
-                right = self._evaluate_jsonlogic(operands[1], data)
+                left = self._evaluate_jsonlogic(operands[0], data, var_cache)
+                right = self._evaluate_jsonlogic(operands[1], data, var_cache)
                 return left != right
             
             elif operator == "in":
                 # Contains: {"in": [needle, haystack]}
-                needle = self._evaluate_jsonlogic(operands[0], data)
-                haystack = self._evaluate_jsonlogic(operands[1], data)
+                needle = self._evaluate_jsonlogic(operands[0], data, var_cache)
+                haystack = self._evaluate_jsonlogic(operands[1], data, var_cache)
                 return needle in haystack if haystack else False
             
             elif operator == "some":
                 # Array some: {"some": [array, condition]}
-                array = self._evaluate_jsonlogic(operands[0], data)
+                array = self._evaluate_jsonlogic(operands[0], data, var_cache)
                 condition = operands[1]
                 if not isinstance(array, list):
                     return False
                 for item in array:
-                    # Create new data context with current item
+                    # Create new data context with current item; item-scoped
+                    # lookups must not share the outer var cache
                     item_data = {**data}
                     if isinstance(item, dict):
                         item_data.update(item)
@@ -211,43 +233,43 @@ class ConditionEvaluator:
             elif operator == "and":
                 # Logical AND: {"and": [condition1, condition2, ...]}
                 for condition in operands:
-                    if not self._evaluate_jsonlogic(condition, data):
+                    if not self._evaluate_jsonlogic(condition, data, var_cache):
                         return False
                 return True
             
             elif operator == "or":
                 # Logical OR: {"or": [condition1, condition2, ...]}
                 for condition in operands:
-                    if self._evaluate_jsonlogic(condition, data):
+                    if self._evaluate_jsonlogic(condition, data, var_cache):
                         return True
                 return False
             
             elif operator == "!":
                 # Logical NOT: {"!": condition}
-                return not self._evaluate_jsonlogic(operands[0], data)
+                return not self._evaluate_jsonlogic(operands[0], data, var_cache)
             
             elif operator == ">=":
                 # Greater than or equal: {">=": [left, right]}
-                left = self._evaluate_jsonlogic(operands[0], data)
-                right = self._evaluate_jsonlogic(operands[1], data)
+                left = self._evaluate_jsonlogic(operands[0], data, var_cache)
+                right = self._evaluate_jsonlogic(operands[1], data, var_cache)
                 return self._compare_values(left, right, ">=")
             
             elif operator == ">":
                 # Greater than: {">":[left, right]}
-                left = self._evaluate_jsonlogic(operands[0], data)
-                right = self._evaluate_jsonlogic(operands[1], data)
+                left = self._evaluate_jsonlogic(operands[0], data, var_cache)
+                right = self._evaluate_jsonlogic(operands[1], data, var_cache)
                 return self._compare_values(left, right, ">")
             
             elif operator == "<":
                 # Less than: {"<": [left, right]}
-                left = self._evaluate_jsonlogic(operands[0], data)
-                right = self._evaluate_jsonlogic(operands[1], data)
+                left = self._evaluate_jsonlogic(operands[0], data, var_cache)
+                right = self._evaluate_jsonlogic(operands[1], data, var_cache)
                 return self._compare_values(left, right, "<")
             
             elif operator == "<=":
                 # Less than or equal: {"<=": [left, right]}
-                left = self._evaluate_jsonlogic(operands[0], data)
-                right = self._evaluate_jsonlogic(operands[1], data)
+                left = self._evaluate_jsonlogic(operands[0], data, var_cache)
+                right = self._evaluate_jsonlogic(operands[1], data, var_cache)
                 return self._compare_values(left, right, "<=")
             
             else:
@@ -370,26 +392,19 @@ class ActionDispatcher:
             
             if template_id:
                 try:
-                    from ..models import MessageTemplate
-                    template = MessageTemplate.objects.get(id=template_id, is_active=True)
-                    title = template.title or template.name
-                    content = template.content
-                    
-                    # Use JSON content if available
-                    if template.json_content and isinstance(template.json_content, dict):
-                        json_content = template.json_content
-                        if 'content' in json_content and isinstance(json_content['content'], dict):
-                            title = json_content['content'].get('title', title)
-                            content = json_content['content'].get('message', content)
+                    template = template_store.get(template_id, active_only=True)
+                    if template is None:
+                        raise LookupError(f"MessageTemplate {template_id} not found or inactive")
+                    title = template.display_title
+                    content = template.display_content
 
                     # Get dismissible setting from template
                     dismissible = template.dismissible
 
-                    # Process template variables using generic template processor
+                    # Process template variables against the pre-parsed placeholders
                     context_mapping = action.get('context_mapping', {})
-                    processor = TemplateProcessor()
-                    content, title = processor.process_variables(content, title, context_mapping, context)
-                        
+                    content, title = template.render_display(context_mapping, context)
+
                 except Exception as e:
                     logger.warning(f"Could not fetch template {template_id}: {e}")
             
@@ -418,13 +433,11 @@ class ActionDispatcher:
 
             template_id = action.get("templateId")
             if template_id:
-                try:
-                    from rules_engine.models import MessageTemplate
-                    template = MessageTemplate.objects.get(id=template_id)
-
+                template = template_store.get(template_id)
+                if template is not None:
                     if template.content_format == 'json' and template.json_content:
                         # Use JSON content for rich display
-                        template_content = template.json_content
+                        template_content = template.copy_json_content()
                         # Extract title from JSON content if available
                         if isinstance(template_content, dict) and 'content' in template_content:
                             inner_content = template_content['content']
@@ -434,8 +447,7 @@ class ActionDispatcher:
                         # Use plain text content
                         template_content = template.content
                         template_title = template.title or template_title
-
-                except MessageTemplate.DoesNotExist:
+                else:
                     logger.warning(f"Template {template_id} not found, using fallback content")
 
             return {
@@ -465,12 +477,10 @@ class ActionDispatcher:
 
             template_id = action.get("messageTemplateId")
             if template_id:
-                try:
-                    from rules_engine.models import MessageTemplate
-                    template = MessageTemplate.objects.get(id=template_id)
-
+                template = template_store.get(template_id)
+                if template is not None:
                     if template.content_format == 'json' and template.json_content:
-                        template_content = template.json_content
+                        template_content = template.copy_json_content()
                         if isinstance(template_content, dict) and 'content' in template_content:
                             inner_content = template_content['content']
                             if isinstance(inner_content, dict) and 'title' in inner_content:
@@ -478,8 +488,7 @@ class ActionDispatcher:
                     else:
                         template_content = template.content
                         template_title = template.title or template_title
-
-                except MessageTemplate.DoesNotExist:
+                else:
                     logger.warning(f"Template {template_id} not found, using fallback content")
 
             # Format the preference for response
@@ -677,18 +686,45 @@ class ExecutionStore:
             return execution_seq_no
 
 
+class _RuleOutcome:
+    """Accumulates one entry point's results during execution"""
+
+    def __init__(self):
+        self.messages = []
+        self.blocked = False
+        self.rules_evaluated = 0
+        self.blocking_rules = []
+        self.required_acknowledgments = []
+        self.satisfied_acknowledgments = []
+        self.rules_executed = []
+        self.preference_prompts = []
+        self.context_updates = {}
+        self.schema_validation_errors = []
+        self.updates = {}
+
+
+class _EvaluationMemo:
+    """Schema validation results and var lookups for an unchanged context"""
+
+    def __init__(self):
+        self.validations: Dict[Optional[str], ValidationResult] = {}
+        self.vars: Dict[str, Any] = {}
+
+    def invalidate(self) -> None:
+        self.validations.clear()
+        self.vars.clear()
+
+
 class RuleEngine:
     
     def _get_template_content(self, template_name):
         """Get template content for acknowledgment"""
         if not template_name:
             return {}
-        try:
-            from ..models.message_template import MessageTemplate
-            template = MessageTemplate.objects.get(name=template_name, is_active=True)
-            return template.json_content or {}
-        except MessageTemplate.DoesNotExist:
+        template = template_store.get_by_name(template_name, active_only=True)
+        if template is None:
             return {}
+        return template.copy_json_content() or {}
     """Main Rules Engine orchestrator"""
     
     def __init__(self):
@@ -721,212 +757,283 @@ class RuleEngine:
                 }
             
             # Execute rules
-            all_messages = []
-            blocked = False
-            rules_evaluated = 0
-            blocking_rules = []
-            required_acknowledgments = []
-            satisfied_acknowledgments = []
-            rules_executed_list = []
-            preference_prompts = []
-            context_updates = {}
-            schema_validation_errors = []
-            update_results = {}
+            outcome = _RuleOutcome()
+            memo = _EvaluationMemo()
+            with template_store.pinned():
+                for rule in rules:
+                    if self._run_rule(rule, entry_point, context, outcome, memo):
+                        break
+
+            total_time_ms = (time.time() - start_time) * 1000
+            return self._build_result(entry_point, outcome, context, total_time_ms)
             
-            for rule in rules:
-                try:
-                    rule_start = time.time()
-                    
-                    # Validate context
-                    validation_result = self.validator.validate_context(context, rule.rules_fields_code)
-                    if not validation_result.is_valid:
-                        logger.warning(f"Context validation failed for rule {rule.rule_code}")
-                        # Collect schema validation errors
-                        for error in validation_result.errors:
-                            schema_validation_errors.append({
-                                'rule_id': rule.rule_code,
-                                'rule_name': rule.name,
-                                'entry_point': entry_point,
-                                'error': error
-                            })
+        except Exception as e:
+            total_time_ms = (time.time() - start_time) * 1000
+            logger.error(f" Rules Engine: Fatal error in '{entry_point}': {e}")
+            return self._fatal_result(entry_point, e, total_time_ms)
+
+    def execute_many(self, entry_points: List[str], context: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Execute several entry points against one shared context.
+
+        The active rules of every entry point are merged into a single pass
+        ordered like RuleRepository (priority, then created_at, both
+        descending). Each distinct rules_fields_code schema is validated
+        once and ``var`` lookups are shared across all conditions; both
+        memos are dropped whenever an update action changes the context.
+        ``stop_processing`` only skips the remaining rules of its own entry
+        point.
+
+        Returns a dict mapping each entry point to a result shaped like
+        ``execute``'s.
+        """
+        start_time = time.time()
+        entry_points = list(dict.fromkeys(entry_points))
+
+        try:
+            context_issues = self._validate_context_structure(context)
+            if context_issues:
+                logger.warning(f"Context structure issues detected: {context_issues}")
+
+            scheduled = []
+            for entry_point in entry_points:
+                scheduled.extend(
+                    (entry_point, rule)
+                    for rule in self.rule_repository.get_active_rules(entry_point)
+                )
+            scheduled.sort(key=lambda item: self._rule_order_key(item[1]))
+
+            outcomes = {entry_point: _RuleOutcome() for entry_point in entry_points}
+            memo = _EvaluationMemo()
+            stopped = set()
+            with template_store.pinned():
+                for entry_point, rule in scheduled:
+                    if entry_point in stopped:
                         continue
+                    if self._run_rule(rule, entry_point, context, outcomes[entry_point], memo):
+                        stopped.add(entry_point)
+
+            total_time_ms = (time.time() - start_time) * 1000
+            return {
+                entry_point: self._build_result(entry_point, outcomes[entry_point], context, total_time_ms)
+                for entry_point in entry_points
+            }
+
+        except Exception as e:
+            total_time_ms = (time.time() - start_time) * 1000
+            logger.error(f" Rules Engine: Fatal error in {entry_points}: {e}")
+            return {
+                entry_point: self._fatal_result(entry_point, e, total_time_ms)
+                for entry_point in entry_points
+            }
+
+    @staticmethod
+    def _rule_order_key(rule) -> tuple:
+        """Sort key matching RuleRepository's ('-priority', '-created_at')."""
+        created = rule.created_at.timestamp() if rule.created_at else 0
+        return (-rule.priority, -created)
+
+    def _run_rule(self, rule, entry_point: str, context: Dict[str, Any],
+                  outcome: '_RuleOutcome', memo: '_EvaluationMemo') -> bool:
+        """Validate, evaluate and dispatch one rule, recording into ``outcome``.
+
+        Returns True when the rule matched and asked to stop processing.
+        """
+        rule_start = time.time()
+        try:
+            # Validate context
+            validation_result = memo.validations.get(rule.rules_fields_code)
+            if validation_result is None:
+                validation_result = self.validator.validate_context(context, rule.rules_fields_code)
+                memo.validations[rule.rules_fields_code] = validation_result
+            if not validation_result.is_valid:
+                logger.warning(f"Context validation failed for rule {rule.rule_code}")
+                # Collect schema validation errors
+                for error in validation_result.errors:
+                    outcome.schema_validation_errors.append({
+                        'rule_id': rule.rule_code,
+                        'rule_name': rule.name,
+                        'entry_point': entry_point,
+                        'error': error
+                    })
+                return False
+            
+            # Evaluate condition
+            condition_result = self.condition_evaluator.evaluate(rule.condition, context, memo.vars)
+
+            # Count this rule as evaluated regardless of condition result
+            outcome.rules_evaluated += 1
+
+            if not condition_result:
+                logger.debug(f"  Rule '{rule.rule_code}' condition not matched")
+                
+                # Track non-matching rule
+                execution_time_ms = (time.time() - rule_start) * 1000
+                outcome.rules_executed.append({
+                    'rule_id': rule.rule_code,
+                    'priority': rule.priority,
+                    'condition_result': False,
+                    'actions_executed': 0,
+                    'stop_processing': rule.stop_processing,
+                    'execution_time_ms': execution_time_ms
+                })
+                return False
+
+            # Execute actions
+            actions_result = self.action_dispatcher.dispatch(rule.actions, context)
+            
+            # Check for blocking acknowledgments and preferences
+            for action, action_result in zip(rule.actions, actions_result):
+                if action.get('type') == 'user_acknowledge':
+                    ack_key = action.get('ackKey')
+                    required = action.get('required', True)
                     
-                    # Evaluate condition
-                    condition_result = self.condition_evaluator.evaluate(rule.condition, context)
-
-                    # Count this rule as evaluated regardless of condition result
-                    rules_evaluated += 1
-
-                    if condition_result:
-                        
-                        # Execute actions
-                        actions_result = self.action_dispatcher.dispatch(rule.actions, context)
-                        
-                        # Check for blocking acknowledgments and preferences
-                        for action, action_result in zip(rule.actions, actions_result):
-                            if action.get('type') == 'user_acknowledge':
-                                ack_key = action.get('ackKey')
-                                required = action.get('required', True)
-                                
-                                # Check if acknowledgment exists in context
-                                acknowledgments = context.get('acknowledgments', {})
-                                if ack_key in acknowledgments and acknowledgments[ack_key].get('acknowledged'):
-                                    satisfied_acknowledgments.append(ack_key)
-                                elif required:
-                                    blocked = True
-                                    blocking_rules.append(rule.rule_code)
-                                    required_acknowledgments.append({
-                                        'ackKey': ack_key,
-                                        'templateName': action.get('templateName'),
-                                        'ruleId': rule.rule_code,
-                                        'required': required
-                                    })
-                                else:  # not required - preference prompt
-                                    preference_prompts.append({
-                                        'ackKey': ack_key,
-                                        'templateName': action.get('templateName'),
-                                        'ruleId': rule.rule_code,
-                                        'required': False
-                                    })
-                            elif action.get('type') == 'user_preference':
-                                # Handle user preferences - collect for response
-                                if action_result.get('success') and 'preference' in action_result:
-                                    preference = action_result['preference']
-                                    preference['ruleId'] = rule.rule_code
-                                    preference_prompts.append(preference)
-                            elif action.get('type') == 'update':
-                                # Apply context updates for subsequent rules
-                                target = action.get('target')
-                                operation = action.get('operation')
-                                value = action.get('value')
-                                
-                                if target and operation == 'set':
-                                    self._set_nested_value(context, target, value)
-                                    context_updates[target] = value
-                                    logger.debug(f"Updated context: {target} = {value}")
-                                elif target and operation == 'increment':
-                                    current_value = self._get_nested_value(context, target) or 0
-                                    new_value = current_value + value
-                                    self._set_nested_value(context, target, new_value)
-                                    context_updates[target] = new_value
-                                    logger.debug(f"Incremented context: {target} from {current_value} to {new_value}")
-                        
-                        # Collect messages and updates
-                        for action_result in actions_result:
-                            if action_result.get("success") and "message" in action_result:
-                                all_messages.append(action_result["message"])
-
-                            # Collect update results (cart fees, etc.)
-                            if action_result.get("success") and action_result.get("type") == "update":
-                                if "updates" in action_result:
-                                    for update_key, update_value in action_result["updates"].items():
-                                        if update_key not in update_results:
-                                            update_results[update_key] = []
-                                        update_results[update_key].extend(update_value if isinstance(update_value, list) else [update_value])
-                        
-                        # Calculate execution time
-                        execution_time_ms = (time.time() - rule_start) * 1000
-                        
-                        # Track executed rule
-                        rules_executed_list.append({
-                            'rule_id': rule.rule_code,
-                            'priority': rule.priority,
-                            'condition_result': True,
-                            'actions_executed': len(actions_result),
-                            'stop_processing': rule.stop_processing,
-                            'execution_time_ms': execution_time_ms
+                    # Check if acknowledgment exists in context
+                    acknowledgments = context.get('acknowledgments', {})
+                    if ack_key in acknowledgments and acknowledgments[ack_key].get('acknowledged'):
+                        outcome.satisfied_acknowledgments.append(ack_key)
+                    elif required:
+                        outcome.blocked = True
+                        outcome.blocking_rules.append(rule.rule_code)
+                        outcome.required_acknowledgments.append({
+                            'ackKey': ack_key,
+                            'templateName': action.get('templateName'),
+                            'ruleId': rule.rule_code,
+                            'required': required
                         })
-                        
-                        # Store execution record
-                        self.execution_store.store_execution(
-                            rule.rule_code, entry_point, context, actions_result,
-                            "success", execution_time_ms
-                        )
-
-                        # Check if we should stop processing
-                        if rule.stop_processing:
-                            break
-                    else:
-                        logger.debug(f"  Rule '{rule.rule_code}' condition not matched")
-                        
-                        # Track non-matching rule
-                        execution_time_ms = (time.time() - rule_start) * 1000
-                        rules_executed_list.append({
-                            'rule_id': rule.rule_code,
-                            'priority': rule.priority,
-                            'condition_result': False,
-                            'actions_executed': 0,
-                            'stop_processing': rule.stop_processing,
-                            'execution_time_ms': execution_time_ms
+                    else:  # not required - preference prompt
+                        outcome.preference_prompts.append({
+                            'ackKey': ack_key,
+                            'templateName': action.get('templateName'),
+                            'ruleId': rule.rule_code,
+                            'required': False
                         })
-                
-                except Exception as e:
-                    logger.error(f" Error processing rule '{rule.rule_code}': {e}")
-                    # Store error execution record
-                    execution_time_ms = (time.time() - rule_start) * 1000
-                    self.execution_store.store_execution(
-                        rule.rule_code, entry_point, context, [],
-                        "error", execution_time_ms, str(e)
-                    )
+                elif action.get('type') == 'user_preference':
+                    # Handle user preferences - collect for response
+                    if action_result.get('success') and 'preference' in action_result:
+                        preference = action_result['preference']
+                        preference['ruleId'] = rule.rule_code
+                        outcome.preference_prompts.append(preference)
+                elif action.get('type') == 'update':
+                    # Apply context updates for subsequent rules
+                    target = action.get('target')
+                    operation = action.get('operation')
+                    value = action.get('value')
+                    
+                    if target and operation == 'set':
+                        self._set_nested_value(context, target, value)
+                        outcome.context_updates[target] = value
+                        memo.invalidate()
+                        logger.debug(f"Updated context: {target} = {value}")
+                    elif target and operation == 'increment':
+                        current_value = self._get_nested_value(context, target) or 0
+                        new_value = current_value + value
+                        self._set_nested_value(context, target, new_value)
+                        outcome.context_updates[target] = new_value
+                        memo.invalidate()
+                        logger.debug(f"Incremented context: {target} from {current_value} to {new_value}")
             
-            total_time_ms = (time.time() - start_time) * 1000
+            # Collect messages and updates
+            for action_result in actions_result:
+                if action_result.get("success") and "message" in action_result:
+                    outcome.messages.append(action_result["message"])
+
+                # Collect update results (cart fees, etc.)
+                if action_result.get("success") and action_result.get("type") == "update":
+                    if "updates" in action_result:
+                        for update_key, update_value in action_result["updates"].items():
+                            if update_key not in outcome.updates:
+                                outcome.updates[update_key] = []
+                            outcome.updates[update_key].extend(update_value if isinstance(update_value, list) else [update_value])
             
-            # Check if we have schema validation errors that should be returned as errors
-            if schema_validation_errors:
-                # Return error response for schema validation failures
-                logger.error(f"Schema validation errors for entry point '{entry_point}': {len(schema_validation_errors)} errors")
-                return {
-                    "success": False,
-                    "blocked": True,
-                    "messages": [],
-                    "rules_evaluated": 0,
-                    "execution_time_ms": total_time_ms,
-                    "entry_point": entry_point,
-                    "schema_validation_errors": schema_validation_errors,
-                    "error": "Context schema validation failed",
-                    "details": f"Schema validation failed for {len(schema_validation_errors)} rule(s)"
-                }
+            # Calculate execution time
+            execution_time_ms = (time.time() - rule_start) * 1000
             
-            result = {
-                "success": True,
-                "blocked": blocked,
-                "messages": all_messages,
-                "rules_evaluated": rules_evaluated,
-                "execution_time_ms": total_time_ms,
-                "entry_point": entry_point,
-                "blocking_rules": blocking_rules,
-                "required_acknowledgments": required_acknowledgments,
-                "satisfied_acknowledgments": satisfied_acknowledgments,
-                "actions_completed": [],
-                "proceed": not blocked,
-                "rules_executed": rules_executed_list,
-                "preference_prompts": preference_prompts,
-                "preferences": preference_prompts,  # Also add as "preferences" for consistency
-                "context_updates": context_updates,
-                "updates": update_results,
-            }
-
-            # Merge the modified context into the result
-            # This allows tests and callers to access enriched context fields
-            result.update(context)
-
-            if blocked:
-                result['error'] = 'Required acknowledgments not provided'
-
-            return result
+            # Track executed rule
+            outcome.rules_executed.append({
+                'rule_id': rule.rule_code,
+                'priority': rule.priority,
+                'condition_result': True,
+                'actions_executed': len(actions_result),
+                'stop_processing': rule.stop_processing,
+                'execution_time_ms': execution_time_ms
+            })
             
+            # Store execution record
+            self.execution_store.store_execution(
+                rule.rule_code, entry_point, context, actions_result,
+                "success", execution_time_ms
+            )
+
+            # Check if we should stop processing
+            return bool(rule.stop_processing)
+        
         except Exception as e:
-            total_time_ms = (time.time() - start_time) * 1000
-            logger.error(f" Rules Engine: Fatal error in '{entry_point}': {e}")
+            logger.error(f" Error processing rule '{rule.rule_code}': {e}")
+            # Store error execution record
+            execution_time_ms = (time.time() - rule_start) * 1000
+            self.execution_store.store_execution(
+                rule.rule_code, entry_point, context, [],
+                "error", execution_time_ms, str(e)
+            )
+            return False
+
+    def _build_result(self, entry_point: str, outcome: '_RuleOutcome',
+                      context: Dict[str, Any], total_time_ms: float) -> Dict[str, Any]:
+        """Shape an entry point's outcome into the execute() response."""
+        # Check if we have schema validation errors that should be returned as errors
+        if outcome.schema_validation_errors:
+            # Return error response for schema validation failures
+            logger.error(f"Schema validation errors for entry point '{entry_point}': {len(outcome.schema_validation_errors)} errors")
             return {
                 "success": False,
-                "blocked": False,
+                "blocked": True,
                 "messages": [],
                 "rules_evaluated": 0,
                 "execution_time_ms": total_time_ms,
-                "error": str(e),
-                "entry_point": entry_point
+                "entry_point": entry_point,
+                "schema_validation_errors": outcome.schema_validation_errors,
+                "error": "Context schema validation failed",
+                "details": f"Schema validation failed for {len(outcome.schema_validation_errors)} rule(s)"
             }
+        
+        result = {
+            "success": True,
+            "blocked": outcome.blocked,
+            "messages": outcome.messages,
+            "rules_evaluated": outcome.rules_evaluated,
+            "execution_time_ms": total_time_ms,
+            "entry_point": entry_point,
+            "blocking_rules": outcome.blocking_rules,
+            "required_acknowledgments": outcome.required_acknowledgments,
+            "satisfied_acknowledgments": outcome.satisfied_acknowledgments,
+            "actions_completed": [],
+            "proceed": not outcome.blocked,
+            "rules_executed": outcome.rules_executed,
+            "preference_prompts": outcome.preference_prompts,
+            "preferences": outcome.preference_prompts,  # Also add as "preferences" for consistency
+            "context_updates": outcome.context_updates,
+            "updates": outcome.updates,
+        }
+
+        # Merge the modified context into the result
+        # This allows tests and callers to access enriched context fields
+        result.update(context)
+
+        if outcome.blocked:
+            result['error'] = 'Required acknowledgments not provided'
+
+        return result
+
+    def _fatal_result(self, entry_point: str, error: Exception, total_time_ms: float) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "blocked": False,
+            "messages": [],
+            "rules_evaluated": 0,
+            "execution_time_ms": total_time_ms,
+            "error": str(error),
+            "entry_point": entry_point
+        }
     
     def _set_nested_value(self, data: Dict[str, Any], path: str, value: Any) -> None:
         """Set nested value in dictionary using dot notation"""
@@ -11,6 +11,34 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 
+PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
+
+class Placeholder(str):
+    """A ``{{name}}`` segment of a parsed template string (the str value is the name)."""
+    __slots__ = ()
+
+
+def parse_placeholders(text: Optional[str]) -> Optional[tuple]:
+    """Split ``text`` into literal strings and :class:`Placeholder` segments.
+
+    Returns None for non-string input so callers can pass content through
+    unchanged. The result is immutable and safe to cache.
+    """
+    if not isinstance(text, str):
+        return None
+    segments = []
+    pos = 0
+    for match in PLACEHOLDER_RE.finditer(text):
+        if match.start() > pos:
+            segments.append(text[pos:match.start()])
+        segments.append(Placeholder(match.group(1)))
+        pos = match.end()
+    if pos < len(text):
+        segments.append(text[pos:])
+    return tuple(segments)
+
+
 class TemplateProcessor:
     """Processes template variables with multiple resolution strategies"""
 
@@ -37,28 +65,48 @@ class TemplateProcessor:
         Returns:
             tuple: (processed_content, processed_title)
         """
-        processed_content = content
-        processed_title = title
-
-        # Find all variables in content and title
-        variables = set()
-        variables.update(re.findall(r'\{\{(\w+)\}\}', content or ''))
-        variables.update(re.findall(r'\{\{(\w+)\}\}', title or ''))
-
-        # Resolve each variable
-        for var_name in variables:
-            try:
-                value = self._resolve_variable(var_name, context_mapping, context)
-                if value is not None:
-                    placeholder = f"{{{{{var_name}}}}}"
-                    processed_content = processed_content.replace(placeholder, str(value))
-                    if processed_title:
-                        processed_title = processed_title.replace(placeholder, str(value))
-            except Exception as e:
-                logger.warning(f"Error resolving variable '{var_name}': {e}")
-                # Leave placeholder as-is if resolution fails
-
-        return processed_content, processed_title
+        return self.render_parsed(
+            parse_placeholders(content), parse_placeholders(title),
+            content, title, context_mapping, context,
+        )
+
+    def render_parsed(self, parsed_content: Optional[tuple], parsed_title: Optional[tuple],
+                      content: Any, title: Any, context_mapping: Dict[str, Any],
+                      context: Dict[str, Any]) -> tuple:
+        """
+        Render pre-parsed content and title (see parse_placeholders).
+
+        Each distinct variable is resolved once. Variables that resolve to
+        None or fail to resolve are left as their ``{{variable}}`` text.
+        Unparsed (None) segments return the original value unchanged.
+
+        Returns:
+            tuple: (processed_content, processed_title)
+        """
+        values = {}
+        for segments in (parsed_content, parsed_title):
+            for segment in segments or ():
+                if isinstance(segment, Placeholder) and segment not in values:
+                    try:
+                        values[segment] = self._resolve_variable(segment, context_mapping, context)
+                    except Exception as e:
+                        logger.warning(f"Error resolving variable '{segment}': {e}")
+                        # Leave placeholder as-is if resolution fails
+                        values[segment] = None
+
+        def render(segments, original):
+            if segments is None:
+                return original
+            parts = []
+            for segment in segments:
+                if isinstance(segment, Placeholder):
+                    value = values[segment]
+                    parts.append(f"{{{{{segment}}}}}" if value is None else str(value))
+                else:
+                    parts.append(segment)
+            return ''.join(parts)
+
+        return render(parsed_content, content), render(parsed_title, title)
 
     def _resolve_variable(self, var_name: str, context_mapping: Dict[str, Any], context: Dict[str, Any]) -> Optional[Any]:
         """
@@ -0,0 +1,196 @@
+"""
+Per-process, versioned store of MessageTemplate rows.
+
+Rule actions (display_message, user_acknowledge, user_preference) and
+RuleEngine._get_template_content look templates up on every execution.
+The store loads every MessageTemplate once, keyed by id and by name, with
+the ``{{variable}}`` placeholders of the display title/content already
+parsed, so a lookup costs no query and no regex scan.
+
+Invalidation: rules_engine.signals bumps a version token in the Django
+cache when a MessageTemplate save/delete commits. Each lookup compares the token
+with the one the store was loaded under and reloads on mismatch, so all
+processes sharing the cache pick up edits on their next lookup.
+RuleEngine runs inside ``template_store.pinned()``, which checks the
+token on the first lookup only, so an engine run costs at most one
+cache read however many templates its actions use.
+Queryset ``update()`` bypasses signals; call ``bump_template_version()``
+after bulk edits.
+"""
+import copy
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from django.core.cache import cache
+
+from .template_processor import TemplateProcessor, parse_placeholders
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_VERSION_CACHE_KEY = "rules:message_templates:version"
+
+
+def bump_template_version() -> str:
+    """Invalidate every process's template store."""
+    token = uuid.uuid4().hex
+    cache.set(TEMPLATE_VERSION_CACHE_KEY, token, timeout=None)
+    logger.debug(f"Bumped message template version to {token}")
+    return token
+
+
+def _current_version() -> str:
+    token = cache.get(TEMPLATE_VERSION_CACHE_KEY)
+    if token is None:
+        # First use (or evicted): publish a token so processes agree on it.
+        cache.add(TEMPLATE_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        token = cache.get(TEMPLATE_VERSION_CACHE_KEY)
+    return token
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Immutable snapshot of a MessageTemplate plus parsed placeholders.
+
+    ``display_title`` / ``display_content`` are what display_message
+    renders: the template title/content, overridden by
+    ``json_content['content']['title'|'message']`` when present.
+    """
+    id: int
+    name: str
+    title: str
+    content: str
+    content_format: str
+    json_content: Any
+    dismissible: bool
+    is_active: bool
+    display_title: Any
+    display_content: Any
+    parsed_display_title: Optional[tuple]
+    parsed_display_content: Optional[tuple]
+
+    @classmethod
+    def from_model(cls, template) -> 'CompiledTemplate':
+        display_title = template.title or template.name
+        display_content = template.content
+        json_content = template.json_content
+        if isinstance(json_content, dict) and isinstance(json_content.get('content'), dict):
+            display_title = json_content['content'].get('title', display_title)
+            display_content = json_content['content'].get('message', display_content)
+        return cls(
+            id=template.id,
+            name=template.name,
+            title=template.title,
+            content=template.content,
+            content_format=template.content_format,
+            json_content=json_content,
+            dismissible=template.dismissible,
+            is_active=template.is_active,
+            display_title=display_title,
+            display_content=display_content,
+            parsed_display_title=parse_placeholders(display_title),
+            parsed_display_content=parse_placeholders(display_content),
+        )
+
+    def copy_json_content(self) -> Any:
+        """Return a private copy of ``json_content``.
+
+        Snapshots are shared across requests, so callers that hand the
+        structure to a response (which may be mutated) must copy it.
+        """
+        return copy.deepcopy(self.json_content)
+
+    def render_display(self, context_mapping: Dict[str, Any], context: Dict[str, Any]) -> tuple:
+        """Return ``(content, title)`` with placeholders resolved."""
+        return template_processor.render_parsed(
+            self.parsed_display_content, self.parsed_display_title,
+            copy.deepcopy(self.display_content), copy.deepcopy(self.display_title),
+            context_mapping, context,
+        )
+
+
+class TemplateStore:
+    """Lazily loaded, version-checked MessageTemplate lookup."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._by_id: Dict[int, CompiledTemplate] = {}
+        self._by_name: Dict[str, CompiledTemplate] = {}
+        self._pin = threading.local()
+
+    @contextmanager
+    def pinned(self):
+        """Check the version at most once for lookups made in this block.
+
+        Nested blocks share the outer block's check. The pin is per
+        thread; edits committed meanwhile are seen on the next block.
+        """
+        depth = getattr(self._pin, 'depth', 0)
+        self._pin.depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._pin.depth = depth
+            if not depth:
+                self._pin.checked = False
+
+    def get(self, template_id, active_only: bool = False) -> Optional[CompiledTemplate]:
+        """Return the template with ``template_id`` or None."""
+        self._ensure_fresh()
+        try:
+            template = self._by_id.get(int(template_id))
+        except (TypeError, ValueError):
+            return None
+        if template is None or (active_only and not template.is_active):
+            return None
+        return template
+
+    def get_by_name(self, name: str, active_only: bool = False) -> Optional[CompiledTemplate]:
+        """Return the template called ``name`` or None."""
+        self._ensure_fresh()
+        template = self._by_name.get(name)
+        if template is None or (active_only and not template.is_active):
+            return None
+        return template
+
+    def clear(self) -> None:
+        """Drop this process's copy; the next lookup reloads."""
+        with self._lock:
+            self._version = None
+            self._by_id = {}
+            self._by_name = {}
+        self._pin.checked = False
+
+    def _ensure_fresh(self) -> None:
+        if getattr(self._pin, 'checked', False):
+            return
+        version = _current_version()
+        if version != self._version:
+            self._load(version)
+        if getattr(self._pin, 'depth', 0):
+            self._pin.checked = True
+
+    def _load(self, version: str) -> None:
+        with self._lock:
+            if version == self._version:
+                return
+            from ..models import MessageTemplate
+
+            by_id = {}
+            by_name = {}
+            for row in MessageTemplate.objects.all():
+                compiled = CompiledTemplate.from_model(row)
+                by_id[compiled.id] = compiled
+                by_name[compiled.name] = compiled
+            # Swap both maps before publishing the version so readers
+            # never see a half-built store.
+            self._by_id, self._by_name = by_id, by_name
+            self._version = version
+            logger.debug(f"Loaded {len(by_id)} message templates (version {version})")
+
+template_processor = TemplateProcessor()
+template_store = TemplateStore()
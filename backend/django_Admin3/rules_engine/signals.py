@@ -3,8 +3,12 @@ Django signals for rules engine cache invalidation.
 
 When ActedRule models are created, updated, or deleted, the corresponding
 cache entry is invalidated to ensure rule changes are immediately reflected.
+MessageTemplate changes bump the template store version (see
+rules_engine.services.template_store) once the writing transaction
+commits, so no process reloads the store from uncommitted rows.
 """
 import logging
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.cache import cache
@@ -55,3 +59,20 @@ def invalidate_cache_on_rule_delete(sender, instance, **kwargs):
     """
     logger.debug(f"Rule {instance.rule_code} deleted, invalidating cache for {instance.entry_point}")
     invalidate_rule_cache(instance.entry_point)
+
+
+@receiver(post_save, sender='rules_engine.MessageTemplate')
+@receiver(post_delete, sender='rules_engine.MessageTemplate')
+def invalidate_template_store(sender, instance, **kwargs):
+    """
+    Bump the message template version so every process reloads its store.
+
+    Args:
+        sender: The model class (MessageTemplate)
+        instance: The template being saved or deleted
+        **kwargs: Additional keyword arguments
+    """
+    from rules_engine.services.template_store import bump_template_version
+
+    logger.debug(f"Message template {instance.name} changed, bumping template version on commit")
+    transaction.on_commit(bump_template_version)
@@ -750,16 +750,18 @@ class TestValidateComprehensiveCheckoutSatisfied(BaseGapTestSetup):
     def test_comprehensive_checkout_satisfied_ack_path(self, mock_engine):
         """Should add satisfied ack to list when ack matches (line 999)."""
         # Mock the rule engine to return required_acknowledgments with ackKey
-        mock_engine.execute.return_value = {
-            'success': True,
-            'blocked': False,
-            'blocking_rules': [],
-            'required_acknowledgments': [
-                {
-                    'ackKey': 'gap_sat_ack_key',
-                    'required': True,
-                },
-            ],
+        mock_engine.execute_many.return_value = {
+            'checkout_terms': {
+                'success': True,
+                'blocked': False,
+                'blocking_rules': [],
+                'required_acknowledgments': [
+                    {
+                        'ackKey': 'gap_sat_ack_key',
+                        'required': True,
+                    },
+                ],
+            },
         }
 
         self.client.force_authenticate(user=self.user)
@@ -878,7 +878,7 @@ class TestValidateComprehensiveCheckout(BaseViewTestSetup):
     def test_comprehensive_checkout_error(self):
         """Should return 500 on unexpected error."""
         url = reverse('validate-comprehensive-checkout')
-        with patch('rules_engine.views.new_rule_engine.execute', side_effect=Exception('Fatal')):
+        with patch('rules_engine.views.new_rule_engine.execute_many', side_effect=Exception('Fatal')):
             data = {'context': {}}
             response = self.client.post(url, data, format='json')
             self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -170,9 +170,11 @@ class TestValidateComprehensiveCheckoutEndpoint(APITestCase):
     @patch('rules_engine.views.new_rule_engine')
     def test_validate_comprehensive_checkout(self, mock_engine):
         """POST /api/rules/validate-comprehensive-checkout/ validates checkout comprehensively."""
-        mock_engine.execute.return_value = {
-            'effects': [],
-            'executed_rules': [],
+        mock_engine.execute_many.return_value = {
+            'checkout_terms': {
+                'effects': [],
+                'executed_rules': [],
+            },
         }
         response = self.client.post(
             '/api/rules/validate-comprehensive-checkout/',
@@ -0,0 +1,174 @@
+"""
+Tests for RuleEngine.execute_many and the request-scoped context builder
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from rules_engine.models import ActedRule, ActedRulesFields
+from rules_engine.services.context_builder import RequestContextBuilder
+from rules_engine.services.rule_engine import RuleEngine
+from userprofile.models.address import UserProfileAddress
+
+User = get_user_model()
+
+
+class ExecuteManyTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ActedRulesFields.objects.create(
+            fields_code='many_schema',
+            name='Many Schema',
+            schema={'type': 'object'},
+            version=1,
+        )
+        self.engine = RuleEngine()
+
+    def tearDown(self):
+        cache.clear()
+
+    def _rule(self, code, entry_point, priority, condition=None, actions=None, **kwargs):
+        return ActedRule.objects.create(
+            rule_code=code,
+            name=code,
+            entry_point=entry_point,
+            rules_fields_code='many_schema',
+            condition=condition or {'==': [1, 1]},
+            actions=actions or [],
+            priority=priority,
+            active=True,
+            **kwargs,
+        )
+
+    def _ack(self, ack_key):
+        return [{'type': 'user_acknowledge', 'ackKey': ack_key, 'required': True}]
+
+    def test_results_match_per_entry_point_execute(self):
+        self._rule('many_terms', 'checkout_terms', 20, actions=self._ack('terms_ack'))
+        self._rule('many_payment', 'checkout_payment', 10, actions=self._ack('payment_ack'))
+
+        results = self.engine.execute_many(
+            ['checkout_terms', 'checkout_payment'], {'acknowledgments': {}},
+        )
+
+        self.assertEqual(set(results), {'checkout_terms', 'checkout_payment'})
+        self.assertEqual(results['checkout_terms']['blocking_rules'], ['many_terms'])
+        self.assertEqual(results['checkout_payment']['blocking_rules'], ['many_payment'])
+        single = self.engine.execute('checkout_terms', {'acknowledgments': {}})
+        self.assertEqual(
+            results['checkout_terms']['required_acknowledgments'],
+            single['required_acknowledgments'],
+        )
+
+    def test_schema_validated_once_per_fields_code(self):
+        self._rule('many_a', 'checkout_terms', 20)
+        self._rule('many_b', 'checkout_payment', 10)
+        self._rule('many_c', 'checkout_preference', 5)
+
+        with patch.object(
+            self.engine.validator, 'validate_context',
+            wraps=self.engine.validator.validate_context,
+        ) as validate:
+            self.engine.execute_many(
+                ['checkout_terms', 'checkout_payment', 'checkout_preference'], {},
+            )
+
+        self.assertEqual(validate.call_count, 1)
+
+    def test_rules_run_in_merged_priority_order(self):
+        self._rule('many_low', 'checkout_terms', 10)
+        self._rule('many_high', 'checkout_payment', 30)
+        self._rule('many_mid', 'checkout_terms', 20)
+
+        with patch.object(self.engine.execution_store, 'store_execution') as store:
+            self.engine.execute_many(['checkout_terms', 'checkout_payment'], {})
+
+        self.assertEqual(
+            [call.args[0] for call in store.call_args_list],
+            ['many_high', 'many_mid', 'many_low'],
+        )
+
+    def test_stop_processing_only_stops_its_entry_point(self):
+        self._rule('many_stop', 'checkout_terms', 30, stop_processing=True)
+        self._rule('many_skipped', 'checkout_terms', 20)
+        self._rule('many_other', 'checkout_payment', 10)
+
+        results = self.engine.execute_many(['checkout_terms', 'checkout_payment'], {})
+
+        self.assertEqual(
+            [r['rule_id'] for r in results['checkout_terms']['rules_executed']], ['many_stop'],
+        )
+        self.assertEqual(
+            [r['rule_id'] for r in results['checkout_payment']['rules_executed']], ['many_other'],
+        )
+
+    def test_update_action_invalidates_memoized_vars(self):
+        self._rule('many_reads_first', 'checkout_terms', 30, condition={'!': [{'var': 'flag'}]})
+        self._rule('many_sets', 'checkout_terms', 20, actions=[
+            {'type': 'update', 'target': 'flag', 'operation': 'set', 'value': True},
+        ])
+        self._rule(
+            'many_reads_after', 'checkout_payment', 10,
+            condition={'==': [{'var': 'flag'}, True]}, actions=self._ack('flag_ack'),
+        )
+
+        results = self.engine.execute_many(['checkout_terms', 'checkout_payment'], {})
+
+        self.assertEqual(results['checkout_payment']['blocking_rules'], ['many_reads_after'])
+
+    def test_schema_errors_reported_per_entry_point(self):
+        ActedRulesFields.objects.create(
+            fields_code='many_strict',
+            name='Many Strict',
+            schema={'type': 'object', 'required': ['must_have']},
+            version=1,
+        )
+        self._rule('many_ok', 'checkout_terms', 20)
+        ActedRule.objects.create(
+            rule_code='many_strict_rule', name='Strict', entry_point='checkout_payment',
+            rules_fields_code='many_strict', condition={'==': [1, 1]}, actions=[],
+            priority=10, active=True,
+        )
+
+        results = self.engine.execute_many(['checkout_terms', 'checkout_payment'], {})
+
+        self.assertTrue(results['checkout_terms']['success'])
+        self.assertFalse(results['checkout_payment']['success'])
+        self.assertIn('schema_validation_errors', results['checkout_payment'])
+
+
+class RequestContextBuilderTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='ctx_builder', email='ctx_builder@example.com', password='pw',
+        )
+        profile = self.user.userprofile
+        UserProfileAddress.objects.create(user_profile=profile, address_type='HOME', country='United Kingdom')
+        UserProfileAddress.objects.create(user_profile=profile, address_type='WORK', country='Ireland')
+        self.request = RequestFactory().post('/api/rules/engine/execute/', {}, REMOTE_ADDR='10.0.0.9')
+        self.request.user = self.user
+        self.request.session = SessionStore()
+        self.request.session['user_acknowledgments'] = [
+            {'ack_key': 'terms', 'acknowledged': True, 'entry_point_location': 'checkout_terms'},
+            {'ack_key': 'pending', 'acknowledged': False, 'entry_point_location': 'checkout_payment'},
+        ]
+
+    def test_user_context_loaded_once_per_request(self):
+        with self.assertNumQueries(1):
+            first = RequestContextBuilder.for_request(self.request).user_context()
+            second = RequestContextBuilder.for_request(self.request).user_context()
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(first['home_country'], 'United Kingdom')
+        self.assertEqual(first['work_country'], 'Ireland')
+        self.assertEqual(first['ip'], '10.0.0.9')
+
+    def test_acknowledgment_views(self):
+        builder = RequestContextBuilder.for_request(self.request)
+
+        self.assertEqual(set(builder.acknowledgments_for('checkout_payment')), {'pending'})
+        self.assertEqual(set(builder.accepted_acknowledgments()), {'terms'})
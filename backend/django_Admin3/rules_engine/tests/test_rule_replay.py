@@ -0,0 +1,115 @@
+"""
+Tests for the ActedRuleExecution replay harness and replay_rule_executions command
+"""
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from rules_engine.models import ActedRule, ActedRuleExecution
+from rules_engine.services.replay import (
+    RuleReplayHarness, build_report, check_regressions, normalize_result, percentile,
+    sample_executions,
+)
+from rules_engine.services.rule_engine import RuleEngine
+
+
+class RuleReplayHarnessTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.rule = ActedRule.objects.create(
+            rule_code='replay_notice',
+            name='Replay Notice',
+            entry_point='checkout_terms',
+            condition={'==': [{'var': 'cart.region'}, 'UK']},
+            actions=[{'type': 'display_message', 'title': 'Notice', 'content': 'UK buyers'}],
+            priority=10,
+            active=True,
+        )
+        RuleEngine().execute('checkout_terms', {'cart': {'region': 'UK'}})
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_replay_matches_recorded_outcome(self):
+        executions = sample_executions()
+
+        stats = RuleReplayHarness(iterations=2).replay(executions)
+
+        entry_stats = stats['checkout_terms']
+        self.assertEqual(entry_stats.snapshots, 1)
+        self.assertEqual(len(entry_stats.latencies_ms), 2)
+        self.assertEqual(entry_stats.rules_evaluated, [1, 1])
+        self.assertEqual(entry_stats.mismatches, [])
+
+    def test_replay_does_not_write_execution_rows(self):
+        executions = sample_executions()
+
+        RuleReplayHarness().replay(executions)
+
+        self.assertEqual(ActedRuleExecution.objects.count(), 1)
+
+    def test_changed_action_is_reported(self):
+        self.rule.actions = [{'type': 'display_message', 'title': 'Notice', 'content': 'Changed'}]
+        self.rule.save()
+
+        stats = RuleReplayHarness().replay(sample_executions())
+
+        mismatch = stats['checkout_terms'].mismatches[0]
+        self.assertEqual(mismatch.rule_code, 'replay_notice')
+        self.assertEqual(mismatch.reason, 'actions_result changed')
+
+    def test_rule_that_stops_matching_is_reported(self):
+        self.rule.condition = {'==': [{'var': 'cart.region'}, 'IE']}
+        self.rule.save()
+
+        stats = RuleReplayHarness().replay(sample_executions())
+
+        self.assertEqual(stats['checkout_terms'].mismatches[0].reason, 'rule did not match on replay')
+
+    def test_command_reports_and_passes(self):
+        out = StringIO()
+
+        call_command('replay_rule_executions', '--iterations=1', stdout=out)
+
+        self.assertIn('checkout_terms: 1 snapshot(s)', out.getvalue())
+        self.assertIn('Replay passed', out.getvalue())
+
+    def test_command_fails_on_query_limit(self):
+        # A cold rules cache costs at least one query per entry point.
+        cache.clear()
+
+        with self.assertRaises(CommandError):
+            call_command(
+                'replay_rule_executions', '--max-queries=0', '--no-warmup',
+                stdout=StringIO(),
+            )
+
+
+class ReplayReportTest(TestCase):
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_normalize_drops_volatile_keys(self):
+        self.assertEqual(
+            normalize_result([{'type': 'x', 'timestamp': 'now', 'nested': {'created_at': 1}}]),
+            [{'type': 'x', 'nested': {}}],
+        )
+
+    def test_check_regressions_against_baseline(self):
+        baseline = {'entry_points': {'checkout_terms': {'p95_ms': 10.0, 'max_queries': 2}}}
+        report = {'entry_points': {'checkout_terms': {'p95_ms': 14.0, 'max_queries': 3}}}
+
+        failures = check_regressions(report, baseline=baseline, latency_tolerance=0.25)
+
+        self.assertEqual(len(failures), 2)
+        self.assertEqual(check_regressions(baseline, baseline=baseline), [])
+
+    def test_build_report_empty(self):
+        self.assertEqual(build_report({}), {'entry_points': {}, 'mismatches': []})
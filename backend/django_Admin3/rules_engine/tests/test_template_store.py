@@ -0,0 +1,137 @@
+"""
+Tests for the versioned in-memory MessageTemplate store
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from rules_engine.models import MessageTemplate
+from rules_engine.services.rule_engine import ActionDispatcher
+from rules_engine.services.template_processor import Placeholder, parse_placeholders
+from rules_engine.services import template_store as template_store_module
+from rules_engine.services.template_store import template_store
+
+
+class ParsePlaceholdersTest(TestCase):
+    def test_splits_literals_and_placeholders(self):
+        parsed = parse_placeholders('Hi {{user_name}}, order {{order_id}}.')
+        self.assertEqual(parsed, ('Hi ', 'user_name', ', order ', 'order_id', '.'))
+        self.assertIsInstance(parsed[1], Placeholder)
+        self.assertNotIsInstance(parsed[0], Placeholder)
+
+    def test_non_string_is_not_parsed(self):
+        self.assertIsNone(parse_placeholders({'element': 'p'}))
+        self.assertIsNone(parse_placeholders(None))
+
+
+class TemplateStoreTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        template_store.clear()
+        self.template = MessageTemplate.objects.create(
+            name='store_welcome',
+            title='Welcome {{user_name}}',
+            content='Your cart holds {{cart_count}} items',
+            message_type='info',
+            variables=['user_name', 'cart_count'],
+        )
+
+    def tearDown(self):
+        cache.clear()
+        template_store.clear()
+
+    def test_lookups_do_not_query_after_load(self):
+        template_store.get(self.template.id)
+
+        with self.assertNumQueries(0):
+            by_id = template_store.get(self.template.id)
+            by_name = template_store.get_by_name('store_welcome')
+
+        self.assertIs(by_id, by_name)
+        self.assertEqual(by_id.title, 'Welcome {{user_name}}')
+
+    def test_save_bumps_version_and_reloads(self):
+        template_store.get(self.template.id)
+
+        self.template.title = 'Hello {{user_name}}'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.template.save()
+
+        self.assertEqual(template_store.get(self.template.id).title, 'Hello {{user_name}}')
+
+    def test_version_is_bumped_only_on_commit(self):
+        template_store.get(self.template.id)
+
+        self.template.title = 'Hello {{user_name}}'
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.template.save()
+
+        self.assertEqual(template_store.get(self.template.id).title, 'Welcome {{user_name}}')
+        self.assertEqual(len(callbacks), 1)
+
+    def test_pinned_block_reads_version_once(self):
+        template_store.get(self.template.id)
+
+        with mock.patch.object(
+            template_store_module, '_current_version', wraps=template_store_module._current_version,
+        ) as current_version:
+            with template_store.pinned():
+                template_store.get(self.template.id)
+                template_store.get_by_name('store_welcome')
+                with template_store.pinned():
+                    template_store.get(self.template.id)
+
+        self.assertEqual(current_version.call_count, 1)
+
+    def test_bump_during_pinned_block_is_seen_by_next_block(self):
+        with template_store.pinned():
+            template_store.get(self.template.id)
+            self.template.title = 'Hello {{user_name}}'
+            with self.captureOnCommitCallbacks(execute=True):
+                self.template.save()
+            self.assertEqual(template_store.get(self.template.id).title, 'Welcome {{user_name}}')
+
+        with template_store.pinned():
+            self.assertEqual(template_store.get(self.template.id).title, 'Hello {{user_name}}')
+
+    def test_delete_removes_template(self):
+        template_id = self.template.id
+        template_store.get(template_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.template.delete()
+
+        self.assertIsNone(template_store.get(template_id))
+        self.assertIsNone(template_store.get_by_name('store_welcome'))
+
+    def test_active_only_hides_inactive_templates(self):
+        self.template.is_active = False
+        self.template.save()
+
+        self.assertIsNone(template_store.get(self.template.id, active_only=True))
+        self.assertIsNotNone(template_store.get(self.template.id))
+
+    def test_display_message_renders_from_store_without_queries(self):
+        dispatcher = ActionDispatcher()
+        action = {'type': 'display_message', 'templateId': self.template.id}
+        context = {'user': {'name': 'Ann'}, 'cart_count': 3}
+        dispatcher.dispatch([action], context)
+
+        with self.assertNumQueries(0):
+            result = dispatcher.dispatch([action], context)[0]
+
+        self.assertEqual(result['message']['title'], 'Welcome Ann')
+        self.assertEqual(result['message']['content']['message'], 'Your cart holds 3 items')
+
+    def test_json_content_is_copied_per_lookup(self):
+        self.template.content_format = 'json'
+        self.template.json_content = {'content': {'title': 'T', 'message': 'M'}}
+        self.template.save()
+
+        first = template_store.get(self.template.id).copy_json_content()
+        first['content']['title'] = 'mutated'
+
+        self.assertEqual(
+            template_store.get(self.template.id).copy_json_content()['content']['title'], 'T',
+        )
@@ -8,6 +8,7 @@ from .models import (
     MessageTemplate, ActedRule, ActedRuleExecution
 )
 from .services.rule_engine import rule_engine as new_rule_engine
+from .services.context_builder import RequestContextBuilder
 from rest_framework import status, viewsets, generics
 from rest_framework.response import Response
 from rest_framework.decorators import action, permission_classes, api_view
@@ -96,88 +97,19 @@ class RulesEngineViewSet(viewsets.ViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            auth_header = request.META.get('HTTP_AUTHORIZATION', 'None')
+            builder = RequestContextBuilder.for_request(request)
             # Only add user context if not already provided in the request or if authenticated
             # This allows schema validation to work properly when user context is intentionally missing
-            if 'user' not in context_data:
-                if request.user.is_authenticated:
-                    user_context = {
-                        'id': request.user.id,  # Use integer, not string
-                        'email': request.user.email,
-                        'is_authenticated': True,
-                        'ip': request.META.get('REMOTE_ADDR', ''),
-                        'home_country': None,
-                        'work_country': None
-                    }
-
-                    # Get user address information for country detection
-                    try:
-                        from userprofile.models import UserProfile
-                        from userprofile.models.address import UserProfileAddress
-
-                        user_profile = UserProfile.objects.get(
-                            user=request.user)
-
-                        # Get home address country
-                        try:
-                            home_address = UserProfileAddress.objects.get(
-                                user_profile=user_profile,
-                                address_type='HOME'
-                            )
-                            user_context['home_country'] = home_address.country
-                        except UserProfileAddress.DoesNotExist:
-                            pass
-
-                        # Get work address country
-                        try:
-                            work_address = UserProfileAddress.objects.get(
-                                user_profile=user_profile,
-                                address_type='WORK'
-                            )
-                            user_context['work_country'] = work_address.country
-                        except UserProfileAddress.DoesNotExist:
-                            pass
-
-                    except UserProfile.DoesNotExist:
-                        # User profile doesn't exist, keep countries as None
-                        pass
-
-                    context_data['user'] = user_context
-                else:
-                    # For unauthenticated users, only add user context if schema validation fails
-                    # This allows proper schema validation for rules that require user context
-                    pass
+            if 'user' not in context_data and request.user.is_authenticated:
+                context_data['user'] = builder.user_context()
 
             # Add session acknowledgments to context for blocking logic
-            session_acknowledgments = request.session.get(
-                'user_acknowledgments', [])
-            if session_acknowledgments:
-                # Convert session acknowledgments to the format expected by rules engine
-                acknowledgments_dict = {}
-                for ack in session_acknowledgments:
-                    if ack.get('entry_point_location') == entry_point:
-                        ack_key = ack.get('ack_key')
-                        if ack_key:
-                            acknowledgments_dict[ack_key] = {
-                                'acknowledged': ack.get('acknowledged', False),
-                                'message_id': ack.get('message_id'),
-                                'timestamp': ack.get('acknowledged_timestamp'),
-                                'entry_point_location': ack.get('entry_point_location')
-                            }
-
-                if acknowledgments_dict:
-                    context_data['acknowledgments'] = acknowledgments_dict
+            acknowledgments_dict = builder.acknowledgments_for(entry_point)
+            if acknowledgments_dict:
+                context_data['acknowledgments'] = acknowledgments_dict
 
             # Add request metadata
-            context_data['request'] = {
-                'ip_address': request.META.get('REMOTE_ADDR'),
-                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                'timestamp': timezone.now().isoformat()
-            }
-
-            # Debug: Log the final context being sent to rules engine
-            if 'user' in context_data:
-                user_ctx = context_data['user']
+            context_data['request'] = builder.request_metadata()
 
             # Execute rules engine
             result = new_rule_engine.execute(entry_point, context_data)
@@ -895,53 +827,14 @@ def validate_comprehensive_checkout(request):
         # Build comprehensive context for all validation
         context_data = request.data.get("context", {})
 
+        builder = RequestContextBuilder.for_request(request)
+
         # Get user info if authenticated
         if request.user.is_authenticated and "user" not in context_data:
-            user_context = {
-                "id": request.user.id,
-                "email": request.user.email,
-                "is_authenticated": True,
-                "ip": request.META.get("REMOTE_ADDR", ""),
-                "home_country": None,
-                "work_country": None
-            }
-
-            # Get user address information for country detection
-            try:
-                from userprofile.models import UserProfile
-                from userprofile.models.address import UserProfileAddress
-
-                user_profile = UserProfile.objects.get(user=request.user)
-
-                # Get home address country
-                try:
-                    home_address = UserProfileAddress.objects.get(
-                        user_profile=user_profile,
-                        address_type="HOME"
-                    )
-                    user_context["home_country"] = home_address.country
-                except UserProfileAddress.DoesNotExist:
-                    pass
-
-                # Get work address country
-                try:
-                    work_address = UserProfileAddress.objects.get(
-                        user_profile=user_profile,
-                        address_type="WORK"
-                    )
-                    user_context["work_country"] = work_address.country
-                except UserProfileAddress.DoesNotExist:
-                    pass
-
-            except UserProfile.DoesNotExist:
-                # User profile doesn't exist, keep countries as None
-                pass
-
-            context_data["user"] = user_context
+            context_data["user"] = builder.user_context()
 
         # Get session acknowledgments
-        session_acknowledgments = request.session.get(
-            "user_acknowledgments", [])
+        session_acknowledgments = builder.session_acknowledgments()
 
         # DEBUG: Log session info
         logger.info(f"🔍 [Comprehensive Validation] Session ID: {request.session.session_key}")
@@ -949,15 +842,7 @@ def validate_comprehensive_checkout(request):
         logger.info(f"🔍 [Comprehensive Validation] Ack keys in session: {[a.get('ack_key') for a in session_acknowledgments]}")
 
         # Convert session acknowledgments to the format expected by rules engine
-        acknowledgments_dict = {}
-        for ack in session_acknowledgments:
-            ack_key = ack.get("ack_key")
-            if ack_key and ack.get("acknowledged"):
-                acknowledgments_dict[ack_key] = {
-                    "acknowledged": True,
-                    "timestamp": ack.get("acknowledged_timestamp"),
-                    "entry_point_location": ack.get("entry_point_location")
-                }
+        acknowledgments_dict = builder.accepted_acknowledgments()
 
         # DEBUG: Log converted acknowledgments
         logger.info(f"🔍 [Comprehensive Validation] Acknowledgments dict keys: {list(acknowledgments_dict.keys())}")
@@ -975,9 +860,11 @@ def validate_comprehensive_checkout(request):
         all_required_acknowledgments = []
         blocking_rules = []
 
+        # Evaluate every entry point in one merged pass over the shared context
+        results = new_rule_engine.execute_many(entry_points_to_check, context_data)
+
         for entry_point in entry_points_to_check:
-            # Execute rules for this entry point
-            result = new_rule_engine.execute(entry_point, context_data)
+            result = results.get(entry_point, {})
 
             if result.get("blocked"):
                 blocking_rules.extend(result.get("blocking_rules", []))
@@ -0,0 +1,21 @@
+"""Cache warmers for the rules engine (see utils.warmup)."""
+from utils.warmup import register_warmer
+
+
+@register_warmer('rules.active_rules')
+def active_rules():
+    """RuleRepository's per-entry-point rule lists, in the shared cache."""
+    from rules_engine.models import RuleEntryPoint
+    from rules_engine.services.rule_engine import rule_engine
+
+    codes = list(RuleEntryPoint.objects.filter(is_active=True).values_list('code', flat=True))
+    rules = sum(len(rule_engine.rule_repository.get_active_rules(code)) for code in codes)
+    return f'{rules} rules over {len(codes)} entry points'
+
+
+@register_warmer('rules.schemas', per_process=True)
+def schemas():
+    """The Validator's in-process JSON Schema cache."""
+    from rules_engine.services.rule_engine import rule_engine
+
+    return f'{rule_engine.validator.preload_schemas()} schemas'
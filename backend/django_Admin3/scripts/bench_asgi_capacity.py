@@ -0,0 +1,215 @@
+"""
+Compare WSGI and ASGI capacity for upstream-bound endpoints.
+
+Starts a fake Postcoder upstream that answers every request after a fixed
+delay, then boots the app twice with the production gunicorn settings
+from railway-start.sh (WSGI: 2 workers x 4 threads; ASGI: 2 uvicorn
+workers with ASYNC_UPSTREAM_VIEWS=true) pointed at it via
+POSTCODER_API_URL. For each mode it fires concurrent address-retrieve
+requests while probing /api/utils/health/ to show whether a slow upstream
+starves unrelated requests.
+
+Reported per mode: throughput, lookup p50/p95, HTTP status counts and
+health probe p95.
+
+Usage (from backend/django_Admin3, with the database reachable as for
+runserver):
+    python scripts/bench_asgi_capacity.py
+    python scripts/bench_asgi_capacity.py --latency 1.0 --concurrency 128 --requests 512
+    python scripts/bench_asgi_capacity.py --modes asgi --json report.json
+"""
+import argparse
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+SERVER_COMMANDS = {
+    'wsgi': [
+        'gunicorn', 'django_Admin3.wsgi:application',
+        '--workers', '2', '--threads', '4', '--timeout', '120',
+    ],
+    'asgi': [
+        'gunicorn', 'django_Admin3.asgi:application',
+        '--workers', '2', '--worker-class', 'uvicorn_worker.UvicornWorker', '--timeout', '120',
+    ],
+}
+
+FAKE_ADDRESS = [{
+    'postcode': 'SW1A 1AA',
+    'summaryline': '10 Downing Street, London',
+    'number': '10',
+    'premise': '10',
+    'street': 'Downing Street',
+    'posttown': 'LONDON',
+    'county': 'Greater London',
+    'addressline1': '10 Downing Street',
+}]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (0.0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def start_fake_upstream(latency):
+    """Serve FAKE_ADDRESS for any GET after ``latency`` seconds."""
+    body = json.dumps(FAKE_ADDRESS).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', free_port()), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_app(mode, port, upstream_url):
+    env = dict(
+        os.environ,
+        POSTCODER_API_URL=upstream_url,
+        POSTCODER_API_KEY='bench',
+        ASYNC_UPSTREAM_VIEWS='true' if mode == 'asgi' else 'false',
+    )
+    command = SERVER_COMMANDS[mode] + ['--bind', f'127.0.0.1:{port}']
+    # gunicorn logs to stderr; a file avoids blocking on a full pipe.
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=log)
+    process.log = log
+    return process
+
+
+def wait_ready(base_url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            process.log.seek(0)
+            raise RuntimeError(f"Server exited early:\n{process.log.read().decode(errors='replace')}")
+        try:
+            if requests.get(f'{base_url}/api/utils/health/', timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f'Server at {base_url} not ready after {timeout}s')
+
+
+def run_load(base_url, concurrency, total):
+    lookup_url = f'{base_url}/api/utils/address-retrieve/?id=BENCH.1&country=GB'
+    results = []
+    probes = []
+    done = threading.Event()
+
+    def one_lookup(_):
+        started = time.perf_counter()
+        try:
+            status = requests.get(lookup_url, timeout=60).status_code
+        except requests.RequestException:
+            status = 'error'
+        results.append((status, (time.perf_counter() - started) * 1000))
+
+    def probe_health():
+        while not done.is_set():
+            started = time.perf_counter()
+            try:
+                requests.get(f'{base_url}/api/utils/health/', timeout=60)
+            except requests.RequestException:
+                pass
+            probes.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.1)
+
+    prober = threading.Thread(target=probe_health, daemon=True)
+    prober.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_lookup, range(total)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    prober.join()
+
+    latencies = [ms for _, ms in results]
+    return {
+        'requests': total,
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 2),
+        'throughput_rps': round(total / elapsed, 1),
+        'lookup_p50_ms': round(percentile(latencies, 50), 1),
+        'lookup_p95_ms': round(percentile(latencies, 95), 1),
+        'statuses': dict(Counter(str(status) for status, _ in results)),
+        'health_probes': len(probes),
+        'health_p95_ms': round(percentile(probes, 95), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.5, help='Simulated upstream latency in seconds')
+    parser.add_argument('--concurrency', type=int, default=64, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=256, help='Total lookups per mode')
+    parser.add_argument('--modes', nargs='+', choices=sorted(SERVER_COMMANDS), default=['wsgi', 'asgi'])
+    parser.add_argument('--json', dest='json_path', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    upstream = start_fake_upstream(args.latency)
+    upstream_url = f'http://127.0.0.1:{upstream.server_address[1]}/pcw'
+    report = {'upstream_latency_s': args.latency, 'modes': {}}
+
+    try:
+        for mode in args.modes:
+            port = free_port()
+            base_url = f'http://127.0.0.1:{port}'
+            process = start_app(mode, port, upstream_url)
+            try:
+                wait_ready(base_url, process)
+                # Warm connections and per-worker caches before measuring.
+                run_load(base_url, min(args.concurrency, 8), 8)
+                report['modes'][mode] = stats = run_load(base_url, args.concurrency, args.requests)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+            print(
+                f"{mode}: {stats['throughput_rps']} req/s, lookup p50 {stats['lookup_p50_ms']}ms "
+                f"p95 {stats['lookup_p95_ms']}ms, health p95 {stats['health_p95_ms']}ms, "
+                f"statuses {stats['statuses']}"
+            )
+    finally:
+        upstream.shutdown()
+
+    if args.json_path:
+        with open(args.json_path, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,3 +8,9 @@ class SearchConfig(AppConfig):
     name = 'search'
     verbose_name = 'Product Search'
     default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        from search.signals import connect_card_signals, connect_typeahead_signals
+
+        connect_card_signals()
+        connect_typeahead_signals()
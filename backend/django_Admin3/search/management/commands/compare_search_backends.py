@@ -0,0 +1,109 @@
+"""Management command comparing search backends side by side.
+
+Runs each query through every backend in search.services.backends over
+the storefront listing queryset and reports, per query, the median
+latency of each backend, its hit count, and how much of the reference
+backend's top N the other backend also returns (top-N overlap).
+
+Usage:
+    python manage.py compare_search_backends "cm2 notes" "mock exam" london
+    python manage.py compare_search_backends --queries-file queries.txt --top 10 --repeat 5
+    python manage.py compare_search_backends cb1 --min-score 60 --reference postgres
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.services.backends import BACKENDS, get_search_backend
+from search.services.search_service import search_service
+
+
+class Command(BaseCommand):
+    help = 'Compare relevance and latency of the search backends'
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='*', help='Queries to run')
+        parser.add_argument(
+            '--queries-file',
+            help='File with one query per line (blank lines and # comments skipped)',
+        )
+        parser.add_argument('--top', type=int, default=10, help='Ranks compared per query (default: 10)')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per query (default: 3)')
+        parser.add_argument(
+            '--min-score',
+            type=int,
+            default=search_service.min_fuzzy_score,
+            help=f'Score threshold (default: {search_service.min_fuzzy_score})',
+        )
+        parser.add_argument(
+            '--reference',
+            choices=sorted(BACKENDS),
+            default='fuzzy',
+            help='Backend whose top N the others are measured against (default: fuzzy)',
+        )
+
+    def _load_queries(self, options):
+        queries = list(options['queries'])
+        if options['queries_file']:
+            try:
+                with open(options['queries_file'], encoding='utf-8') as handle:
+                    queries += [
+                        line.strip() for line in handle
+                        if line.strip() and not line.lstrip().startswith('#')
+                    ]
+            except OSError as e:
+                raise CommandError(f'Cannot read {options["queries_file"]}: {e}')
+        queries = [query.strip().lower() for query in queries if len(query.strip()) >= 2]
+        if not queries:
+            raise CommandError('Give at least one query of 2+ characters.')
+        return queries
+
+    def _run(self, backend, query, min_score, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            scores, _ = backend.score(search_service._build_optimized_queryset(), query, min_score)
+            timings.append((time.perf_counter() - started) * 1000)
+        return scores, statistics.median(timings)
+
+    def handle(self, *args, **options):
+        if options['top'] < 1 or options['repeat'] < 1:
+            raise CommandError('--top and --repeat must be positive.')
+        queries = self._load_queries(options)
+        reference = options['reference']
+        names = [reference] + sorted(name for name in BACKENDS if name != reference)
+        backends = {name: get_search_backend(name) for name in names}
+        top = options['top']
+
+        # Warm-up: builds missing cards / search documents outside the timings.
+        for backend in backends.values():
+            backend.score(search_service._build_optimized_queryset(), queries[0], options['min_score'])
+
+        header = f'{"query":<30}' + ''.join(f'{name + " ms":>14}{name + " hits":>14}' for name in names)
+        header += ''.join(f'{name + " overlap":>18}' for name in names[1:])
+        self.stdout.write(header)
+
+        latencies = {name: [] for name in names}
+        overlaps = {name: [] for name in names[1:]}
+        for query in queries:
+            results = {}
+            line = f'{query[:29]:<30}'
+            for name in names:
+                scores, latency = self._run(backends[name], query, options['min_score'], options['repeat'])
+                results[name] = [sp_id for sp_id, _ in scores]
+                latencies[name].append(latency)
+                line += f'{latency:>14.1f}{len(scores):>14}'
+            expected = set(results[reference][:top])
+            for name in names[1:]:
+                overlap = len(expected & set(results[name][:top])) / len(expected) if expected else 1.0
+                overlaps[name].append(overlap)
+                line += f'{overlap:>18.0%}'
+            self.stdout.write(line)
+
+        self.stdout.write('')
+        for name in names:
+            summary = f'{name}: median {statistics.median(latencies[name]):.1f} ms, max {max(latencies[name]):.1f} ms'
+            if name in overlaps:
+                summary += f', mean top-{top} overlap with {reference} {statistics.mean(overlaps[name]):.0%}'
+            self.stdout.write(self.style.SUCCESS(summary))
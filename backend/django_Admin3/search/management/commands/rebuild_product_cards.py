@@ -0,0 +1,48 @@
+"""Management command to rebuild the product card projection.
+
+Rebuilds every search.ProductCard from the store/catalog tables and drops
+cards no store product maps to any more. Run after bulk imports or
+QuerySet.update() calls, which bypass the signals that keep cards current.
+
+Usage:
+    python manage.py rebuild_product_cards
+    python manage.py rebuild_product_cards --batch-size 200
+    python manage.py rebuild_product_cards --product-ids 12 13 14
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.services.product_cards import rebuild_product_cards, refresh_product_cards
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search product card projection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Store products rendered per batch (default: 500)',
+        )
+        parser.add_argument(
+            '--product-ids',
+            type=int,
+            nargs='+',
+            help='Only rebuild the cards rendering these store product ids',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        started = time.perf_counter()
+        if options['product_ids']:
+            built = refresh_product_cards(options['product_ids'])
+        else:
+            built = rebuild_product_cards(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {built} product card(s) in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,105 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:00
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("store", "0026_product_code_trigram_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductCard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "card_key",
+                    models.CharField(
+                        help_text="material:<ess_id>:<catalog_product_id>, tutorial:<id> or marking:<id>",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("material", "Material"),
+                            ("tutorial", "Tutorial"),
+                            ("marking", "Marking"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "product_type",
+                    models.CharField(
+                        help_text="The card's 'type' (Materials, Tutorial, Markings)",
+                        max_length=32,
+                    ),
+                ),
+                ("subject_code", models.CharField(max_length=20)),
+                ("exam_session_id", models.IntegerField()),
+                (
+                    "store_product_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "related_product_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(),
+                        blank=True,
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                (
+                    "search_entries",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Per store.Product id: [searchable_text, product_name, subject_code] for fuzzy scoring",
+                    ),
+                ),
+                (
+                    "document",
+                    models.JSONField(help_text="Card as returned by the search API"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Product Card",
+                "verbose_name_plural": "Product Cards",
+                "db_table": '"acted"."search_product_card"',
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["store_product_ids"], name="search_card_products_gin"
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["related_product_ids"], name="search_card_related_gin"
+                    ),
+                    models.Index(
+                        fields=["subject_code", "kind"], name="search_card_subject_kind"
+                    ),
+                    models.Index(
+                        fields=["product_type"], name="search_card_product_type"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Seed documents from the search entries the product cards already hold;
+# products without a card get theirs on first search or on the next
+# rebuild_product_cards.
+BACKFILL_SQL = """
+    INSERT INTO "acted"."search_product_document"
+        (store_product_id, searchable_text, product_name, subject_code, updated_at)
+    SELECT entry.key::integer, entry.value->>0, entry.value->>1, entry.value->>2, NOW()
+    FROM "acted"."search_product_card" card
+    CROSS JOIN LATERAL jsonb_each(card.search_entries) AS entry
+    JOIN "acted"."products" product ON product.purchasable_ptr_id = entry.key::integer
+    ON CONFLICT (store_product_id) DO NOTHING;
+
+    UPDATE "acted"."search_product_document" SET search_vector =
+        setweight(to_tsvector('english', product_name || ' ' || subject_code), 'A')
+        || setweight(to_tsvector('english', searchable_text), 'B');
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0005_enable_pg_trgm"),
+        ("search", "0001_product_card"),
+        ("store", "0026_product_code_trigram_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSearchDocument",
+            fields=[
+                (
+                    "store_product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="store.product",
+                    ),
+                ),
+                (
+                    "searchable_text",
+                    models.TextField(
+                        help_text="SearchService._build_searchable_text output (lower-cased)"
+                    ),
+                ),
+                (
+                    "product_name",
+                    models.CharField(
+                        help_text="SearchService._resolve_product_name, lower-cased",
+                        max_length=255,
+                    ),
+                ),
+                ("subject_code", models.CharField(max_length=20)),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(null=True),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Product Search Document",
+                "verbose_name_plural": "Product Search Documents",
+                "db_table": '"acted"."search_product_document"',
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="search_doc_vector_gin"
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            models.F("searchable_text"), name="gin_trgm_ops"
+                        ),
+                        name="search_doc_text_trgm",
+                    ),
+                    models.Index(fields=["subject_code"], name="search_doc_subject"),
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
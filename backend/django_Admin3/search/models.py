@@ -0,0 +1,112 @@
+"""Search models.
+
+ProductCard is a read-side projection of the storefront product listing:
+one row per card the search grid renders, holding the pre-rendered card
+document produced by StoreProductListSerializer plus the keys the search
+service looks cards up by. It is derived data — see
+search.services.product_cards for how rows are built and kept current.
+
+ProductSearchDocument holds the same per-product search text in columns
+the PostgreSQL search backend ranks in SQL.
+
+Tables: acted.search_product_card, acted.search_product_document
+"""
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class ProductCard(models.Model):
+    """
+    Pre-rendered storefront product card.
+
+    Card granularity matches ``serialize_grouped_products``: material rows
+    are grouped per (exam session subject, catalog product) with one entry
+    in ``document['variations']`` per store.Product; tutorial and marking
+    rows get one card per store.Product.
+
+    ``store_product_ids`` lists the store.Products the card renders and is
+    how listings find cards (GIN-indexed ``&&`` overlap).
+    ``related_product_ids`` lists store.Products the document embeds data
+    from without rendering them (recommended products), so edits to those
+    invalidate this card too.
+    """
+
+    KIND_CHOICES = [
+        ('material', 'Material'),
+        ('tutorial', 'Tutorial'),
+        ('marking', 'Marking'),
+    ]
+
+    card_key = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text='material:<ess_id>:<catalog_product_id>, tutorial:<id> or marking:<id>',
+    )
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    product_type = models.CharField(max_length=32, help_text="The card's 'type' (Materials, Tutorial, Markings)")
+    subject_code = models.CharField(max_length=20)
+    exam_session_id = models.IntegerField()
+    store_product_ids = ArrayField(models.IntegerField(), default=list)
+    related_product_ids = ArrayField(models.IntegerField(), default=list, blank=True)
+    search_entries = models.JSONField(
+        default=dict,
+        help_text='Per store.Product id: [searchable_text, product_name, subject_code] for fuzzy scoring',
+    )
+    document = models.JSONField(help_text='Card as returned by the search API')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = '"acted"."search_product_card"'
+        verbose_name = 'Product Card'
+        verbose_name_plural = 'Product Cards'
+        indexes = [
+            GinIndex(fields=['store_product_ids'], name='search_card_products_gin'),
+            GinIndex(fields=['related_product_ids'], name='search_card_related_gin'),
+            models.Index(fields=['subject_code', 'kind'], name='search_card_subject_kind'),
+            models.Index(fields=['product_type'], name='search_card_product_type'),
+        ]
+
+    def __str__(self):
+        return self.card_key
+
+
+class ProductSearchDocument(models.Model):
+    """
+    Search text of one store.Product for the PostgreSQL search backend.
+
+    Written alongside the product cards from the same
+    ``[searchable_text, product_name, subject_code]`` entries, so both
+    backends score identical text. ``search_vector`` weights the product
+    name and subject code (A) above the rest of the text (B); the
+    trigram index on ``searchable_text`` serves the similarity terms.
+    """
+
+    store_product = models.OneToOneField(
+        'store.Product',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document',
+    )
+    searchable_text = models.TextField(help_text='SearchService._build_searchable_text output (lower-cased)')
+    product_name = models.CharField(max_length=255, help_text='SearchService._resolve_product_name, lower-cased')
+    subject_code = models.CharField(max_length=20)
+    search_vector = SearchVectorField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = '"acted"."search_product_document"'
+        verbose_name = 'Product Search Document'
+        verbose_name_plural = 'Product Search Documents'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='search_doc_vector_gin'),
+            GinIndex(
+                OpClass('searchable_text', name='gin_trgm_ops'),
+                name='search_doc_text_trgm',
+            ),
+            models.Index(fields=['subject_code'], name='search_doc_subject'),
+        ]
+
+    def __str__(self):
+        return f'{self.store_product_id}: {self.searchable_text[:50]}'
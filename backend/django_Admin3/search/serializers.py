@@ -16,6 +16,10 @@ class StoreProductListSerializer:
     Produces the same response format as the legacy ESSP ProductListSerializer
     by grouping store.Product instances by their underlying catalog.Product
     and exam_session_subject.
+
+    The search endpoints serve these documents pre-rendered from the
+    search.ProductCard projection (search.services.product_cards), which
+    is built with this serializer.
     """
 
     @classmethod
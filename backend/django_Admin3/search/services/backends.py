@@ -0,0 +1,172 @@
+"""
+Pluggable ranking engines for SearchService.
+
+A backend scores the store.Products of a queryset against a query and
+returns them best-first, with the product cards for the hits. Both
+backends score the same text — the ``[searchable_text, product_name,
+subject_code]`` entries built by ``SearchService._build_searchable_text``
+and ``_resolve_product_name`` — with the R1 weighting of
+``SearchService._composite_score``::
+
+    0.15 * subject_bonus + 0.40 * token_sort + 0.25 * partial_name + 0.20 * token_set
+
+``FuzzySearchBackend`` ('fuzzy', the default) loads every candidate's
+entries from the product cards and scores them in Python with
+fuzzywuzzy. ``PostgresSearchBackend`` ('postgres') ranks in SQL over
+search.ProductSearchDocument: candidates come from the GIN-indexed
+tsvector, the trigram index and the subject code index, and the R1 terms
+map to pg_trgm functions —
+
+  - subject_bonus: 100 when the query starts with the subject code
+  - token_sort:    similarity(searchable_text, query)
+  - partial_name:  word_similarity(query, product_name)
+  - token_set:     word_similarity(query, searchable_text)
+
+— so cost follows the matching rows, not the catalogue size. Scores are
+comparable but not identical; ``manage.py compare_search_backends``
+reports the overlap and latency of the two on real queries.
+
+``settings.SEARCH_BACKEND`` selects the backend.
+"""
+import logging
+import re
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, TrigramSimilarity, TrigramWordSimilarity
+from django.db.models import Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Cast
+
+from search.models import ProductCard, ProductSearchDocument
+from search.services.product_cards import (
+    CARD_KINDS, SEARCH_CONFIG, get_product_cards, refresh_product_cards,
+)
+
+logger = logging.getLogger('search')
+
+Scores = List[Tuple[int, int]]
+
+
+class SearchBackend:
+    """Scores store.Products against a text query."""
+
+    name = None
+
+    def score(self, queryset, query: str, min_score: int) -> Tuple[Scores, Dict[int, ProductCard]]:
+        """Score the store.Products in ``queryset`` against ``query``.
+
+        ``query`` is stripped and lower-cased by the caller.
+
+        Returns:
+            ([(store_product_id, score), ...] at or above ``min_score``
+            sorted by score descending, {store_product_id: ProductCard}
+            covering at least the scored ids)
+        """
+        raise NotImplementedError
+
+
+class FuzzySearchBackend(SearchBackend):
+    """fuzzywuzzy scoring over every candidate's card search entries."""
+
+    name = 'fuzzy'
+
+    def score(self, queryset, query, min_score):
+        from search.services.search_service import SearchService
+
+        product_ids = list(queryset.values_list('pk', flat=True))
+        cards = get_product_cards(product_ids)
+
+        products_with_scores = []
+        for sp_id in product_ids:
+            card = cards.get(sp_id)
+            if card is None:
+                continue
+            searchable_text, product_name, subject_code = card.search_entries[str(sp_id)]
+            score = SearchService._composite_score(query, searchable_text, product_name, subject_code)
+            if score >= min_score:
+                products_with_scores.append((sp_id, score))
+
+        # Sort by score descending
+        products_with_scores.sort(key=lambda x: x[1], reverse=True)
+        return products_with_scores, cards
+
+
+def _prefix_tsquery(query: str) -> str:
+    """``'cm2 note'`` -> ``'cm2:* & note:*'`` (raw to_tsquery syntax)."""
+    terms = re.findall(r'\w+', query)
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+class PostgresSearchBackend(SearchBackend):
+    """tsvector + pg_trgm ranking in SQL over ProductSearchDocument."""
+
+    name = 'postgres'
+
+    def _ensure_documents(self, queryset):
+        missing = queryset.filter(kind__in=CARD_KINDS, search_document__isnull=True)
+        missing_ids = list(missing.values_list('pk', flat=True))
+        if not missing_ids:
+            return
+        logger.debug(f'[SEARCH] Building {len(missing_ids)} missing search documents')
+        refresh_product_cards(missing_ids)
+        # Products that cannot have a card (e.g. no PPV) get no document
+        # either; they are skipped by the serializer as well.
+        unbuilt = missing.filter(pk__in=missing_ids).count()
+        if unbuilt:
+            logger.warning(f'[SEARCH] {unbuilt} of {len(missing_ids)} missing search documents could not be built')
+
+    def score(self, queryset, query, min_score):
+        self._ensure_documents(queryset)
+
+        subject_prefixes = [query[:end] for end in range(1, len(query) + 1)]
+        candidates = Q(subject_code__in=subject_prefixes) | Q(searchable_text__trigram_word_similar=query)
+        tsquery = _prefix_tsquery(query)
+        if tsquery:
+            candidates |= Q(search_vector=SearchQuery(tsquery, search_type='raw', config=SEARCH_CONFIG))
+
+        rows = (
+            ProductSearchDocument.objects
+            .filter(store_product_id__in=queryset.values('pk'))
+            .filter(candidates)
+            .annotate(
+                subject_bonus=Case(
+                    When(subject_code__in=subject_prefixes, then=Value(100.0)),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                ),
+                token_sort=TrigramSimilarity('searchable_text', query) * 100,
+                partial_name=TrigramWordSimilarity(query, 'product_name') * 100,
+                token_set=TrigramWordSimilarity(query, 'searchable_text') * 100,
+            )
+            # float -> integer casts round to nearest in PostgreSQL.
+            .annotate(score=Cast(
+                0.15 * F('subject_bonus')
+                + 0.40 * F('token_sort')
+                + 0.25 * F('partial_name')
+                + 0.20 * F('token_set'),
+                IntegerField(),
+            ))
+            .filter(score__gte=min_score)
+            .order_by('-score', 'store_product_id')
+            .values_list('store_product_id', 'score')
+        )
+        products_with_scores = list(rows)
+        cards = get_product_cards([sp_id for sp_id, _ in products_with_scores])
+        return products_with_scores, cards
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (FuzzySearchBackend, PostgresSearchBackend)
+}
+
+
+def get_search_backend(name: str = None) -> SearchBackend:
+    """The backend called ``name`` (default: ``settings.SEARCH_BACKEND``)."""
+    name = name or getattr(settings, 'SEARCH_BACKEND', 'fuzzy')
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f'Unknown SEARCH_BACKEND {name!r}; expected one of {", ".join(sorted(BACKENDS))}'
+        ) from None
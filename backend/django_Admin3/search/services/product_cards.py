@@ -0,0 +1,337 @@
+"""
+Product card projection (search.ProductCard) — build, invalidate, read.
+
+The storefront listing used to rebuild every card on every request:
+group material rows by (ESS, catalog product), walk PPV → product →
+variation → prices, and query the recommended store product per
+variation. The projection stores each card's rendered document once,
+so a listing reads its cards with one indexed query.
+
+Visibility and filtering are NOT baked into cards. The search service
+still asks ProductFilterService (over available_for_listing()) which
+store.Product ids match, then ``get_product_cards`` fetches the cards
+rendering those ids and ``assemble_product_cards`` trims each material
+card's variations to the matching ids, in the caller's order. Output is
+the same as ``StoreProductListSerializer.serialize_grouped_products``
+over those products.
+
+Maintenance:
+  - search.signals deletes affected cards in the writing transaction
+    (prices, store products, PPVs, catalog products / variations,
+    recommendations, filter groups, subjects, sessions, locations,
+    templates) and enqueues ``refresh_product_cards_task`` on commit.
+  - Reads build missing cards inline, up to ``INLINE_BUILD_LIMIT`` ids
+    per call, so a card deleted by an invalidation heals on first use.
+    Bulk gaps (fresh database, mass invalidation) are left to the
+    ``search.product_cards`` warmer, which builds every missing card
+    after deploys and worker restarts.
+  - Every refresh also rewrites the products' ProductSearchDocument rows
+    (used by the PostgreSQL search backend) from the same search entries;
+    invalidation deletes them, and that backend rebuilds missing ones.
+  - ``manage.py rebuild_product_cards`` rebuilds everything, e.g. after
+    bulk imports or ``QuerySet.update()`` calls that bypass signals.
+    Bulk writers that would fire a receiver per row pause them with
+    ``search.signals.card_signals_paused`` and rebuild once instead.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.contrib.postgres.search import SearchVector
+from django.db.models import Prefetch, Q, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from search.models import ProductCard, ProductSearchDocument
+from search.serializers import StoreProductListSerializer
+from store.models import Product as StoreProduct
+
+logger = logging.getLogger('search')
+
+CARD_KINDS = ('material', 'tutorial', 'marking')
+SEARCH_CONFIG = 'english'
+
+# Most missing ids a read builds itself (see get_product_cards)
+INLINE_BUILD_LIMIT = 100
+
+
+def with_card_relations(queryset):
+    """Apply the select/prefetch set the card serializer and fuzzy-text
+    builders read, so building cards is a fixed number of queries."""
+    from catalog.models import ProductVariationRecommendation
+
+    # Phase 5 Task 4b: PPV is on MaterialProduct now (not on Product
+    # parent). Traverse via the materialproduct reverse-OneToOne.
+    return queryset.select_related(
+        'exam_session_subject__subject',
+        'exam_session_subject__exam_session',
+        'materialproduct__product_product_variation__product',
+        'materialproduct__product_product_variation__product_variation',
+        # Phase 5-followup: pull the subclass-local fields needed by the
+        # polymorphic serializer / fuzzy-text builder in one round-trip.
+        'tutorialproduct__tutorial_location',
+        'tutorialproduct__tutorial_course_template',
+        'markingproduct__marking_template',
+    ).prefetch_related(
+        'prices',
+        'materialproduct__product_product_variation__product_groups__product_group',
+        Prefetch(
+            'materialproduct__product_product_variation__recommendation',
+            queryset=ProductVariationRecommendation.objects.select_related(
+                'recommended_product_product_variation__product',
+                'recommended_product_product_variation__product_variation'
+            )
+        )
+    )
+
+
+def card_key(store_product) -> Optional[str]:
+    """Key of the card rendering ``store_product``; None if it has no card."""
+    kind = getattr(store_product, 'kind', None)
+    if kind in ('tutorial', 'marking'):
+        return f'{kind}:{store_product.pk}'
+    if kind == 'material':
+        ppv = store_product.get_material_ppv()
+        if ppv is not None:
+            return f'material:{store_product.exam_session_subject_id}:{ppv.product_id}'
+    return None
+
+
+def build_cards(store_products: Iterable) -> List[ProductCard]:
+    """Build (unsaved) cards for ``store_products``.
+
+    Material products must come with their whole (ESS, catalog product)
+    group, otherwise the card only lists the variations passed in.
+    """
+    from search.services.search_service import search_service
+
+    groups = defaultdict(list)
+    for sp in store_products:
+        key = card_key(sp)
+        if key is not None:
+            groups[key].append(sp)
+
+    cards = []
+    for key, members in groups.items():
+        documents = StoreProductListSerializer.serialize_grouped_products(members)
+        if not documents:
+            continue
+        document = documents[0]
+        related_ids = {
+            variation['recommended_product']['store_product_id']
+            for variation in document.get('variations', [])
+            if variation.get('recommended_product')
+        }
+        cards.append(ProductCard(
+            card_key=key,
+            kind=document['kind'],
+            product_type=document['type'],
+            subject_code=document['subject_code'],
+            exam_session_id=document['exam_session_id'],
+            store_product_ids=[sp.pk for sp in members],
+            related_product_ids=sorted(related_ids),
+            search_entries={
+                str(sp.pk): [
+                    search_service._build_searchable_text(sp),
+                    search_service._resolve_product_name(sp).lower(),
+                    sp.exam_session_subject.subject.code.lower(),
+                ]
+                for sp in members
+            },
+            document=document,
+            updated_at=timezone.now(),
+        ))
+    return cards
+
+
+def _group_queryset(store_product_ids):
+    """store.Products to render for ``store_product_ids``: the products
+    themselves plus every other member of their material groups."""
+    ids = set(store_product_ids)
+    group_q = Q(pk__in=ids)
+    groups = StoreProduct.objects.filter(pk__in=ids, kind='material').values_list(
+        'exam_session_subject_id', 'materialproduct__product_product_variation__product_id',
+    ).distinct()
+    for ess_id, catalog_product_id in groups:
+        group_q |= Q(
+            kind='material',
+            exam_session_subject_id=ess_id,
+            materialproduct__product_product_variation__product_id=catalog_product_id,
+        )
+    return with_card_relations(StoreProduct.objects.filter(group_q)).order_by(
+        'exam_session_subject__subject__code', 'kind', 'product_code',
+    )
+
+
+def refresh_product_cards(store_product_ids: Iterable[int]) -> int:
+    """Rebuild the cards rendering ``store_product_ids``; return how many."""
+    ids = set(store_product_ids)
+    if not ids:
+        return 0
+
+    products = list(_group_queryset(ids))
+    cards = build_cards(products)
+    rendered_ids = list(ids | {sp.pk for sp in products})
+    with transaction.atomic():
+        # Drop cards these products no longer belong to (e.g. PPV moved
+        # to another catalog product) before upserting the current ones.
+        ProductCard.objects.filter(store_product_ids__overlap=rendered_ids).exclude(
+            card_key__in=[card.card_key for card in cards],
+        ).delete()
+        ProductCard.objects.bulk_create(
+            cards,
+            update_conflicts=True,
+            unique_fields=['card_key'],
+            update_fields=[
+                'kind', 'product_type', 'subject_code', 'exam_session_id',
+                'store_product_ids', 'related_product_ids', 'search_entries',
+                'document', 'updated_at',
+            ],
+        )
+        _write_search_documents(cards, rendered_ids)
+    return len(cards)
+
+
+def _write_search_documents(cards: List[ProductCard], rendered_ids: List[int]) -> None:
+    """Upsert one ProductSearchDocument per card search entry and drop
+    the documents of ``rendered_ids`` that no card renders any more.
+
+    ``search_vector`` uses the weighting of migration 0002: product name
+    and subject code (A) above the searchable text (B).
+    """
+    documents = [
+        ProductSearchDocument(
+            store_product_id=int(sp_id),
+            searchable_text=searchable_text,
+            product_name=product_name[:255],
+            subject_code=subject_code,
+        )
+        for card in cards
+        for sp_id, (searchable_text, product_name, subject_code) in card.search_entries.items()
+    ]
+    written_ids = [document.store_product_id for document in documents]
+    ProductSearchDocument.objects.filter(store_product_id__in=rendered_ids).exclude(
+        store_product_id__in=written_ids,
+    ).delete()
+    ProductSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['store_product'],
+        update_fields=['searchable_text', 'product_name', 'subject_code', 'updated_at'],
+    )
+    ProductSearchDocument.objects.filter(store_product_id__in=written_ids).update(
+        search_vector=(
+            SearchVector(Concat('product_name', Value(' '), 'subject_code'), weight='A', config=SEARCH_CONFIG)
+            + SearchVector('searchable_text', weight='B', config=SEARCH_CONFIG)
+        ),
+    )
+
+
+def invalidate_product_cards(store_product_ids: Iterable[int]) -> int:
+    """Delete cards that render or embed ``store_product_ids``, and the
+    search documents of ``store_product_ids``."""
+    ids = list(set(store_product_ids))
+    if not ids:
+        return 0
+    ProductSearchDocument.objects.filter(store_product_id__in=ids).delete()
+    deleted, _ = ProductCard.objects.filter(
+        Q(store_product_ids__overlap=ids) | Q(related_product_ids__overlap=ids)
+    ).delete()
+    return deleted
+
+
+def rebuild_product_cards(batch_size: int = 500) -> int:
+    """Rebuild every card and delete cards no store.Product maps to."""
+    started = timezone.now()
+    ids = list(
+        StoreProduct.objects.filter(kind__in=CARD_KINDS)
+        .order_by('exam_session_subject_id', 'pk')
+        .values_list('pk', flat=True)
+    )
+    built = 0
+    for start in range(0, len(ids), batch_size):
+        built += refresh_product_cards(ids[start:start + batch_size])
+    ProductCard.objects.filter(updated_at__lt=started).delete()
+    return built
+
+
+def build_missing_product_cards(batch_size: int = 500) -> int:
+    """Build the cards of every store.Product that has none; return how many."""
+    ids = set(StoreProduct.objects.filter(kind__in=CARD_KINDS).values_list('pk', flat=True))
+    for card_ids in ProductCard.objects.values_list('store_product_ids', flat=True):
+        ids.difference_update(card_ids)
+    missing = sorted(ids)
+    built = 0
+    for start in range(0, len(missing), batch_size):
+        built += refresh_product_cards(missing[start:start + batch_size])
+    return built
+
+
+def get_product_cards(store_product_ids: Iterable[int]) -> Dict[int, ProductCard]:
+    """Map each store.Product id to the card rendering it.
+
+    Up to ``INLINE_BUILD_LIMIT`` ids without a card are built on the spot;
+    the rest, and ids that cannot have one (no PPV, non-store kind), are
+    left out, as the serializer skips them.
+    """
+    ids = set(store_product_ids)
+    if not ids:
+        return {}
+
+    def _load():
+        by_id = {}
+        for card in ProductCard.objects.filter(store_product_ids__overlap=list(ids)):
+            for sp_id in card.store_product_ids:
+                if sp_id in ids:
+                    by_id[sp_id] = card
+        return by_id
+
+    cards = _load()
+    missing = ids - cards.keys()
+    if missing:
+        if len(missing) > INLINE_BUILD_LIMIT:
+            logger.warning(
+                f'[SEARCH] {len(missing)} product cards missing; building {INLINE_BUILD_LIMIT}, '
+                f'run the search.product_cards warmer for the rest'
+            )
+            missing = sorted(missing)[:INLINE_BUILD_LIMIT]
+        logger.debug(f'[SEARCH] Building {len(missing)} missing product cards')
+        refresh_product_cards(missing)
+        cards = _load()
+    return cards
+
+
+def assemble_product_cards(ordered_ids: List[int], cards: Dict[int, ProductCard]) -> List[Dict]:
+    """Card documents for ``ordered_ids`` in serialize_grouped_products order.
+
+    Material cards come first (in order of their first listed variation)
+    with variations trimmed to, and ordered by, ``ordered_ids``; then
+    tutorial cards, then marking cards.
+    """
+    position = {sp_id: index for index, sp_id in enumerate(ordered_ids)}
+    material, tutorial, marking = {}, [], []
+    for sp_id in ordered_ids:
+        card = cards.get(sp_id)
+        if card is None:
+            continue
+        if card.kind == 'material':
+            material.setdefault(card.card_key, card)
+        elif card.kind == 'tutorial':
+            tutorial.append(card)
+        else:
+            marking.append(card)
+
+    results = []
+    for card in material.values():
+        document = dict(card.document)
+        variations = sorted(
+            (v for v in document['variations'] if v['store_product_id'] in position),
+            key=lambda v: position[v['store_product_id']],
+        )
+        first_id = variations[0]['store_product_id']
+        document.update(id=first_id, essp_id=first_id, store_product_id=first_id, variations=variations)
+        results.append(document)
+    results.extend(card.document for card in tutorial)
+    results.extend(card.document for card in marking)
+    return results
@@ -12,13 +12,16 @@ from typing import Dict, Any, List, Optional
 from django.db.models import Q, Count, Prefetch
 from django.core.cache import cache
 from django.conf import settings
-from fuzzywuzzy import fuzz
 
 from store.models import Product as StoreProduct, Bundle as StoreBundle
 from catalog.models import Subject
 from filtering.models import FilterGroup, FilterConfiguration, FilterConfigurationGroup
 from filtering.services.filter_service import ProductFilterService
 from search.serializers import StoreProductListSerializer
+from search.services.backends import get_search_backend
+from search.services.product_cards import (
+    assemble_product_cards, get_product_cards, with_card_relations,
+)
 
 logger = logging.getLogger('search')
 
@@ -28,7 +31,8 @@ class SearchService:
     Product search service querying store.Product directly.
 
     Features:
-    - Fuzzy search with FuzzyWuzzy
+    - Fuzzy search with FuzzyWuzzy, or SQL ranking with the PostgreSQL
+      search backend (see search.services.backends)
     - Subject, category, and product type filtering
     - Bundle support
     - Disjunctive faceted filter counts
@@ -114,17 +118,22 @@ class SearchService:
                 base_queryset, filters
             )
 
-        # Get bundles if enabled
+        # Get bundles if enabled. The loaded list also yields the bundle
+        # count below, so bundles are read once per search.
+        bundles = None
         bundles_data = []
         if options.get('include_bundles', True):
+            bundles = self._load_bundles(filters)
             bundles_data = self._get_bundles(
                 filters, search_query, bundle_filter_active,
-                use_fuzzy and not fuzzy_product_ids
+                use_fuzzy and not fuzzy_product_ids,
+                bundles=bundles,
             )
 
-        # Serialize products (grouped by catalog.Product + exam_session_subject)
-        products_list = list(filtered_queryset)
-        products_data = StoreProductListSerializer.serialize_grouped_products(products_list)
+        # Product cards (grouped by catalog.Product + exam_session_subject)
+        # come pre-rendered from the search.ProductCard projection
+        product_ids = list(filtered_queryset.values_list('pk', flat=True))
+        products_data = assemble_product_cards(product_ids, get_product_cards(product_ids))
 
         # Combine bundles and products
         if use_fuzzy and fuzzy_product_ids:
@@ -152,7 +161,7 @@ class SearchService:
         # Add bundle count (bundle logic stays in SearchService).
         # Use setdefault because filter_counts only contains keys for which
         # a FilterConfiguration row exists — 'categories' is not guaranteed.
-        bundle_count = self._get_filtered_bundle_count(filters)
+        bundle_count = self._get_filtered_bundle_count(filters, bundles=bundles)
         if bundle_count > 0:
             filter_counts.setdefault('categories', {})['Bundle'] = {
                 'count': bundle_count, 'name': 'Bundle'
@@ -189,31 +198,7 @@ class SearchService:
         purchase predicate (``Purchasable.objects.available_now()``,
         8 conditions) to reject direct purchase attempts.
         """
-        from catalog.models import ProductVariationRecommendation
-
-        # Phase 5 Task 4b: PPV is on MaterialProduct now (not on Product
-        # parent). Traverse via the materialproduct reverse-OneToOne.
-        return StoreProduct.available_for_listing().select_related(
-            'exam_session_subject__subject',
-            'exam_session_subject__exam_session',
-            'materialproduct__product_product_variation__product',
-            'materialproduct__product_product_variation__product_variation',
-            # Phase 5-followup: pull the subclass-local fields needed by the
-            # polymorphic serializer / fuzzy-text builder in one round-trip.
-            'tutorialproduct__tutorial_location',
-            'tutorialproduct__tutorial_course_template',
-            'markingproduct__marking_template',
-        ).prefetch_related(
-            'prices',
-            'materialproduct__product_product_variation__product_groups__product_group',
-            Prefetch(
-                'materialproduct__product_product_variation__recommendation',
-                queryset=ProductVariationRecommendation.objects.select_related(
-                    'recommended_product_product_variation__product',
-                    'recommended_product_product_variation__product_variation'
-                )
-            )
-        ).order_by(
+        return with_card_relations(StoreProduct.available_for_listing()).order_by(
             'exam_session_subject__subject__code',
             # Sorting on the material-only PPV shortname puts NULLs (every
             # tutorial / marking row) in arbitrary positions relative to
@@ -229,20 +214,18 @@ class SearchService:
         Perform fuzzy search and return matching store.Product IDs
         sorted by relevance score.
         """
-        query_lower = query.lower()
-        products_with_scores = []
-
-        for sp in queryset:
-            searchable_text = self._build_searchable_text(sp)
-            score = self._calculate_fuzzy_score(query_lower, searchable_text, sp)
-
-            if score >= self.min_fuzzy_score:
-                products_with_scores.append((sp.id, score))
+        products_with_scores, _ = self._score_product_cards(queryset, query.lower(), self.min_fuzzy_score)
+        return [pid for pid, _ in products_with_scores]
 
-        # Sort by score descending
-        products_with_scores.sort(key=lambda x: x[1], reverse=True)
+    def _score_product_cards(self, queryset, query: str, min_score: int):
+        """Score every store.Product in ``queryset`` against ``query``
+        with the configured search backend (``settings.SEARCH_BACKEND``).
 
-        return [pid for pid, _ in products_with_scores]
+        Returns:
+            ([(store_product_id, score), ...] at or above ``min_score``
+            sorted by score descending, {store_product_id: ProductCard})
+        """
+        return get_search_backend().score(queryset, query, min_score)
 
     def _build_searchable_text(self, store_product: StoreProduct) -> str:
         """Build searchable text from store.Product fields, kind-aware.
@@ -350,8 +333,19 @@ class SearchService:
         This replaces the previous max(scores) approach which flattened ranking
         by letting subject_bonus (95) dominate all other signals.
         """
-        subject_code = store_product.exam_session_subject.subject.code.lower()
-        product_name = self._resolve_product_name(store_product).lower()
+        return self._composite_score(
+            query,
+            searchable_text,
+            self._resolve_product_name(store_product).lower(),
+            store_product.exam_session_subject.subject.code.lower(),
+        )
+
+    @staticmethod
+    def _composite_score(query: str, searchable_text: str, product_name: str, subject_code: str) -> int:
+        """The R1 composite over pre-lowered inputs (see _calculate_fuzzy_score)."""
+        # Deferred: fuzzywuzzy pulls in Levenshtein, which catalogue-only
+        # workers never need (after the first call this is a dict lookup).
+        from fuzzywuzzy import fuzz
 
         # Subject code exact match bonus (binary: 0 or 100)
         subject_bonus = 100 if query.startswith(subject_code) else 0
@@ -413,27 +407,33 @@ class SearchService:
 
         return result
 
-    def _get_bundles(self, filters: Dict, search_query: str,
-                     bundle_filter_active: bool, no_fuzzy_results: bool) -> List[Dict]:
-        """Get bundles matching filters using single-product matching semantics.
+    def _bundle_queryset(self, filters: Dict):
+        """Bundles visible under ``filters``, with everything serialization reads.
 
-        Single-product matching: a bundle qualifies if at least one of its
-        component products satisfies ALL active filter conditions simultaneously.
-        This prevents false matches where different products satisfy different
-        filter dimensions.
-        """
-        if no_fuzzy_results and not bundle_filter_active:
-            return []
+        Bundles are surfaced only if they (a) are themselves active and
+        (b) contain at least one component whose Purchasable passes the
+        listing predicate (available_for_listing — 7 conditions, drops
+        the date window). A bundle whose components are all flagged
+        inactive renders as an empty card, so hide it from the list.
+        Out-of-window components are still visible here; the cart-add
+        gate (8-condition available_now()) blocks the actual purchase.
+
+        Non-subject filters use single-product matching: a bundle
+        qualifies if at least one of its component products satisfies
+        ALL active filter conditions simultaneously.
 
-        # Bundles are surfaced only if they (a) are themselves active and
-        # (b) contain at least one component whose Purchasable passes the
-        # listing predicate (available_for_listing — 7 conditions, drops
-        # the date window). A bundle whose components are all flagged
-        # inactive renders as an empty card, so hide it from the list.
-        # Out-of-window components are still visible here; the cart-add
-        # gate (8-condition available_now()) blocks the actual purchase.
-        from store.models import Purchasable
+        Active components (in sort order) land on ``bundle.active_components``
+        with their PPV chain joined and prices prefetched, so evaluating
+        the queryset costs three queries however many bundles match.
+        """
+        from store.models import BundleProduct, Purchasable
         available_purchasable_ids = Purchasable.objects.available_for_listing().values('pk')
+        active_components = BundleProduct.objects.filter(is_active=True).select_related(
+            # Phase 5 Task 4b: PPV lives on MaterialProduct now.
+            'product__materialproduct__product_product_variation__product',
+            'product__materialproduct__product_product_variation__product_variation',
+        ).prefetch_related('product__prices').order_by('sort_order')
+
         bundles_queryset = StoreBundle.objects.filter(
             is_active=True,
             bundle_products__is_active=True,
@@ -443,10 +443,7 @@ class SearchService:
             'exam_session_subject__exam_session',
             'exam_session_subject__subject'
         ).prefetch_related(
-            'bundle_products__product__prices',
-            # Phase 5 Task 4b: PPV lives on MaterialProduct now.
-            'bundle_products__product__materialproduct__product_product_variation__product',
-            'bundle_products__product__materialproduct__product_product_variation__product_variation',
+            Prefetch('bundle_products', queryset=active_components, to_attr='active_components'),
         )
 
         # Apply subject filter (at bundle level — bundles have their own ESS)
@@ -460,91 +457,115 @@ class SearchService:
             bundles_queryset = bundles_queryset.filter(subject_q)
 
         # Apply non-subject filters via single-product matching on component products
-        matching_product_ids = self._get_bundle_matching_product_ids(filters)
-        if matching_product_ids is not None:
+        matching_products = self._bundle_matching_products(filters)
+        if matching_products is not None:
             # Filter bundles to those containing at least one matching product
             bundles_queryset = bundles_queryset.filter(
-                bundle_products__product__id__in=matching_product_ids,
+                bundle_products__product__id__in=matching_products.values('pk'),
                 bundle_products__is_active=True
             ).distinct()
 
-        # Serialize bundles with format expected by BundleCard.js
-        bundles_data = []
-        for bundle in bundles_queryset:
-            # Build components array with nested product, product_variation, and prices
-            components = []
-            active_bundle_products = bundle.bundle_products.filter(is_active=True).order_by('sort_order')
-
-            for bp in active_bundle_products:
-                store_product = bp.product
-                ppv = store_product.get_material_ppv()
-
-                # Get product fullname
-                product_fullname = store_product.product_code
-                product_id = store_product.id
-                if ppv and ppv.product:
-                    product_fullname = ppv.product.fullname or store_product.product_code
-                    product_id = ppv.product.id
-
-                # Get product variation info
-                product_variation = None
-                if ppv and ppv.product_variation:
-                    pv = ppv.product_variation
-                    product_variation = {
-                        'id': pv.id,
-                        'name': pv.name,
-                        'variation_type': pv.variation_type,
-                        'description_short': pv.description_short,
-                    }
-
-                # Get prices
-                prices = [
-                    {
-                        'price_type': price.price_type,
-                        'amount': str(price.amount),
-                        'currency': price.currency,
-                    }
-                    for price in store_product.prices.all()
-                ]
-
-                component = {
-                    'id': store_product.id,
-                    'product_code': store_product.product_code,
-                    'product': {
-                        'id': product_id,
-                        'fullname': product_fullname,
-                    },
-                    'product_variation': product_variation,
-                    'prices': prices,
-                    'default_price_type': bp.default_price_type,
-                    'quantity': bp.quantity,
-                    'sort_order': bp.sort_order,
+        return bundles_queryset
+
+    def _load_bundles(self, filters: Dict) -> List:
+        """Evaluate ``_bundle_queryset`` (bundles plus prefetched components)."""
+        return list(self._bundle_queryset(filters))
+
+    def _get_bundles(self, filters: Dict, search_query: str,
+                     bundle_filter_active: bool, no_fuzzy_results: bool,
+                     bundles: Optional[List] = None) -> List[Dict]:
+        """Get bundles matching filters using single-product matching semantics.
+
+        Single-product matching: a bundle qualifies if at least one of its
+        component products satisfies ALL active filter conditions simultaneously.
+        This prevents false matches where different products satisfy different
+        filter dimensions.
+
+        ``bundles`` is the result of ``_load_bundles(filters)`` when the
+        caller already has it.
+        """
+        if no_fuzzy_results and not bundle_filter_active:
+            return []
+
+        if bundles is None:
+            bundles = self._load_bundles(filters)
+        return [self._serialize_bundle(bundle) for bundle in bundles]
+
+    @staticmethod
+    def _serialize_bundle(bundle) -> Dict:
+        """Bundle in the format expected by BundleCard.js.
+
+        Reads only prefetched data (``bundle.active_components``).
+        """
+        # Build components array with nested product, product_variation, and prices
+        components = []
+        for bp in bundle.active_components:
+            store_product = bp.product
+            ppv = store_product.get_material_ppv()
+
+            # Get product fullname
+            product_fullname = store_product.product_code
+            product_id = store_product.id
+            if ppv and ppv.product:
+                product_fullname = ppv.product.fullname or store_product.product_code
+                product_id = ppv.product.id
+
+            # Get product variation info
+            product_variation = None
+            if ppv and ppv.product_variation:
+                pv = ppv.product_variation
+                product_variation = {
+                    'id': pv.id,
+                    'name': pv.name,
+                    'variation_type': pv.variation_type,
+                    'description_short': pv.description_short,
                 }
-                components.append(component)
-
-            bundle_data = {
-                'id': bundle.id,  # Numeric ID for API calls
-                'essp_id': bundle.id,
-                'item_type': 'bundle',
-                'is_bundle': True,
-                'type': 'Bundle',
-                'bundle_type': 'store',
-                'name': bundle.name,
-                'bundle_name': bundle.name,  # BundleCard.js expects this
-                'shortname': bundle.name,
-                'fullname': bundle.description or bundle.name,
-                'description': bundle.description,
-                'code': bundle.exam_session_subject.subject.code,
-                'subject_code': bundle.exam_session_subject.subject.code,
-                'subject_id': bundle.exam_session_subject.subject.id,
-                'exam_session_code': bundle.exam_session_subject.exam_session.session_code,
-                'exam_session_id': bundle.exam_session_subject.exam_session.id,
-                'components': components,  # BundleCard.js expects 'components'
-                'components_count': len(components),  # BundleCard.js expects this
+
+            # Get prices
+            prices = [
+                {
+                    'price_type': price.price_type,
+                    'amount': str(price.amount),
+                    'currency': price.currency,
+                }
+                for price in store_product.prices.all()
+            ]
+
+            component = {
+                'id': store_product.id,
+                'product_code': store_product.product_code,
+                'product': {
+                    'id': product_id,
+                    'fullname': product_fullname,
+                },
+                'product_variation': product_variation,
+                'prices': prices,
+                'default_price_type': bp.default_price_type,
+                'quantity': bp.quantity,
+                'sort_order': bp.sort_order,
             }
-            bundles_data.append(bundle_data)
+            components.append(component)
 
-        return bundles_data
+        return {
+            'id': bundle.id,  # Numeric ID for API calls
+            'essp_id': bundle.id,
+            'item_type': 'bundle',
+            'is_bundle': True,
+            'type': 'Bundle',
+            'bundle_type': 'store',
+            'name': bundle.name,
+            'bundle_name': bundle.name,  # BundleCard.js expects this
+            'shortname': bundle.name,
+            'fullname': bundle.description or bundle.name,
+            'description': bundle.description,
+            'code': bundle.exam_session_subject.subject.code,
+            'subject_code': bundle.exam_session_subject.subject.code,
+            'subject_id': bundle.exam_session_subject.subject.id,
+            'exam_session_code': bundle.exam_session_subject.exam_session.session_code,
+            'exam_session_id': bundle.exam_session_subject.exam_session.id,
+            'components': components,  # BundleCard.js expects 'components'
+            'components_count': len(components),  # BundleCard.js expects this
+        }
 
     @staticmethod
     def _resolve_group_ids_with_hierarchy(group_names, exclude_names=None):
@@ -590,7 +611,18 @@ class SearchService:
         return resolved_ids
 
     def _get_bundle_matching_product_ids(self, filters: Dict) -> Optional[set]:
-        """Find store.Product IDs that satisfy ALL non-subject filter dimensions.
+        """Set of store.Product IDs that satisfy ALL non-subject filter
+        dimensions, or None if no non-subject filters are active.
+
+        See _bundle_matching_products.
+        """
+        matching_products = self._bundle_matching_products(filters)
+        if matching_products is None:
+            return None
+        return set(matching_products.values_list('id', flat=True))
+
+    def _bundle_matching_products(self, filters: Dict):
+        """Find store.Products that satisfy ALL non-subject filter dimensions.
 
         Used for single-product matching: a bundle qualifies only if at least
         one of its component products matches ALL active filter conditions
@@ -603,8 +635,9 @@ class SearchService:
             filters: Dict of active filters.
 
         Returns:
-            Set of matching store.Product IDs, or None if no non-subject
-            filters are active (meaning all bundles qualify).
+            Unevaluated queryset of matching store.Products (bundle queries
+            use it as a subquery), or None if no non-subject filters are
+            active (meaning all bundles qualify).
         """
         # Collect non-subject filter conditions
         has_non_subject_filters = any(
@@ -651,52 +684,26 @@ class SearchService:
                         materialproduct__product_product_variation__product_groups__product_group__name__in=names
                     )
 
-        return set(product_qs.distinct().values_list('id', flat=True))
+        return product_qs.distinct()
 
-    def _get_filtered_bundle_count(self, filters: Dict) -> int:
+    def _get_filtered_bundle_count(self, filters: Dict, bundles: Optional[List] = None) -> int:
         """Count bundles that match ALL active filter dimensions.
 
-        Uses the same single-product matching semantics as _get_bundles():
-        a bundle is counted only if at least one component product satisfies
-        ALL active filter conditions simultaneously.
+        Uses the same visibility rules and single-product matching
+        semantics as _get_bundles() (both go through _bundle_queryset), so
+        the count never over-reports bundles filtered out of the list.
 
         Args:
             filters: Dict of active filters.
+            bundles: ``_load_bundles(filters)`` when the caller already
+                loaded them; the count is then taken from that list.
 
         Returns:
             Count of matching active bundles.
         """
-        # Match the visibility rules used by _get_bundles: bundle must be
-        # active AND contain at least one component whose Purchasable passes
-        # available_for_listing(). Otherwise the count would over-report
-        # bundles that are filtered out of the actual list.
-        from store.models import Purchasable
-        available_purchasable_ids = Purchasable.objects.available_for_listing().values('pk')
-        bundles_qs = StoreBundle.objects.filter(
-            is_active=True,
-            bundle_products__is_active=True,
-            bundle_products__product_id__in=available_purchasable_ids,
-        ).distinct()
-
-        # Apply subject filter at bundle level
-        if filters.get('subjects'):
-            subject_q = Q()
-            for subject in filters['subjects']:
-                if isinstance(subject, int) or (isinstance(subject, str) and subject.isdigit()):
-                    subject_q |= Q(exam_session_subject__subject__id=int(subject))
-                else:
-                    subject_q |= Q(exam_session_subject__subject__code=subject)
-            bundles_qs = bundles_qs.filter(subject_q)
-
-        # Apply non-subject filters via single-product matching
-        matching_product_ids = self._get_bundle_matching_product_ids(filters)
-        if matching_product_ids is not None:
-            bundles_qs = bundles_qs.filter(
-                bundle_products__product__id__in=matching_product_ids,
-                bundle_products__is_active=True
-            ).distinct()
-
-        return bundles_qs.count()
+        if bundles is not None:
+            return len(bundles)
+        return self._bundle_queryset(filters).count()
 
     def fuzzy_search(self, query: str, min_score: int = 60, limit: int = 50) -> Dict[str, Any]:
         """
@@ -716,23 +723,11 @@ class SearchService:
         self.min_fuzzy_score = min_score
         query_lower = query.strip().lower()
 
-        base_queryset = self._build_optimized_queryset()
-        products_with_scores = []
-
-        for sp in base_queryset:
-            searchable_text = self._build_searchable_text(sp)
-            score = self._calculate_fuzzy_score(query_lower, searchable_text, sp)
-
-            if score >= min_score:
-                products_with_scores.append((sp, score))
-
-        # Sort by score
-        products_with_scores.sort(key=lambda x: x[1], reverse=True)
-        top_products = products_with_scores[:limit]
-
-        # Serialize
-        products_list = [item[0] for item in top_products]
-        products_data = StoreProductListSerializer.serialize_grouped_products(products_list)
+        products_with_scores, cards = self._score_product_cards(
+            self._build_optimized_queryset(), query_lower, min_score,
+        )
+        top_ids = [pid for pid, _ in products_with_scores[:limit]]
+        products_data = assemble_product_cards(top_ids, cards)
 
         return {
             'products': products_data,
@@ -790,20 +785,9 @@ class SearchService:
         # Fuzzy search on filtered queryset
         self.min_fuzzy_score = min_score
         query_lower = query.strip().lower()
-        products_with_scores = []
-
-        for sp in base_queryset:
-            searchable_text = self._build_searchable_text(sp)
-            score = self._calculate_fuzzy_score(query_lower, searchable_text, sp)
-
-            if score >= min_score:
-                products_with_scores.append((sp, score))
-
-        products_with_scores.sort(key=lambda x: x[1], reverse=True)
-        top_products = products_with_scores[:limit]
-
-        products_list = [item[0] for item in top_products]
-        products_data = StoreProductListSerializer.serialize_grouped_products(products_list)
+        products_with_scores, cards = self._score_product_cards(base_queryset, query_lower, min_score)
+        top_ids = [pid for pid, _ in products_with_scores[:limit]]
+        products_data = assemble_product_cards(top_ids, cards)
 
         return {
             'products': products_data,
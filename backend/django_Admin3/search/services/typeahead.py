@@ -0,0 +1,236 @@
+"""
+Typeahead suggestions for the storefront search box.
+
+``catalog.views.navigation_views.fuzzy_search`` runs fuzzywuzzy over every
+subject, filter group, catalog product and listing-visible store product
+on each keystroke. Suggestions only need a handful of names, so this
+module keeps an in-process prefix index instead:
+
+  - ``SuggestionIndex`` holds a sorted array of lower-cased keys (subject
+    codes, product codes, short names and the words in them). A prefix
+    lookup is a ``bisect`` plus a short forward scan.
+  - When no key starts with the query, a bounded edit-distance pass over
+    the keys sharing its first character suggests near misses ("cm3" →
+    "cm2"). That is the only fuzzy scoring this path does.
+
+The index is built once per process and versioned by the catalogue
+generation: a token in the shared cache that search.signals replaces
+when a committed write adds, removes or renames a subject or product.
+Each lookup costs one cache read; a changed token (or an index older
+than ``INDEX_MAX_AGE_SECONDS``) triggers a rebuild.
+"""
+import bisect
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+
+logger = logging.getLogger('search')
+
+GENERATION_CACHE_KEY = 'search:catalog_generation'
+INDEX_MAX_AGE_SECONDS = 3600
+MAX_PREFIX_SCAN = 500
+MIN_FUZZY_LENGTH = 3
+
+# Ranking of suggestion types when keys tie.
+TYPE_PRIORITY = {'subject': 0, 'product_group': 1, 'product': 2, 'store_product': 3}
+
+
+def get_catalog_generation() -> str:
+    """Current catalogue generation token (created on first use)."""
+    generation = cache.get(GENERATION_CACHE_KEY)
+    if generation is None:
+        cache.add(GENERATION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        generation = cache.get(GENERATION_CACHE_KEY)
+    return generation
+
+
+def bump_catalog_generation() -> None:
+    """Start a new catalogue generation; every process rebuilds its index."""
+    cache.set(GENERATION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def _tokens(text: str) -> List[str]:
+    return [token for token in text.lower().replace('/', ' ').split() if token]
+
+
+def prefix_edit_distance(query: str, key: str, max_distance: int) -> int:
+    """Smallest edit distance between ``query`` and any prefix of ``key``.
+
+    Returns ``max_distance + 1`` as soon as every cell of a DP row exceeds
+    ``max_distance``.
+    """
+    key = key[:len(query) + max_distance]
+    previous = list(range(len(key) + 1))
+    for i, q_char in enumerate(query, 1):
+        current = [i]
+        for j, k_char in enumerate(key, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (q_char != k_char),
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous)
+
+
+@dataclass
+class SuggestionIndex:
+    """Sorted-array prefix index over catalogue suggestions."""
+
+    generation: str
+    keys: List[str] = field(default_factory=list)
+    # Parallel to ``keys``: (rank, suggestion id) — rank 0 for whole
+    # codes/names, 1 for single words within a name.
+    postings: List[Tuple[int, int]] = field(default_factory=list)
+    suggestions: List[Dict] = field(default_factory=list)
+    built_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(cls, generation: str) -> 'SuggestionIndex':
+        index = cls(generation=generation)
+        entries = []
+        for suggestion, whole_keys, word_keys in _catalog_entries():
+            suggestion_id = len(index.suggestions)
+            index.suggestions.append(suggestion)
+            for key in {key.lower() for key in whole_keys if key}:
+                entries.append((key, 0, suggestion_id))
+            for key in set(word_keys) - {key.lower() for key in whole_keys if key}:
+                entries.append((key, 1, suggestion_id))
+        entries.sort()
+        index.keys = [key for key, _, _ in entries]
+        index.postings = [(rank, suggestion_id) for _, rank, suggestion_id in entries]
+        return index
+
+    def _rank(self, key: str, query: str, rank: int, suggestion_id: int) -> tuple:
+        suggestion = self.suggestions[suggestion_id]
+        return (key != query, rank, TYPE_PRIORITY[suggestion['type']], len(key), suggestion['label'])
+
+    def lookup_prefix(self, query: str, limit: int) -> List[Dict]:
+        start = bisect.bisect_left(self.keys, query)
+        best = {}
+        for position in range(start, min(start + MAX_PREFIX_SCAN, len(self.keys))):
+            key = self.keys[position]
+            if not key.startswith(query):
+                break
+            rank, suggestion_id = self.postings[position]
+            sort_key = self._rank(key, query, rank, suggestion_id)
+            if suggestion_id not in best or sort_key < best[suggestion_id]:
+                best[suggestion_id] = sort_key
+        ordered = sorted(best, key=best.get)[:limit]
+        return [self.suggestions[suggestion_id] for suggestion_id in ordered]
+
+    def lookup_fuzzy(self, query: str, limit: int) -> List[Dict]:
+        """Near misses for ``query`` among keys sharing its first character."""
+        if len(query) < MIN_FUZZY_LENGTH:
+            return []
+        max_distance = 1 if len(query) < 6 else 2
+        start = bisect.bisect_left(self.keys, query[0])
+        end = bisect.bisect_left(self.keys, chr(ord(query[0]) + 1))
+        best = {}
+        for position in range(start, end):
+            key = self.keys[position]
+            distance = prefix_edit_distance(query, key, max_distance)
+            if distance > max_distance:
+                continue
+            rank, suggestion_id = self.postings[position]
+            sort_key = (distance, *self._rank(key, query, rank, suggestion_id))
+            if suggestion_id not in best or sort_key < best[suggestion_id]:
+                best[suggestion_id] = sort_key
+        ordered = sorted(best, key=best.get)[:limit]
+        return [self.suggestions[suggestion_id] for suggestion_id in ordered]
+
+    def suggest(self, query: str, limit: int = 8) -> Tuple[List[Dict], bool]:
+        """Return ``(suggestions, fuzzy)`` for a raw search-box query."""
+        query = ' '.join(query.lower().split())
+        if not query:
+            return [], False
+        results = self.lookup_prefix(query, limit)
+        if results:
+            return results, False
+        return self.lookup_fuzzy(query, limit), True
+
+
+def _catalog_entries():
+    """Yield (suggestion, whole_keys, word_keys) for every suggestible row."""
+    from catalog.models import Product, Subject
+    from filtering.models import FilterGroup
+    from store.models import Product as StoreProduct
+
+    for pk, code, description in Subject.objects.filter(active=True).values_list(
+        'pk', 'code', 'description',
+    ):
+        yield (
+            {'type': 'subject', 'id': pk, 'code': code, 'label': f'{code} - {description}'},
+            [code],
+            _tokens(description or ''),
+        )
+
+    for pk, code, name in FilterGroup.objects.filter(is_active=True).values_list('pk', 'code', 'name'):
+        yield (
+            {'type': 'product_group', 'id': pk, 'code': code, 'label': name},
+            [name],
+            _tokens(name),
+        )
+
+    for pk, code, shortname in Product.objects.filter(is_active=True).values_list(
+        'pk', 'code', 'shortname',
+    ):
+        yield (
+            {'type': 'product', 'id': pk, 'code': code, 'label': shortname},
+            [code, shortname],
+            _tokens(shortname or ''),
+        )
+
+    store_rows = StoreProduct.available_for_listing().filter(is_active=True).values_list(
+        'pk', 'product_code', 'exam_session_subject__subject__code',
+        'materialproduct__product_product_variation__product__shortname',
+    )
+    for pk, product_code, subject_code, shortname in store_rows:
+        label = f'{subject_code} {shortname}' if shortname else product_code
+        yield (
+            {'type': 'store_product', 'id': pk, 'code': product_code, 'label': label},
+            [product_code],
+            [],
+        )
+
+
+_index: Optional[SuggestionIndex] = None
+_index_lock = threading.Lock()
+
+
+def _is_current(index: Optional[SuggestionIndex], generation: str) -> bool:
+    return (
+        index is not None
+        and index.generation == generation
+        and time.monotonic() - index.built_at < INDEX_MAX_AGE_SECONDS
+    )
+
+
+def get_suggestion_index() -> SuggestionIndex:
+    """This process's index for the current catalogue generation."""
+    global _index
+    generation = get_catalog_generation()
+    if _is_current(_index, generation):
+        return _index
+    with _index_lock:
+        if not _is_current(_index, generation):
+            started = time.perf_counter()
+            _index = SuggestionIndex.build(generation)
+            logger.info(
+                f'[SEARCH] Built typeahead index: {len(_index.suggestions)} suggestions, '
+                f'{len(_index.keys)} keys in {(time.perf_counter() - started) * 1000:.0f}ms'
+            )
+        return _index
+
+
+def clear_suggestion_index() -> None:
+    """Drop this process's index (tests)."""
+    global _index
+    _index = None
@@ -0,0 +1,195 @@
+"""
+Product card projection maintenance.
+
+Every model a card document is rendered from is mapped to the
+store.Product ids whose cards it affects. On save/delete those cards are
+deleted in the writing transaction (so a reader never sees a card older
+than the data it shows) and a refresh task is enqueued once the
+transaction commits. Reads rebuild any card still missing, so a failed
+or skipped refresh only costs the first reader a rebuild.
+
+Tutorial events and sessions are not listed: the card documents do not
+embed them.
+
+Typeahead receivers start a new catalogue generation on commit, which
+makes every process rebuild its typeahead index (search.services.typeahead),
+only when a subject or product is created or deleted or one of the fields
+the index is built from changes. Prices, recommendations and filter
+groups don't bump it; the index's maximum age picks those up.
+"""
+import logging
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from search.services.product_cards import invalidate_product_cards
+from search.services.typeahead import bump_catalog_generation
+
+logger = logging.getLogger('search')
+
+
+def _store_product_ids(**lookups):
+    from store.models import Product as StoreProduct
+
+    return StoreProduct.objects.filter(**lookups).values_list('pk', flat=True)
+
+
+def _material_product_ids(product):
+    # Cards recommending this PPV in the same ESS embed this product once
+    # it exists; those whose recommendation resolved to None need a rebuild.
+    return [product.pk, *_store_product_ids(
+        exam_session_subject_id=product.exam_session_subject_id,
+        materialproduct__product_product_variation__recommendation__recommended_product_product_variation_id=(
+            product.product_product_variation_id
+        ),
+    )]
+
+
+# model label -> function(instance) returning affected store.Product ids
+CARD_DEPENDENCIES = {
+    'store.Price': lambda price: [price.purchasable_id],
+    'store.Product': lambda product: [product.pk],
+    'store.MaterialProduct': _material_product_ids,
+    'store.TutorialProduct': lambda product: [product.pk],
+    'store.MarkingProduct': lambda product: [product.pk],
+    'catalog_products.ProductProductVariation': lambda ppv: _store_product_ids(
+        materialproduct__product_product_variation=ppv.pk,
+    ),
+    'catalog_products.Product': lambda product: _store_product_ids(
+        materialproduct__product_product_variation__product=product.pk,
+    ),
+    'catalog_products.ProductVariation': lambda variation: _store_product_ids(
+        materialproduct__product_product_variation__product_variation=variation.pk,
+    ),
+    'catalog_products_recommendations.ProductVariationRecommendation': lambda recommendation: _store_product_ids(
+        materialproduct__product_product_variation=recommendation.product_product_variation_id,
+    ),
+    'filtering.ProductProductGroup': lambda product_group: _store_product_ids(
+        materialproduct__product_product_variation=product_group.product_product_variation_id,
+    ),
+    'filtering.FilterGroup': lambda group: _store_product_ids(
+        materialproduct__product_product_variation__product_groups__product_group=group.pk,
+    ),
+    'catalog_subjects.Subject': lambda subject: _store_product_ids(exam_session_subject__subject=subject.pk),
+    'catalog_exam_sessions.ExamSession': lambda session: _store_product_ids(
+        exam_session_subject__exam_session=session.pk,
+    ),
+    'catalog.ExamSessionSubject': lambda ess: _store_product_ids(exam_session_subject=ess.pk),
+    'tutorials.TutorialLocation': lambda location: _store_product_ids(
+        tutorialproduct__tutorial_location=location.pk,
+    ),
+    'tutorials.TutorialCourseTemplate': lambda template: _store_product_ids(
+        tutorialproduct__tutorial_course_template=template.pk,
+    ),
+    'marking.MarkingTemplate': lambda template: _store_product_ids(
+        markingproduct__marking_template=template.pk,
+    ),
+}
+
+
+def _enqueue_refresh(store_product_ids):
+    from search.tasks import refresh_product_cards_task
+
+    try:
+        refresh_product_cards_task.enqueue(sorted(store_product_ids))
+    except Exception as e:
+        # Cards stay missing and are rebuilt by the next read.
+        logger.warning(f'Failed to enqueue product card refresh: {str(e)}')
+
+
+def _make_receiver(label, resolve):
+    def invalidate_product_cards_on_change(sender, instance, **kwargs):
+        if kwargs.get('raw'):
+            return  # loaddata
+        try:
+            store_product_ids = set(resolve(instance))
+        except Exception as e:
+            logger.warning(f'Could not resolve product cards affected by {label} {instance.pk}: {str(e)}')
+            return
+        if not store_product_ids:
+            return
+        invalidate_product_cards(store_product_ids)
+        transaction.on_commit(lambda: _enqueue_refresh(store_product_ids))
+
+    return invalidate_product_cards_on_change
+
+
+def _connect(label):
+    model = apps.get_model(label)
+    receiver = _make_receiver(label, CARD_DEPENDENCIES[label])
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f'search_cards_save_{label}')
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f'search_cards_delete_{label}')
+
+
+def connect_card_signals():
+    """Connect the receivers; called from SearchConfig.ready()."""
+    for label in CARD_DEPENDENCIES:
+        _connect(label)
+
+
+# model label -> fields search.services.typeahead builds suggestions from
+TYPEAHEAD_FIELDS = {
+    'catalog_subjects.Subject': ('code', 'description', 'active'),
+    'catalog_products.Product': ('code', 'shortname', 'is_active'),
+    'store.Product': ('product_code', 'is_active'),
+    'store.MaterialProduct': ('product_code', 'is_active'),
+    'store.MarkingProduct': ('product_code', 'is_active'),
+    'store.TutorialProduct': ('product_code', 'is_active'),
+}
+
+
+def _typeahead_values(instance, fields):
+    return tuple(getattr(instance, name) for name in fields)
+
+
+def _make_typeahead_receivers(fields):
+    def remember_typeahead_values(sender, instance, **kwargs):
+        if kwargs.get('raw') or instance.pk is None:
+            return
+        instance._typeahead_values = (
+            sender._default_manager.filter(pk=instance.pk).values_list(*fields).first()
+        )
+
+    def bump_generation_on_change(sender, instance, created=False, **kwargs):
+        if kwargs.get('raw'):
+            return
+        if created or getattr(instance, '_typeahead_values', None) != _typeahead_values(instance, fields):
+            # Typeahead indexes are rebuilt per process on the next lookup.
+            transaction.on_commit(bump_catalog_generation)
+
+    def bump_generation_on_delete(sender, instance, **kwargs):
+        transaction.on_commit(bump_catalog_generation)
+
+    return remember_typeahead_values, bump_generation_on_change, bump_generation_on_delete
+
+
+def connect_typeahead_signals():
+    """Connect the typeahead receivers; called from SearchConfig.ready()."""
+    for label, fields in TYPEAHEAD_FIELDS.items():
+        model = apps.get_model(label)
+        remember, on_change, on_delete = _make_typeahead_receivers(fields)
+        pre_save.connect(remember, sender=model, weak=False, dispatch_uid=f'search_typeahead_pre_save_{label}')
+        post_save.connect(on_change, sender=model, weak=False, dispatch_uid=f'search_typeahead_save_{label}')
+        post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'search_typeahead_delete_{label}')
+
+
+@contextmanager
+def card_signals_paused(*labels):
+    """Disconnect the receivers of ``labels`` (e.g. 'store.Price') for the
+    block.
+
+    For bulk writes that would otherwise invalidate and enqueue a refresh
+    per row; the caller rebuilds the cards itself (rebuild_product_cards).
+    Process-wide, so meant for management commands.
+    """
+    for label in labels:
+        model = apps.get_model(label)
+        post_save.disconnect(sender=model, dispatch_uid=f'search_cards_save_{label}')
+        post_delete.disconnect(sender=model, dispatch_uid=f'search_cards_delete_{label}')
+    try:
+        yield
+    finally:
+        for label in labels:
+            _connect(label)
@@ -0,0 +1,13 @@
+from django.tasks import task
+
+from search.services.product_cards import refresh_product_cards
+
+
+@task()
+def refresh_product_cards_task(store_product_ids: list) -> None:
+    """Rebuild the product cards invalidated by a committed write.
+
+    Always rebuilds: a card that exists now may have been rebuilt by a
+    concurrent read from data older than this write.
+    """
+    refresh_product_cards(store_product_ids)
@@ -0,0 +1,97 @@
+"""Query-count tests for the bundle read path of SearchService.
+
+Bundles, their active components, PPVs and prices load in a fixed number
+of queries, and the bundle count reuses the loaded list.
+"""
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from search.services.search_service import SearchService
+from search.tests.factories import (
+    create_subject,
+    create_exam_session,
+    create_exam_session_subject,
+    create_catalog_product,
+    create_product_variation,
+    create_store_product,
+    create_bundle_with_products,
+)
+from store.models import Price
+
+
+class BundleQueryCountTest(TestCase):
+
+    def setUp(self):
+        self.service = SearchService()
+        self.ess = create_exam_session_subject(create_exam_session('2025-04'), create_subject('SBQ1'))
+        catalog = create_catalog_product('SBQ1 Course Notes', 'SBQ1 Notes', 'SBQN')
+        self.printed = create_store_product(
+            self.ess, catalog, create_product_variation('Printed', 'Print', code='BQP'),
+            product_code='SBQ1/BQP/2025-04',
+        )
+        self.ebook = create_store_product(
+            self.ess, catalog, create_product_variation('eBook', 'eBook', code='BQE'),
+            product_code='SBQ1/BQE/2025-04',
+        )
+        for sp in (self.printed, self.ebook):
+            Price.objects.create(product=sp, price_type='standard', amount=Decimal('25.00'), currency='GBP')
+
+    def _make_bundles(self, count, start=0):
+        for i in range(start, start + count):
+            create_bundle_with_products(self.ess, [self.printed, self.ebook], bundle_name=f'SBQ1 Pack {i}')
+
+    def _get_bundles(self):
+        return self.service._get_bundles(
+            filters={}, search_query='', bundle_filter_active=False, no_fuzzy_results=False,
+        )
+
+    def test_query_count_is_constant_for_200_bundles(self):
+        self._make_bundles(1)
+        with CaptureQueriesContext(connection) as one_bundle:
+            self._get_bundles()
+
+        self._make_bundles(199, start=1)
+        with CaptureQueriesContext(connection) as many_bundles:
+            bundles = self._get_bundles()
+
+        self.assertEqual(len(bundles), 200)
+        self.assertEqual(len(many_bundles), len(one_bundle))
+        self.assertLessEqual(len(many_bundles), 3)
+        components = bundles[0]['components']
+        self.assertEqual([c['id'] for c in components], [self.printed.id, self.ebook.id])
+        self.assertEqual(components[0]['prices'][0]['amount'], '25.00')
+
+    def test_filtered_query_count_is_constant(self):
+        self._make_bundles(200)
+        with CaptureQueriesContext(connection) as queries:
+            bundles = self.service._get_bundles(
+                filters={'subjects': ['SBQ1'], 'products': [str(self.printed.get_material_ppv().product_id)]},
+                search_query='', bundle_filter_active=True, no_fuzzy_results=False,
+            )
+
+        self.assertEqual(len(bundles), 200)
+        self.assertLessEqual(len(queries), 3)
+
+    def test_count_reuses_loaded_bundles(self):
+        self._make_bundles(3)
+        bundles = self.service._load_bundles({})
+
+        with self.assertNumQueries(0):
+            count = self.service._get_filtered_bundle_count({}, bundles=bundles)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(self.service._get_filtered_bundle_count({}), 3)
+
+    def test_inactive_components_are_left_out(self):
+        bundle, bundle_products = create_bundle_with_products(self.ess, [self.printed, self.ebook], 'SBQ1 Mixed')
+        bundle_products[1].is_active = False
+        bundle_products[1].save()
+
+        bundles = self._get_bundles()
+
+        self.assertEqual(len(bundles), 1)
+        self.assertEqual([c['id'] for c in bundles[0]['components']], [self.printed.id])
+        self.assertEqual(bundles[0]['components_count'], 1)
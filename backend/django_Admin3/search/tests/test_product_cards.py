@@ -0,0 +1,160 @@
+"""Tests for the product card projection (search.ProductCard).
+
+Covers: card build / lookup parity with StoreProductListSerializer,
+variation trimming, signal invalidation and pausing, the refresh task,
+the bounded inline build, the search.product_cards warmer and the
+rebuild_product_cards command.
+"""
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from search.models import ProductCard
+from search.serializers import StoreProductListSerializer
+from search.signals import card_signals_paused
+from search.tasks import refresh_product_cards_task
+from search.services.product_cards import (
+    assemble_product_cards, build_missing_product_cards, get_product_cards, with_card_relations,
+)
+from search.tests.factories import (
+    create_subject,
+    create_exam_session,
+    create_exam_session_subject,
+    create_catalog_product,
+    create_product_variation,
+    create_store_product,
+    create_tutorial_product,
+    create_marking_product,
+)
+from store.models import Price, Product as StoreProduct
+
+
+class ProductCardProjectionTest(TestCase):
+
+    def setUp(self):
+        self.ess = create_exam_session_subject(create_exam_session('2025-04'), create_subject('CM2'))
+        self.catalog_product = create_catalog_product(
+            fullname='CM2 Combined Materials', shortname='CM2 Materials', code='PCM2',
+        )
+        self.printed_sp = create_store_product(
+            self.ess, self.catalog_product, create_product_variation('Printed', 'Standard Printed', code='P'),
+        )
+        self.ebook_sp = create_store_product(
+            self.ess, self.catalog_product, create_product_variation('eBook', 'Vitalsource eBook', code='C'),
+        )
+        self.tutorial_sp = create_tutorial_product(self.ess)
+        self.marking_sp = create_marking_product(self.ess)
+        for sp in (self.printed_sp, self.ebook_sp, self.tutorial_sp, self.marking_sp):
+            Price.objects.create(product=sp, price_type='standard', amount=Decimal('10.00'), currency='GBP')
+        self.ids = [self.printed_sp.pk, self.ebook_sp.pk, self.tutorial_sp.pk, self.marking_sp.pk]
+
+    def _serialized(self, ids):
+        products = with_card_relations(StoreProduct.objects.filter(pk__in=ids))
+        by_id = {sp.pk: sp for sp in products}
+        return StoreProductListSerializer.serialize_grouped_products([by_id[pk] for pk in ids])
+
+    def test_cards_match_serializer_output(self):
+        result = assemble_product_cards(self.ids, get_product_cards(self.ids))
+
+        self.assertEqual(result, self._serialized(self.ids))
+        self.assertEqual(ProductCard.objects.count(), 3)
+
+    def test_lookup_is_one_query_once_built(self):
+        get_product_cards(self.ids)
+
+        with self.assertNumQueries(1):
+            cards = get_product_cards(self.ids)
+
+        self.assertEqual(set(cards), set(self.ids))
+
+    def test_material_variations_trimmed_to_requested_ids(self):
+        ids = [self.ebook_sp.pk]
+        result = assemble_product_cards(ids, get_product_cards(ids))
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]['store_product_id'], self.ebook_sp.pk)
+        self.assertEqual([v['store_product_id'] for v in result[0]['variations']], ids)
+        self.assertEqual(result, self._serialized(ids))
+
+    def test_price_change_invalidates_card(self):
+        get_product_cards(self.ids)
+
+        price = Price.objects.get(purchasable_id=self.ebook_sp.pk)
+        price.amount = Decimal('12.50')
+        price.save()
+
+        self.assertFalse(ProductCard.objects.filter(store_product_ids__contains=[self.ebook_sp.pk]).exists())
+        result = assemble_product_cards(self.ids, get_product_cards(self.ids))
+        amounts = {v['store_product_id']: v['prices'][0]['amount'] for v in result[0]['variations']}
+        self.assertEqual(amounts[self.ebook_sp.pk], '12.50')
+
+    def test_refresh_task_rebuilds_existing_cards(self):
+        # A read may rebuild a card from data older than the write whose
+        # refresh is queued; the refresh must not trust existing cards.
+        get_product_cards(self.ids)
+        Price.objects.filter(purchasable_id=self.ebook_sp.pk).update(amount=Decimal('14.00'))
+
+        refresh_product_cards_task.call([self.ebook_sp.pk])
+
+        card = get_product_cards([self.ebook_sp.pk])[self.ebook_sp.pk]
+        amounts = {v['store_product_id']: v['prices'][0]['amount'] for v in card.document['variations']}
+        self.assertEqual(amounts[self.ebook_sp.pk], '14.00')
+
+    def test_paused_signals_leave_cards_alone_until_resumed(self):
+        get_product_cards(self.ids)
+        price = Price.objects.get(purchasable_id=self.ebook_sp.pk)
+
+        with card_signals_paused('store.Price'):
+            price.save()
+        self.assertTrue(ProductCard.objects.filter(store_product_ids__contains=[self.ebook_sp.pk]).exists())
+
+        price.save()
+        self.assertFalse(ProductCard.objects.filter(store_product_ids__contains=[self.ebook_sp.pk]).exists())
+
+    def test_inline_build_is_bounded(self):
+        with patch('search.services.product_cards.INLINE_BUILD_LIMIT', 1):
+            cards = get_product_cards([self.tutorial_sp.pk, self.marking_sp.pk])
+
+        self.assertEqual(list(cards), [min(self.tutorial_sp.pk, self.marking_sp.pk)])
+        self.assertEqual(ProductCard.objects.count(), 1)
+
+    def test_build_missing_builds_only_cardless_products(self):
+        get_product_cards([self.tutorial_sp.pk])
+        tutorial_card = ProductCard.objects.get()
+
+        self.assertEqual(build_missing_product_cards(), 2)
+
+        self.assertEqual(ProductCard.objects.count(), 3)
+        self.assertEqual(ProductCard.objects.get(pk=tutorial_card.pk).updated_at, tutorial_card.updated_at)
+        with self.assertNumQueries(1):
+            self.assertEqual(set(get_product_cards(self.ids)), set(self.ids))
+
+    def test_search_entries_match_fuzzy_text(self):
+        from search.services.search_service import search_service
+
+        card = get_product_cards([self.tutorial_sp.pk])[self.tutorial_sp.pk]
+        searchable_text, product_name, subject_code = card.search_entries[str(self.tutorial_sp.pk)]
+
+        sp = with_card_relations(StoreProduct.objects.filter(pk=self.tutorial_sp.pk)).get()
+        self.assertEqual(searchable_text, search_service._build_searchable_text(sp))
+        self.assertEqual(subject_code, 'cm2')
+
+
+class RebuildProductCardsCommandTest(TestCase):
+
+    def test_rebuild_builds_cards_and_drops_orphans(self):
+        ess = create_exam_session_subject(create_exam_session('2025-04'), create_subject('CM2'))
+        sp = create_marking_product(ess)
+        ProductCard.objects.create(
+            card_key='marking:999999', kind='marking', product_type='Markings', subject_code='CM2',
+            exam_session_id=ess.exam_session_id, store_product_ids=[999999], document={},
+        )
+
+        out = StringIO()
+        call_command('rebuild_product_cards', stdout=out)
+
+        self.assertEqual(list(ProductCard.objects.values_list('card_key', flat=True)), [f'marking:{sp.pk}'])
+        self.assertIn('Rebuilt 1 product card(s)', out.getvalue())
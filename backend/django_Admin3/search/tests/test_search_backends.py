@@ -0,0 +1,121 @@
+"""Tests for the pluggable search backends (search.services.backends)."""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from search.models import ProductSearchDocument
+from search.services.backends import (
+    FuzzySearchBackend, PostgresSearchBackend, get_search_backend,
+)
+from search.services.product_cards import refresh_product_cards
+from search.services.search_service import SearchService
+from search.tests.factories import (
+    create_catalog_product,
+    create_exam_session,
+    create_exam_session_subject,
+    create_product_variation,
+    create_store_product,
+    create_subject,
+)
+
+
+class SearchBackendTestMixin:
+
+    def setUp(self):
+        self.service = SearchService()
+        ess = create_exam_session_subject(create_exam_session('2025-04'), create_subject('CS2'))
+        printed = create_product_variation('Printed', 'Standard Printed', code='P')
+        self.sp_mock = create_store_product(
+            ess,
+            create_catalog_product('CS2 Additional Mock Exam Marking', 'CS2 Mock Exam Marking', 'MOCK01'),
+            printed,
+            product_code='CS2/PMOCK01/2025-04',
+        )
+        self.sp_notes = create_store_product(
+            ess,
+            create_catalog_product('CS2 Course Notes', 'CS2 Course Notes', 'CN01'),
+            printed,
+            product_code='CS2/PCN01/2025-04',
+        )
+
+    def _score(self, backend, query, min_score=45):
+        return backend.score(self.service._build_optimized_queryset(), query, min_score)
+
+
+class BackendSelectionTest(TestCase):
+
+    def test_default_is_fuzzy(self):
+        self.assertIsInstance(get_search_backend(), FuzzySearchBackend)
+
+    @override_settings(SEARCH_BACKEND='postgres')
+    def test_setting_selects_backend(self):
+        self.assertIsInstance(get_search_backend(), PostgresSearchBackend)
+
+    @override_settings(SEARCH_BACKEND='elastic')
+    def test_unknown_backend_raises(self):
+        with self.assertRaises(ValueError):
+            get_search_backend()
+
+
+class PostgresSearchBackendTest(SearchBackendTestMixin, TestCase):
+
+    def test_builds_missing_documents_and_ranks_in_sql(self):
+        self.assertFalse(ProductSearchDocument.objects.exists())
+
+        scores, cards = self._score(PostgresSearchBackend(), 'cs2 course notes')
+
+        self.assertEqual(scores[0][0], self.sp_notes.pk)
+        self.assertIn(self.sp_notes.pk, cards)
+        document = ProductSearchDocument.objects.get(store_product=self.sp_notes)
+        self.assertIn('course notes', document.searchable_text)
+        self.assertIsNotNone(document.search_vector)
+
+    def test_refresh_writes_weighted_documents(self):
+        refresh_product_cards([self.sp_notes.pk, self.sp_mock.pk])
+
+        documents = ProductSearchDocument.objects.filter(store_product__in=[self.sp_notes, self.sp_mock])
+        self.assertEqual(documents.count(), 2)
+        document = documents.get(store_product=self.sp_notes)
+        self.assertEqual(document.subject_code, 'cs2')
+        self.assertIn("'cs2':", str(document.search_vector))
+
+    def test_agrees_with_fuzzy_backend_on_top_hit(self):
+        for query in ('cs2 mock exam', 'course notes'):
+            fuzzy, _ = self._score(FuzzySearchBackend(), query)
+            postgres, _ = self._score(PostgresSearchBackend(), query)
+            self.assertEqual(postgres[0][0], fuzzy[0][0], query)
+
+    def test_respects_min_score_and_queryset(self):
+        scores, _ = self._score(PostgresSearchBackend(), 'zzqx')
+        self.assertEqual(scores, [])
+
+        queryset = self.service._build_optimized_queryset().exclude(pk=self.sp_notes.pk)
+        scores, _ = PostgresSearchBackend().score(queryset, 'cs2 course notes', 0)
+        self.assertNotIn(self.sp_notes.pk, [sp_id for sp_id, _ in scores])
+
+    def test_product_edit_drops_document_until_rebuilt(self):
+        self._score(PostgresSearchBackend(), 'cs2')
+        self.sp_notes.save()
+
+        self.assertFalse(ProductSearchDocument.objects.filter(store_product=self.sp_notes).exists())
+        self._score(PostgresSearchBackend(), 'cs2')
+        self.assertTrue(ProductSearchDocument.objects.filter(store_product=self.sp_notes).exists())
+
+    @override_settings(SEARCH_BACKEND='postgres')
+    def test_search_service_uses_configured_backend(self):
+        result = self.service.fuzzy_search('cs2 course notes', min_score=45)
+
+        self.assertEqual(result['products'][0]['store_product_id'], self.sp_notes.pk)
+
+
+class CompareSearchBackendsCommandTest(SearchBackendTestMixin, TestCase):
+
+    def test_reports_latency_and_overlap(self):
+        out = StringIO()
+        call_command('compare_search_backends', 'cs2 notes', 'mock exam', '--repeat', '1', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('cs2 notes', output)
+        self.assertIn('postgres ms', output)
+        self.assertIn('top-10 overlap with fuzzy', output)
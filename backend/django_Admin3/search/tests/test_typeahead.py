@@ -0,0 +1,113 @@
+"""Tests for the search-box typeahead (search.services.typeahead)."""
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from search.services.typeahead import (
+    GENERATION_CACHE_KEY,
+    clear_suggestion_index,
+    get_catalog_generation,
+    get_suggestion_index,
+    prefix_edit_distance,
+)
+from search.tests.factories import create_catalog_dependencies, create_store_product, create_subject
+
+
+class PrefixEditDistanceTest(TestCase):
+
+    def test_distance_to_closest_prefix(self):
+        self.assertEqual(prefix_edit_distance('cm2', 'cm2 materials', 1), 0)
+        self.assertEqual(prefix_edit_distance('cm3', 'cm2', 1), 1)
+        self.assertEqual(prefix_edit_distance('matreials', 'materials', 2), 2)
+
+    def test_gives_up_past_max_distance(self):
+        self.assertEqual(prefix_edit_distance('xyz', 'cm2', 1), 2)
+
+
+class SuggestionIndexTest(TestCase):
+
+    def setUp(self):
+        cache.delete(GENERATION_CACHE_KEY)
+        clear_suggestion_index()
+        deps = create_catalog_dependencies('CM2')
+        self.subject = deps['subject']
+        self.store_product = create_store_product(
+            deps['exam_session_subject'], deps['product'], deps['printed_variation'],
+        )
+
+    def tearDown(self):
+        clear_suggestion_index()
+
+    def test_prefix_matches_codes_and_name_words(self):
+        suggestions, fuzzy = get_suggestion_index().suggest('cm')
+
+        self.assertFalse(fuzzy)
+        self.assertEqual(suggestions[0], {
+            'type': 'subject', 'id': self.subject.pk, 'code': 'CM2', 'label': 'CM2 - Subject CM2',
+        })
+        self.assertIn(self.store_product.pk, [s['id'] for s in suggestions if s['type'] == 'store_product'])
+
+        words, _ = get_suggestion_index().suggest('mater')
+        self.assertIn('product', [s['type'] for s in words])
+
+    def test_edit_distance_only_when_prefix_has_no_answer(self):
+        suggestions, fuzzy = get_suggestion_index().suggest('cm3')
+
+        self.assertTrue(fuzzy)
+        self.assertEqual(suggestions[0]['code'], 'CM2')
+
+    def test_lookups_reuse_index_until_generation_changes(self):
+        index = get_suggestion_index()
+        with self.assertNumQueries(0):
+            self.assertIs(get_suggestion_index(), index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_subject('SP9')
+
+        rebuilt = get_suggestion_index()
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(rebuilt.suggest('sp9')[0][0]['code'], 'SP9')
+
+    def test_only_suggestible_changes_start_a_new_generation(self):
+        from store.models import Price
+
+        generation = get_catalog_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            Price.objects.create(purchasable=self.store_product, price_type='standard', amount=10)
+            self.subject.save()
+        self.assertEqual(get_catalog_generation(), generation)
+
+        self.subject.description = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subject.save()
+        self.assertNotEqual(get_catalog_generation(), generation)
+
+
+class TypeaheadViewTest(APITestCase):
+
+    def setUp(self):
+        cache.delete(GENERATION_CACHE_KEY)
+        clear_suggestion_index()
+        create_subject('CB1')
+
+    def tearDown(self):
+        clear_suggestion_index()
+
+    def test_returns_suggestions(self):
+        response = self.client.get('/api/search/suggest/', {'q': 'CB'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['query'], 'CB')
+        self.assertFalse(response.data['fuzzy'])
+        self.assertEqual(response.data['suggestions'][0]['code'], 'CB1')
+
+    def test_warm_index_serves_without_queries(self):
+        self.client.get('/api/search/suggest/', {'q': 'c'})
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/search/suggest/', {'q': 'cb1'})
+        self.assertEqual(len(response.data['suggestions']), 1)
+
+    def test_empty_query_and_bad_limit(self):
+        self.assertEqual(self.client.get('/api/search/suggest/').data['suggestions'], [])
+        response = self.client.get('/api/search/suggest/', {'q': 'cb', 'limit': 'x'})
+        self.assertEqual(response.status_code, 400)
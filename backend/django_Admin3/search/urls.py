@@ -10,6 +10,7 @@ from .views import (
     DefaultSearchDataView,
     FuzzySearchView,
     AdvancedFuzzySearchView,
+    TypeaheadView,
 )
 
 app_name = 'search'
@@ -19,4 +20,5 @@ urlpatterns = [
     path('default-data/', DefaultSearchDataView.as_view(), name='default-search-data'),
     path('fuzzy/', FuzzySearchView.as_view(), name='fuzzy-search'),
     path('advanced-fuzzy/', AdvancedFuzzySearchView.as_view(), name='advanced-fuzzy-search'),
+    path('suggest/', TypeaheadView.as_view(), name='suggest'),
 ]
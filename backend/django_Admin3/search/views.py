@@ -9,6 +9,7 @@ Endpoints:
 - GET /api/search/default-data/ - Default data for initial page load
 - GET /api/search/fuzzy/ - Simple fuzzy search
 - GET /api/search/advanced-fuzzy/ - Fuzzy search with pre-filters
+- GET /api/search/suggest/ - Search-box typeahead suggestions
 """
 import logging
 from rest_framework.views import APIView
@@ -17,6 +18,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework import status
 
 from .services.search_service import search_service
+from .services.typeahead import get_suggestion_index
 from .serializers import ProductSearchRequestSerializer
 
 logger = logging.getLogger(__name__)
@@ -273,3 +275,46 @@ class AdvancedFuzzySearchView(APIView):
                 'error': 'Search failed',
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class TypeaheadView(APIView):
+    """
+    Search-box suggestions.
+
+    GET /api/search/suggest/
+
+    Served from the in-process prefix index (search.services.typeahead),
+    so a keystroke costs one cache read and an in-memory lookup. Edit
+    distance is only tried when no suggestion starts with the query.
+
+    Query Parameters:
+    - q: Partial query as typed
+    - limit: Maximum suggestions (default: 8, max: 20)
+
+    Response:
+    {
+        "query": "cm",
+        "suggestions": [{"type": "subject", "id": 1, "code": "CM2", "label": "CM2 - ..."}],
+        "fuzzy": false
+    }
+    """
+    permission_classes = [AllowAny]
+    # Anonymous endpoint: skip JWT decoding and the user lookup it costs.
+    authentication_classes = []
+
+    def get(self, request):
+        """Return suggestions for a partial query."""
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 8)), 1), 20)
+        except ValueError:
+            return Response({
+                'error': 'Query parameter "limit" must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        suggestions, fuzzy = get_suggestion_index().suggest(query, limit)
+        return Response({
+            'query': query,
+            'suggestions': suggestions,
+            'fuzzy': fuzzy,
+        })
@@ -0,0 +1,18 @@
+"""Warmers for search (see utils.warmup)."""
+from utils.warmup import register_warmer
+
+
+@register_warmer('search.suggestion_index', per_process=True)
+def suggestion_index():
+    """The in-process typeahead prefix index."""
+    from search.services.typeahead import get_suggestion_index
+
+    return f'{len(get_suggestion_index().suggestions)} suggestions'
+
+
+@register_warmer('search.product_cards')
+def product_cards():
+    """Build every missing product card, so listings never build in bulk."""
+    from search.services.product_cards import build_missing_product_cards
+
+    return f'{build_missing_product_cards()} cards built'
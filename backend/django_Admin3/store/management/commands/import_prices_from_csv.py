@@ -13,7 +13,8 @@ CSV columns: code, amount, price_type
 Behaviour:
   * Validates every row first (preloads purchasables into memory).
   * --commit truncates "acted"."prices" and re-inserts every row
-    inside ONE transaction.
+    inside ONE transaction, then rebuilds the product cards once in that
+    transaction (the per-price card signals are paused meanwhile).
   * Wildcard codes resolve to the global Purchasable; multiple
     wildcard rows for the same purchasable are deduplicated by
     (purchasable_id, price_type) — the last one wins.
@@ -221,21 +222,27 @@ class Command(BaseCommand):
 
     @transaction.atomic
     def _commit(self, prepared):
+        from search.services.product_cards import rebuild_product_cards
+        from search.signals import card_signals_paused
+
         existing = Price.objects.count()
         self.stdout.write(f"Truncating \"acted\".\"prices\" (was {existing} rows)…")
-        Price.objects.all().delete()
-
-        objs = [
-            Price(
-                purchasable_id=pid,
-                price_type=pt,
-                amount=amount,
-                currency="GBP",
-                is_active=True,
-            )
-            for (pid, pt), amount in prepared.items()
-        ]
-        Price.objects.bulk_create(objs, batch_size=1000)
+        with card_signals_paused("store.Price"):
+            Price.objects.all().delete()
+
+            objs = [
+                Price(
+                    purchasable_id=pid,
+                    price_type=pt,
+                    amount=amount,
+                    currency="GBP",
+                    is_active=True,
+                )
+                for (pid, pt), amount in prepared.items()
+            ]
+            Price.objects.bulk_create(objs, batch_size=1000)
         self.stdout.write(self.style.SUCCESS(
             f"Inserted {len(objs)} Price rows."
         ))
+        built = rebuild_product_cards()
+        self.stdout.write(f"Rebuilt {built} product cards.")
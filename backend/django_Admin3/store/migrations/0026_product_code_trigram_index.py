@@ -0,0 +1,29 @@
+"""Trigram GIN index on UPPER(product_code) for admin code searches.
+
+Non-atomic so the index can be built CONCURRENTLY. pg_trgm is enabled
+by catalog.0005_enable_pg_trgm.
+"""
+import django.db.models.functions.text
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('catalog', '0005_enable_pg_trgm'),
+        ('store', '0025_delete_dangling_catalog_rows'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=GinIndex(
+                OpClass(django.db.models.functions.text.Upper('product_code'), name='gin_trgm_ops'),
+                name='products_code_trgm',
+            ),
+        ),
+    ]
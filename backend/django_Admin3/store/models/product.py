@@ -5,7 +5,9 @@ Shares a PK with its parent Purchasable row (via MTI).
 
 Table: acted.products
 """
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 from store.models.purchasable import Purchasable
 
@@ -43,6 +45,13 @@ class Product(Purchasable):
         # Purchasable.code UNIQUE.
         verbose_name = 'Store Product'
         verbose_name_plural = 'Store Products'
+        indexes = [
+            # Serves admin product_code__icontains filters
+            GinIndex(
+                OpClass(Upper('product_code'), name='gin_trgm_ops'),
+                name='products_code_trgm',
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         """Parent-class save. Each subclass (Material/Tutorial/Marking)
@@ -8,16 +8,16 @@ Supports ?catalog_product_id=X query parameter to filter store products
 by their linked catalog product — used by the frontend expandable panel.
 """
 from rest_framework import viewsets, status
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from django.db.models import ProtectedError
 
 from catalog.permissions import IsSuperUser
 from store.models import Product
 from store.serializers.product_admin import StoreProductAdminSerializer
+from utils.pagination import AdminListPagination
 
 
-class AdminPagination(PageNumberPagination):
+class AdminPagination(AdminListPagination):
     page_size_query_param = 'page_size'
     max_page_size = 500
 
@@ -16,13 +16,26 @@ Usage:
 
   # Resume from a specific row offset
   python manage.py import_students --csv ../../docs/misc/students_anonymized.csv --offset 500 --batch-size 100
+
+  # High-throughput bulk import with a resumable checkpoint file
+  python manage.py import_students --csv ../../docs/misc/students_anonymized.csv --bulk --batch-size 1000 \
+      --checkpoint ../../docs/misc/students_import.checkpoint.json
+
+  # Bulk import hashing a plaintext password column in 4 worker processes
+  python manage.py import_students --csv students.csv --bulk --password-column password --hash-workers 4
+
+  # Profile the import (hashing in --hash-workers processes is not sampled)
+  python manage.py import_students --csv students.csv --bulk --profile /tmp/import_students.folded
 """
 
 import csv
+import json
 import os
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
 from django.db import transaction
@@ -33,9 +46,10 @@ from userprofile.models import UserProfile
 from userprofile.models.address import UserProfileAddress
 from userprofile.models.contact_number import UserProfileContactNumber
 from userprofile.models.email import UserProfileEmail
+from utils.profiling import ProfileCommandMixin
 
 
-class Command(BaseCommand):
+class Command(ProfileCommandMixin, BaseCommand):
     help = "Import students from legacy CSV with anonymization support"
 
     def add_arguments(self, parser):
@@ -86,6 +100,30 @@ class Command(BaseCommand):
             action="store_true",
             help="CSV has no header row; use standard column names",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Insert each batch with bulk_create instead of row-by-row "
+                 "savepoints (falls back to row-by-row for a failing batch)",
+        )
+        parser.add_argument(
+            "--password-column",
+            help="(--bulk) CSV column holding a plaintext password to hash. "
+                 "When omitted, accounts get an unusable password and are "
+                 "activated later through the password reset flow",
+        )
+        parser.add_argument(
+            "--hash-workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="(--bulk) Processes used to hash passwords (default: CPU count)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="(--bulk) JSON file recording the next row to import. "
+                 "Written after every committed batch; when it exists the "
+                 "import resumes from it and --offset is ignored",
+        )
 
     def handle(self, *args, **options):
         csv_path = options["csv"]
@@ -128,13 +166,26 @@ class Command(BaseCommand):
             raw_rows_for_hash = None
 
         # Phase 2: Import
+        offset = options["offset"]
+        checkpoint_path = options["checkpoint"] if options["bulk"] else None
+        if checkpoint_path:
+            checkpoint = self._read_checkpoint(checkpoint_path, csv_path)
+            if checkpoint is not None:
+                offset = checkpoint
+                self.stdout.write(f"Resuming from checkpoint at row offset {offset}")
+
         self._import_rows(
             import_rows,
             raw_rows=raw_rows_for_hash,
             batch_size=options["batch_size"],
-            offset=options["offset"],
+            offset=offset,
             limit=options["limit"],
             dry_run=options["dry_run"],
+            bulk=options["bulk"],
+            password_column=options["password_column"],
+            hash_workers=options["hash_workers"],
+            checkpoint_path=checkpoint_path,
+            csv_path=csv_path,
         )
 
     # ── CSV I/O ──────────────────────────────────────────────────────
@@ -281,13 +332,16 @@ class Command(BaseCommand):
 
     # ── Import ───────────────────────────────────────────────────────
 
-    def _import_rows(self, rows, raw_rows, batch_size, offset, limit, dry_run):
+    def _import_rows(self, rows, raw_rows, batch_size, offset, limit, dry_run,
+                     bulk=False, password_column=None, hash_workers=1,
+                     checkpoint_path=None, csv_path=None):
         """Import rows in batched transactions.
 
         Args:
             rows: Anonymised rows to import.
             raw_rows: Original raw rows (same length/order as rows) for
                       computing search hashes. None if no hashing needed.
+            bulk: Use the bulk_create pipeline (see _import_rows_bulk).
         """
         # Apply offset and limit
         subset = rows[offset:]
@@ -302,7 +356,16 @@ class Command(BaseCommand):
             f"(offset={offset}, batch_size={batch_size}, dry_run={dry_run})"
         )
 
-        if dry_run:
+        if bulk:
+            self._import_rows_bulk(
+                subset, raw_subset, batch_size, offset,
+                dry_run=dry_run,
+                password_column=password_column,
+                hash_workers=hash_workers,
+                checkpoint_path=checkpoint_path,
+                csv_path=csv_path,
+            )
+        elif dry_run:
             self._import_rows_dry_run(subset, raw_subset, batch_size, offset)
         else:
             self._import_rows_live(subset, raw_subset, batch_size, offset)
@@ -322,19 +385,11 @@ class Command(BaseCommand):
 
             try:
                 with transaction.atomic():
-                    for i, (row, raw_row) in enumerate(zip(batch, raw_batch)):
-                        row_num = absolute_start + i + 1
-                        try:
-                            with transaction.atomic():
-                                result = self._import_single_row(row, raw_row)
-                                if result == "created":
-                                    created += 1
-                                elif result == "skipped":
-                                    skipped += 1
-                        except Exception as e:
-                            errors.append(
-                                f"Row {row_num} (ref={row.get('ref', '?')}): {e}"
-                            )
+                    batch_created, batch_skipped = self._import_batch_row_by_row(
+                        batch, raw_batch, absolute_start, errors
+                    )
+                    created += batch_created
+                    skipped += batch_skipped
 
             except Exception as e:
                 errors.append(f"Batch {batch_num} failed: {e}")
@@ -393,6 +448,279 @@ class Command(BaseCommand):
                 self.style.SUCCESS("Dry-run complete. All changes rolled back.")
             )
 
+    def _import_batch_row_by_row(self, batch, raw_batch, absolute_start, errors):
+        """Import a batch one row at a time, each row in its own savepoint.
+
+        Must be called inside a transaction. Row errors are appended to
+        ``errors``; returns (created, skipped).
+        """
+        created = 0
+        skipped = 0
+        for i, (row, raw_row) in enumerate(zip(batch, raw_batch)):
+            row_num = absolute_start + i + 1
+            try:
+                with transaction.atomic():
+                    result = self._import_single_row(row, raw_row)
+                    if result == "created":
+                        created += 1
+                    elif result == "skipped":
+                        skipped += 1
+            except Exception as e:
+                errors.append(
+                    f"Row {row_num} (ref={row.get('ref', '?')}): {e}"
+                )
+        return created, skipped
+
+    # ── Bulk import ──────────────────────────────────────────────────
+
+    def _import_rows_bulk(self, subset, raw_subset, batch_size, offset,
+                          dry_run, password_column, hash_workers,
+                          checkpoint_path, csv_path):
+        """Bulk import: one bulk_create per table per batch.
+
+        Existing usernames and student refs are loaded once up front so
+        rows are planned in memory without per-row queries. User rows are
+        inserted with bulk_create, so the post_save signal does not fire
+        and UserProfile rows are created explicitly.
+
+        Each batch is its own committed transaction. If a batch fails,
+        it is retried row-by-row so a single bad row only loses itself.
+        After each committed batch the checkpoint file (if any) records
+        the next row offset, so an interrupted import can be re-run with
+        the same arguments.
+        """
+        pool = None
+        if password_column and hash_workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=hash_workers, initializer=_init_hash_worker
+            )
+
+        try:
+            if dry_run:
+                try:
+                    with transaction.atomic():
+                        self._run_bulk_batches(
+                            subset, raw_subset, batch_size, offset,
+                            password_column, pool,
+                            checkpoint_path=None, csv_path=csv_path,
+                        )
+                        raise DryRunRollback()
+                except DryRunRollback:
+                    self.stdout.write(
+                        self.style.SUCCESS("Dry-run complete. All changes rolled back.")
+                    )
+                return
+
+            created = self._run_bulk_batches(
+                subset, raw_subset, batch_size, offset,
+                password_column, pool,
+                checkpoint_path=checkpoint_path, csv_path=csv_path,
+            )
+            if created > 0:
+                self._reset_student_sequence()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _run_bulk_batches(self, subset, raw_subset, batch_size, offset,
+                          password_column, pool, checkpoint_path, csv_path):
+        """Run every batch of the bulk import. Returns the created count."""
+        total = len(subset)
+        created = 0
+        skipped = 0
+        errors = []
+
+        known_usernames = set(User.objects.values_list("username", flat=True))
+        known_refs = set(Student.objects.values_list("student_ref", flat=True))
+
+        for batch_start in range(0, total, batch_size):
+            batch = subset[batch_start : batch_start + batch_size]
+            raw_batch = raw_subset[batch_start : batch_start + batch_size] if raw_subset else [None] * len(batch)
+            batch_num = (batch_start // batch_size) + 1
+            absolute_start = offset + batch_start
+
+            plan, batch_skipped, batch_errors = self._plan_bulk_batch(
+                batch, raw_batch, absolute_start, known_usernames, known_refs
+            )
+            passwords = self._hash_passwords(plan, password_column, pool)
+
+            try:
+                with transaction.atomic():
+                    self._bulk_create_batch(plan, passwords)
+                created += len(plan)
+                skipped += batch_skipped
+                errors.extend(batch_errors)
+                known_usernames.update(entry["username"] for entry in plan)
+                known_refs.update(entry["student_ref"] for entry in plan)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(
+                    f"  Batch {batch_num} bulk insert failed ({e}); "
+                    f"retrying row-by-row"
+                ))
+                try:
+                    with transaction.atomic():
+                        batch_created, batch_skipped = self._import_batch_row_by_row(
+                            batch, raw_batch, absolute_start, errors
+                        )
+                    created += batch_created
+                    skipped += batch_skipped
+                except Exception as batch_error:
+                    errors.append(f"Batch {batch_num} failed: {batch_error}")
+                usernames = [entry["username"] for entry in plan]
+                known_usernames.update(
+                    User.objects.filter(username__in=usernames)
+                    .values_list("username", flat=True)
+                )
+                known_refs.update(
+                    Student.objects.filter(student_ref__in=[e["student_ref"] for e in plan])
+                    .values_list("student_ref", flat=True)
+                )
+
+            if checkpoint_path:
+                self._write_checkpoint(
+                    checkpoint_path, csv_path, absolute_start + len(batch)
+                )
+
+            self.stdout.write(
+                f"  Batch {batch_num}: rows {absolute_start + 1}-"
+                f"{absolute_start + len(batch)} "
+                f"(created={created}, skipped={skipped}, errors={len(errors)})"
+            )
+
+        self._print_summary(created, skipped, errors)
+        return created
+
+    def _plan_bulk_batch(self, batch, raw_batch, absolute_start,
+                         known_usernames, known_refs):
+        """Resolve usernames and refs for a batch without touching the DB.
+
+        Returns (plan, skipped, errors) where plan is a list of dicts with
+        the row, raw row, resolved username and student_ref.
+        """
+        plan = []
+        skipped = 0
+        errors = []
+        batch_usernames = set()
+        batch_refs = set()
+
+        def is_taken(username):
+            return username in known_usernames or username in batch_usernames
+
+        for i, (row, raw_row) in enumerate(zip(batch, raw_batch)):
+            row_num = absolute_start + i + 1
+            ref = row.get("ref", "").strip()
+            try:
+                if not ref:
+                    raise ValueError("Missing ref")
+                student_ref = int(ref)
+                if student_ref in known_refs or student_ref in batch_refs:
+                    raise ValueError(f"student_ref {student_ref} already exists")
+            except ValueError as e:
+                errors.append(f"Row {row_num} (ref={row.get('ref', '?')}): {e}")
+                continue
+
+            username = self._resolve_username(row, is_taken)
+            if username is None:
+                skipped += 1
+                continue
+
+            batch_usernames.add(username)
+            batch_refs.add(student_ref)
+            plan.append({
+                "row": row,
+                "raw_row": raw_row,
+                "ref": ref,
+                "username": username,
+                "student_ref": student_ref,
+            })
+        return plan, skipped, errors
+
+    def _hash_passwords(self, plan, password_column, pool):
+        """Return one encoded password per planned row.
+
+        Without a password column every account gets an unusable password,
+        which needs no hashing. With one, plaintext values are hashed in
+        the worker pool when available.
+        """
+        if not password_column:
+            return [make_password(None) for _ in plan]
+
+        raw_passwords = [
+            entry["row"].get(password_column.lower(), "") for entry in plan
+        ]
+        if pool is None:
+            return [_hash_password(raw) for raw in raw_passwords]
+        return list(pool.map(_hash_password, raw_passwords, chunksize=64))
+
+    def _bulk_create_batch(self, plan, passwords):
+        """Insert users, profiles, addresses, contacts, emails and students."""
+        users = User.objects.bulk_create([
+            User(
+                username=entry["username"],
+                email=entry["username"],
+                password=password,
+                first_name=entry["row"].get("firstname", "").strip()[:30],
+                last_name=entry["row"].get("lastname", "").strip()[:150],
+                is_superuser=False,
+                is_staff=False,
+                is_active=False,
+            )
+            for entry, password in zip(plan, passwords)
+        ])
+
+        # bulk_create skips post_save, so profiles are created here
+        profiles = UserProfile.objects.bulk_create([
+            UserProfile(user=user, **self._profile_fields(entry["row"], entry["raw_row"]))
+            for entry, user in zip(plan, users)
+        ])
+
+        addresses = []
+        contact_numbers = []
+        emails = []
+        students = []
+        for entry, user, profile in zip(plan, users, profiles):
+            row, raw_row = entry["row"], entry["raw_row"]
+
+            address_fields = self._address_fields(row)
+            if address_fields:
+                addresses.append(UserProfileAddress(user_profile=profile, **address_fields))
+
+            contact_numbers.extend(
+                UserProfileContactNumber(user_profile=profile, **contact_fields)
+                for contact_fields in self._contact_number_fields(row, raw_row)
+            )
+            emails.append(UserProfileEmail(
+                user_profile=profile, **self._email_fields(entry["username"], raw_row)
+            ))
+            students.append(Student(user=user, **self._student_fields(entry["ref"])))
+
+        UserProfileAddress.objects.bulk_create(addresses)
+        UserProfileContactNumber.objects.bulk_create(contact_numbers)
+        UserProfileEmail.objects.bulk_create(emails)
+        Student.objects.bulk_create(students)
+
+    # ── Checkpoints ──────────────────────────────────────────────────
+
+    def _read_checkpoint(self, path, csv_path):
+        """Return the saved row offset, or None if there is no usable checkpoint."""
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("csv") != csv_path:
+            self.stdout.write(self.style.WARNING(
+                f"Checkpoint {path} belongs to {data.get('csv')}; ignoring it"
+            ))
+            return None
+        return int(data.get("next_offset", 0))
+
+    def _write_checkpoint(self, path, csv_path, next_offset):
+        """Atomically record the next row offset to import."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"csv": csv_path, "next_offset": next_offset}, f)
+        os.replace(tmp_path, path)
+
     def _print_summary(self, created, skipped, errors):
         """Print import summary."""
         self.stdout.write("")
@@ -436,31 +764,22 @@ class Command(BaseCommand):
                      If None, no hashes are stored.
         """
         ref = row.get("ref", "").strip()
-        email = row.get("email", "").strip()
         firstname = row.get("firstname", "").strip()
         lastname = row.get("lastname", "").strip()
-        title = row.get("title", "").strip()
 
         if not ref:
             raise ValueError("Missing ref")
 
-        if not email:
-            email = f"student_{ref}@example.com"
-
-        # If anonymized email collides with existing user, use fallback
-        if User.objects.filter(username=email.lower()).exists():
-            fallback = f"student_{ref}@example.com"
-            if fallback.lower() == email.lower():
-                # Fallback itself collides — truly a duplicate ref
-                return "skipped"
-            email = fallback
-            if User.objects.filter(username=email.lower()).exists():
-                return "skipped"
+        email = self._resolve_username(
+            row, lambda username: User.objects.filter(username=username).exists()
+        )
+        if email is None:
+            return "skipped"
 
         # 1. Create auth_user (with anonymised names)
         user = User.objects.create_user(
-            username=email.lower(),
-            email=email.lower(),
+            username=email,
+            email=email,
             first_name=firstname[:30],  # Django max_length=30 for first_name
             last_name=lastname[:150],  # Django max_length=150 for last_name
             is_superuser=False,
@@ -472,102 +791,161 @@ class Command(BaseCommand):
         user.save(update_fields=["password"])
 
         # 2. Update UserProfile (auto-created by post_save signal on User)
-        delivery_pref = row.get("delivery preference", "").strip().upper() or "HOME"
-        invoice_pref = row.get("invoice preference", "").strip().upper() or "HOME"
-
         profile = user.userprofile
-        profile.title = title if title and title != "T" else ""
-        profile.send_study_material_to = delivery_pref if delivery_pref in ("HOME", "WORK") else "HOME"
-        profile.send_invoices_to = invoice_pref if invoice_pref in ("HOME", "WORK") else "HOME"
-
-        # Store hashes from raw data if available
-        if raw_row:
-            profile.first_name_hash = compute_search_hash(
-                raw_row.get("firstname", "")
-            )
-            profile.last_name_hash = compute_search_hash(
-                raw_row.get("lastname", "")
-            )
-
+        for field, value in self._profile_fields(row, raw_row).items():
+            setattr(profile, field, value)
         profile.save()
 
         # 3. Create UserProfileAddress (HOME)
-        address_data = {}
-        building = row.get("address building", "").strip()
-        street = row.get("address street", "").strip()
-        district = row.get("address district", "").strip()
-        town = row.get("address town", "").strip()
-        county = row.get("address county", "").strip()
-        postcode = row.get("address postcode", "").strip()
-        country = row.get("address country", "").strip()
-
-        if building:
-            address_data["building"] = building
-        if street:
-            address_data["street"] = street
-        if district:
-            address_data["district"] = district
-        if town:
-            address_data["town"] = town
-        if county:
-            address_data["county"] = county
-        if postcode:
-            address_data["postcode"] = postcode
-
-        if address_data or country:
-            UserProfileAddress.objects.create(
-                user_profile=profile,
-                address_type="HOME",
-                address_data=address_data,
-                country=country or "",
-            )
+        address_fields = self._address_fields(row)
+        if address_fields:
+            UserProfileAddress.objects.create(user_profile=profile, **address_fields)
 
         # 4. Create UserProfileContactNumber(s)
-        phone_fields = [
-            ("home phone", "HOME"),
-            ("work phone", "WORK"),
-            ("mobile", "MOBILE"),
-        ]
-        for csv_field, contact_type in phone_fields:
-            number = row.get(csv_field, "").strip()
-            if number and number.upper() != "N/A":
-                # Hash from raw phone (with spaces stripped)
-                raw_number = ""
-                if raw_row:
-                    raw_val = raw_row.get(csv_field, "").strip()
-                    if raw_val and raw_val.upper() != "N/A":
-                        raw_number = raw_val.replace(" ", "")
-
-                UserProfileContactNumber.objects.create(
-                    user_profile=profile,
-                    contact_type=contact_type,
-                    number=number,
-                    number_hash=compute_search_hash(raw_number) if raw_number else "",
-                )
+        for contact_fields in self._contact_number_fields(row, raw_row):
+            UserProfileContactNumber.objects.create(
+                user_profile=profile, **contact_fields
+            )
 
         # 5. Create UserProfileEmail
-        raw_email = ""
-        if raw_row:
-            raw_email = raw_row.get("email", "").strip()
-
         UserProfileEmail.objects.create(
-            user_profile=profile,
-            email_type="PERSONAL",
-            email=email.lower(),
-            email_hash=compute_search_hash(raw_email) if raw_email else "",
+            user_profile=profile, **self._email_fields(email, raw_row)
         )
 
         # 6. Create Student with legacy ref as student_ref (primary key)
-        Student.objects.create(
-            student_ref=int(ref),
-            user=user,
-            student_type="S",
-            apprentice_type="none",
-            remarks=f"Imported from legacy system (ref={ref})",
-        )
+        Student.objects.create(user=user, **self._student_fields(ref))
 
         return "created"
 
+    # ── Row → field mapping (shared by row-by-row and bulk imports) ──
+
+    def _resolve_username(self, row, is_taken):
+        """Return the lowercased username/email to use, or None to skip.
+
+        If the anonymised email collides with an existing user, the
+        student_{ref}@example.com fallback is used instead.
+
+        Args:
+            is_taken: Callable(username) -> bool.
+        """
+        ref = row.get("ref", "").strip()
+        email = row.get("email", "").strip() or f"student_{ref}@example.com"
+        email = email.lower()
+
+        if is_taken(email):
+            fallback = f"student_{ref}@example.com".lower()
+            if fallback == email:
+                # Fallback itself collides — truly a duplicate ref
+                return None
+            if is_taken(fallback):
+                return None
+            email = fallback
+        return email
+
+    def _profile_fields(self, row, raw_row):
+        """UserProfile field values for a row."""
+        title = row.get("title", "").strip()
+        delivery_pref = row.get("delivery preference", "").strip().upper() or "HOME"
+        invoice_pref = row.get("invoice preference", "").strip().upper() or "HOME"
+
+        fields = {
+            "title": title if title and title != "T" else "",
+            "send_study_material_to": delivery_pref if delivery_pref in ("HOME", "WORK") else "HOME",
+            "send_invoices_to": invoice_pref if invoice_pref in ("HOME", "WORK") else "HOME",
+        }
+        # Store hashes from raw data if available
+        if raw_row:
+            fields["first_name_hash"] = compute_search_hash(raw_row.get("firstname", ""))
+            fields["last_name_hash"] = compute_search_hash(raw_row.get("lastname", ""))
+        return fields
+
+    ADDRESS_COLUMNS = [
+        ("address building", "building"),
+        ("address street", "street"),
+        ("address district", "district"),
+        ("address town", "town"),
+        ("address county", "county"),
+        ("address postcode", "postcode"),
+    ]
+
+    def _address_fields(self, row):
+        """HOME UserProfileAddress field values, or None if the row has no address."""
+        address_data = {}
+        for csv_field, key in self.ADDRESS_COLUMNS:
+            value = row.get(csv_field, "").strip()
+            if value:
+                address_data[key] = value
+        country = row.get("address country", "").strip()
+
+        if not (address_data or country):
+            return None
+        return {
+            "address_type": "HOME",
+            "address_data": address_data,
+            "country": country or "",
+        }
+
+    PHONE_COLUMNS = [
+        ("home phone", "HOME"),
+        ("work phone", "WORK"),
+        ("mobile", "MOBILE"),
+    ]
+
+    def _contact_number_fields(self, row, raw_row):
+        """UserProfileContactNumber field values for each phone on the row."""
+        contacts = []
+        for csv_field, contact_type in self.PHONE_COLUMNS:
+            number = row.get(csv_field, "").strip()
+            if not number or number.upper() == "N/A":
+                continue
+            # Hash from raw phone (with spaces stripped)
+            raw_number = ""
+            if raw_row:
+                raw_val = raw_row.get(csv_field, "").strip()
+                if raw_val and raw_val.upper() != "N/A":
+                    raw_number = raw_val.replace(" ", "")
+            contacts.append({
+                "contact_type": contact_type,
+                "number": number,
+                "number_hash": compute_search_hash(raw_number) if raw_number else "",
+            })
+        return contacts
+
+    def _email_fields(self, email, raw_row):
+        """UserProfileEmail field values (PERSONAL)."""
+        raw_email = raw_row.get("email", "").strip() if raw_row else ""
+        return {
+            "email_type": "PERSONAL",
+            "email": email,
+            "email_hash": compute_search_hash(raw_email) if raw_email else "",
+        }
+
+    def _student_fields(self, ref):
+        """Student field values keyed on the legacy ref."""
+        return {
+            "student_ref": int(ref),
+            "student_type": "S",
+            "apprentice_type": "none",
+            "remarks": f"Imported from legacy system (ref={ref})",
+        }
+
+
+def _hash_password(raw_password):
+    """Hash one password (module-level so it can run in a worker process).
+
+    Blank values produce an unusable password, matching create_user(password=None).
+    """
+    return make_password(raw_password or None)
+
+
+def _init_hash_worker():
+    """Configure Django in spawned hash workers (Windows has no fork)."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
 
 class DryRunRollback(Exception):
     """Raised to trigger transaction rollback during dry runs."""
@@ -0,0 +1,39 @@
+"""
+Trigram GIN indexes on auth_user name and email columns.
+
+Staff searches (marking submissions, legacy orders) match students by
+``user__first_name/last_name/email__icontains``, which PostgreSQL runs
+as ``UPPER(col) LIKE UPPER('%term%')``. auth_user belongs to
+django.contrib.auth, so the indexes are created here with RunSQL
+rather than on a model Meta. Built CONCURRENTLY (non-atomic migration).
+"""
+from django.conf import settings
+from django.db import migrations
+
+TRIGRAM_INDEXES = {
+    'auth_user_first_name_trgm': 'first_name',
+    'auth_user_last_name_trgm': 'last_name',
+    'auth_user_email_trgm': 'email',
+}
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('catalog', '0005_enable_pg_trgm'),
+        ('students', '0002_migrate_to_acted_schema'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON auth_user USING gin (UPPER({column}) gin_trgm_ops)'
+            ),
+            reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS {name}',
+        )
+        for name, column in TRIGRAM_INDEXES.items()
+    ]
@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from students.models import Student
+from userprofile.models import UserProfile
+from userprofile.models.address import UserProfileAddress
+from userprofile.models.contact_number import UserProfileContactNumber
+from userprofile.models.email import UserProfileEmail
+
+
+HEADER = (
+    'ref,title,firstname,lastname,email,address building,address street,'
+    'address district,address town,address county,address postcode,'
+    'address country,home phone,work phone,mobile,delivery preference,'
+    'invoice preference\n'
+)
+
+
+def _row(ref, email, firstname='Ann', lastname='Lee', mobile='07700900123'):
+    return (
+        f'{ref},Ms,{firstname},{lastname},{email},1,High Street,,London,,'
+        f'N1 1AA,United Kingdom,,,{mobile},WORK,HOME\n'
+    )
+
+
+class ImportStudentsBulkCommandTests(TestCase):
+    def _write_csv(self, content):
+        f = tempfile.NamedTemporaryFile(
+            mode='w', suffix='.csv', delete=False, newline='', encoding='latin-1',
+        )
+        f.write(content)
+        f.close()
+        self.addCleanup(os.unlink, f.name)
+        return f.name
+
+    def _checkpoint_path(self):
+        path = tempfile.mktemp(suffix='.json')
+        self.addCleanup(lambda: os.path.exists(path) and os.unlink(path))
+        return path
+
+    def test_bulk_creates_user_profile_and_related_rows(self):
+        path = self._write_csv(HEADER + _row(1001, 'Ann@Example.com') + _row(1002, 'bob@example.com'))
+
+        call_command('import_students', '--csv', path, '--bulk', stdout=StringIO())
+
+        user = User.objects.get(username='ann@example.com')
+        self.assertFalse(user.is_active)
+        self.assertFalse(user.has_usable_password())
+        profile = UserProfile.objects.get(user=user)
+        self.assertEqual(profile.title, 'Ms')
+        self.assertEqual(profile.send_study_material_to, 'WORK')
+        self.assertEqual(Student.objects.get(user=user).student_ref, 1001)
+        address = UserProfileAddress.objects.get(user_profile=profile)
+        self.assertEqual(address.address_data['postcode'], 'N1 1AA')
+        self.assertEqual(address.country, 'United Kingdom')
+        self.assertEqual(
+            UserProfileContactNumber.objects.get(user_profile=profile).contact_type,
+            'MOBILE',
+        )
+        self.assertEqual(
+            UserProfileEmail.objects.get(user_profile=profile).email,
+            'ann@example.com',
+        )
+        self.assertEqual(Student.objects.count(), 2)
+
+    def test_bulk_uses_fallback_username_when_email_taken(self):
+        User.objects.create_user(username='ann@example.com')
+        path = self._write_csv(HEADER + _row(1001, 'ann@example.com'))
+
+        call_command('import_students', '--csv', path, '--bulk', stdout=StringIO())
+
+        self.assertEqual(
+            Student.objects.get(student_ref=1001).user.username,
+            'student_1001@example.com',
+        )
+
+    def test_bulk_dedupes_usernames_within_a_batch(self):
+        path = self._write_csv(
+            HEADER + _row(1001, 'same@example.com') + _row(1002, 'same@example.com')
+        )
+
+        call_command('import_students', '--csv', path, '--bulk', stdout=StringIO())
+
+        usernames = set(Student.objects.values_list('user__username', flat=True))
+        self.assertEqual(usernames, {'same@example.com', 'student_1002@example.com'})
+
+    def test_bulk_reports_existing_student_ref_as_error(self):
+        existing = User.objects.create_user(username='existing')
+        Student.objects.create(student_ref=1001, user=existing)
+        path = self._write_csv(HEADER + _row(1001, 'ann@example.com') + _row(1002, 'bob@example.com'))
+        out = StringIO()
+
+        call_command('import_students', '--csv', path, '--bulk', stdout=out)
+
+        self.assertIn('student_ref 1001 already exists', out.getvalue())
+        self.assertFalse(User.objects.filter(username='ann@example.com').exists())
+        self.assertTrue(Student.objects.filter(student_ref=1002).exists())
+
+    def test_bulk_hashes_password_column(self):
+        path = self._write_csv(
+            'ref,firstname,lastname,email,password\n'
+            '1001,Ann,Lee,ann@example.com,s3cret-pass\n'
+        )
+
+        call_command(
+            'import_students', '--csv', path, '--bulk',
+            '--password-column', 'password', '--hash-workers', '1',
+            stdout=StringIO(),
+        )
+
+        self.assertTrue(User.objects.get(username='ann@example.com').check_password('s3cret-pass'))
+
+    def test_bulk_writes_and_resumes_from_checkpoint(self):
+        path = self._write_csv(
+            HEADER + _row(1001, 'a@example.com') + _row(1002, 'b@example.com')
+            + _row(1003, 'c@example.com')
+        )
+        checkpoint = self._checkpoint_path()
+
+        call_command(
+            'import_students', '--csv', path, '--bulk', '--batch-size', '2',
+            '--limit', '2', '--checkpoint', checkpoint, stdout=StringIO(),
+        )
+        with open(checkpoint) as f:
+            self.assertEqual(json.load(f)['next_offset'], 2)
+        self.assertEqual(Student.objects.count(), 2)
+
+        out = StringIO()
+        call_command(
+            'import_students', '--csv', path, '--bulk', '--batch-size', '2',
+            '--checkpoint', checkpoint, stdout=out,
+        )
+        self.assertIn('Resuming from checkpoint at row offset 2', out.getvalue())
+        self.assertEqual(
+            sorted(Student.objects.values_list('student_ref', flat=True)),
+            [1001, 1002, 1003],
+        )
+
+    def test_bulk_dry_run_rolls_back(self):
+        path = self._write_csv(HEADER + _row(1001, 'ann@example.com'))
+
+        call_command('import_students', '--csv', path, '--bulk', '--dry-run', stdout=StringIO())
+
+        self.assertFalse(Student.objects.exists())
+        self.assertFalse(User.objects.filter(username='ann@example.com').exists())
@@ -8,7 +8,6 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -31,6 +30,7 @@ from tutorials.models import (
     TutorialVenue,
 )
 from tutorials.services.attendance_save_service import save_attendance_items
+from utils.pagination import AdminListPagination
 
 
 ALLOWED_ORDERING = {
@@ -42,7 +42,7 @@ ALLOWED_ORDERING = {
 }
 
 
-class AdminTutorialEventPagination(PageNumberPagination):
+class AdminTutorialEventPagination(AdminListPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 200
@@ -29,7 +29,7 @@ from django.core.management.base import BaseCommand, CommandError
 
 from tutorials.services.orders_csv_parser import parse_orders_csv
 from tutorials.services.orders_csv_importer import (
-    import_parsed_orders, OrdersImportReport,
+    DEFAULT_BATCH_SIZE, import_parsed_orders, OrdersImportReport,
 )
 
 
@@ -54,6 +54,10 @@ class Command(BaseCommand):
             help='File encoding (default utf-8). Use cp1252 for the legacy '
                  'Windows export with accented characters.',
         )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help=f'Rows committed per transaction (default {DEFAULT_BATCH_SIZE}).',
+        )
 
     def handle(self, *args, **opts):
         csv_path = Path(opts['csv_path'])
@@ -74,7 +78,9 @@ class Command(BaseCommand):
             f"unparseable:{parsed.skipped_unparseable_count}"
         ))
 
-        report: OrdersImportReport = import_parsed_orders(parsed, dry_run=not commit)
+        report: OrdersImportReport = import_parsed_orders(
+            parsed, dry_run=not commit, batch_size=opts['batch_size'],
+        )
 
         self.stdout.write(self.style.SUCCESS(
             f"[{mode_label}] orders_created={report.orders_created} "
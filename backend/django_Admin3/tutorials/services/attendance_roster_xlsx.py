@@ -13,10 +13,6 @@ from __future__ import annotations
 from io import BytesIO
 
 from django.utils import timezone
-from openpyxl import Workbook
-from openpyxl.styles import Font
-from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.datavalidation import DataValidation
 
 from tutorials.models import TutorialRegistration, TutorialSessions
 
@@ -26,6 +22,13 @@ STATUS_LIST_FORMULA = '"ATTENDED,ABSENT,LATE,OTHER"'
 
 def generate_roster_xlsx(session: TutorialSessions) -> bytes:
     """Return the xlsx as bytes (suitable for an email attachment)."""
+    # openpyxl is imported here, not at module level: it is only needed when
+    # a roster is generated.
+    from openpyxl import Workbook
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+    from openpyxl.worksheet.datavalidation import DataValidation
+
     wb = Workbook()
     ws = wb.active
     ws.title = 'Roster'
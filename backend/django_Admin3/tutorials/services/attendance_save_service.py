@@ -3,10 +3,16 @@
 Used by both the admin AttendanceView and the public attendance endpoint so
 the two callers produce identical results (same validation, same recorded_at).
 
+Writes are set-based: registrations for every session in a call are
+validated with one query and attendance rows are upserted with a single
+``INSERT ... ON CONFLICT (registration_id) DO UPDATE``.
+``save_attendance_batch`` accepts items for many sessions at once (bulk
+post-session uploads); ``save_attendance_items`` is the single-session form.
+
 Administrate sync
 -----------------
-After a successful save we enqueue a single ``AttendanceSyncJob`` row
-carrying the saved items + each student's ``student_ref``. The cron
+After a successful save we enqueue one ``AttendanceSyncJob`` row per
+session carrying the saved items + each student's ``student_ref``. The cron
 command ``sync_attendance_to_administrate`` drains the queue and calls
 ``AdministrateAttendanceSyncService.sync_job`` per row. Failures stay
 in the queue and retry with backoff; they never block the local save.
@@ -27,7 +33,9 @@ class CrossSessionRegistration(Exception):
     """Caller passed a registration_id that does not belong to the given session."""
 
 
-@transaction.atomic
+ATTENDANCE_UPSERT_FIELDS = ['status', 'reason', 'recorded_by', 'recorded_at', 'updated_at']
+
+
 def save_attendance_items(
     *, session, recorded_by, items: Iterable[Mapping],
 ) -> list[TutorialAttendance]:
@@ -41,47 +49,89 @@ def save_attendance_items(
     change. The enqueue happens inside the same transaction as the
     upsert, so a partially-saved batch never leaves a stale job behind.
     """
-    item_list = list(items)
-    if not item_list:
+    return save_attendance_batch(
+        recorded_by=recorded_by, items_by_session={session: items},
+    )
+
+
+@transaction.atomic
+def save_attendance_batch(
+    *, recorded_by, items_by_session: Mapping[object, Iterable[Mapping]],
+) -> list[TutorialAttendance]:
+    """Upsert attendance for several sessions in one pass.
+
+    ``items_by_session`` maps a TutorialSessions instance to its items
+    (same shape as :func:`save_attendance_items`). Registrations are
+    loaded with one query, attendance is written with one bulk upsert,
+    and exactly one AttendanceSyncJob is enqueued per session that had
+    items. If the same registration appears twice, the last item wins
+    (as it did with sequential ``update_or_create`` calls).
+    """
+    session_items = {}
+    for session, items in items_by_session.items():
+        item_list = list(items)
+        if item_list:
+            session_items[session] = item_list
+    if not session_items:
         return []
 
-    reg_ids = [int(it['registration_id']) for it in item_list]
-    valid_regs = (
+    reg_ids = {
+        int(it['registration_id'])
+        for item_list in session_items.values()
+        for it in item_list
+    }
+    regs_by_id = (
         TutorialRegistration.objects
-        .filter(tutorial_session=session, id__in=reg_ids)
+        .filter(tutorial_session__in=list(session_items), id__in=reg_ids)
         .select_related('student')
+        .in_bulk()
     )
-    valid_reg_ids = set(valid_regs.values_list('id', flat=True))
-    foreign = [rid for rid in reg_ids if rid not in valid_reg_ids]
-    if foreign:
-        raise CrossSessionRegistration(
-            f'registration ids do not belong to session {session.id}: {foreign}'
-        )
+    for session, item_list in session_items.items():
+        foreign = []
+        for it in item_list:
+            reg = regs_by_id.get(int(it['registration_id']))
+            if reg is None or reg.tutorial_session_id != session.id:
+                foreign.append(int(it['registration_id']))
+        if foreign:
+            raise CrossSessionRegistration(
+                f'registration ids do not belong to session {session.id}: {foreign}'
+            )
 
     now = timezone.now()
-    written: list[TutorialAttendance] = []
-    for it in item_list:
-        obj, _ = TutorialAttendance.objects.update_or_create(
-            registration_id=int(it['registration_id']),
-            defaults={
-                'status': it['status'],
-                'reason': it.get('reason') or '',
-                'recorded_by': recorded_by,
-                'recorded_at': now,
-            },
-        )
-        written.append(obj)
+    rows: dict[int, TutorialAttendance] = {}
+    for item_list in session_items.values():
+        for it in item_list:
+            reg_id = int(it['registration_id'])
+            rows[reg_id] = TutorialAttendance(
+                registration_id=reg_id,
+                status=it['status'],
+                reason=it.get('reason') or '',
+                recorded_by=recorded_by,
+                recorded_at=now,
+            )
+    written = TutorialAttendance.objects.bulk_create(
+        list(rows.values()),
+        update_conflicts=True,
+        unique_fields=['registration'],
+        update_fields=ATTENDANCE_UPSERT_FIELDS,
+    )
 
-    # Enqueue the Administrate sync job (with student_ref enrichment so
+    # Enqueue the Administrate sync jobs (with student_ref enrichment so
     # the cron drain doesn't need to re-query students). Imported lazily
     # to avoid pulling administrate models during local-only tests.
     from administrate.services.attendance_sync_service import (
         AdministrateAttendanceSyncService,
     )
-    payload = AdministrateAttendanceSyncService.build_payload_from_registrations(
-        list(valid_regs), item_list,
-    )
-    if payload:
-        AttendanceSyncJob.objects.create(session=session, payload=payload)
+    jobs = []
+    for session, item_list in session_items.items():
+        session_regs = [
+            regs_by_id[int(it['registration_id'])] for it in item_list
+        ]
+        payload = AdministrateAttendanceSyncService.build_payload_from_registrations(
+            session_regs, item_list,
+        )
+        if payload:
+            jobs.append(AttendanceSyncJob(session=session, payload=payload))
+    AttendanceSyncJob.objects.bulk_create(jobs)
 
     return written
@@ -14,7 +14,6 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import IO, Dict, List
 
-from openpyxl import load_workbook
 
 VALID_STATUSES = {'ATTENDED', 'ABSENT', 'LATE', 'OTHER'}
 HEADER_COLS = ('Title', 'First Name', 'Last Name', 'Student Ref', 'Email', 'Company', 'Attendance')
@@ -42,7 +41,10 @@ def parse_attendance_xlsx(file: IO[bytes], session) -> ParseResult:
     ``items`` shape expected by ``save_attendance_items`` using
     ``ref_to_registration_id`` for the join.
     """
-    # Local import to avoid a model-import cycle at service-module load time.
+    # Local imports: a model-import cycle at service-module load time, and
+    # openpyxl is only needed by the upload view.
+    from openpyxl import load_workbook
+
     from tutorials.models import TutorialRegistration
 
     # data_only=False so formulas surface as their raw '=...' strings; the
@@ -51,3 +51,48 @@ def resolve_choice_for_registration(student, session) -> ChoiceResolution:
             ),
         )
     return ChoiceResolution(choice=matches[0])
+
+
+def resolve_choices_for_registrations(pairs) -> dict:
+    """Batch form of :func:`resolve_choice_for_registration`.
+
+    ``pairs`` is an iterable of ``(student, session)``. All candidate
+    choices are fetched in one query; the result maps
+    ``(student.pk, session.pk)`` to a :class:`ChoiceResolution` with the
+    same zero / one / many semantics as the single-pair resolver.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return {}
+
+    matches_by_key = {}
+    for choice in (
+        TutorialChoice.objects
+        .filter(
+            student_id__in={student.pk for student, _ in pairs},
+            tutorial_event_id__in={session.tutorial_event_id for _, session in pairs},
+            order_item__is_cancelled=False,
+        )
+        .order_by('choice_rank', 'created_at')
+    ):
+        matches_by_key.setdefault(
+            (choice.student_id, choice.tutorial_event_id), [],
+        ).append(choice)
+
+    resolutions = {}
+    for student, session in pairs:
+        matches = matches_by_key.get((student.pk, session.tutorial_event_id), [])
+        if not matches:
+            resolution = ChoiceResolution()
+        elif len(matches) >= 2:
+            resolution = ChoiceResolution(
+                choice=None,
+                warning=(
+                    f"multiple matching choices for student={student.student_ref} "
+                    f"event={session.tutorial_event.code}; left unlinked"
+                ),
+            )
+        else:
+            resolution = ChoiceResolution(choice=matches[0])
+        resolutions[(student.pk, session.pk)] = resolution
+    return resolutions
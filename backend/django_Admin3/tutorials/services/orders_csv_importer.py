@@ -8,11 +8,15 @@ Per Q2 + Q4 (2026-05-01):
 
 Per Q5=A: additive only — never truncates. Re-runs create new Orders.
 
-The whole import runs in one transaction. dry_run=True rolls back at the
-end so counts are computed without persisting writes.
+Rows are processed in fixed-size chunks: each chunk's orders, items and
+choices are written with one bulk insert per table (BulkOrderWriter) and
+committed in their own transaction. dry_run=True wraps every chunk in one
+outer transaction that rolls back at the end, so counts are computed
+without persisting writes.
 """
 from __future__ import annotations
 
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
 
@@ -20,10 +24,14 @@ from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 
 from orders.models import Order, OrderItem
+from orders.services.order_writer import BulkOrderWriter
 from tutorials.models import TutorialChoice
 from tutorials.services.orders_csv_parser import OrdersParseResult, ParsedOrderRow
 from tutorials.services.orders_csv_resolver import resolve_order_row
 
+# Parsed rows per committed transaction.
+DEFAULT_BATCH_SIZE = 500
+
 
 @dataclass
 class OrdersImportReport:
@@ -36,76 +44,94 @@ class OrdersImportReport:
     row_errors: List[dict] = field(default_factory=list)
 
 
-def import_parsed_orders(parsed: OrdersParseResult, *, dry_run: bool) -> OrdersImportReport:
+def import_parsed_orders(parsed: OrdersParseResult, *, dry_run: bool,
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> OrdersImportReport:
     report = OrdersImportReport(dry_run=dry_run)
 
-    with transaction.atomic():
-        # Cache of Order objects by (student_ref, sitting_year) so the second
-        # row for the same student+sitting reuses the Order created by the first.
-        orders_by_key: Dict[Tuple[int, str], Order] = {}
-
-        # Track which students were created during this run (informational).
-        from students.models import Student
-        existing_student_refs = set(
-            Student.objects.values_list('student_ref', flat=True)
-        )
-
-        for parsed_row in parsed.rows:
-            resolution = resolve_order_row(parsed_row)
-            if resolution.errors:
-                report.rows_skipped_errors += 1
-                report.row_errors.append({
-                    'student_ref': parsed_row.student_ref,
-                    'event_code_xname': parsed_row.event_code_xname,
-                    'sitting_year': parsed_row.sitting_year,
-                    'errors': resolution.errors,
-                })
-                continue
-
-            # Auto-creation tracking (resolver creates students on first sight).
-            if parsed_row.student_ref not in existing_student_refs:
-                report.students_auto_created += 1
-                existing_student_refs.add(parsed_row.student_ref)
-
-            # Get-or-create the Order for this (student, sitting).
-            key = (parsed_row.student_ref, parsed_row.sitting_year)
-            order = orders_by_key.get(key)
-            if order is None:
-                order = Order.objects.create(user=resolution.student.user)
-                report.orders_created += 1
-                orders_by_key[key] = order
-
-            # ONE OrderItem per choice (Q4).
-            order_item = OrderItem.objects.create(
-                order=order,
-                purchasable=resolution.store_product.purchasable_ptr,
-            )
-            report.order_items_created += 1
-
-            # ONE TutorialChoice per OrderItem.
-            choice = TutorialChoice(
-                order_item=order_item,
-                student=resolution.student,
-                tutorial_event=resolution.tutorial_event,
-                choice_rank=parsed_row.choice_rank,
-            )
-            try:
-                choice.full_clean()
-            except DjangoValidationError as e:
-                report.rows_skipped_errors += 1
-                report.row_errors.append({
-                    'student_ref': parsed_row.student_ref,
-                    'event_code_xname': parsed_row.event_code_xname,
-                    'sitting_year': parsed_row.sitting_year,
-                    'errors': [str(e)],
-                })
-                # Roll back this row's OrderItem (and Order if we just created it).
-                # Simpler: skip cleanup — operators see the count and re-run after fix.
-                continue
-            choice.save()
-            report.choices_created += 1
-
+    # Cache of Order objects by (student_ref, sitting_year) so the second
+    # row for the same student+sitting reuses the Order created by the
+    # first — including across chunks, once the Order has been flushed.
+    orders_by_key: Dict[Tuple[int, str], Order] = {}
+
+    # Track which students were created during this run (informational).
+    from students.models import Student
+    existing_student_refs = set(
+        Student.objects.values_list('student_ref', flat=True)
+    )
+
+    rows = parsed.rows
+    with transaction.atomic() if dry_run else nullcontext():
+        for start in range(0, len(rows), batch_size):
+            with transaction.atomic():
+                _import_chunk(
+                    rows[start:start + batch_size], report,
+                    orders_by_key, existing_student_refs,
+                )
         if dry_run:
             transaction.set_rollback(True)
 
     return report
+
+
+def _import_chunk(rows: List[ParsedOrderRow], report: OrdersImportReport,
+                  orders_by_key: Dict[Tuple[int, str], Order],
+                  existing_student_refs: set) -> None:
+    """Resolve and validate a chunk of rows, then bulk-write it."""
+    writer = BulkOrderWriter()
+    choices: List[TutorialChoice] = []
+
+    for parsed_row in rows:
+        resolution = resolve_order_row(parsed_row)
+        if resolution.errors:
+            _record_error(report, parsed_row, resolution.errors)
+            continue
+
+        # Auto-creation tracking (resolver creates students on first sight).
+        if parsed_row.student_ref not in existing_student_refs:
+            report.students_auto_created += 1
+            existing_student_refs.add(parsed_row.student_ref)
+
+        # ONE OrderItem per choice (Q4), ONE TutorialChoice per OrderItem.
+        # Validate before queuing so a bad row leaves no orphan item.
+        order_item = OrderItem(purchasable=resolution.store_product.purchasable_ptr)
+        choice = TutorialChoice(
+            order_item=order_item,
+            student=resolution.student,
+            tutorial_event=resolution.tutorial_event,
+            choice_rank=parsed_row.choice_rank,
+        )
+        try:
+            # The FK targets were just loaded by the resolver and the
+            # order item is new, so skip their per-row existence queries.
+            choice.full_clean(exclude=['order_item', 'student', 'tutorial_event'])
+        except DjangoValidationError as e:
+            _record_error(report, parsed_row, [str(e)])
+            continue
+
+        # Get-or-create the Order for this (student, sitting).
+        key = (parsed_row.student_ref, parsed_row.sitting_year)
+        order = orders_by_key.get(key)
+        if order is None:
+            order = writer.add_order(user=resolution.student.user)
+            report.orders_created += 1
+            orders_by_key[key] = order
+
+        writer.add_item(order, item=order_item)
+        report.order_items_created += 1
+        choices.append(choice)
+
+    writer.flush()
+    if choices:
+        TutorialChoice.objects.bulk_create(choices)
+        report.choices_created += len(choices)
+
+
+def _record_error(report: OrdersImportReport, parsed_row: ParsedOrderRow,
+                  errors: List[str]) -> None:
+    report.rows_skipped_errors += 1
+    report.row_errors.append({
+        'student_ref': parsed_row.student_ref,
+        'event_code_xname': parsed_row.event_code_xname,
+        'sitting_year': parsed_row.sitting_year,
+        'errors': errors,
+    })
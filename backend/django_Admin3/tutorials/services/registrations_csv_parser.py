@@ -20,6 +20,9 @@ Design decisions resolved against real data:
 
 The parser does NOT raise on bad rows. It counts and reports them so the
 operator can decide whether to fix the source file.
+
+Sessions and students are resolved up front with one query each (all
+distinct titles / all candidate refs in the file), not per row.
 """
 from __future__ import annotations
 
@@ -60,16 +63,58 @@ def _is_truthy_cancelled(value: str) -> bool:
     return (value or '').strip().lower() in {'true', '1', 'yes', 'y'}
 
 
+def _ref_tokens(refs_field: str):
+    """Yield ``(token, match)`` for each non-blank comma-separated token."""
+    for token in refs_field.split(','):
+        token = token.strip()
+        if token:
+            yield token, _REF_RE.match(token)
+
+
+def _is_live(raw: dict) -> bool:
+    return (
+        not _is_truthy_cancelled(raw.get('Is Cancelled') or '')
+        and bool((raw.get('ActEd Student Numbers') or '').strip())
+    )
+
+
+def _load_sessions_by_title(titles) -> dict:
+    """Map title -> first TutorialSessions (by sequence) in one query."""
+    sessions_by_title = {}
+    for session in (
+        TutorialSessions.objects
+        .filter(title__in=titles)
+        .order_by('sequence', 'pk')
+    ):
+        sessions_by_title.setdefault(session.title, session)
+    return sessions_by_title
+
+
 def parse_registrations_csv(file_obj) -> RegistrationsParseResult:
     """Parse a registrations CSV stream into resolved rows.
 
     Returns a :class:`RegistrationsParseResult`. Bad rows are recorded in
     ``unmatched`` and the corresponding skip counter is incremented.
     """
-    reader = csv.DictReader(file_obj)
+    raw_rows = list(csv.DictReader(file_obj))
     result = RegistrationsParseResult()
 
-    for raw in reader:
+    live_rows = [raw for raw in raw_rows if _is_live(raw)]
+    sessions_by_title = _load_sessions_by_title({
+        (raw.get('Title') or '').strip() for raw in live_rows
+    })
+    candidate_refs = {
+        int(m.group('ref'))
+        for raw in live_rows
+        for _, m in _ref_tokens(raw.get('ActEd Student Numbers') or '')
+        if m and not m.group('suffix')
+    }
+    known_refs = set(
+        Student.objects.filter(student_ref__in=candidate_refs)
+        .values_list('student_ref', flat=True)
+    )
+
+    for raw in raw_rows:
         result.total_rows += 1
         row_num = result.total_rows
 
@@ -85,7 +130,7 @@ def parse_registrations_csv(file_obj) -> RegistrationsParseResult:
             result.skipped_empty += 1
             continue
 
-        session = TutorialSessions.objects.filter(title=title).first()
+        session = sessions_by_title.get(title)
         if session is None:
             result.skipped_unknown_session += 1
             result.unmatched.append({
@@ -98,11 +143,7 @@ def parse_registrations_csv(file_obj) -> RegistrationsParseResult:
         # Tokenise refs (comma-delimited, possibly with paren suffix or
         # whitespace).
         ref_ints: List[int] = []
-        for token in refs_field.split(','):
-            token = token.strip()
-            if not token:
-                continue
-            m = _REF_RE.match(token)
+        for token, m in _ref_tokens(refs_field):
             if not m:
                 # Garbage token — record and skip.
                 result.unmatched.append({
@@ -134,12 +175,8 @@ def parse_registrations_csv(file_obj) -> RegistrationsParseResult:
             result.skipped_empty += 1
             continue
 
-        existing = set(
-            Student.objects.filter(student_ref__in=unique_refs)
-            .values_list('student_ref', flat=True)
-        )
         for r in unique_refs:
-            if r not in existing:
+            if r not in known_refs:
                 result.skipped_unknown_student += 1
                 result.unmatched.append({
                     'row': row_num,
@@ -147,7 +184,7 @@ def parse_registrations_csv(file_obj) -> RegistrationsParseResult:
                     'reason': f"unknown student_ref: {r}",
                 })
 
-        valid = [r for r in unique_refs if r in existing]
+        valid = [r for r in unique_refs if r in known_refs]
         if valid:
             result.rows.append(ParsedRegistrationRow(
                 session_id=session.id,
@@ -13,6 +13,13 @@ on the ``TutorialEnrolmentImport.report['warnings']`` list.
 This importer is **one-shot** — it refuses to run if the
 ``tutorial_registrations`` table is non-empty. Future incremental
 sync (soft-deactivate / reactivate) is out of scope.
+
+Sessions, students and candidate choices are each resolved with one
+query for the whole file, and registrations are written with
+``bulk_create``. Because the table starts empty, the only possible
+duplicates are repeated (session, student) pairs inside the file; those
+are detected in memory (``uniq_active_reg_per_student_session`` is a
+partial index, so it cannot be used as an ``ON CONFLICT`` target).
 """
 from __future__ import annotations
 
@@ -25,9 +32,11 @@ from students.models import Student
 from tutorials.models import (
     TutorialEnrolmentImport, TutorialRegistration, TutorialSessions,
 )
-from tutorials.services.choice_resolver import resolve_choice_for_registration
+from tutorials.services.choice_resolver import resolve_choices_for_registrations
 from tutorials.services.registrations_csv_parser import parse_registrations_csv
 
+BULK_CREATE_BATCH_SIZE = 1000
+
 
 @dataclass
 class ImportResult:
@@ -76,42 +85,61 @@ def import_registrations_csv(
         )
         result.batch_id = batch.pk
 
+        sessions = (
+            TutorialSessions.objects
+            .select_related('tutorial_event')
+            .in_bulk({row.session_id for row in parsed.rows})
+        )
+        students_by_ref = {
+            s.student_ref: s for s in Student.objects.filter(
+                student_ref__in={ref for row in parsed.rows for ref in row.student_refs},
+            )
+        }
+
+        pairs = []
+        seen = set()
         for row in parsed.rows:
-            session = TutorialSessions.objects.get(pk=row.session_id)
-            students_by_ref = {
-                s.student_ref: s for s in Student.objects.filter(
-                    student_ref__in=row.student_refs,
-                )
-            }
+            session = sessions[row.session_id]
             for ref in row.student_refs:
                 student = students_by_ref.get(ref)
                 if student is None:
                     # Already counted by parser as skipped_unknown_student.
                     continue
-                resolution = resolve_choice_for_registration(student, session)
-                if resolution.warning:
-                    result.warnings.append(resolution.warning)
-                    result.multi_match_warnings += 1
-
-                try:
-                    with transaction.atomic():
-                        TutorialRegistration.objects.create(
-                            student=student,
-                            tutorial_session=session,
-                            tutorial_choice=resolution.choice,
-                            import_batch=batch,
-                        )
-                except IntegrityError:
+                key = (student.pk, session.pk)
+                if key in seen:
                     if strict:
-                        raise
+                        raise IntegrityError(
+                            'duplicate key value violates unique constraint '
+                            f'"uniq_active_reg_per_student_session": student={ref} '
+                            f'session={session.pk}'
+                        )
                     result.skipped_duplicate_in_db += 1
                     continue
-
-                result.created += 1
-                if resolution.choice is not None:
-                    result.linked_to_choice += 1
-                else:
-                    result.unlinked += 1
+                seen.add(key)
+                pairs.append((student, session))
+
+        resolutions = resolve_choices_for_registrations(pairs)
+        registrations = []
+        for student, session in pairs:
+            resolution = resolutions[(student.pk, session.pk)]
+            if resolution.warning:
+                result.warnings.append(resolution.warning)
+                result.multi_match_warnings += 1
+            registrations.append(TutorialRegistration(
+                student=student,
+                tutorial_session=session,
+                tutorial_choice=resolution.choice,
+                import_batch=batch,
+            ))
+            result.created += 1
+            if resolution.choice is not None:
+                result.linked_to_choice += 1
+            else:
+                result.unlinked += 1
+
+        TutorialRegistration.objects_all.bulk_create(
+            registrations, batch_size=BULK_CREATE_BATCH_SIZE,
+        )
 
         # Finalise the batch row.
         batch.total_rows = result.total_csv_rows
@@ -113,3 +113,82 @@ class SaveAttendanceEnqueuesSyncJobTests(TestCase):
             session=self.session, recorded_by=self.recorder, items=[],
         )
         self.assertEqual(AttendanceSyncJob.objects.count(), 0)
+
+
+class SaveAttendanceBatchTests(TestCase):
+    """save_attendance_batch upserts across sessions in one pass and
+    enqueues one AttendanceSyncJob per session."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recorder = User.objects.create_user(username='batch_recorder')
+        cls.event = make_event(code='UT-BATCH-1')
+        cls.session_a = make_session(event=cls.event, title='Batch A', sequence=1)
+        cls.session_b = make_session(event=cls.event, title='Batch B', sequence=2)
+        cls.regs = {}
+        for ref, session in ((910, cls.session_a), (911, cls.session_a), (912, cls.session_b)):
+            u = User.objects.create_user(username=f'batch_s{ref}')
+            student = Student.objects.create(student_ref=ref, user=u)
+            cls.regs[ref] = TutorialRegistration.objects.create(
+                student=student, tutorial_session=session,
+            )
+
+    def test_one_job_per_session_and_upserts_existing_rows(self):
+        from tutorials.models import AttendanceSyncJob
+        from tutorials.services.attendance_save_service import save_attendance_batch
+        TutorialAttendance.objects.create(
+            registration=self.regs[910], status='ABSENT', recorded_at=timezone.now(),
+        )
+
+        save_attendance_batch(
+            recorded_by=self.recorder,
+            items_by_session={
+                self.session_a: [
+                    {'registration_id': self.regs[910].id, 'status': 'ATTENDED', 'reason': ''},
+                    {'registration_id': self.regs[911].id, 'status': 'LATE', 'reason': ''},
+                ],
+                self.session_b: [
+                    {'registration_id': self.regs[912].id, 'status': 'ABSENT', 'reason': ''},
+                ],
+            },
+        )
+
+        self.assertEqual(TutorialAttendance.objects.count(), 3)
+        self.assertEqual(
+            TutorialAttendance.objects.get(registration=self.regs[910]).status, 'ATTENDED',
+        )
+        jobs = {job.session_id: job for job in AttendanceSyncJob.objects.all()}
+        self.assertEqual(set(jobs), {self.session_a.id, self.session_b.id})
+        self.assertEqual(len(jobs[self.session_a.id].payload), 2)
+        self.assertEqual(jobs[self.session_b.id].payload[0]['student_ref'], 912)
+
+    def test_duplicate_registration_last_item_wins(self):
+        save_attendance_items(
+            session=self.session_a, recorded_by=self.recorder,
+            items=[
+                {'registration_id': self.regs[910].id, 'status': 'ABSENT', 'reason': ''},
+                {'registration_id': self.regs[910].id, 'status': 'LATE', 'reason': ''},
+            ],
+        )
+        self.assertEqual(
+            TutorialAttendance.objects.get(registration=self.regs[910]).status, 'LATE',
+        )
+
+    def test_cross_session_item_rolls_back_whole_batch(self):
+        from tutorials.models import AttendanceSyncJob
+        from tutorials.services.attendance_save_service import save_attendance_batch
+
+        with self.assertRaises(CrossSessionRegistration):
+            save_attendance_batch(
+                recorded_by=self.recorder,
+                items_by_session={
+                    self.session_a: [
+                        {'registration_id': self.regs[910].id, 'status': 'ATTENDED', 'reason': ''},
+                    ],
+                    self.session_b: [
+                        {'registration_id': self.regs[911].id, 'status': 'ABSENT', 'reason': ''},
+                    ],
+                },
+            )
+        self.assertFalse(TutorialAttendance.objects.exists())
+        self.assertFalse(AttendanceSyncJob.objects.exists())
@@ -13,7 +13,7 @@ from catalog.models import (
     Product as CatProduct, ProductVariation, ProductProductVariation,
 )
 from store.models import TutorialProduct
-from orders.models import Order, OrderItem
+from orders.models import Order, OrderItem, OrderSearch
 from students.models import Student
 from tutorials.models import TutorialChoice, TutorialEvents
 from tutorials.services.orders_csv_parser import OrdersParseResult, ParsedOrderRow
@@ -163,3 +163,43 @@ class OrdersOrchestratorTests(TestCase):
         self.assertEqual(Order.objects.count(), 2)
         self.assertEqual(OrderItem.objects.count(), 2)
         self.assertEqual(TutorialChoice.objects.count(), 2)
+
+    def test_order_spanning_chunks_is_reused(self):
+        """Rows for one (student, sitting) split across chunks share one Order."""
+        parsed = OrdersParseResult(rows=[
+            _row(choice_rank=1, event_code_xname='CP2-17'),
+            _row(choice_rank=2, event_code_xname='CP2-02'),
+            _row(choice_rank=3, event_code_xname='CP2-12'),
+        ])
+        report = import_parsed_orders(parsed, dry_run=False, batch_size=2)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(OrderItem.objects.count(), 3)
+        self.assertEqual(TutorialChoice.objects.count(), 3)
+        self.assertEqual(report.orders_created, 1)
+
+    def test_order_spanning_chunks_search_row_lists_every_item(self):
+        """Items added to an Order from an earlier chunk reach its search row."""
+        cs2_event = _seed_event(subject_code='CS2', event_num='82')
+        parsed = OrdersParseResult(rows=[
+            _row(subject_code='CP2', choice_rank=1, event_code_xname='CP2-17'),
+            _row(subject_code='CS2', choice_rank=1, event_code_xname='CS2-82'),
+        ])
+        import_parsed_orders(parsed, dry_run=False, batch_size=1)
+        order = Order.objects.get()
+        expected = sorted(
+            TutorialProduct.objects.filter(
+                pk__in=[self.event_17.store_product_id, cs2_event.store_product_id],
+            ).values_list('code', flat=True)
+        )
+        self.assertEqual(len(expected), 2)
+        self.assertEqual(OrderSearch.objects.get(order=order).purchasable_codes, expected)
+
+    def test_dry_run_with_chunks_rolls_back_everything(self):
+        parsed = OrdersParseResult(rows=[
+            _row(choice_rank=1, event_code_xname='CP2-17'),
+            _row(choice_rank=2, event_code_xname='CP2-02'),
+        ])
+        report = import_parsed_orders(parsed, dry_run=True, batch_size=1)
+        self.assertEqual(Order.objects.count(), 0)
+        self.assertEqual(TutorialChoice.objects.count(), 0)
+        self.assertEqual(report.choices_created, 2)
@@ -6,7 +6,9 @@ any TutorialRegistration row already exists (active or inactive).
 import io
 
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from tutorials.models import (
     TutorialChoice, TutorialEnrolmentImport, TutorialRegistration,
@@ -152,6 +154,72 @@ class NullChoiceTests(TestCase):
         self.assertEqual(len(batch.report['warnings']), 1)
 
 
+class MultiSessionBatchTests(TestCase):
+    """Sessions, students and choices are resolved once per file."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='importer', email='i@t.com')
+        self.sp = factories.make_store_product()
+        self.event = factories.make_event(store_product=self.sp)
+        self.session_a = factories.make_session(event=self.event, sequence=1)
+        self.session_b = factories.make_session(event=self.event, sequence=2)
+        self.students = [factories.make_student() for _ in range(3)]
+
+    def _csv(self, *rows):
+        header = (
+            '"Title","Subject","Is Cancelled","Sitting","Enrolled",'
+            '"ActEd Student Numbers","Swaps In ActEd Student Numbers",'
+            '"Swaps out","Custom: Swaps out ActEd Student Numbers (Event)"\n'
+        )
+        body = ''.join(
+            f'"{title}","CM2",False,"2024A",0,"{", ".join(str(r) for r in refs)}","","",""\n'
+            for title, refs in rows
+        )
+        return header + body
+
+    def test_imports_every_session_and_links_choices(self):
+        linked = self.students[0]
+        oi = _make_order_item(linked, self.sp)
+        choice = TutorialChoice.objects.create(
+            order_item=oi, student=linked,
+            tutorial_event=self.event, choice_rank=1,
+        )
+        refs = [s.student_ref for s in self.students]
+        csv = self._csv((self.session_a.title, refs), (self.session_b.title, refs[:2]))
+
+        result = import_registrations_csv(
+            io.StringIO(csv), uploaded_by=self.user, filename='legacy.csv',
+        )
+
+        self.assertEqual(result.created, 5)
+        self.assertEqual(result.linked_to_choice, 2)
+        self.assertEqual(TutorialRegistration.objects.filter(tutorial_session=self.session_a).count(), 3)
+        self.assertEqual(TutorialRegistration.objects.filter(tutorial_session=self.session_b).count(), 2)
+        self.assertEqual(
+            set(TutorialRegistration.objects.filter(student=linked)
+                .values_list('tutorial_choice_id', flat=True)),
+            {choice.pk},
+        )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        refs = [s.student_ref for s in self.students]
+        small = self._csv((self.session_a.title, refs[:1]))
+        large = self._csv((self.session_a.title, refs), (self.session_b.title, refs))
+
+        with CaptureQueriesContext(connection) as small_ctx:
+            import_registrations_csv(
+                io.StringIO(small), uploaded_by=self.user, filename='s.csv',
+                dry_run=True,
+            )
+        with CaptureQueriesContext(connection) as large_ctx:
+            import_registrations_csv(
+                io.StringIO(large), uploaded_by=self.user, filename='l.csv',
+                dry_run=True,
+            )
+
+        self.assertEqual(len(small_ctx.captured_queries), len(large_ctx.captured_queries))
+
+
 class SkipCategoryTests(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='importer', email='i@t.com')
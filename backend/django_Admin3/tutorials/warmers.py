@@ -0,0 +1,9 @@
+"""Cache warmers for the tutorial catalogue (see utils.warmup)."""
+from utils.warmup import register_warmer, warm_url
+
+
+@register_warmer('tutorials.catalogue')
+def catalogue():
+    """The all-products list and the comprehensive tutorial data."""
+    warm_url('/api/tutorials/products/all/')
+    warm_url('/api/tutorials/data/comprehensive/')
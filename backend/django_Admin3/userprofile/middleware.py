@@ -0,0 +1,53 @@
+"""
+Request-scoped memo for user address countries.
+
+Must come after AuthenticationMiddleware. The memo is keyed by user id
+rather than bound to ``request.user``, because DRF authenticates JWT
+requests inside the view, after middleware has run.
+
+``request.user_countries`` is a lazy UserCountries for the user
+authenticated at the time it is first read. It may hit the database, so
+async views must read it through ``sync_to_async``.
+
+The middleware is async-capable, so it adds no thread hop under ASGI.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject
+
+from .user_context import begin_request_memo, end_request_memo, get_user_countries
+
+
+class UserContextMiddleware:
+    """Shares one country lookup per user across a request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self._begin(request)
+        try:
+            return self.get_response(request)
+        finally:
+            end_request_memo(token)
+
+    async def __acall__(self, request):
+        token = self._begin(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            end_request_memo(token)
+
+    @staticmethod
+    def _begin(request):
+        token = begin_request_memo()
+        request.user_countries = SimpleLazyObject(
+            lambda: get_user_countries(getattr(request, 'user', None))
+        )
+        return token
@@ -1,7 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from .models import UserProfile
+from .models import UserProfile, UserProfileAddress
+from .user_context import invalidate_user_countries
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -11,3 +12,14 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     instance.userprofile.save()
+
+
+@receiver(post_save, sender=UserProfileAddress)
+@receiver(post_delete, sender=UserProfileAddress)
+def invalidate_address_countries(sender, instance, **kwargs):
+    """Drop the cached address countries for the address owner."""
+    try:
+        user_id = instance.user_profile.user_id
+    except UserProfile.DoesNotExist:
+        return
+    invalidate_user_countries(user_id)
@@ -0,0 +1,97 @@
+"""
+Test suite for the shared user country resolver and its middleware.
+"""
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from userprofile.middleware import UserContextMiddleware
+from userprofile.models import UserProfileAddress
+from userprofile.user_context import (
+    NO_COUNTRIES, begin_request_memo, end_request_memo, get_user_countries,
+)
+from utils.models import UtilsCountrys
+
+
+class UserCountriesTestCase(TestCase):
+    """Test cases for get_user_countries."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='ctx_user', email='ctx_user@example.com', password='testpass123'
+        )
+        UtilsCountrys.objects.update_or_create(code='IE', defaults={'name': 'Ireland'})
+        self.home = UserProfileAddress.objects.create(
+            user_profile=self.user.userprofile, address_type='HOME', country='Ireland',
+        )
+        UserProfileAddress.objects.create(
+            user_profile=self.user.userprofile, address_type='WORK', country='France',
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_resolves_home_work_and_code_in_one_query(self):
+        with self.assertNumQueries(1):
+            countries = get_user_countries(self.user)
+
+        self.assertEqual(countries.home_country, 'Ireland')
+        self.assertEqual(countries.work_country, 'France')
+        self.assertEqual(countries.home_country_code, 'IE')
+
+    def test_second_lookup_is_served_from_cache(self):
+        get_user_countries(self.user)
+
+        with self.assertNumQueries(0):
+            countries = get_user_countries(self.user)
+
+        self.assertEqual(countries.home_country, 'Ireland')
+
+    def test_address_change_invalidates_cache(self):
+        get_user_countries(self.user)
+
+        self.home.country = 'United Kingdom'
+        self.home.save()
+
+        self.assertEqual(get_user_countries(self.user).home_country, 'United Kingdom')
+
+    def test_address_delete_invalidates_cache(self):
+        get_user_countries(self.user)
+
+        self.home.delete()
+
+        self.assertIsNone(get_user_countries(self.user).home_country)
+
+    def test_request_memo_skips_cache_and_database(self):
+        token = begin_request_memo()
+        try:
+            get_user_countries(self.user)
+            cache.clear()
+            with self.assertNumQueries(0):
+                countries = get_user_countries(self.user)
+        finally:
+            end_request_memo(token)
+
+        self.assertEqual(countries.work_country, 'France')
+
+    def test_anonymous_user_has_no_countries(self):
+        with self.assertNumQueries(0):
+            self.assertIs(get_user_countries(AnonymousUser()), NO_COUNTRIES)
+            self.assertIs(get_user_countries(None), NO_COUNTRIES)
+
+    def test_middleware_attaches_lazy_countries(self):
+        seen = {}
+
+        def view(request):
+            request.user = self.user
+            seen['home'] = request.user_countries.home_country
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        UserContextMiddleware(view)(request)
+
+        self.assertEqual(seen['home'], 'Ireland')
@@ -0,0 +1,127 @@
+"""
+Shared resolution of a user's address countries.
+
+Cart serialization, cart VAT context, the rules engine views and order
+notifications all need the countries on a user's HOME and WORK profile
+addresses. ``get_user_countries`` resolves both, plus the ISO code of the
+HOME country from ``UtilsCountrys`` (matched by name or code), in one
+query, with two layers of memoization:
+
+  - request scope: ``UserContextMiddleware`` opens a per-request memo, so
+    every caller in the same request shares one lookup, even callers
+    that only hold a ``User`` (e.g. CartService).
+  - cross request: results are cached under ``userprofile:countries:<id>``
+    and invalidated by userprofile.signals when a profile address is
+    saved or deleted. Queryset ``update()`` bypasses signals; call
+    ``invalidate_user_countries()`` after bulk edits.
+"""
+import contextvars
+import logging
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+
+logger = logging.getLogger(__name__)
+
+USER_COUNTRIES_CACHE_TIMEOUT = 60 * 60  # 1 hour; address edits invalidate sooner
+
+_request_memo: contextvars.ContextVar[Optional[Dict[int, 'UserCountries']]] = contextvars.ContextVar(
+    'userprofile_request_memo', default=None,
+)
+
+
+@dataclass(frozen=True)
+class UserCountries:
+    """Countries from a user's profile addresses.
+
+    ``home_country`` / ``work_country`` are the raw address values;
+    ``home_country_code`` is the matching UtilsCountrys code, if any.
+    """
+    home_country: Optional[str] = None
+    work_country: Optional[str] = None
+    home_country_code: Optional[str] = None
+
+
+NO_COUNTRIES = UserCountries()
+
+
+def user_countries_cache_key(user_id) -> str:
+    return f"userprofile:countries:{user_id}"
+
+
+def get_user_countries(user) -> UserCountries:
+    """Return the address countries for ``user`` (NO_COUNTRIES if anonymous)."""
+    if user is None or not getattr(user, 'is_authenticated', False) or user.pk is None:
+        return NO_COUNTRIES
+
+    memo = _request_memo.get()
+    if memo is not None and user.pk in memo:
+        return memo[user.pk]
+
+    key = user_countries_cache_key(user.pk)
+    cached = cache.get(key)
+    if cached is not None:
+        countries = UserCountries(**cached)
+    else:
+        countries = _load_user_countries(user.pk)
+        cache.set(key, asdict(countries), timeout=USER_COUNTRIES_CACHE_TIMEOUT)
+
+    if memo is not None:
+        memo[user.pk] = countries
+    return countries
+
+
+def invalidate_user_countries(user_id) -> None:
+    """Drop the cached countries for ``user_id`` now and again on commit.
+
+    The second delete covers a concurrent request that re-cached the old
+    values between the first delete and the commit.
+    """
+    key = user_countries_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+    memo = _request_memo.get()
+    if memo is not None:
+        memo.pop(user_id, None)
+
+
+def begin_request_memo():
+    """Start a request-scoped memo; pass the token to ``end_request_memo``."""
+    return _request_memo.set({})
+
+
+def end_request_memo(token) -> None:
+    _request_memo.reset(token)
+
+
+def _load_user_countries(user_id) -> UserCountries:
+    from userprofile.models import UserProfileAddress
+    from utils.models import UtilsCountrys
+
+    country_code = (
+        UtilsCountrys.objects
+        .filter(Q(name=OuterRef('country')) | Q(code=OuterRef('country')))
+        .values('code')[:1]
+    )
+    rows = (
+        UserProfileAddress.objects
+        .filter(user_profile__user_id=user_id, address_type__in=('HOME', 'WORK'))
+        .annotate(country_code=Subquery(country_code))
+        .order_by('id')
+        .values_list('address_type', 'country', 'country_code')
+    )
+
+    found = {}
+    for address_type, country, code in rows:
+        found.setdefault(address_type, (country, code))
+
+    home_country, home_code = found.get('HOME', (None, None))
+    work_country, _ = found.get('WORK', (None, None))
+    return UserCountries(
+        home_country=home_country,
+        work_country=work_country,
+        home_country_code=home_code,
+    )
@@ -0,0 +1,203 @@
+"""
+Async variants of the address lookup views for the ASGI deployment.
+
+Each view awaits its upstream call through utils.http_client instead of
+holding a worker thread for the round-trip. ORM work (country name
+lookups, analytics rows) runs through ``sync_to_async`` so it stays on
+Django's thread-sensitive executor, with its own DB connection handling.
+
+Routed in place of the sync views in utils/urls.py when
+``settings.ASYNC_UPSTREAM_VIEWS`` is enabled; request parameters, response
+shapes and error codes match the sync views. A saturated upstream returns
+503 with code UPSTREAM_BUSY.
+"""
+import asyncio
+import logging
+import time
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+
+from utils.http_client import UpstreamBusy, upstream_request
+from utils.views import (
+    log_address_lookup, lookup_response, parse_lookup_params,
+    transform_autocomplete_suggestions,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _busy_response(exc: UpstreamBusy) -> JsonResponse:
+    return JsonResponse({
+        'error': str(exc),
+        'code': 'UPSTREAM_BUSY',
+        'addresses': []
+    }, status=503)
+
+
+@csrf_exempt
+@require_GET
+async def postcoder_address_lookup(request):
+    """Async variant of utils.views.postcoder_address_lookup."""
+    from utils.services import AddressLookupLogger, PostcoderService
+
+    start_time = time.time()
+
+    query, postcode, country_code, error_response = parse_lookup_params(request)
+    if error_response:
+        return error_response
+
+    logger.info(f"🔍 Address lookup request: query='{query}', postcode='{postcode}', country={country_code}")
+
+    postcoder_service = PostcoderService()
+    error_message = None
+
+    try:
+        postcoder_response = await postcoder_service.aautocomplete_address(
+            search_query=query,
+            country_code=country_code,
+            postcode=postcode if postcode else None
+        )
+        addresses = await sync_to_async(transform_autocomplete_suggestions)(postcoder_response, country_code)
+        success = True
+
+    except UpstreamBusy as e:
+        return _busy_response(e)
+
+    except ValueError as e:
+        error_message = str(e)
+        addresses = {"addresses": []}
+        success = False
+
+    except TimeoutError as e:
+        error_message = f"API timeout: {str(e)}"
+        addresses = {"addresses": []}
+        success = False
+
+    except Exception as e:
+        error_message = f"API error: {str(e)}"
+        addresses = {"addresses": []}
+        success = False
+
+    response_time_ms = int((time.time() - start_time) * 1000)
+
+    await sync_to_async(log_address_lookup)(
+        AddressLookupLogger(), query, postcode, country_code,
+        addresses, response_time_ms, success, error_message,
+    )
+
+    return lookup_response(addresses, response_time_ms, success, error_message)
+
+
+@csrf_exempt
+@require_GET
+async def address_retrieve(request):
+    """Async variant of utils.views.address_retrieve."""
+    from utils.services import PostcoderService
+
+    start_time = time.time()
+
+    address_id = request.GET.get('id', '').strip()
+    country_code = request.GET.get('country', 'GB').strip().upper()
+
+    if not address_id:
+        return JsonResponse({
+            'error': 'Missing ID parameter',
+            'code': 'MISSING_ID'
+        }, status=400)
+
+    logger.info(f"🔍 Address retrieve request: id='{address_id}', country={country_code}")
+
+    postcoder_service = PostcoderService()
+
+    try:
+        full_address = await postcoder_service.aretrieve_address(address_id, country_code=country_code)
+        addresses = await sync_to_async(postcoder_service.transform_to_getaddress_format)(
+            full_address, country_code=country_code
+        )
+
+    except UpstreamBusy as e:
+        return _busy_response(e)
+
+    except ValueError as e:
+        logger.error(f"❌ Validation error: {str(e)}")
+        return JsonResponse({
+            'error': str(e),
+            'code': 'VALIDATION_ERROR'
+        }, status=500)
+
+    except TimeoutError as e:
+        error_message = f"API timeout: {str(e)}"
+        logger.error(f"❌ {error_message}")
+        return JsonResponse({
+            'error': error_message,
+            'code': 'TIMEOUT'
+        }, status=500)
+
+    except Exception as e:
+        error_message = f"API error: {str(e)}"
+        logger.error(f"❌ {error_message}")
+        return JsonResponse({
+            'error': error_message,
+            'code': 'API_ERROR'
+        }, status=500)
+
+    response_time_ms = int((time.time() - start_time) * 1000)
+    logger.info(f"✅ Successfully retrieved address for ID: {address_id}")
+
+    return JsonResponse({
+        **addresses,
+        'response_time_ms': response_time_ms
+    })
+
+
+@csrf_exempt
+@require_GET
+async def address_lookup_proxy(request, is_test=True):
+    """
+    Async variant of utils.views.address_lookup_proxy (getaddress.io).
+
+    In live mode the per-suggestion detail calls are issued concurrently
+    rather than one after another; the getaddress bulkhead bounds them.
+    """
+    postcode = request.GET.get('postcode', '').replace(' ', '').upper()
+    if not postcode:
+        return JsonResponse({'error': 'Missing postcode'}, status=400)
+
+    try:
+        if is_test:
+            api_key = settings.GETADDRESS_ADMIN_KEY
+            auto_resp = await upstream_request(
+                'getaddress', 'GET', f'https://api.getAddress.io/v2/private-address?api-key={api_key}'
+            )
+            auto_resp.raise_for_status()
+            auto_data = auto_resp.json()
+            # Private Address API returns a list of addresses directly
+            addresses = auto_data if isinstance(auto_data, list) else []
+            return JsonResponse({'addresses': addresses}, safe=False)
+
+        api_key = settings.GETADDRESS_API_KEY
+        auto_resp = await upstream_request(
+            'getaddress', 'GET', f'https://api.getaddress.io/autocomplete/{postcode}?api-key={api_key}'
+        )
+        auto_resp.raise_for_status()
+        suggestion_ids = [
+            suggestion.get('id')
+            for suggestion in auto_resp.json().get('suggestions', [])
+            if suggestion.get('id')
+        ]
+        responses = await asyncio.gather(*(
+            upstream_request('getaddress', 'GET', f'https://api.getaddress.io/get/{suggestion_id}?api-key={api_key}')
+            for suggestion_id in suggestion_ids
+        ))
+        addresses = [resp.json() for resp in responses if resp.status_code == 200]
+        return JsonResponse({'addresses': addresses}, safe=False)
+
+    except UpstreamBusy as e:
+        return _busy_response(e)
+    except (httpx.HTTPError, ValueError) as e:
+        return JsonResponse({'error': str(e)}, status=500)
@@ -8,6 +8,9 @@ import sys
 import os
 import traceback
 
+from django_Admin3.db_pool import pool_stats
+from utils.warmup import readiness, warmup_settings
+
 
 def health_check(request):
     """
@@ -16,13 +19,18 @@ def health_check(request):
 
     Returns 200 OK even if database is not ready yet to allow Railway
     deployment to succeed. Database status is included in response for monitoring.
+
+    The one exception is cache warm-up (utils.warmup): while the worker
+    serving this request is still running its shared warmers, it answers
+    503 (with WARMUP['gate_health_check']). Other workers' state is not
+    checked; per-process warmers finish before any worker serves.
     """
     health_status = {
         "status": "healthy",
         "checks": {},
         "debug_info": {}
     }
-    # Always return 200 OK to pass Railway health check
+    # Return 200 OK to pass Railway health check (unless still warming, below)
     http_status = 200
 
     # Add system information
@@ -85,6 +93,12 @@ def health_check(request):
         if settings.DEBUG or os.environ.get('DJANGO_ENV') == 'uat':
             health_status["debug_info"]["database_traceback"] = traceback.format_exc()
 
+    # Connection pool usage for the worker serving this request (empty when pooling is off)
+    try:
+        health_status["debug_info"]["db_pool"] = pool_stats()
+    except Exception as e:
+        health_status["debug_info"]["db_pool_error"] = str(e)
+
     # Check essential environment variables
     env_checks = {
         "DATABASE_URL": bool(os.environ.get('DATABASE_URL')),
@@ -102,4 +116,16 @@ def health_check(request):
     }
     health_status["debug_info"]["railway_variables"] = railway_vars
 
+    # Readiness gate: this worker's cache warm-up
+    warmup = readiness()
+    health_status["checks"]["warmup"] = warmup["status"]
+    health_status["debug_info"]["warmup"] = {
+        "total_ms": warmup["total_ms"],
+        "failed": warmup["failed"],
+        "warmers": warmup["results"],
+    }
+    if warmup["status"] == "warming" and warmup_settings()["gate_health_check"]:
+        health_status["status"] = "warming"
+        http_status = 503
+
     return JsonResponse(health_status, status=http_status)
@@ -0,0 +1,120 @@
+"""
+Shared async HTTP client for views that wait on external services.
+
+Under the ASGI deployment (see railway-start.sh, SERVER_MODE=asgi) the
+address lookup and reCAPTCHA views await their upstream calls instead of
+holding a worker thread for the round-trip. They all go through
+``upstream_request``, which:
+
+  - reuses one ``httpx.AsyncClient`` (and its connection pool) per event
+    loop, so TLS connections to Postcoder/Google are kept alive;
+  - applies the per-upstream timeout from ``settings.UPSTREAM_HTTP``;
+  - caps in-flight requests per upstream with a semaphore (a bulkhead).
+    When an upstream is slow and its cap is reached, further callers wait
+    at most ``acquire_timeout`` seconds and then get ``UpstreamBusy``
+    instead of piling up, so one slow upstream cannot exhaust the
+    connection pool or file descriptors the rest of the storefront needs.
+
+Settings example::
+
+    UPSTREAM_HTTP = {
+        'postcoder': {'timeout': 10.0, 'max_concurrency': 20},
+    }
+"""
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPSTREAM_CONFIG = {
+    'timeout': 10.0,
+    'max_concurrency': 20,
+    'acquire_timeout': 0.5,
+}
+
+# Connection pool shared by all upstreams on one event loop. The
+# per-upstream semaphores keep any single upstream well below this.
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# Keyed by event loop: an AsyncClient and asyncio primitives are bound to
+# the loop they were first used on. Under uvicorn there is one loop per
+# worker; under WSGI, async views run on a short-lived loop per request
+# and the client is dropped with it.
+_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = weakref.WeakKeyDictionary()
+_bulkheads: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]' = weakref.WeakKeyDictionary()
+
+
+class UpstreamBusy(Exception):
+    """Raised when an upstream's concurrency cap stays full for ``acquire_timeout``."""
+
+    def __init__(self, upstream: str):
+        super().__init__(f"Too many concurrent requests to {upstream}")
+        self.upstream = upstream
+
+
+def upstream_config(upstream: str) -> Dict[str, Any]:
+    """Return the effective config for ``upstream`` (defaults + settings)."""
+    overrides = getattr(settings, 'UPSTREAM_HTTP', {}).get(upstream, {})
+    return {**DEFAULT_UPSTREAM_CONFIG, **overrides}
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=POOL_LIMITS, follow_redirects=False)
+        _clients[loop] = client
+    return client
+
+
+def _bulkhead(upstream: str, config: Dict[str, Any]) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphores = _bulkheads.setdefault(loop, {})
+    semaphore = semaphores.get(upstream)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(config['max_concurrency'])
+        semaphores[upstream] = semaphore
+    return semaphore
+
+
+async def upstream_request(upstream: str, method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request to ``upstream`` through the shared client and its bulkhead.
+
+    Args:
+        upstream: Key into ``settings.UPSTREAM_HTTP`` (e.g. 'postcoder')
+        method: HTTP method
+        url: Absolute URL
+        **kwargs: Passed to ``httpx.AsyncClient.request`` (params, data, ...)
+
+    Raises:
+        UpstreamBusy: If the upstream's concurrency cap stays full
+        httpx.TimeoutException: If the upstream exceeds its timeout
+        httpx.HTTPError: For other transport errors
+    """
+    config = upstream_config(upstream)
+    semaphore = _bulkhead(upstream, config)
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=config['acquire_timeout'])
+    except asyncio.TimeoutError:
+        logger.warning(f"Upstream {upstream} at concurrency cap ({config['max_concurrency']})")
+        raise UpstreamBusy(upstream)
+    try:
+        kwargs.setdefault('timeout', config['timeout'])
+        return await get_async_client().request(method, url, **kwargs)
+    finally:
+        semaphore.release()
+
+
+async def aclose_async_client() -> None:
+    """Close the running loop's client (tests and shutdown hooks)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    _bulkheads.pop(loop, None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1 @@
+# Storefront load-test suite: synthetic catalogue, scripted journeys, reports
@@ -0,0 +1,459 @@
+"""
+Synthetic storefront catalogue for the load-test suite.
+
+``CatalogueGenerator`` fills a scratch database with a catalogue and
+order history shaped like production — subjects x exam sessions, material
+products in Printed / eBook / Hub variations with prices, tutorial
+products with events, marking products, bundles, filter groups, customers
+with open carts and a long order history skewed towards popular products
+— at one of the ``SCALES`` volumes. The same scale and seed always build
+the same rows, so runs on different git revisions measure the same data.
+
+Generated rows are recognisable by ``PREFIX``: subject, catalog product,
+exam session, location and marking template codes start with it, and
+customers use the ``EMAIL_DOMAIN`` address domain. ``flush()`` deletes
+exactly those rows, so a generated catalogue can be rebuilt at another
+scale. Shared reference rows (product variations, filter groups, the
+categories filter configuration) are reused when present and left in
+place by ``flush()``.
+
+Materials, tutorials and markings are multi-table-inheritance models,
+which ``bulk_create`` cannot insert; they are saved one by one inside a
+transaction per subject. Everything else is bulk inserted; orders go
+through BulkOrderWriter so the order-search read model is filled too.
+"""
+import logging
+import random
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'LT'
+EMAIL_DOMAIN = 'loadtest.invalid'
+PASSWORD = 'loadtest-password'
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Row volumes of a generated catalogue."""
+
+    subjects: int
+    exam_sessions: int
+    catalog_products: int
+    tutorials_per_subject: int
+    events_per_tutorial: int
+    markings_per_subject: int
+    bundles_per_subject: int
+    users: int
+    carts: int
+    items_per_cart: int
+    orders: int
+    items_per_order: int
+
+
+SCALES = {
+    'tiny': Scale(
+        subjects=2, exam_sessions=1, catalog_products=3, tutorials_per_subject=1,
+        events_per_tutorial=1, markings_per_subject=1, bundles_per_subject=1,
+        users=5, carts=2, items_per_cart=2, orders=10, items_per_order=2,
+    ),
+    'small': Scale(
+        subjects=10, exam_sessions=2, catalog_products=6, tutorials_per_subject=2,
+        events_per_tutorial=2, markings_per_subject=1, bundles_per_subject=1,
+        users=200, carts=50, items_per_cart=3, orders=1_000, items_per_order=3,
+    ),
+    'medium': Scale(
+        subjects=40, exam_sessions=3, catalog_products=10, tutorials_per_subject=4,
+        events_per_tutorial=3, markings_per_subject=2, bundles_per_subject=2,
+        users=5_000, carts=1_000, items_per_cart=3, orders=50_000, items_per_order=3,
+    ),
+    'large': Scale(
+        subjects=100, exam_sessions=4, catalog_products=12, tutorials_per_subject=6,
+        events_per_tutorial=4, markings_per_subject=2, bundles_per_subject=2,
+        users=50_000, carts=10_000, items_per_cart=4, orders=500_000, items_per_order=3,
+    ),
+}
+
+SUBJECT_NAMES = [
+    'Actuarial Mathematics', 'Actuarial Statistics', 'Business Finance',
+    'Business Economics', 'Communications Practice', 'Modelling Practice',
+    'Health and Care', 'Life Insurance', 'Pensions and Other Benefits',
+    'General Insurance', 'Enterprise Risk Management', 'Investment and Finance',
+]
+
+# (fullname, shortname, filter group) of catalog product templates.
+CATALOG_PRODUCTS = [
+    ('Course Notes', 'Course Notes', 'Core Study Materials'),
+    ('Question and Answer Bank', 'Q&A Bank', 'Revision Materials'),
+    ('Mock Exam', 'Mock Exam', 'Revision Materials'),
+    ('Revision Notes', 'Revision Notes', 'Revision Materials'),
+    ('Flashcards', 'Flashcards', 'Revision Materials'),
+    ('Assignment Pack', 'Assignments', 'Core Study Materials'),
+    ('Core Reading', 'Core Reading', 'Core Study Materials'),
+    ('Formula and Tables Summary', 'Formula Summary', 'Core Study Materials'),
+    ('Exam Revision Kit', 'Revision Kit', 'Revision Materials'),
+    ('Online Classroom Recordings', 'Recordings', 'Core Study Materials'),
+    ('Sound Revision', 'Sound Revision', 'Revision Materials'),
+    ('Practice Exam Pack', 'Practice Exams', 'Revision Materials'),
+]
+
+# (variation_type, name, code, price multiplier)
+VARIATIONS = [
+    ('Printed', 'Standard Printed', 'P', Decimal('1.00')),
+    ('eBook', 'Vitalsource eBook', 'C', Decimal('0.85')),
+    ('Hub', 'Online Hub', 'H', Decimal('0.60')),
+]
+
+TUTORIAL_LOCATIONS = ['London', 'Edinburgh', 'Manchester', 'Birmingham', 'Leeds', 'Bristol']
+TUTORIAL_FORMATS = ['LO_6H', 'F2F_3F', 'LO_2F', 'F2F_6H', 'LO_4H', 'F2F_2F']
+
+PRICE_TYPES = [
+    ('standard', Decimal('1.00')),
+    ('retaker', Decimal('0.80')),
+    ('additional', Decimal('0.50')),
+]
+
+BATCH_SIZE = 1_000
+
+
+class CatalogueGenerator:
+    """Builds (or removes) a synthetic catalogue at a given ``Scale``.
+
+    Usage::
+
+        generator = CatalogueGenerator(SCALES['small'], seed=42)
+        generator.flush()
+        counts = generator.generate()
+    """
+
+    def __init__(self, scale: Scale, seed: int = 0):
+        self.scale = scale
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.counts: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------ flush
+
+    @staticmethod
+    def flush() -> Dict[str, int]:
+        """Delete every generated row. Returns deleted counts per model."""
+        from catalog.exam_session.models import ExamSession
+        from catalog.products.models import Product as CatalogProduct
+        from catalog.subject.models import Subject
+        from marking.models import MarkingTemplate
+        from tutorials.models import TutorialLocation, TutorialVenue
+
+        deleted = {}
+        with transaction.atomic():
+            # Users first: their orders and carts PROTECT the purchasables.
+            for label, queryset in [
+                ('users', User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')),
+                ('subjects', Subject.objects.filter(code__startswith=PREFIX)),
+                ('exam_sessions', ExamSession.objects.filter(session_code__startswith=f'{PREFIX}-')),
+                ('catalog_products', CatalogProduct.objects.filter(code__startswith=PREFIX)),
+                ('marking_templates', MarkingTemplate.objects.filter(code__startswith=PREFIX)),
+                ('tutorial_venues', TutorialVenue.objects.filter(location__code__startswith=PREFIX)),
+                ('tutorial_locations', TutorialLocation.objects.filter(code__startswith=PREFIX)),
+            ]:
+                deleted[label], _ = queryset.delete()
+        return deleted
+
+    # --------------------------------------------------------------- generate
+
+    def generate(self) -> Dict[str, int]:
+        """Create the catalogue, customers, carts and orders.
+
+        Returns:
+            Row counts per generated model.
+        """
+        from catalog.subject.models import Subject
+
+        if Subject.objects.filter(code__startswith=PREFIX).exists():
+            raise ValueError('A generated catalogue already exists; flush() it first.')
+
+        self.counts = {}
+        reference = self._reference_data()
+        sessions = self._exam_sessions()
+        templates = self._catalog_products(reference)
+        locations = self._tutorial_locations()
+        products = []
+        for index in range(self.scale.subjects):
+            with transaction.atomic():
+                products += self._subject(index, sessions, templates, reference, locations)
+        users = self._users()
+        self._carts(users, products)
+        self._orders(users, products)
+        return dict(self.counts)
+
+    def _count(self, label: str, number: int = 1) -> None:
+        self.counts[label] = self.counts.get(label, 0) + number
+
+    def _reference_data(self) -> Dict:
+        """Variations, filter groups and the categories filter config."""
+        from catalog.products.models import ProductVariation
+        from filtering.models import FilterConfiguration, FilterConfigurationGroup, FilterGroup
+
+        variations = []
+        for variation_type, name, code, multiplier in VARIATIONS:
+            variation, _ = ProductVariation.objects.get_or_create(
+                code=code,
+                defaults={'variation_type': variation_type, 'name': name, 'is_active': True},
+            )
+            if not variation.is_active:
+                variation.is_active = True
+                variation.save(update_fields=['is_active'])
+            variations.append((variation, multiplier))
+
+        config, _ = FilterConfiguration.objects.get_or_create(
+            filter_key='categories',
+            defaults={
+                'name': 'Categories', 'display_label': 'Categories',
+                'filter_type': 'filter_group', 'ui_component': 'multi_select',
+            },
+        )
+        groups = {}
+        for order, name in enumerate(sorted({group for _, _, group in CATALOG_PRODUCTS})):
+            groups[name], _ = FilterGroup.objects.get_or_create(
+                name=name, defaults={'is_active': True, 'display_order': order},
+            )
+            FilterConfigurationGroup.objects.get_or_create(
+                filter_configuration=config, filter_group=groups[name],
+                defaults={'display_order': order},
+            )
+        return {'variations': variations, 'groups': groups}
+
+    def _exam_sessions(self) -> List:
+        """Open sessions, six months apart, all purchasable today."""
+        from catalog.exam_session.models import ExamSession
+
+        now = timezone.now()
+        sessions = []
+        for index in range(self.scale.exam_sessions):
+            sitting = now + timedelta(days=90 + 182 * index)
+            sessions.append(ExamSession.objects.create(
+                session_code=f'{PREFIX}-{sitting:%Y-%m}',
+                start_date=now - timedelta(days=30),
+                end_date=sitting,
+                is_active=True,
+            ))
+        self._count('exam_sessions', len(sessions))
+        return sessions
+
+    def _catalog_products(self, reference: Dict) -> List[Dict]:
+        """Catalog templates with their variations and filter groups."""
+        from catalog.products.models import Product as CatalogProduct, ProductProductVariation
+        from filtering.models import ProductProductGroup
+
+        templates = []
+        links = []
+        for index in range(self.scale.catalog_products):
+            fullname, shortname, group = CATALOG_PRODUCTS[index % len(CATALOG_PRODUCTS)]
+            if index >= len(CATALOG_PRODUCTS):
+                suffix = f' {index // len(CATALOG_PRODUCTS) + 1}'
+                fullname, shortname = fullname + suffix, shortname + suffix
+            product = CatalogProduct.objects.create(
+                fullname=fullname, shortname=shortname, code=f'{PREFIX}{index + 1:02d}', is_active=True,
+            )
+            base_price = Decimal(self.rng.randrange(40, 250))
+            ppvs = []
+            for variation, multiplier in reference['variations']:
+                ppv = ProductProductVariation.objects.create(
+                    product=product, product_variation=variation, is_active=True,
+                )
+                links.append(ProductProductGroup(
+                    product_product_variation=ppv, product_group=reference['groups'][group],
+                ))
+                ppvs.append((ppv, (base_price * multiplier).quantize(Decimal('0.01'))))
+            templates.append({'product': product, 'ppvs': ppvs})
+        ProductProductGroup.objects.bulk_create(links)
+        self._count('catalog_products', len(templates))
+        self._count('product_product_variations', len(links))
+        return templates
+
+    def _tutorial_locations(self) -> List:
+        from tutorials.models import TutorialLocation, TutorialVenue
+
+        locations = []
+        for index, name in enumerate(TUTORIAL_LOCATIONS):
+            location = TutorialLocation.objects.create(name=name, code=f'{PREFIX}{name[:3].upper()}')
+            venue = TutorialVenue.objects.create(name=f'{name} Conference Centre', location=location)
+            locations.append((location, venue))
+        self._count('tutorial_locations', len(locations))
+        return locations
+
+    def _subject(self, index, sessions, templates, reference, locations) -> List[Dict]:
+        """One subject with its per-session products; returns the material
+        products as ``{'id', 'price'}`` for carts and orders."""
+        from catalog.models import ExamSessionSubject
+        from catalog.products.bundle.models import ProductBundle, ProductBundleProduct
+        from catalog.subject.models import Subject
+        from marking.models import MarkingTemplate
+        from store.models import Bundle, BundleProduct, MarkingProduct, MaterialProduct, Price, TutorialProduct
+        from tutorials.models import TutorialEvents
+
+        name = SUBJECT_NAMES[index % len(SUBJECT_NAMES)]
+        subject = Subject.objects.create(
+            code=f'{PREFIX}{index + 1:02d}',
+            description=f'{name} {index // len(SUBJECT_NAMES) + 1}',
+            active=True,
+        )
+        self._count('subjects')
+
+        bundle_templates = []
+        for number in range(self.scale.bundles_per_subject):
+            bundle = ProductBundle.objects.create(
+                subject=subject, bundle_name=f'{subject.code} Study Bundle {number + 1}', is_active=True,
+            )
+            members = self.rng.sample(templates, min(3, len(templates)))
+            ProductBundleProduct.objects.bulk_create([
+                ProductBundleProduct(bundle=bundle, product_product_variation=member['ppvs'][0][0], sort_order=order)
+                for order, member in enumerate(members)
+            ])
+            bundle_templates.append((bundle, [member['ppvs'][0][0].pk for member in members]))
+
+        marking_templates = [
+            MarkingTemplate.objects.create(code=f'{PREFIX}M{number + 1}', name=f'{subject.code} Mock Marking {number + 1}')
+            for number in range(self.scale.markings_per_subject)
+        ]
+
+        materials, prices, events, bundle_products = [], [], [], []
+        for session in sessions:
+            ess = ExamSessionSubject.objects.create(exam_session=session, subject=subject, is_active=True)
+            self._count('exam_session_subjects')
+            by_ppv = {}
+            for template in templates:
+                for ppv, amount in template['ppvs']:
+                    product = MaterialProduct(
+                        exam_session_subject=ess, product_product_variation=ppv, is_active=True,
+                    )
+                    product.name = template['product'].fullname
+                    product.save()
+                    by_ppv[ppv.pk] = product
+                    prices += self._prices(product, amount)
+                    materials.append({'id': product.pk, 'price': amount})
+            self._count('material_products', len(by_ppv))
+
+            for number, (location, venue) in enumerate(self.rng.sample(
+                locations, min(self.scale.tutorials_per_subject, len(locations)),
+            )):
+                tutorial = TutorialProduct(
+                    exam_session_subject=ess, tutorial_location=location,
+                    format=TUTORIAL_FORMATS[number % len(TUTORIAL_FORMATS)], is_active=True,
+                )
+                tutorial.name = f'{subject.code} {location.name} Tutorial'
+                tutorial.save()
+                prices += self._prices(tutorial, Decimal(self.rng.randrange(300, 900)))
+                starts = session.end_date - timedelta(days=60)
+                for event_number in range(self.scale.events_per_tutorial):
+                    start = starts + timedelta(days=7 * event_number)
+                    events.append(TutorialEvents(
+                        code=f'{tutorial.product_code}/{event_number + 1}',
+                        store_product=tutorial, venue=venue, location=location,
+                        remain_space=self.rng.randrange(0, 40),
+                        lms_start_date=start, lms_end_date=start + timedelta(days=2),
+                    ))
+                self._count('tutorial_products')
+
+            for template in marking_templates:
+                marking = MarkingProduct(exam_session_subject=ess, marking_template=template, is_active=True)
+                marking.name = template.name
+                marking.save()
+                prices += self._prices(marking, Decimal(self.rng.randrange(50, 120)))
+                self._count('marking_products')
+
+            for bundle_template, ppv_ids in bundle_templates:
+                bundle = Bundle.objects.create(bundle_template=bundle_template, exam_session_subject=ess, is_active=True)
+                bundle_products += [
+                    BundleProduct(bundle=bundle, product=by_ppv[ppv_id], sort_order=order)
+                    for order, ppv_id in enumerate(ppv_ids)
+                ]
+                self._count('bundles')
+
+        Price.objects.bulk_create(prices, batch_size=BATCH_SIZE)
+        TutorialEvents.objects.bulk_create(events, batch_size=BATCH_SIZE)
+        BundleProduct.objects.bulk_create(bundle_products, batch_size=BATCH_SIZE)
+        self._count('prices', len(prices))
+        self._count('tutorial_events', len(events))
+        return materials
+
+    def _prices(self, purchasable, amount: Decimal) -> List:
+        from store.models import Price
+
+        return [
+            Price(purchasable_id=purchasable.pk, price_type=price_type,
+                  amount=(amount * multiplier).quantize(Decimal('0.01')))
+            for price_type, multiplier in PRICE_TYPES
+        ]
+
+    def _users(self) -> List[User]:
+        password = make_password(PASSWORD)
+        users = [
+            User(username=f'loadtest{number}', email=f'loadtest{number}@{EMAIL_DOMAIN}',
+                 first_name=f'Load{number}', last_name='Tester', password=password, is_active=True)
+            for number in range(self.scale.users)
+        ]
+        users = User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        self._count('users', len(users))
+        return users
+
+    def _popular(self, products: List[Dict], count: int) -> List[Dict]:
+        """``count`` products skewed towards a popular head (Zipf-like)."""
+        weights = [1 / (rank + 1) for rank in range(len(products))]
+        return self.rng.choices(products, weights=weights, k=count)
+
+    def _carts(self, users: List[User], products: List[Dict]) -> None:
+        from cart.models import Cart, CartItem
+
+        carts = Cart.objects.bulk_create(
+            [Cart(user=user) for user in users[-self.scale.carts:]] if self.scale.carts else [],
+            batch_size=BATCH_SIZE,
+        )
+        items = [
+            CartItem(cart=cart, purchasable_id=product['id'], quantity=1,
+                     price_type='standard', actual_price=product['price'])
+            for cart in carts
+            for product in self._popular(products, self.scale.items_per_cart)
+        ]
+        CartItem.objects.bulk_create(items, batch_size=BATCH_SIZE)
+        self._count('carts', len(carts))
+        self._count('cart_items', len(items))
+
+    def _orders(self, users: List[User], products: List[Dict]) -> None:
+        from orders.services.order_writer import BulkOrderWriter
+
+        now = timezone.now()
+        writer = BulkOrderWriter()
+        for number in range(self.scale.orders):
+            lines = self._popular(products, self.scale.items_per_order)
+            subtotal = sum(line['price'] for line in lines)
+            vat = (subtotal * Decimal('0.20')).quantize(Decimal('0.01'))
+            order = writer.add_order(
+                user_id=self.rng.choice(users).pk,
+                subtotal=subtotal, vat_amount=vat, total_amount=subtotal + vat,
+                vat_rate=Decimal('0.2000'), vat_country='GB',
+                order_date=now - timedelta(minutes=self.rng.randrange(0, 365 * 24 * 60)),
+            )
+            for line in lines:
+                line_vat = (line['price'] * Decimal('0.20')).quantize(Decimal('0.01'))
+                writer.add_item(
+                    order, purchasable_id=line['id'], quantity=1, price_type='standard',
+                    actual_price=line['price'], net_amount=line['price'], vat_amount=line_vat,
+                    gross_amount=line['price'] + line_vat, vat_rate=Decimal('0.2000'),
+                )
+            if len(writer) >= BATCH_SIZE or number == self.scale.orders - 1:
+                with transaction.atomic():
+                    orders, items = writer.flush()
+                self._count('orders', len(orders))
+                self._count('order_items', len(items))
+                logger.debug(f'[LOADTEST] {self.counts["orders"]}/{self.scale.orders} orders written')
+
+    def describe(self) -> Dict:
+        return {'seed': self.seed, **asdict(self.scale)}
@@ -0,0 +1,262 @@
+"""
+Scripted storefront journeys for the load-test suite.
+
+A journey is a function ``journey(session, data, rng)`` that walks one
+customer path through the public API. Every request goes through a
+``JourneySession``, which times it and records a ``Sample`` named after
+the step (``search.unified``, ``cart.add``, ...). Two session types run
+the same journeys:
+
+  - ``TestClientSession``: django.test.Client, in process — no server,
+    runs wherever ``manage.py`` does;
+  - ``HttpSession``: a requests.Session against a running server
+    (``runserver``, gunicorn), for numbers that include the HTTP stack.
+
+Query counts come from the ``Server-Timing`` header that
+utils.middleware.RequestMetricsMiddleware adds (``db;desc="N queries"``),
+so both session types report them.
+
+``JourneyData`` holds what the journeys pick from — the generated
+subjects, search terms, filter groups, purchasable products and
+customer logins — and is loaded once per run from the database.
+"""
+import itertools
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+from utils.loadtest.generator import EMAIL_DOMAIN, PASSWORD, PREFIX
+
+_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+@dataclass
+class Sample:
+    """One timed request."""
+
+    journey: str
+    step: str
+    status: int
+    ms: float
+    queries: Optional[int]
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+
+@dataclass
+class JourneyData:
+    """Inputs the journeys draw from."""
+
+    subjects: List[str]
+    search_terms: List[str]
+    categories: List[str]
+    products: List[Dict]
+    logins: List[str] = field(default_factory=list)
+    _next_login: itertools.count = field(default_factory=itertools.count, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def next_login(self) -> Optional[str]:
+        """The customers in turn, so concurrent journeys use different carts."""
+        if not self.logins:
+            return None
+        with self._lock:
+            return self.logins[next(self._next_login) % len(self.logins)]
+
+    @classmethod
+    def load(cls) -> 'JourneyData':
+        """Read the generated catalogue back from the database."""
+        from django.contrib.auth.models import User
+
+        from catalog.products.models import Product as CatalogProduct
+        from catalog.subject.models import Subject
+        from filtering.models import ProductProductGroup
+        from store.models import Price, Product
+
+        subjects = list(Subject.objects.filter(code__startswith=PREFIX).order_by('code').values_list('code', flat=True))
+        if not subjects:
+            raise ValueError('No generated catalogue found; run loadtest_generate first.')
+        names = list(CatalogProduct.objects.filter(code__startswith=PREFIX).values_list('shortname', flat=True))
+        terms = [name.lower() for name in names]
+        terms += [
+            f'{code.lower()} {names[index % len(names)].split()[0].lower()}'
+            for index, code in enumerate(subjects)
+        ]
+        categories = sorted(set(
+            ProductProductGroup.objects
+            .filter(product_product_variation__product__code__startswith=PREFIX)
+            .values_list('product_group__name', flat=True)
+        ))
+        purchasable = Product.available_now().filter(
+            kind='material', exam_session_subject__subject__code__startswith=PREFIX,
+        ).values_list('pk', flat=True)
+        prices = dict(
+            Price.objects.filter(purchasable_id__in=purchasable, price_type='standard')
+            .values_list('purchasable_id', 'amount')
+        )
+        products = [{'id': pk, 'price': str(amount)} for pk, amount in sorted(prices.items())]
+        logins = list(
+            User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')
+            .order_by('pk').values_list('email', flat=True)
+        )
+        return cls(subjects=subjects, search_terms=terms, categories=categories, products=products, logins=logins)
+
+
+class JourneySession:
+    """Issues journey requests and records a Sample per request."""
+
+    def __init__(self):
+        self.samples: List[Sample] = []
+        self.journey = ''
+
+    def _send(self, method: str, path: str, payload: Optional[Dict]):
+        """Return ``(status, json body or None, Server-Timing header)``."""
+        raise NotImplementedError
+
+    def login(self, email: str) -> None:
+        raise NotImplementedError
+
+    def request(self, step: str, method: str, path: str, payload: Optional[Dict] = None):
+        started = time.perf_counter()
+        status, body, server_timing = self._send(method, path, payload)
+        ms = (time.perf_counter() - started) * 1000
+        match = _QUERIES.search(server_timing or '')
+        self.samples.append(Sample(
+            journey=self.journey, step=step, status=status, ms=ms,
+            queries=int(match.group(1)) if match else None,
+        ))
+        return status, body
+
+    def close(self) -> None:
+        pass
+
+
+class TestClientSession(JourneySession):
+    """In-process session over django.test.Client."""
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self):
+        from django.test import Client
+
+        super().__init__()
+        self.client = Client()
+
+    def _send(self, method, path, payload):
+        kwargs = {'content_type': 'application/json', 'data': payload} if payload is not None else {}
+        response = getattr(self.client, method.lower())(path, **kwargs)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return response.status_code, body, response.get('Server-Timing')
+
+    def login(self, email):
+        from django.contrib.auth.models import User
+
+        self.client.force_login(User.objects.get(email=email))
+
+
+class HttpSession(JourneySession):
+    """Session against a running server, authenticated with the JWT login."""
+
+    def __init__(self, base_url: str, timeout: float = 30):
+        import requests
+
+        super().__init__()
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.http = requests.Session()
+
+    def _send(self, method, path, payload):
+        import requests
+
+        try:
+            response = self.http.request(method, self.base_url + path, json=payload, timeout=self.timeout)
+        except requests.RequestException:
+            return 599, None, None
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return response.status_code, body, response.headers.get('Server-Timing')
+
+    def login(self, email):
+        status, body = self.request('auth.login', 'POST', '/api/auth/login/', {'username': email, 'password': PASSWORD})
+        if status == 200 and body:
+            self.http.headers['Authorization'] = f'Bearer {body["token"]}'
+
+    def close(self):
+        self.http.close()
+
+
+# ------------------------------------------------------------------ journeys
+
+def browse(session: JourneySession, data: JourneyData, rng: random.Random) -> None:
+    """Navigation menu, default listing, then one subject's products."""
+    session.request('browse.navigation', 'GET', '/api/catalog/navigation-data/')
+    session.request('browse.default_data', 'GET', '/api/search/default-data/')
+    session.request('browse.subject', 'POST', '/api/search/unified/', {
+        'searchQuery': '',
+        'filters': {'subjects': [rng.choice(data.subjects)]},
+        'pagination': {'page': 1, 'page_size': 20},
+    })
+
+
+def search(session: JourneySession, data: JourneyData, rng: random.Random) -> None:
+    """Typeahead while typing, a free-text search, then narrowing by filters."""
+    term = rng.choice(data.search_terms)
+    for length in (2, 4, len(term)):
+        session.request('search.suggest', 'GET', '/api/search/suggest/?' + urlencode({'q': term[:length]}))
+    session.request('search.unified', 'POST', '/api/search/unified/', {
+        'searchQuery': term, 'pagination': {'page': 1, 'page_size': 20},
+    })
+    filters = {'subjects': rng.sample(data.subjects, min(2, len(data.subjects)))}
+    if data.categories:
+        filters['categories'] = [rng.choice(data.categories)]
+    session.request('search.filtered', 'POST', '/api/search/unified/', {
+        'searchQuery': term, 'filters': filters, 'pagination': {'page': 2, 'page_size': 20},
+    })
+
+
+def _fill_cart(session: JourneySession, data: JourneyData, rng: random.Random, items: int) -> None:
+    session.request('cart.view', 'GET', '/api/cart/')
+    for product in rng.sample(data.products, min(items, len(data.products))):
+        session.request('cart.add', 'POST', '/api/cart/add/', {
+            'current_product': product['id'], 'quantity': 1,
+            'price_type': 'standard', 'actual_price': product['price'],
+        })
+
+
+def cart(session: JourneySession, data: JourneyData, rng: random.Random) -> None:
+    """Guest cart: add a few products and recalculate VAT."""
+    _fill_cart(session, data, rng, items=3)
+    session.request('cart.vat', 'POST', '/api/cart/vat/recalculate/')
+
+
+def checkout(session: JourneySession, data: JourneyData, rng: random.Random) -> None:
+    """Signed-in customer: fill the cart, VAT, pay by invoice (no gateway)."""
+    email = data.next_login()
+    if email is None:
+        return
+    session.login(email)
+    _fill_cart(session, data, rng, items=2)
+    session.request('cart.vat', 'POST', '/api/cart/vat/recalculate/')
+    session.request('checkout.submit', 'POST', '/api/orders/checkout/', {
+        'payment_method': 'invoice',
+        'employer_code': 'LOADTEST',
+        'general_terms_accepted': True,
+    })
+
+
+JOURNEYS: Dict[str, Callable] = {
+    'browse': browse,
+    'search': search,
+    'cart': cart,
+    'checkout': checkout,
+}
@@ -0,0 +1,250 @@
+"""
+Running journeys and comparing their results across git revisions.
+
+``run_journeys`` drives the journeys of utils.loadtest.journeys from
+``concurrency`` worker threads, a fresh session (guest or customer) per
+journey run. ``build_report`` turns the samples into a JSON-serialisable
+report tagged with the git revision and run parameters:
+
+  - per step (``search.unified``, ``cart.add``, ...): requests, errors,
+    p50 / p95 / max latency and mean / max queries per request;
+  - per journey: runs and p50 / p95 of the whole journey;
+  - overall requests per second.
+
+Reports of the same scale and journeys from different revisions are
+compared with ``compare_reports``, which lines up each step's p50, p95
+and mean queries against the first (baseline) report and flags steps
+whose p95 or query count grew past a threshold.
+"""
+import math
+import platform
+import random
+import statistics
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import django
+
+from utils.loadtest.journeys import JOURNEYS, JourneyData, JourneySession, Sample
+
+REPORT_VERSION = 1
+
+# Report fields that must match for two runs to be comparable. Order
+# counts are left out: every checkout journey adds orders.
+COMPARABLE_FIELDS = {
+    'dataset': ('subjects', 'store_products', 'users'),
+    'parameters': ('client', 'journeys', 'iterations', 'concurrency', 'seed'),
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def git_revision() -> Dict:
+    """``{'sha', 'branch', 'dirty'}`` of the working tree (None outside git)."""
+    def git(*args):
+        try:
+            return subprocess.run(
+                ['git', *args], capture_output=True, text=True, check=True, timeout=10,
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    return {
+        'sha': git('rev-parse', '--short', 'HEAD'),
+        'branch': git('rev-parse', '--abbrev-ref', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def run_journeys(
+    session_factory: Callable[[], JourneySession],
+    data: JourneyData,
+    journeys: Sequence[str],
+    iterations: int,
+    concurrency: int = 1,
+    seed: int = 0,
+    on_thread_exit: Optional[Callable[[], None]] = None,
+) -> Tuple[List[Sample], List[Tuple[str, float]], float]:
+    """Run every journey ``iterations`` times, spread over worker threads.
+
+    Each worker draws from its own ``Random(seed + worker)``, so a run is
+    repeatable for a given seed and concurrency. With one worker the
+    journeys run in the calling thread; ``on_thread_exit`` runs at the
+    end of each spawned worker thread (e.g. to close its connections).
+
+    Returns:
+        (samples, [(journey, total ms), ...], wall time in seconds)
+    """
+    plan = [name for _ in range(iterations) for name in journeys]
+    samples: List[Sample] = []
+    runs: List[Tuple[str, float]] = []
+    lock = threading.Lock()
+
+    def worker(number: int, own_thread: bool = False):
+        rng = random.Random(seed + number)
+        try:
+            for name in plan[number::concurrency]:
+                session = session_factory()
+                session.journey = name
+                started = time.perf_counter()
+                try:
+                    JOURNEYS[name](session, data, rng)
+                finally:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    session.close()
+                with lock:
+                    samples.extend(session.samples)
+                    runs.append((name, elapsed))
+        finally:
+            if own_thread and on_thread_exit is not None:
+                on_thread_exit()
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        # In the calling thread: same database connection (and test transaction).
+        worker(0)
+    else:
+        threads = [threading.Thread(target=worker, args=(number, True)) for number in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return samples, runs, time.perf_counter() - started
+
+
+def build_report(
+    samples: List[Sample],
+    runs: List[Tuple[str, float]],
+    wall_s: float,
+    parameters: Dict,
+    dataset: Dict,
+) -> Dict:
+    """Aggregate a run into a JSON-serialisable report."""
+    by_step = defaultdict(list)
+    for sample in samples:
+        by_step[sample.step].append(sample)
+
+    steps = {}
+    for step, step_samples in sorted(by_step.items()):
+        latencies = [sample.ms for sample in step_samples]
+        queries = [sample.queries for sample in step_samples if sample.queries is not None]
+        steps[step] = {
+            'requests': len(step_samples),
+            'errors': sum(1 for sample in step_samples if not sample.ok),
+            'statuses': dict(sorted(
+                (str(status), sum(1 for sample in step_samples if sample.status == status))
+                for status in {sample.status for sample in step_samples}
+            )),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'max_ms': round(max(latencies), 2),
+            'mean_queries': round(statistics.mean(queries), 1) if queries else None,
+            'max_queries': max(queries) if queries else None,
+        }
+
+    by_journey = defaultdict(list)
+    for name, elapsed in runs:
+        by_journey[name].append(elapsed)
+    journeys = {
+        name: {
+            'runs': len(elapsed),
+            'p50_ms': round(percentile(elapsed, 50), 2),
+            'p95_ms': round(percentile(elapsed, 95), 2),
+        }
+        for name, elapsed in sorted(by_journey.items())
+    }
+
+    return {
+        'version': REPORT_VERSION,
+        'revision': git_revision(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {'python': platform.python_version(), 'django': django.get_version()},
+        'parameters': parameters,
+        'dataset': dataset,
+        'totals': {
+            'requests': len(samples),
+            'errors': sum(1 for sample in samples if not sample.ok),
+            'wall_s': round(wall_s, 2),
+            'throughput_rps': round(len(samples) / wall_s, 2) if wall_s else 0.0,
+        },
+        'journeys': journeys,
+        'steps': steps,
+    }
+
+
+def _growth(baseline: Optional[float], value: Optional[float]) -> Optional[float]:
+    if baseline is None or value is None:
+        return None
+    if not baseline:
+        return 0.0 if not value else math.inf
+    return (value - baseline) / baseline * 100
+
+
+def compare_reports(reports: List[Dict], max_p95_growth: Optional[float] = None) -> Dict:
+    """Line up each step across ``reports`` (the first is the baseline).
+
+    A step regresses in a later report when its p95 grew by more than
+    ``max_p95_growth`` percent, or when it ran more queries per request
+    on average than in the baseline.
+
+    Returns:
+        {'labels': [...], 'rows': [{'step', 'values': [...], 'regressions': [...]}],
+         'throughput': [...], 'regressions': [...]}
+    """
+    labels = [report['revision'].get('sha') or f'report {index}' for index, report in enumerate(reports)]
+    labels = [
+        f'{label}+dirty' if report['revision'].get('dirty') else label
+        for label, report in zip(labels, reports)
+    ]
+    baseline = reports[0]['steps']
+    steps = sorted({step for report in reports for step in report['steps']})
+    rows, regressions = [], []
+    for step in steps:
+        values = [report['steps'].get(step) for report in reports]
+        row_regressions = []
+        base = baseline.get(step)
+        for label, value in zip(labels[1:], values[1:]):
+            if base is None or value is None:
+                continue
+            growth = _growth(base['p95_ms'], value['p95_ms'])
+            if max_p95_growth is not None and growth is not None and growth > max_p95_growth:
+                row_regressions.append(f'{step}: p95 {base["p95_ms"]} -> {value["p95_ms"]} ms on {label}')
+            if (
+                base['mean_queries'] is not None and value['mean_queries'] is not None
+                and value['mean_queries'] > base['mean_queries']
+            ):
+                row_regressions.append(
+                    f'{step}: queries {base["mean_queries"]} -> {value["mean_queries"]} per request on {label}'
+                )
+        rows.append({'step': step, 'values': values, 'regressions': row_regressions})
+        regressions += row_regressions
+    return {
+        'labels': labels,
+        'rows': rows,
+        'throughput': [report['totals']['throughput_rps'] for report in reports],
+        'regressions': regressions,
+    }
+
+
+def check_comparable(reports: List[Dict]) -> List[str]:
+    """Differences in dataset or parameters that make ``reports`` unfair
+    to compare (different scale, journeys, client or concurrency)."""
+    problems = []
+    base = reports[0]
+    for index, report in enumerate(reports[1:], start=1):
+        for section, keys in COMPARABLE_FIELDS.items():
+            left, right = base.get(section, {}), report.get(section, {})
+            for key in keys:
+                if left.get(key) != right.get(key):
+                    problems.append(f'report {index} {section}.{key}: {left.get(key)!r} != {right.get(key)!r}')
+    return problems
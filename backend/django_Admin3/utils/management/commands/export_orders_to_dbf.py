@@ -28,16 +28,20 @@ Usage Examples:
     # Combine filters with debug output
     python manage.py export_orders_to_dbf --output-dir /exports --from-date 2024-01-01 --only-with-orders --debug
 
+    # Profile the export (writes a flamegraph-ready profile-*.folded / .speedscope.json)
+    python manage.py export_orders_to_dbf --output-dir /exports --profile
+
 Dependencies:
     - ydbf: Required for DBF file creation (pip install ydbf)
     - dbfread: Optional for file validation (pip install dbfread)
 """
 import os
 from django.core.management.base import BaseCommand
+from utils.profiling import ProfileCommandMixin
 from utils.services.dbf_export_service import DbfExportService
 
 
-class Command(BaseCommand):
+class Command(ProfileCommandMixin, BaseCommand):
     help = 'Export orders, order items, users, and profiles to FoxPro DBF files'
 
     def add_arguments(self, parser):
@@ -0,0 +1,164 @@
+"""
+Management command measuring worker cold start: django.setup() plus URL loading.
+
+Each run starts a fresh interpreter (``python -X importtime``) with the
+current settings, times ``django.setup()`` and loading the full URLconf
+(which imports every app's views), and records peak resident memory and
+which of ``HEAVY_MODULES`` got imported. Those libraries are imported at
+the point of use (see email_system.services.email_service,
+search.services.search_service, rules_engine, tutorials.services); a
+module-level import of one of them shows up here.
+
+Reports the median of ``--runs`` runs and the largest top-level imports.
+``--max-seconds``, ``--max-rss-mb`` and ``--fail-on-heavy`` turn it into a
+CI check (non-zero exit when exceeded).
+
+Usage:
+    python manage.py importtime
+    python manage.py importtime --runs 5 --top 25
+    python manage.py importtime --settings=django_Admin3.settings.ci --runs 3 \\
+        --max-seconds 6 --max-rss-mb 250 --fail-on-heavy
+    python manage.py importtime --output importtime.json
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Libraries web workers should not load at boot.
+HEAVY_MODULES = (
+    'mjml', 'premailer', 'cssutils', 'pandas', 'numpy', 'openpyxl',
+    'fuzzywuzzy', 'Levenshtein', 'jsonschema',
+)
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+setup_done = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().reverse_dict  # imports every included URLconf and its views
+urls_done = time.perf_counter()
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024
+except ImportError:  # Windows
+    rss_mb = None
+heavy = sorted(name for name in json.loads(sys.argv[1]) if name in sys.modules)
+print(json.dumps({
+    'setup_s': setup_done - started,
+    'urls_s': urls_done - setup_done,
+    'total_s': urls_done - started,
+    'rss_mb': rss_mb,
+    'modules': len(sys.modules),
+    'heavy': heavy,
+}))
+"""
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Cumulative import time in microseconds per top-level package,
+    from ``python -X importtime`` output."""
+    totals = defaultdict(int)
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        if len(indent) == 1:  # imported directly, not by another import
+            totals[name.split('.')[0]] += int(cumulative)
+    return dict(totals)
+
+
+class Command(BaseCommand):
+    help = 'Measure cold-start time and memory of django.setup() plus URL loading'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters to start (median is reported)')
+        parser.add_argument('--top', type=int, default=15, help='Largest top-level imports to list')
+        parser.add_argument('--max-seconds', type=float, help='Fail when the median cold start exceeds this')
+        parser.add_argument('--max-rss-mb', type=float, help='Fail when the peak resident memory exceeds this')
+        parser.add_argument(
+            '--fail-on-heavy',
+            action='store_true',
+            help=f'Fail when any of {", ".join(HEAVY_MODULES)} is imported at boot',
+        )
+        parser.add_argument('--output', help='Also write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1')
+
+        results = [self._probe() for _ in range(options['runs'])]
+        total_s = statistics.median(result['total_s'] for result in results)
+        setup_s = statistics.median(result['setup_s'] for result in results)
+        urls_s = statistics.median(result['urls_s'] for result in results)
+        rss = [result['rss_mb'] for result in results if result['rss_mb'] is not None]
+        rss_mb = max(rss) if rss else None
+        heavy = results[-1]['heavy']
+        imports = results[-1]['imports']
+
+        self.stdout.write(f'Cold start ({len(results)} run(s), median, settings {settings.SETTINGS_MODULE}):')
+        self.stdout.write(f'  django.setup()  {setup_s * 1000:8.0f} ms')
+        self.stdout.write(f'  URL loading     {urls_s * 1000:8.0f} ms')
+        self.stdout.write(f'  total           {total_s * 1000:8.0f} ms')
+        self.stdout.write(f'  peak RSS        {rss_mb:8.1f} MB' if rss_mb is not None else '  peak RSS        n/a')
+        self.stdout.write(f'  modules         {results[-1]["modules"]:8d}')
+
+        self.stdout.write('\nLargest top-level imports (cumulative):')
+        for name, micros in sorted(imports.items(), key=lambda item: item[1], reverse=True)[:options['top']]:
+            self.stdout.write(f'  {micros / 1000:8.1f} ms  {name}')
+
+        if heavy:
+            self.stdout.write(self.style.WARNING(f'\nHeavy modules imported at boot: {", ".join(heavy)}'))
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump({
+                    'settings': settings.SETTINGS_MODULE,
+                    'runs': results,
+                    'median_total_s': total_s,
+                    'median_setup_s': setup_s,
+                    'median_urls_s': urls_s,
+                    'peak_rss_mb': rss_mb,
+                    'heavy': heavy,
+                }, handle, indent=2)
+            self.stdout.write(f'\nResults written to {options["output"]}')
+
+        failures = []
+        if options['max_seconds'] is not None and total_s > options['max_seconds']:
+            failures.append(f'cold start {total_s:.2f}s exceeds {options["max_seconds"]}s')
+        if options['max_rss_mb'] is not None and rss_mb is not None and rss_mb > options['max_rss_mb']:
+            failures.append(f'peak RSS {rss_mb:.1f} MB exceeds {options["max_rss_mb"]} MB')
+        if options['fail_on_heavy'] and heavy:
+            failures.append(f'heavy modules imported at boot: {", ".join(heavy)}')
+        if failures:
+            raise CommandError('; '.join(failures))
+
+    def _probe(self) -> dict:
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE, json.dumps(HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            cwd=str(settings.BASE_DIR),
+            env=env,
+        )
+        if completed.returncode != 0:
+            tail = '\n'.join(
+                line for line in completed.stderr.splitlines() if not line.startswith('import time:')
+            )[-2000:]
+            raise CommandError(f'Cold-start probe failed:\n{tail}')
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        result['imports'] = parse_importtime(completed.stderr)
+        return result
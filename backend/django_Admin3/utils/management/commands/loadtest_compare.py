@@ -0,0 +1,75 @@
+"""
+Management command comparing loadtest_run reports across revisions.
+
+Lines up every journey step of two or more reports — the first is the
+baseline — showing p50 / p95 latency and queries per request for each,
+plus overall throughput. Steps whose p95 grew more than
+``--max-p95-growth`` percent, or that run more queries per request than
+the baseline, are listed as regressions; ``--fail-on-regression`` turns
+them into a non-zero exit for CI.
+
+Usage:
+    python manage.py loadtest_compare loadtest-1a2b3c4.json loadtest-5d6e7f8.json
+    python manage.py loadtest_compare base.json head.json --max-p95-growth 20 --fail-on-regression
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.loadtest.report import REPORT_VERSION, check_comparable, compare_reports
+
+
+class Command(BaseCommand):
+    help = 'Compare load-test reports from different git revisions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('reports', nargs='+', help='Report files; the first is the baseline')
+        parser.add_argument(
+            '--max-p95-growth',
+            type=float,
+            default=25.0,
+            help='p95 growth in percent reported as a regression (default: 25)',
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='Exit with an error when any step regresses',
+        )
+
+    def _load(self, path):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                report = json.load(handle)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+        if report.get('version') != REPORT_VERSION:
+            raise CommandError(f'{path} is not a version {REPORT_VERSION} load-test report')
+        return report
+
+    def handle(self, *args, **options):
+        reports = [self._load(path) for path in options['reports']]
+        for problem in check_comparable(reports):
+            self.stdout.write(self.style.WARNING(f'Not like for like: {problem}'))
+
+        comparison = compare_reports(reports, max_p95_growth=options['max_p95_growth'])
+        labels = comparison['labels']
+        self.stdout.write(f'{"step":<22}' + ''.join(f'{label:>28}' for label in labels))
+        self.stdout.write(f'{"":<22}' + f'{"p50 / p95 ms, queries":>28}' * len(labels))
+        for row in comparison['rows']:
+            line = f'{row["step"]:<22}'
+            for value in row['values']:
+                if value is None:
+                    line += f'{"-":>28}'
+                    continue
+                queries = '-' if value['mean_queries'] is None else f'{value["mean_queries"]:.1f}'
+                line += f'{value["p50_ms"]:.1f} / {value["p95_ms"]:.1f}, {queries}'.rjust(28)
+            self.stdout.write(line)
+        self.stdout.write(f'{"throughput req/s":<22}' + ''.join(f'{rps:>28}' for rps in comparison['throughput']))
+
+        if not comparison['regressions']:
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
+            return
+        for regression in comparison['regressions']:
+            self.stdout.write(self.style.ERROR(f'Regression: {regression}'))
+        if options['fail_on_regression']:
+            raise CommandError(f'{len(comparison["regressions"])} regression(s) against the baseline')
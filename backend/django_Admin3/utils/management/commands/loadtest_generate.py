@@ -0,0 +1,63 @@
+"""
+Management command building the synthetic load-test catalogue.
+
+Fills the database with a generated catalogue, customers, carts and
+order history at one of the utils.loadtest.generator SCALES. Same scale
+and seed, same rows — so loadtest_run numbers from different revisions
+are comparable. Meant for a local scratch database: generated rows are
+prefixed ``LT`` and ``--flush`` removes them again.
+
+Usage:
+    python manage.py loadtest_generate --scale small
+    python manage.py loadtest_generate --scale medium --seed 7 --flush
+    python manage.py loadtest_generate --flush-only
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.loadtest.generator import SCALES, CatalogueGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic storefront catalogue for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            choices=list(SCALES),
+            default='small',
+            help='Data volume (default: small)',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+        parser.add_argument(
+            '--flush',
+            action='store_true',
+            help='Delete a previously generated catalogue first',
+        )
+        parser.add_argument(
+            '--flush-only',
+            action='store_true',
+            help='Delete the generated catalogue and stop',
+        )
+
+    def handle(self, *args, **options):
+        if options['flush'] or options['flush_only']:
+            deleted = CatalogueGenerator.flush()
+            self.stdout.write(f'Deleted: {", ".join(f"{label}={count}" for label, count in deleted.items())}')
+            if options['flush_only']:
+                return
+
+        generator = CatalogueGenerator(SCALES[options['scale']], seed=options['seed'])
+        started = time.perf_counter()
+        try:
+            counts = generator.generate()
+        except ValueError:
+            raise CommandError('A generated catalogue already exists; add --flush to replace it.')
+
+        for label, count in counts.items():
+            self.stdout.write(f'  {label:<28}{count:>10}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated the {options["scale"]} catalogue (seed {options["seed"]}) '
+            f'in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,144 @@
+"""
+Management command running the scripted storefront journeys.
+
+Runs the utils.loadtest.journeys (browse, search, cart, checkout) against
+the catalogue built by loadtest_generate and writes a JSON report tagged
+with the current git revision — per step p50/p95 latency, errors and
+queries per request, plus overall throughput. Compare reports from
+several revisions with loadtest_compare.
+
+Two clients:
+  - ``--client test`` (default): django.test.Client in this process, no
+    server needed. Outgoing mail goes to the in-memory backend.
+  - ``--client http``: a running server at ``--base-url`` (runserver or
+    gunicorn with the same settings), so the numbers include the HTTP
+    stack. Start it with development settings (non-secure session
+    cookies) and an offline EMAIL_BACKEND.
+
+Checkout pays by invoice, so no payment gateway is called; with a local
+PostgreSQL and Redis the whole run is offline. Query counts need
+utils.middleware.RequestMetricsMiddleware (Server-Timing) enabled.
+
+Usage:
+    python manage.py loadtest_run
+    python manage.py loadtest_run --iterations 50 --concurrency 4 --output before.json
+    python manage.py loadtest_run --client http --base-url http://localhost:8888 --journeys search cart
+"""
+import json
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from utils.loadtest.generator import EMAIL_DOMAIN, PREFIX
+from utils.loadtest.journeys import JOURNEYS, HttpSession, JourneyData, TestClientSession
+from utils.loadtest.report import build_report, run_journeys
+
+
+class Command(BaseCommand):
+    help = 'Run the storefront load-test journeys and write a JSON report'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--journeys',
+            nargs='+',
+            choices=list(JOURNEYS),
+            default=list(JOURNEYS),
+            help='Journeys to run (default: all)',
+        )
+        parser.add_argument('--iterations', type=int, default=20, help='Runs of each journey (default: 20)')
+        parser.add_argument('--warmup', type=int, default=1, help='Unrecorded runs of each journey first (default: 1)')
+        parser.add_argument('--concurrency', type=int, default=1, help='Worker threads (default: 1)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+        parser.add_argument('--client', choices=['test', 'http'], default='test', help='Request client (default: test)')
+        parser.add_argument(
+            '--base-url',
+            default='http://localhost:8000',
+            help='Server for --client http (default: http://localhost:8000)',
+        )
+        parser.add_argument(
+            '--cold-cache',
+            action='store_true',
+            help='Clear the default cache first; with --warmup 0 the first requests run cold',
+        )
+        parser.add_argument('--output', help='Report path (default: loadtest-<revision>.json)')
+
+    def _dataset(self):
+        from django.contrib.auth.models import User
+
+        from catalog.subject.models import Subject
+        from orders.models import Order
+        from store.models import Product
+
+        return {
+            'subjects': Subject.objects.filter(code__startswith=PREFIX).count(),
+            'store_products': Product.objects.filter(exam_session_subject__subject__code__startswith=PREFIX).count(),
+            'users': User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').count(),
+            'orders': Order.objects.filter(user__email__endswith=f'@{EMAIL_DOMAIN}').count(),
+        }
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1 or options['concurrency'] < 1 or options['warmup'] < 0:
+            raise CommandError('--iterations and --concurrency must be positive, --warmup not negative.')
+        try:
+            data = JourneyData.load()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        test_environment = False
+        if options['client'] == 'http':
+            def session_factory():
+                return HttpSession(options['base_url'])
+            on_thread_exit = None
+        else:
+            from django.test.utils import setup_test_environment, teardown_test_environment
+
+            # Adds 'testserver' to ALLOWED_HOSTS and switches to the
+            # in-memory email backend for the duration of the run.
+            try:
+                setup_test_environment()
+                test_environment = True
+            except RuntimeError:
+                pass  # Already set up: running inside the test suite.
+            session_factory = TestClientSession
+            on_thread_exit = connections.close_all
+
+        try:
+            if options['cold_cache']:
+                cache.clear()
+            run = dict(
+                session_factory=session_factory, data=data, journeys=options['journeys'],
+                concurrency=options['concurrency'], seed=options['seed'], on_thread_exit=on_thread_exit,
+            )
+            if options['warmup']:
+                run_journeys(iterations=options['warmup'], **run)
+            samples, runs, wall_s = run_journeys(iterations=options['iterations'], **run)
+        finally:
+            if test_environment:
+                teardown_test_environment()
+
+        parameters = {
+            key: options[key]
+            for key in ('client', 'journeys', 'iterations', 'warmup', 'concurrency', 'seed', 'cold_cache')
+        }
+        if options['client'] == 'http':
+            parameters['base_url'] = options['base_url']
+        report = build_report(samples, runs, wall_s, parameters, self._dataset())
+
+        output = options['output'] or f'loadtest-{report["revision"]["sha"] or "unknown"}.json'
+        with open(output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+
+        self.stdout.write(f'{"step":<22}{"requests":>10}{"errors":>8}{"p50 ms":>10}{"p95 ms":>10}{"queries":>9}')
+        for step, stats in report['steps'].items():
+            queries = '-' if stats['mean_queries'] is None else f'{stats["mean_queries"]:.1f}'
+            self.stdout.write(
+                f'{step:<22}{stats["requests"]:>10}{stats["errors"]:>8}'
+                f'{stats["p50_ms"]:>10.1f}{stats["p95_ms"]:>10.1f}{queries:>9}'
+            )
+        totals = report['totals']
+        style = self.style.WARNING if totals['errors'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f'{totals["requests"]} requests in {totals["wall_s"]}s ({totals["throughput_rps"]} req/s), '
+            f'{totals["errors"]} errors — report written to {output}'
+        ))
@@ -0,0 +1,37 @@
+"""
+Management command minting an X-Profile-Token header for request profiling.
+
+Requests sent with the token (to a path under ``--path``) are profiled by
+utils.middleware.ProfilingMiddleware, subject to its rate limit. The
+token is signed with SECRET_KEY and expires after
+``PROFILING['token_max_age']`` seconds, so it can be handed to someone
+reproducing a slow request without giving them staff access.
+
+Usage:
+    python manage.py profile_token
+    python manage.py profile_token --path /api/search/
+    curl -H "X-Profile-Token: $(python manage.py profile_token)" https://.../api/search/unified/ -i
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.profiling import make_profile_token, profiling_settings
+
+
+class Command(BaseCommand):
+    help = 'Print a signed X-Profile-Token header value for profiling requests'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='/api/',
+            help='Only requests under this path prefix are profiled (default: /api/)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['path'].startswith('/'):
+            raise CommandError('--path must start with /')
+        config = profiling_settings()
+        if not config['enabled']:
+            self.stderr.write(self.style.WARNING('PROFILING is disabled; the token will be ignored'))
+        self.stdout.write(make_profile_token(options['path']))
+        self.stderr.write(f'Valid for {config["token_max_age"]} seconds on {options["path"]}*')
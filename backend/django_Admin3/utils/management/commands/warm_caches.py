@@ -0,0 +1,71 @@
+"""
+Management command running the cache warmers (utils.warmup).
+
+Runs every registered warmer (or those named with ``--only``) and prints
+the time each took. Shared warmers fill the shared cache, so running this
+once after a deploy warms it for every worker; per-process warmers only
+warm this process and are skipped unless named or ``--all`` is given.
+
+Usage:
+    python manage.py warm_caches
+    python manage.py warm_caches --only catalog.navigation rules.active_rules
+    python manage.py warm_caches --list
+    python manage.py warm_caches --strict    # non-zero exit when a warmer fails
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.warmup import get_warmers, run_warmers
+
+
+class Command(BaseCommand):
+    help = 'Prime caches by running the registered cache warmers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='+', metavar='NAME', help='Run only these warmers')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Also run per-process warmers (they only warm this process)',
+        )
+        parser.add_argument('--list', action='store_true', help='List the registered warmers and exit')
+        parser.add_argument(
+            '--no-lock',
+            action='store_true',
+            help='Run shared warmers even when a worker is running the same warmer',
+        )
+        parser.add_argument('--strict', action='store_true', help='Exit non-zero when any warmer fails')
+
+    def handle(self, *args, **options):
+        try:
+            warmers = get_warmers(options['only'])
+        except KeyError as exc:
+            raise CommandError(exc.args[0])
+
+        if options['list']:
+            for warmer in warmers:
+                kind = 'per-process' if warmer.per_process else 'shared'
+                self.stdout.write(f'{warmer.name:32} {kind}')
+            return
+
+        if not options['only'] and not options['all']:
+            warmers = [warmer for warmer in warmers if not warmer.per_process]
+        if not warmers:
+            self.stdout.write('No warmers to run.')
+            return
+
+        results = run_warmers([warmer.name for warmer in warmers], use_lock=not options['no_lock'])
+        for result in results:
+            if result.skipped:
+                outcome = self.style.WARNING('skipped')
+            elif result.ok:
+                outcome = self.style.SUCCESS('ok')
+            else:
+                outcome = self.style.ERROR('failed')
+            detail = f'  {result.detail}' if result.detail else ''
+            self.stdout.write(f'{result.name:32} {outcome} {result.duration_ms:8.0f} ms{detail}')
+
+        failed = [result.name for result in results if not result.ok]
+        total_ms = sum(result.duration_ms for result in results)
+        self.stdout.write(f'{len(results)} warmer(s) in {total_ms:.0f} ms, {len(failed)} failed')
+        if failed and options['strict']:
+            raise CommandError(f'Warmers failed: {", ".join(failed)}')
@@ -1,8 +1,20 @@
 """
 Custom middleware for Django Admin3 project
 """
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
 from django.utils.deprecation import MiddlewareMixin
 
+from django_Admin3.db_pool import statement_timeout_for
+
+logger = logging.getLogger(__name__)
+metrics_logger = logging.getLogger('request_metrics')
+
 
 class HealthCheckMiddleware(MiddlewareMixin):
     """
@@ -26,3 +38,243 @@ class HealthCheckMiddleware(MiddlewareMixin):
             # Mark request as HTTPS to bypass SSL redirect
             request.META['HTTP_X_FORWARDED_PROTO'] = 'https'
         return None
+
+
+class _StatementTimeout:
+    """Execute wrapper issuing ``SET statement_timeout`` before the first
+    query of the request, so requests that never query don't touch (or
+    check out) a connection."""
+
+    def __init__(self, timeout):
+        self.timeout = int(timeout)
+        self.applied = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if not self.applied:
+            self.applied = _execute_raw(context['connection'], f"SET statement_timeout = {self.timeout}")
+        return execute(sql, params, many, context)
+
+
+def _execute_raw(db, sql):
+    """Run ``sql`` on the driver cursor, outside query logging."""
+    try:
+        db.ensure_connection()
+        with db.wrap_database_errors, db.connection.cursor() as cursor:
+            cursor.execute(sql)
+        return True
+    except Exception as exc:
+        # Never fail the request over the timeout itself
+        logger.warning(f"Could not apply '{sql}': {exc}")
+        return False
+
+
+class StatementTimeoutMiddleware(MiddlewareMixin):
+    """
+    Bound query time per route class with PostgreSQL statement_timeout.
+
+    settings.STATEMENT_TIMEOUTS gives a short default for storefront routes
+    and longer limits for admin route prefixes. The timeout is applied
+    lazily: an execute wrapper sets it right before the request's first
+    query, and it is reset after the response only if it was set, so the
+    connection goes back to the pool with the server default and requests
+    that never query cost nothing. Management commands never pass through
+    here and keep that default (unlimited).
+
+    The statements go through the raw driver cursor, so they don't show up
+    in query logging or assertNumQueries counts.
+    """
+
+    def process_request(self, request):
+        timeout = statement_timeout_for(request.path, getattr(settings, 'STATEMENT_TIMEOUTS', {}))
+        if not timeout or connection.vendor != 'postgresql':
+            return None
+        request._statement_timeout = _StatementTimeout(timeout)
+        connection.execute_wrappers.append(request._statement_timeout)
+        return None
+
+    def process_response(self, request, response):
+        statement_timeout = getattr(request, '_statement_timeout', None)
+        if statement_timeout is not None:
+            if statement_timeout in connection.execute_wrappers:
+                connection.execute_wrappers.remove(statement_timeout)
+            if statement_timeout.applied:
+                _execute_raw(connection, "RESET statement_timeout")
+        return response
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, DB time, repeated SQL and cache hits per request.
+
+    Uses utils.request_metrics to:
+      - add a ``Server-Timing`` header (``db``, ``cache`` and ``app``
+        entries) that browser dev tools show per request;
+      - log one ``request_metrics`` line per request, with the numbers as
+        ``extra={'request_metrics': {...}}`` for structured handlers —
+        INFO when statements repeat (likely N+1), DEBUG otherwise;
+      - log the full SQL of a sample of slow requests;
+      - check ``settings.QUERY_BUDGETS``: over-budget requests are logged
+        as warnings, or raise QueryBudgetExceeded when
+        ``QUERY_BUDGETS_ENFORCED`` is set (test / CI settings).
+
+    Sync and async capable, so it adds no thread hop under ASGI; queries
+    an async view runs through ``sync_to_async`` are counted as well.
+
+    Place it first in MIDDLEWARE so queries run by other middleware
+    (sessions, auth) are counted too. ``settings.REQUEST_METRICS``
+    configures it; see base settings.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        from utils.request_metrics import install_cache_instrumentation, install_query_instrumentation
+
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_cache_instrumentation()
+        install_query_instrumentation()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        from utils.request_metrics import record_request_metrics
+
+        config = getattr(settings, 'REQUEST_METRICS', {})
+        if not config.get('enabled', True):
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        with record_request_metrics() as metrics:
+            response = self.get_response(request)
+        return self._report(request, response, metrics, started, config)
+
+    async def __acall__(self, request):
+        from utils.request_metrics import record_request_metrics
+
+        config = getattr(settings, 'REQUEST_METRICS', {})
+        if not config.get('enabled', True):
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        with record_request_metrics() as metrics:
+            response = await self.get_response(request)
+        return self._report(request, response, metrics, started, config)
+
+    def _report(self, request, response, metrics, started, config):
+        from utils.request_metrics import QueryBudgetExceeded, budget_for, check_budget
+
+        total_ms = (time.perf_counter() - started) * 1000
+        request.request_metrics = metrics
+
+        if config.get('server_timing', True):
+            response['Server-Timing'] = (
+                f'db;dur={metrics.db_time_ms:.1f};desc="{metrics.queries} queries", '
+                f'cache;desc="{metrics.cache_hits} hits {metrics.cache_misses} misses", '
+                f'app;dur={total_ms:.1f}'
+            )
+
+        summary = (
+            f'{request.method} {request.path} {response.status_code} '
+            f'queries={metrics.queries} db_ms={metrics.db_time_ms:.1f} '
+            f'dup={metrics.duplicate_queries} cache_hit={metrics.cache_hits} '
+            f'cache_miss={metrics.cache_misses} total_ms={total_ms:.1f}'
+        )
+        fields = {**metrics.as_dict(), 'method': request.method, 'path': request.path,
+                  'status': response.status_code, 'total_ms': round(total_ms, 1)}
+        metrics_logger.log(
+            logging.INFO if metrics.duplicate_queries else logging.DEBUG,
+            f'request_metrics {summary}',
+            extra={'request_metrics': fields},
+        )
+
+        if total_ms >= config.get('slow_request_ms', 1000) and random.random() < config.get('slow_sample_rate', 0.1):
+            statements = '\n'.join(f'  {ms:.1f}ms {sql}' for sql, ms in metrics.samples)
+            metrics_logger.warning(
+                f'slow_request {summary}\n{statements}',
+                extra={'request_metrics': {**fields, 'sql': metrics.samples}},
+            )
+
+        failure = check_budget(metrics, budget_for(request.path), f'{request.method} {request.path}')
+        if failure:
+            if getattr(settings, 'QUERY_BUDGETS_ENFORCED', False):
+                raise QueryBudgetExceeded(failure)
+            metrics_logger.warning(f'query_budget_exceeded {failure}')
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Run a requested request under the sampling profiler (utils.profiling).
+
+    A request is profiled when it carries a valid ``X-Profile-Token``
+    header (``manage.py profile_token``) or comes from a staff user with
+    ``?_profile=1``, and a rate-limit slot is free. The profile is kept in
+    the cache for ``PROFILING['ttl']`` seconds; the response names it in
+    ``X-Profile-Id`` and ``X-Profile-Url``, or says why it was not taken
+    in ``X-Profile-Skipped``. Disabled unless ``PROFILING['enabled']``.
+
+    Sync and async capable. Requests that don't ask for a profile pass
+    straight through, with no thread hop under ASGI. An async profile
+    samples the event-loop thread, so work a view hands to
+    ``sync_to_async`` shows up only as the await.
+
+    Place it after AuthenticationMiddleware so session users are known.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        from utils import profiling
+
+        if not profiling.profiling_settings()['enabled'] or not profiling.profile_requested(request):
+            return self.get_response(request)
+        if not profiling.acquire_slot():
+            response = self.get_response(request)
+            response['X-Profile-Skipped'] = 'rate-limited'
+            return response
+
+        with profiling.profiled(f'{request.method} {request.path}') as run:
+            response = self.get_response(request)
+        profiling.store_profile(run.profile)
+        return self._annotate(request, response, run.profile)
+
+    async def __acall__(self, request):
+        from utils import profiling
+
+        if not profiling.profiling_settings()['enabled'] or not profiling.profile_asked(request):
+            return await self.get_response(request)
+        # The staff check may load the user; the slot and store hit the cache.
+        if not await sync_to_async(profiling.profile_requested)(request):
+            return await self.get_response(request)
+        if not await sync_to_async(profiling.acquire_slot)():
+            response = await self.get_response(request)
+            response['X-Profile-Skipped'] = 'rate-limited'
+            return response
+
+        with profiling.profiled(f'{request.method} {request.path}') as run:
+            response = await self.get_response(request)
+        await sync_to_async(profiling.store_profile)(run.profile)
+        return self._annotate(request, response, run.profile)
+
+    @staticmethod
+    def _annotate(request, response, profile):
+        logger.info(
+            f'Profiled {request.method} {request.path}: {profile.samples} samples, '
+            f'{profile.duration_ms:.0f} ms, id {profile.id}'
+        )
+        response['X-Profile-Id'] = profile.id
+        response['X-Profile-Url'] = f'/api/utils/profiles/{profile.id}/'
+        return response
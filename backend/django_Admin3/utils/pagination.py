@@ -0,0 +1,326 @@
+"""
+Pagination for admin list APIs over large tables.
+
+``AdminListPagination`` is a drop-in replacement for ``PageNumberPagination``
+that avoids the two costs that grow with table size:
+
+  - COUNT(*): when the request carries no filter parameters, the total is
+    estimated from ``pg_class.reltuples`` (unfiltered querysets) or the
+    planner's row estimate from EXPLAIN (querysets with base filters).
+    Estimates below ``estimate_count_threshold`` fall back to an exact
+    count, and filtered requests always count exactly. Responses carry
+    ``count_is_estimate``.
+  - OFFSET: passing ``cursor`` (empty for the first page) switches to
+    keyset pagination on the queryset's existing ordering columns plus a
+    pk tiebreaker, so every page costs the same however deep it is.
+    ``next`` / ``previous`` carry opaque cursors; ``count`` is null for
+    filtered keyset requests.
+
+With an estimated count, page-number mode works out ``next`` by reading
+one extra row instead of trusting the estimate.
+"""
+import base64
+import binascii
+import datetime
+import json
+import logging
+import uuid
+from decimal import Decimal
+from functools import partial
+from typing import List, Optional, Tuple
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Page, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+logger = logging.getLogger(__name__)
+
+
+# ── count estimates ──────────────────────────────────────────────────────
+
+def estimated_table_rows(model, using='default') -> Optional[int]:
+    """Row estimate for ``model``'s table from pg_class.reltuples.
+
+    None when not on PostgreSQL or the table has never been analyzed.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def estimated_queryset_rows(queryset) -> Optional[int]:
+    """Planner row estimate for ``queryset`` (EXPLAIN, no execution)."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimated_count(queryset) -> Optional[int]:
+    """reltuples for unfiltered querysets, the EXPLAIN estimate otherwise."""
+    try:
+        if not queryset.query.where:
+            return estimated_table_rows(queryset.model, using=queryset.db)
+        return estimated_queryset_rows(queryset)
+    except (DatabaseError, KeyError, IndexError, TypeError, ValueError) as exc:
+        logger.warning(f"Row estimate failed for {queryset.model.__name__}: {exc}")
+        return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts a given row estimate instead of COUNT(*).
+
+    Page numbers past the estimate are still served, and ``has_next`` is
+    decided by reading one extra row.
+    """
+
+    def __init__(self, object_list, per_page, *, estimated_count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._estimated_count = estimated_count
+
+    @cached_property
+    def count(self):
+        return self._estimated_count
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        return ProbedPage(rows[:self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+
+class ProbedPage(Page):
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self._has_more = has_more
+
+    def has_next(self):
+        return self._has_more
+
+
+# ── keyset cursors ──────────────────────────────────────────────────────
+
+def _encode_value(value):
+    # Full precision: DjangoJSONEncoder truncates microseconds, which would
+    # make the keyset comparison skip rows.
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def _row_value(row, path):
+    value = row
+    for part in path.split('__'):
+        if value is None:
+            return None
+        value = value[part] if isinstance(value, dict) else getattr(value, part)
+    return value
+
+
+def keyset_ordering(queryset) -> List[Tuple[str, bool]]:
+    """Return the queryset ordering as (field path, descending) pairs.
+
+    A pk tiebreaker is appended unless the ordering already ends on pk.
+    Raises ParseError for orderings keyset pagination cannot follow
+    (random, expressions, no ordering).
+    """
+    if queryset.query.order_by:
+        ordering = list(queryset.query.order_by)
+    elif queryset.query.default_ordering:
+        ordering = list(queryset.model._meta.ordering)
+    else:
+        ordering = []
+
+    fields = []
+    for item in ordering:
+        if not isinstance(item, str) or item == '?':
+            raise ParseError('Keyset pagination is not available for this ordering.')
+        fields.append((item.lstrip('-'), item.startswith('-')))
+    if not fields:
+        raise ParseError('Keyset pagination needs an ordered queryset.')
+
+    pk_names = {'pk', queryset.model._meta.pk.name}
+    if fields[-1][0] not in pk_names:
+        fields.append(('pk', False))
+    return fields
+
+
+def keyset_filter(fields, values, reverse=False) -> Q:
+    """Q for rows strictly after ``values`` in the given ordering.
+
+    Follows PostgreSQL's NULL placement (last when ascending, first when
+    descending), so nullable ordering columns page correctly.
+    """
+    condition = Q(pk__in=[])
+    ties = Q()
+    for (field, descending), value in zip(fields, values):
+        descending = descending != reverse
+        if value is None:
+            after = Q(**{f'{field}__isnull': False}) if descending else Q(pk__in=[])
+            equal = Q(**{f'{field}__isnull': True})
+        elif descending:
+            after = Q(**{f'{field}__lt': value})
+            equal = Q(**{field: value})
+        else:
+            after = Q(**{f'{field}__gt': value}) | Q(**{f'{field}__isnull': True})
+            equal = Q(**{field: value})
+        condition |= ties & after
+        ties &= equal
+    return condition
+
+
+class AdminListPagination(PageNumberPagination):
+    """Page-number pagination with estimated counts and an opt-in keyset mode.
+
+    Subclass per view to set page_size / page_size_query_param /
+    max_page_size, as with PageNumberPagination.
+    """
+
+    cursor_query_param = 'cursor'
+    estimate_count_threshold = 10000
+
+    # Query params that don't filter the result set
+    non_filter_params = {'ordering', 'format'}
+
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count_is_estimate = False
+        self.keyset = self.cursor_query_param in request.query_params
+        if self.keyset:
+            return self._paginate_keyset(queryset, request)
+
+        estimate = self._estimate_count(queryset, request)
+        if estimate is None:
+            self.django_paginator_class = Paginator
+        else:
+            self.count_is_estimate = True
+            self.django_paginator_class = partial(EstimatedCountPaginator, estimated_count=estimate)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return Response({
+                'count': self.keyset_count,
+                'count_is_estimate': self.count_is_estimate,
+                'next': self.next_cursor_link,
+                'previous': self.previous_cursor_link,
+                'results': data,
+            })
+        return Response({
+            'count': self.page.paginator.count,
+            'count_is_estimate': self.count_is_estimate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    # ── counts ──
+    def has_filters(self, request) -> bool:
+        ignored = self.non_filter_params | {
+            self.page_query_param, self.page_size_query_param, self.cursor_query_param,
+        }
+        return any(
+            value.strip()
+            for key, values in request.query_params.lists()
+            if key not in ignored
+            for value in values
+        )
+
+    def _estimate_count(self, queryset, request) -> Optional[int]:
+        """The estimate to use instead of COUNT(*), or None to count exactly."""
+        if self.has_filters(request):
+            return None
+        estimate = estimated_count(queryset)
+        if estimate is None or estimate < self.estimate_count_threshold:
+            return None
+        return estimate
+
+    # ── keyset mode ──
+    def _paginate_keyset(self, queryset, request):
+        page_size = self.get_page_size(request)
+        fields = keyset_ordering(queryset)
+        values, reverse = self._decode_cursor(request.query_params.get(self.cursor_query_param), fields)
+
+        ordered = queryset.order_by(*[
+            f"{'-' if descending != reverse else ''}{field}" for field, descending in fields
+        ])
+        if values is not None:
+            ordered = ordered.filter(keyset_filter(fields, values, reverse))
+
+        rows = list(ordered[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else values is not None
+
+        self.next_cursor_link = self._cursor_link(request, fields, rows[-1], False) if rows and has_next else None
+        self.previous_cursor_link = self._cursor_link(request, fields, rows[0], True) if rows and has_previous else None
+
+        # Filtered keyset listings skip the count entirely
+        self.keyset_count = None
+        if not self.has_filters(request):
+            estimate = self._estimate_count(queryset, request)
+            self.count_is_estimate = estimate is not None
+            self.keyset_count = estimate if estimate is not None else queryset.count()
+        return rows
+
+    def _cursor_link(self, request, fields, row, reverse):
+        payload = {
+            'o': [f"{'-' if descending else ''}{field}" for field, descending in fields],
+            'v': [_encode_value(_row_value(row, field)) for field, _ in fields],
+            'r': reverse,
+        }
+        token = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        url = remove_query_param(request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def _decode_cursor(self, token, fields):
+        """Return (values, reverse); (None, False) for the first page."""
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            ordering = [f"{'-' if descending else ''}{field}" for field, descending in fields]
+            if payload['o'] != ordering or len(payload['v']) != len(fields):
+                raise ValueError('cursor ordering does not match')
+            return payload['v'], bool(payload['r'])
+        except (binascii.Error, KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,346 @@
+"""
+On-demand sampling profiles of requests and management commands.
+
+Opt-in, for diagnosing a slow endpoint or command in place without a
+debug build:
+
+  - Requests (utils.middleware.ProfilingMiddleware): a request carrying a
+    valid ``X-Profile-Token`` header (minted by ``manage.py profile_token``,
+    signed with SECRET_KEY, short-lived), or a staff user's request with
+    ``?_profile=1``, runs under the profiler. The profile is stored in the
+    cache for ``PROFILING['ttl']`` seconds — expiry is the cache's — and
+    the response carries ``X-Profile-Id`` / ``X-Profile-Url``; staff
+    download it from ``/api/utils/profiles/<id>/``. At most
+    ``PROFILING['max_per_window']`` profiles are taken per
+    ``PROFILING['window']`` seconds across all instances.
+  - Commands: ``ProfileCommandMixin`` adds ``--profile [PATH]`` to a
+    management command and writes the profile of the whole run to PATH.
+
+Two profilers, both sampling (cheap enough for production traffic):
+
+  - ``pyinstrument`` when installed — output in speedscope JSON;
+  - ``sampling``, a stdlib fallback that samples the profiled thread's
+    stack every ``PROFILING['interval_ms']`` — output as folded stacks
+    (``frame;frame;frame count`` lines).
+
+Both formats open directly in https://www.speedscope.app and the folded
+stacks feed flamegraph.pl / inferno. ``PROFILING['backend']`` picks one;
+``'auto'`` prefers pyinstrument.
+"""
+import gzip
+import logging
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+
+try:
+    import pyinstrument
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pragma: no cover - optional dependency
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'enabled': False,
+    'backend': 'auto',
+    'interval_ms': 5,
+    'ttl': 3600,
+    'max_per_window': 10,
+    'window': 600,
+    'token_max_age': 900,
+}
+
+TOKEN_HEADER = 'HTTP_X_PROFILE_TOKEN'
+QUERY_FLAG = '_profile'
+MAX_STACK_DEPTH = 128
+MAX_SAMPLES = 200_000
+
+_TOKEN_SALT = 'utils.profiling.token'
+_PROFILE_KEY = 'profiling:profile:{}'
+_RATE_KEY = 'profiling:rate:{}'
+
+EXTENSIONS = {'speedscope': 'speedscope.json', 'folded': 'folded'}
+CONTENT_TYPES = {'speedscope': 'application/json', 'folded': 'text/plain'}
+
+
+def profiling_settings() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'PROFILING', {})}
+
+
+@dataclass
+class Profile:
+    """A finished profile."""
+
+    label: str
+    format: str
+    content: bytes
+    duration_ms: float
+    samples: int
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def filename(self) -> str:
+        return f'profile-{self.id}.{EXTENSIONS[self.format]}'
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread.
+
+    Stacks are aggregated as folded-stack counts; each frame is named
+    ``function (path:first line)`` so samples anywhere in a function add
+    up to the same frame.
+    """
+
+    format = 'folded'
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self.samples = 0
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval) and self.samples < MAX_SAMPLES:
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def render(self) -> bytes:
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common()).encode()
+
+
+class PyinstrumentSampler:
+    """pyinstrument's statistical profiler, rendered as speedscope JSON."""
+
+    format = 'speedscope'
+
+    def __init__(self, interval_ms: float):
+        self.profiler = pyinstrument.Profiler(interval=interval_ms / 1000, async_mode='disabled')
+        self.samples = 0
+
+    def start(self):
+        self.profiler.start()
+
+    def stop(self):
+        session = self.profiler.stop()
+        self.samples = session.sample_count
+
+    def render(self) -> bytes:
+        return self.profiler.output(renderer=SpeedscopeRenderer()).encode()
+
+
+BACKENDS = {'sampling': StackSampler, 'pyinstrument': PyinstrumentSampler}
+
+
+def get_sampler(backend: Optional[str] = None):
+    config = profiling_settings()
+    backend = backend or config['backend']
+    if backend == 'auto':
+        backend = 'pyinstrument' if pyinstrument is not None else 'sampling'
+    if backend == 'pyinstrument' and pyinstrument is None:
+        raise ValueError('PROFILING backend "pyinstrument" is selected but pyinstrument is not installed')
+    try:
+        return BACKENDS[backend](config['interval_ms'])
+    except KeyError:
+        raise ValueError(f'Unknown profiling backend {backend!r}; expected auto, {", ".join(BACKENDS)}') from None
+
+
+class _Profiling:
+    profile: Optional[Profile] = None
+
+
+@contextmanager
+def profiled(label: str, backend: Optional[str] = None):
+    """Profile the block; ``.profile`` is set on the yielded object on exit.
+
+    Usage::
+
+        with profiled('recalculate') as run:
+            recalculate_everything()
+        with open(run.profile.filename, 'wb') as handle:
+            handle.write(run.profile.content)
+    """
+    sampler = get_sampler(backend)
+    run = _Profiling()
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        yield run
+    finally:
+        sampler.stop()
+        run.profile = Profile(
+            label=label,
+            format=sampler.format,
+            content=sampler.render(),
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            samples=sampler.samples,
+        )
+
+
+# ---------------------------------------------------------------- requests
+
+def make_profile_token(path_prefix: str = '/') -> str:
+    """A header token allowing profiles of requests under ``path_prefix``."""
+    return signing.TimestampSigner(salt=_TOKEN_SALT).sign(path_prefix)
+
+
+def token_allows(token: str, path: str) -> bool:
+    try:
+        prefix = signing.TimestampSigner(salt=_TOKEN_SALT).unsign(
+            token, max_age=profiling_settings()['token_max_age'],
+        )
+    except signing.BadSignature:
+        return False
+    return path.startswith(prefix)
+
+
+def _is_staff(request) -> bool:
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    # API clients authenticate with JWT inside DRF, after middleware.
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except (InvalidToken, TokenError):
+        return False
+    return bool(result) and result[0].is_staff
+
+
+def profile_asked(request) -> bool:
+    """Whether ``request`` asks for a profile at all (no DB or cache)."""
+    return bool(request.META.get(TOKEN_HEADER)) or request.GET.get(QUERY_FLAG) == '1'
+
+
+def profile_requested(request) -> bool:
+    """Whether ``request`` asks for, and is allowed, a profile."""
+    token = request.META.get(TOKEN_HEADER)
+    if token:
+        return token_allows(token, request.path)
+    if request.GET.get(QUERY_FLAG) == '1':
+        return _is_staff(request)
+    return False
+
+
+def acquire_slot() -> bool:
+    """Take one of the ``max_per_window`` profiles of the current window."""
+    config = profiling_settings()
+    key = _RATE_KEY.format(int(time.time() // config['window']))
+    cache.add(key, 0, timeout=config['window'])
+    try:
+        taken = cache.incr(key)
+    except ValueError:  # expired between add and incr
+        cache.add(key, 1, timeout=config['window'])
+        taken = 1
+    return taken <= config['max_per_window']
+
+
+def store_profile(profile: Profile) -> None:
+    """Keep ``profile`` for ``PROFILING['ttl']`` seconds."""
+    cache.set(
+        _PROFILE_KEY.format(profile.id),
+        {
+            'label': profile.label, 'format': profile.format, 'duration_ms': profile.duration_ms,
+            'samples': profile.samples, 'created_at': profile.created_at,
+            'content': gzip.compress(profile.content),
+        },
+        timeout=profiling_settings()['ttl'],
+    )
+
+
+def load_profile(profile_id: str) -> Optional[Profile]:
+    stored = cache.get(_PROFILE_KEY.format(profile_id))
+    if stored is None:
+        return None
+    return Profile(
+        id=profile_id, label=stored['label'], format=stored['format'],
+        content=gzip.decompress(stored['content']), duration_ms=stored['duration_ms'],
+        samples=stored['samples'], created_at=stored['created_at'],
+    )
+
+
+# ---------------------------------------------------------------- commands
+
+class ProfileCommandMixin:
+    """Adds ``--profile [PATH]`` to a management command.
+
+    The whole run is profiled and written to PATH (default:
+    ``profile-<command>-<time>.<ext>`` in the working directory)::
+
+        class Command(ProfileCommandMixin, BaseCommand):
+            ...
+
+        python manage.py sync_all --profile
+        python manage.py import_students data.csv --profile /tmp/import.folded
+
+    Only this process is sampled — work in worker processes is not.
+    """
+
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        parser.add_argument(
+            '--profile',
+            nargs='?',
+            const='',
+            default=None,
+            metavar='PATH',
+            help='Profile this run with a sampling profiler and write a flamegraph-ready file to PATH',
+        )
+        self._command_name = subcommand
+        return parser
+
+    def execute(self, *args, **options):
+        path = options.pop('profile', None)
+        if path is None:
+            return super().execute(*args, **options)
+        label = getattr(self, '_command_name', None) or self.__module__.rsplit('.', 1)[-1]
+        run = None
+        try:
+            with profiled(label) as run:
+                return super().execute(*args, **options)
+        finally:
+            # Also on failure or Ctrl-C: a run that dies slowly is the one
+            # worth looking at.
+            if run is not None and run.profile is not None:
+                self._write_profile(run.profile, path, label)
+
+    def _write_profile(self, profile: Profile, path: str, label: str) -> None:
+        if not path:
+            path = f'profile-{label}-{time.strftime("%Y%m%d-%H%M%S")}.{EXTENSIONS[profile.format]}'
+        with open(path, 'wb') as handle:
+            handle.write(profile.content)
+        self.stderr.write(
+            f'Profile: {profile.samples} samples over {profile.duration_ms:.0f} ms '
+            f'written to {path} ({profile.format}; open in https://www.speedscope.app)'
+        )
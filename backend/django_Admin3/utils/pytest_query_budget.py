@@ -0,0 +1,48 @@
+"""
+pytest plugin for query budgets (see utils.request_metrics).
+
+Registered from the root conftest.py. Provides:
+
+  - route budgets: every test runs with ``QUERY_BUDGETS_ENFORCED``, so a
+    request to a path in ``settings.QUERY_BUDGETS`` that runs too many
+    queries fails the test that made it;
+  - ``@pytest.mark.query_budget(n)``: fails the test when its body runs
+    more than ``n`` queries;
+  - the ``query_budget`` fixture, for budgets on part of a test::
+
+        def test_cart(client, query_budget):
+            with query_budget(6):
+                client.get('/api/cart/')
+"""
+import pytest
+from django.test import override_settings
+
+from utils.request_metrics import query_budget as _query_budget
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'query_budget(max_queries): fail the test if it runs more than max_queries queries',
+    )
+
+
+@pytest.fixture(autouse=True)
+def _enforce_route_query_budgets():
+    with override_settings(QUERY_BUDGETS_ENFORCED=True):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _query_budget_marker(request):
+    marker = request.node.get_closest_marker('query_budget')
+    if marker is None:
+        yield
+        return
+    with _query_budget(marker.args[0], label=request.node.nodeid):
+        yield
+
+
+@pytest.fixture
+def query_budget():
+    """``query_budget(n)`` context manager / decorator factory."""
+    return _query_budget
@@ -1,8 +1,11 @@
 import requests
 import logging
+import httpx
 from django.conf import settings
 from typing import Dict, Optional
 
+from utils.http_client import UpstreamBusy, upstream_request
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,35 +20,10 @@ def verify_recaptcha(recaptcha_response: str, user_ip: Optional[str] = None) ->
     Returns:
         Dict containing verification result and details
     """
-    if not recaptcha_response:
-        return {
-            "success": False,
-            "error": "No reCAPTCHA response provided",
-            "error_codes": ["missing-input-response"]
-        }
-    
-    # Get reCAPTCHA settings
-    secret_key = getattr(settings, "RECAPTCHA_SECRET_KEY", "")
-    verify_url = getattr(settings, "RECAPTCHA_VERIFY_URL", "https://www.google.com/recaptcha/api/siteverify")
-    
-    if not secret_key:
-        logger.error("RECAPTCHA_SECRET_KEY not configured in settings")
-        return {
-            "success": False,
-            "error": "reCAPTCHA not properly configured",
-            "error_codes": ["missing-secret-key"]
-        }
-    
-    # Prepare verification data
-    verification_data = {
-        "secret": secret_key,
-        "response": recaptcha_response,
-    }
-    
-    # Add IP address if provided
-    if user_ip:
-        verification_data["remoteip"] = user_ip
-    
+    verify_url, verification_data, error = _prepare_verification(recaptcha_response, user_ip)
+    if error:
+        return error
+
     try:
         # Make request to Google verification endpoint
         response = requests.post(
@@ -58,24 +36,7 @@ def verify_recaptcha(recaptcha_response: str, user_ip: Optional[str] = None) ->
         response.raise_for_status()  # Raise exception for HTTP errors
         
         # Parse JSON response
-        result = response.json()
-        
-        # Log the verification attempt
-        if result.get("success"):
-            pass
-        else:
-            error_codes = result.get("error-codes", [])
-            logger.warning(f"reCAPTCHA verification failed. Error codes: {error_codes}")
-        
-        return {
-            "success": result.get("success", False),
-            "score": result.get("score"),  # For reCAPTCHA v3
-            "action": result.get("action"),  # For reCAPTCHA v3
-            "challenge_ts": result.get("challenge_ts"),  # Timestamp of challenge
-            "hostname": result.get("hostname"),  # Hostname of the site where reCAPTCHA was solved
-            "error_codes": result.get("error-codes", []),
-            "raw_response": result
-        }
+        return _verification_result(response.json())
         
     except requests.RequestException as e:
         logger.error(f"Network error during reCAPTCHA verification: {str(e)}")
@@ -117,37 +78,7 @@ def verify_recaptcha_v3(recaptcha_response: str, expected_action: str = None, mi
     """
     # First verify with Google
     result = verify_recaptcha(recaptcha_response, user_ip)
-    
-    if not result["success"]:
-        return result
-    
-    # Additional v3-specific validation
-    score = result.get("score")
-    action = result.get("action")
-    
-    # Check score threshold
-    if score is not None and score < min_score:
-        logger.warning(f"reCAPTCHA score {score} below threshold {min_score}")
-        return {
-            "success": False,
-            "error": f"reCAPTCHA score {score} below required threshold {min_score}",
-            "error_codes": ["score-too-low"],
-            "score": score,
-            "min_score": min_score
-        }
-    
-    # Check action if specified
-    if expected_action and action != expected_action:
-        logger.warning(f"reCAPTCHA action '{action}' does not match expected '{expected_action}'")
-        return {
-            "success": False,
-            "error": f"reCAPTCHA action '{action}' does not match expected '{expected_action}'",
-            "error_codes": ["action-mismatch"],
-            "action": action,
-            "expected_action": expected_action
-        }
-
-    return result
+    return _check_v3_result(result, expected_action, min_score)
 
 
 def is_recaptcha_enabled() -> bool:
@@ -182,4 +113,137 @@ def get_client_ip(request) -> Optional[str]:
         # Fallback to direct connection IP
         ip = request.META.get("REMOTE_ADDR")
     
-    return ip 
\ No newline at end of file
+    return ip 
+
+async def averify_recaptcha(recaptcha_response: str, user_ip: Optional[str] = None) -> Dict[str, any]:
+    """
+    Async variant of verify_recaptcha using the shared async HTTP client.
+
+    Returns the same result dicts; a saturated upstream is reported with the
+    "upstream-busy" error code.
+    """
+    verify_url, verification_data, error = _prepare_verification(recaptcha_response, user_ip)
+    if error:
+        return error
+
+    try:
+        response = await upstream_request('recaptcha', 'POST', verify_url, data=verification_data)
+        response.raise_for_status()
+        return _verification_result(response.json())
+
+    except UpstreamBusy as e:
+        logger.error(f"reCAPTCHA verification skipped: {str(e)}")
+        return {
+            "success": False,
+            "error": "reCAPTCHA service busy",
+            "error_codes": ["upstream-busy"]
+        }
+
+    except httpx.HTTPError as e:
+        logger.error(f"Network error during reCAPTCHA verification: {str(e)}")
+        return {
+            "success": False,
+            "error": f"Network error: {str(e)}",
+            "error_codes": ["network-error"]
+        }
+
+    except ValueError as e:
+        logger.error(f"Invalid JSON response from reCAPTCHA verification: {str(e)}")
+        return {
+            "success": False,
+            "error": "Invalid response from reCAPTCHA service",
+            "error_codes": ["invalid-json-response"]
+        }
+
+
+async def averify_recaptcha_v3(recaptcha_response: str, expected_action: str = None, min_score: float = 0.5, user_ip: Optional[str] = None) -> Dict[str, any]:
+    """Async variant of verify_recaptcha_v3."""
+    result = await averify_recaptcha(recaptcha_response, user_ip)
+    return _check_v3_result(result, expected_action, min_score)
+
+
+def _prepare_verification(recaptcha_response: str, user_ip: Optional[str]):
+    """Return (verify_url, verification_data, error); error is a result dict or None."""
+    if not recaptcha_response:
+        return None, None, {
+            "success": False,
+            "error": "No reCAPTCHA response provided",
+            "error_codes": ["missing-input-response"]
+        }
+
+    # Get reCAPTCHA settings
+    secret_key = getattr(settings, "RECAPTCHA_SECRET_KEY", "")
+    verify_url = getattr(settings, "RECAPTCHA_VERIFY_URL", "https://www.google.com/recaptcha/api/siteverify")
+
+    if not secret_key:
+        logger.error("RECAPTCHA_SECRET_KEY not configured in settings")
+        return None, None, {
+            "success": False,
+            "error": "reCAPTCHA not properly configured",
+            "error_codes": ["missing-secret-key"]
+        }
+
+    # Prepare verification data
+    verification_data = {
+        "secret": secret_key,
+        "response": recaptcha_response,
+    }
+
+    # Add IP address if provided
+    if user_ip:
+        verification_data["remoteip"] = user_ip
+
+    return verify_url, verification_data, None
+
+
+def _verification_result(result: Dict) -> Dict[str, any]:
+    """Normalize Google's siteverify payload."""
+    if not result.get("success"):
+        error_codes = result.get("error-codes", [])
+        logger.warning(f"reCAPTCHA verification failed. Error codes: {error_codes}")
+
+    return {
+        "success": result.get("success", False),
+        "score": result.get("score"),  # For reCAPTCHA v3
+        "action": result.get("action"),  # For reCAPTCHA v3
+        "challenge_ts": result.get("challenge_ts"),  # Timestamp of challenge
+        "hostname": result.get("hostname"),  # Hostname of the site where reCAPTCHA was solved
+        "error_codes": result.get("error-codes", []),
+        "raw_response": result
+    }
+
+
+def _check_v3_result(result: Dict, expected_action: Optional[str], min_score: float) -> Dict[str, any]:
+    """Apply the v3 score and action checks to a verification result."""
+    if not result["success"]:
+        return result
+
+    # Additional v3-specific validation
+    score = result.get("score")
+    action = result.get("action")
+
+    # Check score threshold
+    if score is not None and score < min_score:
+        logger.warning(f"reCAPTCHA score {score} below threshold {min_score}")
+        return {
+            "success": False,
+            "error": f"reCAPTCHA score {score} below required threshold {min_score}",
+            "error_codes": ["score-too-low"],
+            "score": score,
+            "min_score": min_score
+        }
+
+    # Check action if specified
+    if expected_action and action != expected_action:
+        logger.warning(f"reCAPTCHA action '{action}' does not match expected '{expected_action}'")
+        return {
+            "success": False,
+            "error": f"reCAPTCHA action '{action}' does not match expected '{expected_action}'",
+            "error_codes": ["action-mismatch"],
+            "action": action,
+            "expected_action": expected_action
+        }
+
+    return result
+
+
@@ -0,0 +1,253 @@
+"""
+Per-request database and cache metrics, and query budgets.
+
+``record_request_metrics()`` counts the queries and cache reads of a
+block into a ``RequestMetrics``:
+
+  - query count and total DB time
+  - SQL fingerprints seen more than once (the N+1 signature: the same
+    statement with different parameters)
+  - cache hits and misses on ``get`` / ``get_many``
+  - the statements themselves (capped), for slow-request samples
+
+The active metrics live in a context variable, and the recorders (an
+execute wrapper installed on every connection, the patched cache
+classes) read it. So a block or request that hops threads — an async
+view calling the ORM through ``sync_to_async`` — is still counted: the
+context follows the call into the worker thread, whose connection has
+the wrapper too. Nested blocks each count what runs inside them.
+
+utils.middleware.RequestMetricsMiddleware records every request this way
+and reports it (Server-Timing header, log line, slow-request samples).
+
+Query budgets cap the number of queries a route may run.
+``settings.QUERY_BUDGETS`` maps request paths to budgets; with
+``QUERY_BUDGETS_ENFORCED`` (test and CI settings) the middleware raises
+``QueryBudgetExceeded`` so the test that made the request fails. Tests
+can also cap a block or a test method directly::
+
+    @query_budget(5)
+    def test_cart_read(self): ...
+
+    with query_budget(3):
+        client.get('/api/cart/')
+
+utils.pytest_query_budget exposes the same to pytest (marker, fixture).
+"""
+import contextvars
+import hashlib
+import re
+import time
+from contextlib import ContextDecorator, contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+MAX_SQL_SAMPLES = 200
+
+# The RequestMetrics of every block entered in this context, outermost first.
+_current = contextvars.ContextVar('request_metrics', default=())
+_MISS = object()
+
+_IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)', re.IGNORECASE)
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request or block ran more queries than its budget allows."""
+
+
+def fingerprint(sql: str) -> str:
+    """Stable id for a statement shape: literals and IN-list lengths
+    normalised, so the same query with other parameters matches."""
+    normalised = _IN_LIST.sub('IN (...)', sql)
+    normalised = _STRING.sub('?', normalised)
+    normalised = _NUMBER.sub('?', normalised)
+    normalised = _SPACE.sub(' ', normalised).strip()
+    return hashlib.sha1(normalised.encode()).hexdigest()[:12]
+
+
+@dataclass
+class RequestMetrics:
+    """Database and cache activity of one request (or block)."""
+
+    queries: int = 0
+    db_time_ms: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    fingerprints: Dict[str, int] = field(default_factory=dict)
+    samples: List[Tuple[str, float]] = field(default_factory=list)
+    _first_sql: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    def record_query(self, sql: str, duration_ms: float) -> None:
+        self.queries += 1
+        self.db_time_ms += duration_ms
+        key = fingerprint(sql)
+        self.fingerprints[key] = self.fingerprints.get(key, 0) + 1
+        self._first_sql.setdefault(key, sql)
+        if len(self.samples) < MAX_SQL_SAMPLES:
+            self.samples.append((sql, duration_ms))
+
+    def duplicates(self, limit: int = 5) -> List[Tuple[str, int, str]]:
+        """``(fingerprint, count, sql)`` for statements run more than once,
+        most repeated first."""
+        repeated = sorted(
+            ((key, count) for key, count in self.fingerprints.items() if count > 1),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        return [(key, count, self._first_sql[key]) for key, count in repeated[:limit]]
+
+    @property
+    def duplicate_queries(self) -> int:
+        return sum(count - 1 for count in self.fingerprints.values() if count > 1)
+
+    def as_dict(self) -> Dict:
+        return {
+            'queries': self.queries,
+            'db_time_ms': round(self.db_time_ms, 1),
+            'duplicate_queries': self.duplicate_queries,
+            'duplicates': [
+                {'fingerprint': key, 'count': count, 'sql': sql[:200]}
+                for key, count, sql in self.duplicates()
+            ],
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+    def describe_duplicates(self) -> str:
+        return '\n'.join(
+            f'  {count}x [{key}] {sql[:200]}' for key, count, sql in self.duplicates()
+        )
+
+
+def _record_query(execute, sql, params, many, context):
+    active = _current.get()
+    if not active:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        for metrics in active:
+            metrics.record_query(sql, duration_ms)
+
+
+def _instrument_connection(connection, **kwargs):
+    # Innermost, so only the statement itself is timed.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+def install_query_instrumentation() -> None:
+    """Add the query recorder to this thread's open connections and to
+    every connection opened from now on, in any thread."""
+    connection_created.connect(_instrument_connection, dispatch_uid='utils.request_metrics')
+    for connection in connections.all(initialized_only=True):
+        _instrument_connection(connection)
+
+
+def _instrument_cache_class(cache_class) -> None:
+    """Count hits and misses of ``cache_class.get`` / ``get_many`` into the
+    active RequestMetrics. Patched once per class; a no-op outside
+    ``record_request_metrics``."""
+    if getattr(cache_class, '_request_metrics_instrumented', False):
+        return
+    original_get = cache_class.get
+    original_get_many = cache_class.get_many
+
+    def get(self, key, default=None, version=None, **kwargs):
+        active = _current.get()
+        if not active:
+            return original_get(self, key, default=default, version=version, **kwargs)
+        value = original_get(self, key, default=_MISS, version=version, **kwargs)
+        hit = value is not _MISS
+        for metrics in active:
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+        return value if hit else default
+
+    def get_many(self, keys, *args, **kwargs):
+        keys = list(keys)
+        active = _current.get()
+        # BaseCache.get_many falls back to self.get per key; don't count twice.
+        token = _current.set(())
+        try:
+            found = original_get_many(self, keys, *args, **kwargs)
+        finally:
+            _current.reset(token)
+        for metrics in active:
+            metrics.cache_hits += len(found)
+            metrics.cache_misses += len(keys) - len(found)
+        return found
+
+    cache_class.get = get
+    cache_class.get_many = get_many
+    cache_class._request_metrics_instrumented = True
+
+
+def install_cache_instrumentation() -> None:
+    """Instrument the backend class of every configured cache."""
+    for alias in settings.CACHES:
+        _instrument_cache_class(type(caches[alias]))
+
+
+@contextmanager
+def record_request_metrics(metrics: Optional[RequestMetrics] = None):
+    """Record queries on every connection and cache reads into ``metrics``."""
+    metrics = metrics if metrics is not None else RequestMetrics()
+    install_query_instrumentation()
+    token = _current.set(_current.get() + (metrics,))
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def budget_for(path: str) -> Optional[int]:
+    """The query budget of ``path`` from ``settings.QUERY_BUDGETS``."""
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(path)
+
+
+def check_budget(metrics: RequestMetrics, budget: Optional[int], label: str) -> Optional[str]:
+    """Return the failure message when ``metrics`` exceeds ``budget``."""
+    if budget is None or metrics.queries <= budget:
+        return None
+    message = f'{label} ran {metrics.queries} queries (budget {budget})'
+    if metrics.duplicates():
+        message += f'; repeated statements:\n{metrics.describe_duplicates()}'
+    return message
+
+
+class query_budget(ContextDecorator):
+    """Fail when the wrapped block or function runs more than
+    ``max_queries`` queries. Usable as a decorator or context manager."""
+
+    def __init__(self, max_queries: int, label: str = 'block'):
+        self.max_queries = max_queries
+        self.label = label
+        self._stack = []
+
+    def __enter__(self) -> RequestMetrics:
+        recorder = record_request_metrics()
+        metrics = recorder.__enter__()
+        self._stack.append((recorder, metrics))
+        return metrics
+
+    def __exit__(self, exc_type, exc, tb):
+        recorder, metrics = self._stack.pop()
+        recorder.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            failure = check_budget(metrics, self.max_queries, self.label)
+            if failure:
+                raise QueryBudgetExceeded(failure)
+        return False
@@ -11,6 +11,10 @@ from django.conf import settings
 from typing import Dict, List, Optional
 import logging
 
+import httpx
+
+from utils.http_client import upstream_request
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +38,7 @@ class PostcoderService:
             api_key: Postcoder API key (defaults to settings.POSTCODER_API_KEY)
         """
         self.api_key = api_key or settings.POSTCODER_API_KEY
+        self.base_url = getattr(settings, 'POSTCODER_API_URL', self.BASE_URL).rstrip('/')
         if not self.api_key:
             logger.warning("POSTCODER_API_KEY not configured")
 
@@ -63,17 +68,8 @@ class PostcoderService:
             raise ValueError("POSTCODER_API_KEY not configured")
 
         # Postcoder.com Autocomplete Find API endpoint
-        url = "https://ws.postcoder.com/pcw/autocomplete/find"
-
-        params = {
-            'query': search_query.strip(),
-            'country': country_code.upper(),
-            'apikey': self.api_key
-        }
-
-        # Add postcode parameter if provided (for countries that use postcodes)
-        if postcode and postcode.strip():
-            params['postcode'] = postcode.strip()
+        url = f"{self.base_url}/autocomplete/find"
+        params = self._autocomplete_params(search_query, country_code, postcode)
 
         try:
             logger.info(f"Calling Postcoder Autocomplete Find API for {country_code}")
@@ -129,13 +125,8 @@ class PostcoderService:
             raise ValueError("POSTCODER_API_KEY not configured")
 
         # Postcoder.com Autocomplete Retrieve API endpoint
-        url = "https://ws.postcoder.com/pcw/autocomplete/retrieve"
-
-        params = {
-            'id': address_id.strip(),
-            'country': country_code.upper(),
-            'apikey': self.api_key
-        }
+        url = f"{self.base_url}/autocomplete/retrieve"
+        params = self._retrieve_params(address_id, country_code)
 
         try:
             logger.info(f"Retrieving full address details for ID: {address_id}")
@@ -163,6 +154,94 @@ class PostcoderService:
             logger.error(f"❌ Postcoder Retrieve API error for ID {address_id}: {str(e)}")
             raise
 
+    def _autocomplete_params(self, search_query: str, country_code: str, postcode: str = None) -> Dict:
+        params = {
+            'query': search_query.strip(),
+            'country': country_code.upper(),
+            'apikey': self.api_key
+        }
+
+        # Add postcode parameter if provided (for countries that use postcodes)
+        if postcode and postcode.strip():
+            params['postcode'] = postcode.strip()
+        return params
+
+    def _retrieve_params(self, address_id: str, country_code: str) -> Dict:
+        return {
+            'id': address_id.strip(),
+            'country': country_code.upper(),
+            'apikey': self.api_key
+        }
+
+    async def _aget_json(self, url: str, params: Dict, description: str):
+        """GET ``url`` through the shared async client and return the decoded payload.
+
+        Errors follow the sync methods: TimeoutError on timeout and
+        requests.RequestException for HTTP errors or a ``{"error": ...}`` body.
+        """
+        try:
+            response = await upstream_request('postcoder', 'GET', url, params=params)
+            response.raise_for_status()
+        except httpx.TimeoutException:
+            logger.error(f"❌ Postcoder {description} API timeout")
+            raise TimeoutError("Postcoder API request timed out")
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Postcoder {description} API error: {str(e)}")
+            raise requests.RequestException(str(e))
+
+        data = response.json()
+        if isinstance(data, dict) and 'error' in data:
+            error_msg = data.get('error', 'Unknown error')
+            logger.error(f"Postcoder {description} API error: {error_msg}")
+            raise requests.RequestException(f"Postcoder API error: {error_msg}")
+        return data
+
+    async def aautocomplete_address(self, search_query: str, country_code: str = 'GB', postcode: str = None) -> Dict:
+        """Async variant of ``autocomplete_address`` for the ASGI views.
+
+        Raises:
+            ValueError: If search query is invalid or missing
+            utils.http_client.UpstreamBusy: If too many Postcoder calls are in flight
+            requests.RequestException: If API call fails
+            TimeoutError: If API call times out
+        """
+        if not search_query or not search_query.strip():
+            raise ValueError("Search query is required")
+
+        if not self.api_key:
+            raise ValueError("POSTCODER_API_KEY not configured")
+
+        data = await self._aget_json(
+            f"{self.base_url}/autocomplete/find",
+            self._autocomplete_params(search_query, country_code, postcode),
+            'Autocomplete',
+        )
+        logger.info(f"✅ Successfully retrieved {len(data) if isinstance(data, list) else 0} address suggestions for {country_code}")
+        return data
+
+    async def aretrieve_address(self, address_id: str, country_code: str = 'GB') -> Dict:
+        """Async variant of ``retrieve_address`` for the ASGI views.
+
+        Raises:
+            ValueError: If address_id is invalid or missing
+            utils.http_client.UpstreamBusy: If too many Postcoder calls are in flight
+            requests.RequestException: If API call fails
+            TimeoutError: If API call times out
+        """
+        if not address_id or not address_id.strip():
+            raise ValueError("ID is required")
+
+        if not self.api_key:
+            raise ValueError("POSTCODER_API_KEY not configured")
+
+        data = await self._aget_json(
+            f"{self.base_url}/autocomplete/retrieve",
+            self._retrieve_params(address_id, country_code),
+            'Retrieve',
+        )
+        logger.info(f"✅ Successfully retrieved full address for ID: {address_id}")
+        return data
+
     def lookup_address(self, postcode: str, country_code: str = 'GB') -> Dict:
         """
         Look up addresses for a given postcode using Postcoder.com API.
@@ -196,7 +275,7 @@ class PostcoderService:
         country_lower = country_code.lower()
 
         # Postcoder.com API endpoint (postcode lookup)
-        url = f"{self.BASE_URL}/{self.api_key}/address/{country_lower}/{clean_postcode}"
+        url = f"{self.base_url}/{self.api_key}/address/{country_lower}/{clean_postcode}"
 
         try:
             logger.info(f"Calling Postcoder API for {country_code} postcode: {clean_postcode}")
@@ -6,8 +6,6 @@ from django.utils import timezone
 from django.db import transaction
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
-from premailer import transform
-from mjml import mjml2html
 
 from ..models import EmailTemplate, EmailQueue, EmailLog, EmailAttachment, EmailTemplateAttachment
 from ..email_service import EmailService
@@ -0,0 +1,137 @@
+"""
+Tests for the async address lookup views, shared async HTTP client and
+async reCAPTCHA verification used by the ASGI deployment.
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from utils import async_views
+from utils.http_client import UpstreamBusy, aclose_async_client, upstream_request
+from utils.models import UtilsCountrys
+from utils.recaptcha_utils import averify_recaptcha, averify_recaptcha_v3
+
+
+class UpstreamRequestTest(TestCase):
+    async def asyncTearDown(self):
+        await aclose_async_client()
+
+    @override_settings(UPSTREAM_HTTP={'slow': {'max_concurrency': 1, 'acquire_timeout': 0.01}})
+    async def test_full_bulkhead_raises_upstream_busy(self):
+        release = asyncio.Event()
+
+        async def slow_request(method, url, **kwargs):
+            await release.wait()
+            return Mock(status_code=200)
+
+        client = Mock(request=slow_request)
+        with patch('utils.http_client.get_async_client', return_value=client):
+            first = asyncio.ensure_future(upstream_request('slow', 'GET', 'http://upstream/'))
+            await asyncio.sleep(0)
+
+            with self.assertRaises(UpstreamBusy):
+                await upstream_request('slow', 'GET', 'http://upstream/')
+
+            release.set()
+            self.assertEqual((await first).status_code, 200)
+
+    @override_settings(UPSTREAM_HTTP={'other': {'timeout': 2.5}})
+    async def test_upstream_timeout_is_applied(self):
+        client = Mock(request=AsyncMock(return_value=Mock(status_code=200)))
+        with patch('utils.http_client.get_async_client', return_value=client):
+            await upstream_request('other', 'GET', 'http://upstream/', params={'a': 1})
+
+        client.request.assert_awaited_once_with('GET', 'http://upstream/', params={'a': 1}, timeout=2.5)
+
+
+class AsyncAddressViewsTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        UtilsCountrys.objects.update_or_create(code='GB', defaults={'name': 'United Kingdom'})
+
+    @patch('utils.services.AddressLookupLogger')
+    @patch('utils.services.PostcoderService.aautocomplete_address', new_callable=AsyncMock)
+    async def test_lookup_returns_transformed_suggestions(self, mock_autocomplete, mock_logger):
+        mock_autocomplete.return_value = [
+            {'id': 'GB|1', 'summaryline': '10 Downing Street', 'locationsummary': 'London'},
+        ]
+        request = self.factory.get('/api/utils/address-lookup/', {'query': 'Downing', 'country': 'GB'})
+
+        response = await async_views.postcoder_address_lookup(request)
+
+        self.assertEqual(response.status_code, 200)
+        payload = json.loads(response.content)
+        self.assertEqual(payload['addresses'][0]['id'], 'GB|1')
+        self.assertEqual(payload['addresses'][0]['country'], 'United Kingdom')
+        mock_logger.return_value.log_lookup.assert_called_once()
+
+    async def test_lookup_validates_postcode(self):
+        request = self.factory.get('/api/utils/address-lookup/', {'postcode': 'AB1'})
+
+        response = await async_views.postcoder_address_lookup(request)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content)['code'], 'INVALID_POSTCODE')
+
+    @patch('utils.services.PostcoderService.aretrieve_address', new_callable=AsyncMock)
+    async def test_retrieve_reports_busy_upstream(self, mock_retrieve):
+        mock_retrieve.side_effect = UpstreamBusy('postcoder')
+        request = self.factory.get('/api/utils/address-retrieve/', {'id': 'GB|1'})
+
+        response = await async_views.address_retrieve(request)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(json.loads(response.content)['code'], 'UPSTREAM_BUSY')
+
+    @patch('utils.services.PostcoderService.aretrieve_address', new_callable=AsyncMock)
+    async def test_retrieve_maps_timeout(self, mock_retrieve):
+        mock_retrieve.side_effect = TimeoutError('Postcoder API request timed out')
+        request = self.factory.get('/api/utils/address-retrieve/', {'id': 'GB|1'})
+
+        response = await async_views.address_retrieve(request)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(json.loads(response.content)['code'], 'TIMEOUT')
+
+
+@override_settings(RECAPTCHA_SECRET_KEY='secret')
+class AsyncRecaptchaTest(TestCase):
+    @patch('utils.recaptcha_utils.upstream_request', new_callable=AsyncMock)
+    async def test_v3_success(self, mock_request):
+        mock_request.return_value = Mock(
+            json=Mock(return_value={'success': True, 'score': 0.9, 'action': 'password_reset'}),
+            raise_for_status=Mock(),
+        )
+
+        result = await averify_recaptcha_v3('token', expected_action='password_reset', user_ip='1.2.3.4')
+
+        self.assertTrue(result['success'])
+        self.assertEqual(mock_request.await_args.kwargs['data']['remoteip'], '1.2.3.4')
+
+    @patch('utils.recaptcha_utils.upstream_request', new_callable=AsyncMock)
+    async def test_v3_low_score_fails(self, mock_request):
+        mock_request.return_value = Mock(
+            json=Mock(return_value={'success': True, 'score': 0.1, 'action': 'password_reset'}),
+            raise_for_status=Mock(),
+        )
+
+        result = await averify_recaptcha_v3('token', expected_action='password_reset', min_score=0.5)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error_codes'], ['score-too-low'])
+
+    @patch('utils.recaptcha_utils.upstream_request', new_callable=AsyncMock)
+    async def test_busy_upstream_fails_closed(self, mock_request):
+        mock_request.side_effect = UpstreamBusy('recaptcha')
+
+        result = await averify_recaptcha('token')
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error_codes'], ['upstream-busy'])
+
+    async def test_missing_token(self):
+        result = await averify_recaptcha('')
+
+        self.assertEqual(result['error_codes'], ['missing-input-response'])
@@ -0,0 +1,73 @@
+"""Tests for django_Admin3/db_pool.py - pool sizing and route timeouts."""
+import os
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from django_Admin3.db_pool import (
+    ASGI_DEFAULT_POOL_SIZE, pool_options, statement_timeout_for, with_pool,
+)
+
+POSTGRES = {
+    'ENGINE': 'django.db.backends.postgresql',
+    'NAME': 'admin3',
+    'OPTIONS': {'client_encoding': 'UTF8'},
+    'CONN_MAX_AGE': 600,
+}
+
+
+class TestPoolOptions(SimpleTestCase):
+    """Pool sizing follows the server concurrency."""
+
+    @patch.dict(os.environ, {'GUNICORN_THREADS': '6'}, clear=True)
+    def test_wsgi_pool_sized_from_threads(self):
+        options = pool_options()
+        self.assertEqual(options['max_size'], 7)
+        self.assertEqual(options['min_size'], 2)
+
+    @patch.dict(os.environ, {'SERVER_MODE': 'asgi'}, clear=True)
+    def test_asgi_pool_uses_fixed_cap(self):
+        self.assertEqual(pool_options()['max_size'], ASGI_DEFAULT_POOL_SIZE)
+
+    @patch.dict(os.environ, {'DB_POOL_MAX_SIZE': '1', 'DB_POOL_TIMEOUT': '3'}, clear=True)
+    def test_env_overrides(self):
+        options = pool_options()
+        self.assertEqual(options['max_size'], 1)
+        self.assertEqual(options['min_size'], 1)
+        self.assertEqual(options['timeout'], 3)
+
+
+class TestWithPool(SimpleTestCase):
+    """with_pool rewrites DATABASES entries for the psycopg pool."""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_postgres_entry_is_pooled(self):
+        database = with_pool(POSTGRES)
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(database['OPTIONS']['client_encoding'], 'UTF8')
+        self.assertIn('max_size', database['OPTIONS']['pool'])
+        # The original entry is not mutated
+        self.assertNotIn('pool', POSTGRES['OPTIONS'])
+
+    @patch.dict(os.environ, {'DB_POOL': 'false'}, clear=True)
+    def test_env_opt_out(self):
+        self.assertIs(with_pool(POSTGRES), POSTGRES)
+
+    def test_sqlite_fallback_untouched(self):
+        sqlite = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+        self.assertIs(with_pool(sqlite, enabled=True), sqlite)
+
+
+class TestStatementTimeoutFor(SimpleTestCase):
+    """Route prefixes pick the timeout, first match wins."""
+
+    TIMEOUTS = {'default': 5000, 'routes': [('/admin/', 60000), ('/api/email/', 30000)]}
+
+    def test_prefix_match(self):
+        self.assertEqual(statement_timeout_for('/admin/login/', self.TIMEOUTS), 60000)
+        self.assertEqual(statement_timeout_for('/api/email/queue/', self.TIMEOUTS), 30000)
+
+    def test_default(self):
+        self.assertEqual(statement_timeout_for('/api/search/', self.TIMEOUTS), 5000)
+        self.assertEqual(statement_timeout_for('/api/search/', {}), 0)
@@ -0,0 +1,46 @@
+"""Tests for the importtime management command.
+
+Covers:
+- parse_importtime() totals cumulative time per directly imported package
+- a real cold start: django.setup() plus URL loading imports none of the
+  heavy libraries that are meant to load on first use
+- thresholds turn into a CommandError
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from utils.management.commands.importtime import parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       342 |        342 |       _json
+import time:       689 |       1031 |     json.decoder
+import time:       423 |       1454 |   json
+import time:       100 |        100 |   email.charset
+import time:        50 |        150 |   email.utils
+some unrelated stderr line
+"""
+
+
+class ParseImporttimeTest(SimpleTestCase):
+
+    def test_totals_direct_imports_by_package(self):
+        self.assertEqual(parse_importtime(IMPORTTIME_OUTPUT), {'json': 1454, 'email': 250})
+
+
+class ImporttimeCommandTest(SimpleTestCase):
+
+    def test_boot_does_not_import_heavy_modules(self):
+        out = StringIO()
+
+        call_command('importtime', runs=1, fail_on_heavy=True, stdout=out)
+
+        self.assertIn('django.setup()', out.getvalue())
+        self.assertIn('Largest top-level imports', out.getvalue())
+
+    def test_threshold_exceeded(self):
+        with self.assertRaisesMessage(CommandError, 'cold start'):
+            call_command('importtime', runs=1, max_seconds=0.001, stdout=StringIO())
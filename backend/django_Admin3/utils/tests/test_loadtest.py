@@ -0,0 +1,171 @@
+"""Tests for the storefront load-test suite (utils/loadtest).
+
+Covers:
+- CatalogueGenerator builds a repeatable catalogue and flush() removes it
+- the journeys run in process against a generated catalogue
+- report aggregation and cross-revision comparison
+- the loadtest_generate / loadtest_run / loadtest_compare commands
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from catalog.subject.models import Subject
+from orders.models import Order
+from store.models import Price, Product
+from utils.loadtest.generator import EMAIL_DOMAIN, SCALES, CatalogueGenerator
+from utils.loadtest.journeys import JourneyData, Sample, TestClientSession
+from utils.loadtest.report import build_report, check_comparable, compare_reports, percentile, run_journeys
+
+
+class CatalogueGeneratorTest(TestCase):
+
+    def test_generates_scale_volumes(self):
+        scale = SCALES['tiny']
+        counts = CatalogueGenerator(scale, seed=1).generate()
+
+        self.assertEqual(counts['subjects'], scale.subjects)
+        self.assertEqual(counts['orders'], scale.orders)
+        self.assertEqual(counts['order_items'], scale.orders * scale.items_per_order)
+        self.assertEqual(Subject.objects.filter(code__startswith='LT').count(), scale.subjects)
+        self.assertTrue(Product.available_now().filter(exam_session_subject__subject__code='LT01').exists())
+        self.assertEqual(
+            Price.objects.filter(purchasable__code__startswith='LT01/', price_type='standard').count(),
+            counts['material_products'] // scale.subjects + scale.tutorials_per_subject + scale.markings_per_subject,
+        )
+
+    def test_same_seed_same_catalogue(self):
+        def snapshot():
+            return sorted(Price.objects.filter(purchasable__code__startswith='LT').values_list('purchasable__code', 'amount'))
+
+        CatalogueGenerator(SCALES['tiny'], seed=3).generate()
+        first = snapshot()
+        CatalogueGenerator.flush()
+        CatalogueGenerator(SCALES['tiny'], seed=3).generate()
+
+        self.assertEqual(snapshot(), first)
+
+    def test_flush_removes_generated_rows_only(self):
+        Subject.objects.create(code='CM2', description='Real subject', active=True)
+        CatalogueGenerator(SCALES['tiny']).generate()
+
+        CatalogueGenerator.flush()
+
+        self.assertEqual(list(Subject.objects.values_list('code', flat=True)), ['CM2'])
+        self.assertFalse(Order.objects.filter(user__email__endswith=EMAIL_DOMAIN).exists())
+
+    def test_refuses_to_generate_twice(self):
+        CatalogueGenerator(SCALES['tiny']).generate()
+        with self.assertRaises(ValueError):
+            CatalogueGenerator(SCALES['tiny']).generate()
+
+
+class JourneyTest(TestCase):
+
+    def setUp(self):
+        CatalogueGenerator(SCALES['tiny']).generate()
+        self.data = JourneyData.load()
+
+    def test_journeys_run_in_process(self):
+        samples, runs, _ = run_journeys(
+            TestClientSession, self.data, ['browse', 'search', 'cart', 'checkout'], iterations=1,
+        )
+
+        self.assertEqual([name for name, _ in runs], ['browse', 'search', 'cart', 'checkout'])
+        steps = {sample.step for sample in samples}
+        self.assertTrue({'browse.navigation', 'search.unified', 'cart.add', 'cart.vat', 'checkout.submit'} <= steps)
+        self.assertEqual([s for s in samples if s.status >= 500], [])
+        self.assertTrue(all(sample.queries is not None for sample in samples))
+
+    def test_checkout_places_an_order(self):
+        before = Order.objects.count()
+        samples, _, _ = run_journeys(TestClientSession, self.data, ['checkout'], iterations=1)
+
+        submit = [sample for sample in samples if sample.step == 'checkout.submit']
+        self.assertEqual(submit[0].status, 201)
+        self.assertEqual(Order.objects.count(), before + 1)
+
+
+def _report(sha, p95, queries, rps=10.0):
+    samples = [Sample('search', 'search.unified', 200, p95, queries)]
+    report = build_report(samples, [('search', p95)], 0.1, {'client': 'test', 'journeys': ['search']}, {'subjects': 2})
+    report['revision'] = {'sha': sha, 'branch': 'main', 'dirty': False}
+    report['totals']['throughput_rps'] = rps
+    return report
+
+
+class ReportTest(SimpleTestCase):
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 95), 0.0)
+        self.assertEqual(percentile(list(range(1, 101)), 50), 50)
+        self.assertEqual(percentile(list(range(1, 101)), 95), 95)
+
+    def test_build_report_aggregates_steps(self):
+        samples = [
+            Sample('cart', 'cart.add', 200, 10.0, 8),
+            Sample('cart', 'cart.add', 200, 30.0, 10),
+            Sample('cart', 'cart.add', 404, 20.0, 4),
+        ]
+        report = build_report(samples, [('cart', 60.0)], 2.0, {}, {})
+
+        step = report['steps']['cart.add']
+        self.assertEqual((step['requests'], step['errors'], step['statuses']), (3, 1, {'200': 2, '404': 1}))
+        self.assertEqual((step['p50_ms'], step['p95_ms'], step['max_queries']), (20.0, 30.0, 10))
+        self.assertEqual(step['mean_queries'], 7.3)
+        self.assertEqual(report['totals']['throughput_rps'], 1.5)
+
+    def test_compare_flags_slower_p95_and_more_queries(self):
+        comparison = compare_reports(
+            [_report('aaa', 100.0, 5), _report('bbb', 110.0, 5), _report('ccc', 200.0, 7)],
+            max_p95_growth=25,
+        )
+
+        self.assertEqual(comparison['labels'], ['aaa', 'bbb', 'ccc'])
+        self.assertEqual(len(comparison['regressions']), 2)
+        self.assertTrue(all('on ccc' in regression for regression in comparison['regressions']))
+
+    def test_check_comparable(self):
+        other = _report('bbb', 100.0, 5)
+        other['dataset']['subjects'] = 40
+
+        self.assertEqual(check_comparable([_report('aaa', 100.0, 5), _report('aaa', 90.0, 5)]), [])
+        self.assertEqual(len(check_comparable([_report('aaa', 100.0, 5), other])), 1)
+
+
+class LoadTestCommandTest(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def _path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def test_generate_run_compare(self):
+        call_command('loadtest_generate', '--scale', 'tiny', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('loadtest_generate', '--scale', 'tiny', stdout=StringIO())
+
+        for name in ('base.json', 'head.json'):
+            call_command(
+                'loadtest_run', '--journeys', 'browse', 'search', '--iterations', '2', '--warmup', '0',
+                '--output', self._path(name), stdout=StringIO(),
+            )
+        with open(self._path('base.json')) as handle:
+            report = json.load(handle)
+        self.assertEqual(report['dataset']['subjects'], SCALES['tiny'].subjects)
+        self.assertEqual(report['journeys']['search']['runs'], 2)
+
+        out = StringIO()
+        call_command('loadtest_compare', self._path('base.json'), self._path('head.json'),
+                     '--max-p95-growth', '100000', stdout=out)
+        self.assertIn('search.unified', out.getvalue())
+
+    def test_run_without_catalogue_fails(self):
+        with self.assertRaisesMessage(CommandError, 'loadtest_generate'):
+            call_command('loadtest_run', stdout=StringIO())
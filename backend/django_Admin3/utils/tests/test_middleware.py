@@ -1,12 +1,16 @@
-"""Tests for utils/middleware.py - HealthCheckMiddleware.
+"""Tests for utils/middleware.py - HealthCheckMiddleware and StatementTimeoutMiddleware.
 
 Covers:
 - process_request sets HTTP_X_FORWARDED_PROTO for health check endpoint
 - process_request leaves other endpoints unchanged
 - Middleware returns None (passes through)
+- statement_timeout is set per route class for the view and reset afterwards
+- statement_timeout is only set once the request queries
 """
-from django.test import TestCase, RequestFactory
-from utils.middleware import HealthCheckMiddleware
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+from utils.middleware import HealthCheckMiddleware, StatementTimeoutMiddleware
 
 
 class TestHealthCheckMiddleware(TestCase):
@@ -63,3 +67,61 @@ class TestHealthCheckMiddleware(TestCase):
         result = self.middleware.process_request(request)
         self.assertIsNone(result)
         self.assertEqual(request.META.get('HTTP_X_FORWARDED_PROTO'), 'https')
+
+
+def _show_statement_timeout():
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW statement_timeout")
+        return cursor.fetchone()[0]
+
+
+@override_settings(STATEMENT_TIMEOUTS={
+    'default': 5000,
+    'routes': [('/admin/', 60000), ('/api/health/', 0)],
+})
+class TestStatementTimeoutMiddleware(TestCase):
+    """Test StatementTimeoutMiddleware applies and resets statement_timeout."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.seen = {}
+
+        def view(request):
+            self.seen['timeout'] = _show_statement_timeout()
+            return HttpResponse()
+
+        self.middleware = StatementTimeoutMiddleware(get_response=view)
+
+    def test_UTL_storefront_route_gets_default_timeout(self):
+        """Storefront paths run with the short default."""
+        before = _show_statement_timeout()
+        self.middleware(self.factory.get('/api/cart/'))
+        self.assertEqual(self.seen['timeout'], '5s')
+        self.assertEqual(_show_statement_timeout(), before)
+
+    def test_UTL_admin_route_gets_admin_timeout(self):
+        """Admin prefixes get the longer limit."""
+        self.middleware(self.factory.get('/admin/orders/order/'))
+        self.assertEqual(self.seen['timeout'], '1min')
+
+    def test_UTL_unlimited_route_is_untouched(self):
+        """A 0 timeout leaves the connection default in place."""
+        before = _show_statement_timeout()
+        request = self.factory.get('/api/health/')
+        self.middleware(request)
+        self.assertEqual(self.seen['timeout'], before)
+        self.assertFalse(hasattr(request, '_statement_timeout'))
+
+    def test_UTL_request_without_queries_does_not_set_timeout(self):
+        """The timeout is applied on the first query, not per request."""
+        middleware = StatementTimeoutMiddleware(get_response=lambda r: HttpResponse())
+        request = self.factory.get('/api/cart/')
+        middleware(request)
+        self.assertFalse(request._statement_timeout.applied)
+        self.assertNotIn(request._statement_timeout, connection.execute_wrappers)
+
+    def test_UTL_timeout_statements_are_not_counted(self):
+        """SET/RESET bypass query logging, so query budgets are unaffected."""
+        middleware = StatementTimeoutMiddleware(get_response=lambda r: HttpResponse())
+        with self.assertNumQueries(0):
+            middleware(self.factory.get('/api/cart/'))
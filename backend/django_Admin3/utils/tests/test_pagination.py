@@ -0,0 +1,126 @@
+"""Tests for utils/pagination.py - estimated counts and keyset pages."""
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from django.test import TestCase
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from legacy.models import LegacyProduct
+from utils.pagination import AdminListPagination
+
+
+class SmallPagination(AdminListPagination):
+    page_size = 4
+    page_size_query_param = 'page_size'
+
+
+def _cursor(link):
+    return parse_qs(urlparse(link).query)['cursor'][0]
+
+
+class AdminListPaginationTestBase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # Few distinct subject/session values so the pk tiebreaker matters
+        LegacyProduct.objects.bulk_create([
+            LegacyProduct(
+                subject_code=f'CM{i % 3}', delivery_format='P',
+                product_template_code='N', session_code=f'{i % 2:02d}',
+                full_code=f'CM{i % 3}/PN/{i:02d}',
+                legacy_product_name='Course Notes', short_name='Course Notes',
+                normalized_name='Course Notes',
+                source_file='test.csv', source_line=i + 1,
+            )
+            for i in range(11)
+        ])
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.queryset = LegacyProduct.objects.order_by('subject_code', 'session_code', 'normalized_name')
+
+    def paginate(self, params=None, pagination=None):
+        pagination = pagination or SmallPagination()
+        request = Request(self.factory.get('/api/legacy/products/', params or {}))
+        rows = pagination.paginate_queryset(self.queryset, request)
+        return rows, pagination.get_paginated_response([row.pk for row in rows]).data
+
+
+class TestEstimatedCount(AdminListPaginationTestBase):
+
+    def test_small_tables_are_counted_exactly(self):
+        _, data = self.paginate()
+        self.assertEqual(data['count'], 11)
+        self.assertFalse(data['count_is_estimate'])
+
+    @patch('utils.pagination.estimated_count', return_value=50000)
+    def test_unfiltered_listing_uses_estimate(self, mock_estimate):
+        rows, data = self.paginate({'page': 3})
+        self.assertEqual(data['count'], 50000)
+        self.assertTrue(data['count_is_estimate'])
+        self.assertEqual(len(rows), 3)
+        # The estimate does not invent further pages
+        self.assertIsNone(data['next'])
+        self.assertIsNotNone(data['previous'])
+
+    @patch('utils.pagination.estimated_count', return_value=50000)
+    def test_filtered_listing_counts_exactly(self, mock_estimate):
+        _, data = self.paginate({'subject': 'CM1', 'page_size': '2'})
+        self.assertEqual(data['count'], 11)
+        self.assertFalse(data['count_is_estimate'])
+        mock_estimate.assert_not_called()
+
+    @patch('utils.pagination.estimated_count', return_value=50000)
+    def test_page_past_the_end_is_not_found(self, mock_estimate):
+        with self.assertRaises(NotFound):
+            self.paginate({'page': 10})
+
+
+class TestKeysetPagination(AdminListPaginationTestBase):
+
+    def test_walk_matches_offset_order(self):
+        expected = list(self.queryset.order_by(
+            'subject_code', 'session_code', 'normalized_name', 'pk'
+        ).values_list('pk', flat=True))
+
+        seen = []
+        params = {'cursor': ''}
+        while True:
+            rows, data = self.paginate(params)
+            seen.extend(data['results'])
+            if not data['next']:
+                break
+            params = {'cursor': _cursor(data['next'])}
+
+        self.assertEqual(seen, expected)
+
+    def test_previous_returns_the_earlier_page(self):
+        first, data = self.paginate({'cursor': ''})
+        self.assertIsNone(data['previous'])
+        second, data = self.paginate({'cursor': _cursor(data['next'])})
+
+        back, data = self.paginate({'cursor': _cursor(data['previous'])})
+
+        self.assertEqual([row.pk for row in back], [row.pk for row in first])
+        self.assertIsNone(data['previous'])
+        self.assertIsNotNone(data['next'])
+
+    def test_filtered_keyset_page_skips_count(self):
+        _, data = self.paginate({'cursor': ''})
+        with self.assertNumQueries(1):
+            _, data = self.paginate({'cursor': _cursor(data['next']), 'subject': 'CM1'})
+        self.assertIsNone(data['count'])
+        self.assertFalse(data['count_is_estimate'])
+
+    def test_invalid_cursor_is_not_found(self):
+        with self.assertRaises(NotFound):
+            self.paginate({'cursor': 'not-a-cursor'})
+
+    def test_cursor_from_other_ordering_is_rejected(self):
+        _, data = self.paginate({'cursor': ''})
+        token = _cursor(data['next'])
+        self.queryset = LegacyProduct.objects.order_by('-full_code')
+        with self.assertRaises(NotFound):
+            self.paginate({'cursor': token})
@@ -0,0 +1,224 @@
+"""Tests for utils/profiling.py, ProfilingMiddleware and the profile download view.
+
+Covers:
+- the stdlib sampler produces folded stacks of the profiled thread
+- X-Profile-Token tokens are bound to a path prefix
+- the per-window rate limit
+- the middleware (sync and async): profiles token / staff requests, stores and names the profile
+- the download view is staff-only and 404s once a profile expires
+- ProfileCommandMixin's --profile option
+"""
+import os
+import tempfile
+import time
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from utils.middleware import ProfilingMiddleware
+from utils.profiling import (
+    ProfileCommandMixin,
+    acquire_slot,
+    load_profile,
+    make_profile_token,
+    profiled,
+    store_profile,
+    token_allows,
+)
+
+PROFILING = {
+    'enabled': True,
+    'backend': 'sampling',
+    'interval_ms': 1,
+    'ttl': 60,
+    'max_per_window': 2,
+    'window': 600,
+    'token_max_age': 60,
+}
+
+
+def busy(ms):
+    deadline = time.perf_counter() + ms / 1000
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+class SlowCommand(ProfileCommandMixin, BaseCommand):
+
+    def handle(self, *args, **options):
+        busy(30)
+
+
+@override_settings(PROFILING=PROFILING)
+class ProfiledTest(TestCase):
+
+    def test_sampler_collects_folded_stacks(self):
+        with profiled('busy') as run:
+            busy(50)
+
+        profile = run.profile
+        self.assertEqual(profile.format, 'folded')
+        self.assertGreater(profile.samples, 0)
+        lines = profile.content.decode().splitlines()
+        self.assertTrue(any('busy (' in line for line in lines))
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertIn(';', stack)
+
+
+@override_settings(PROFILING=PROFILING)
+class TokenAndRateLimitTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_token_is_bound_to_path_prefix(self):
+        token = make_profile_token('/api/search/')
+
+        self.assertTrue(token_allows(token, '/api/search/unified/'))
+        self.assertFalse(token_allows(token, '/api/cart/'))
+        self.assertFalse(token_allows(token + 'x', '/api/search/unified/'))
+
+    def test_rate_limit_per_window(self):
+        self.assertTrue(acquire_slot())
+        self.assertTrue(acquire_slot())
+        self.assertFalse(acquire_slot())
+
+
+@override_settings(PROFILING=PROFILING)
+class ProfilingMiddlewareTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+        def view(request):
+            busy(20)
+            return HttpResponse('ok')
+
+        self.middleware = ProfilingMiddleware(view)
+
+    def _request(self, path='/api/search/unified/', **extra):
+        request = self.factory.get(path, **extra)
+        request.user = AnonymousUser()
+        return request
+
+    def test_unrequested_request_is_not_profiled(self):
+        response = self.middleware(self._request())
+
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_token_request_is_profiled_and_stored(self):
+        token = make_profile_token('/api/')
+
+        response = self.middleware(self._request(HTTP_X_PROFILE_TOKEN=token))
+
+        profile = load_profile(response['X-Profile-Id'])
+        self.assertIsNotNone(profile)
+        self.assertEqual(profile.label, 'GET /api/search/unified/')
+        self.assertEqual(response['X-Profile-Url'], f'/api/utils/profiles/{profile.id}/')
+
+    def test_staff_query_flag(self):
+        staff = User.objects.create_user('profiler', is_staff=True)
+        customer = User.objects.create_user('customer')
+
+        request = self.factory.get('/api/cart/?_profile=1')
+        request.user = staff
+        self.assertIn('X-Profile-Id', self.middleware(request))
+
+        request = self.factory.get('/api/cart/?_profile=1')
+        request.user = customer
+        self.assertNotIn('X-Profile-Id', self.middleware(request))
+
+    def test_rate_limited_requests_are_skipped(self):
+        token = make_profile_token('/api/')
+
+        responses = [self.middleware(self._request(HTTP_X_PROFILE_TOKEN=token)) for _ in range(3)]
+
+        self.assertIn('X-Profile-Id', responses[1])
+        self.assertNotIn('X-Profile-Id', responses[2])
+        self.assertEqual(responses[2]['X-Profile-Skipped'], 'rate-limited')
+
+    @override_settings(PROFILING={**PROFILING, 'enabled': False})
+    def test_disabled(self):
+        token = make_profile_token('/api/')
+
+        response = self.middleware(self._request(HTTP_X_PROFILE_TOKEN=token))
+
+        self.assertNotIn('X-Profile-Id', response)
+
+    async def test_async_token_request_is_profiled(self):
+        async def view(request):
+            busy(20)
+            return HttpResponse('ok')
+
+        middleware = ProfilingMiddleware(view)
+        token = make_profile_token('/api/')
+
+        unrequested = await middleware(self._request())
+        response = await middleware(self._request(HTTP_X_PROFILE_TOKEN=token))
+
+        self.assertNotIn('X-Profile-Id', unrequested)
+        self.assertEqual(response.content, b'ok')
+        self.assertEqual(response['X-Profile-Url'], f'/api/utils/profiles/{response["X-Profile-Id"]}/')
+
+
+@override_settings(PROFILING=PROFILING)
+class ProfileDownloadViewTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        with profiled('GET /api/cart/') as run:
+            busy(20)
+        store_profile(run.profile)
+        self.profile = run.profile
+        self.url = f'/api/utils/profiles/{self.profile.id}/'
+
+    def test_staff_downloads_profile(self):
+        self.client.force_authenticate(User.objects.create_user('staff', is_staff=True))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.profile.content)
+        self.assertIn(self.profile.filename, response['Content-Disposition'])
+
+    def test_non_staff_forbidden(self):
+        self.client.force_authenticate(User.objects.create_user('customer'))
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_expired_profile_is_404(self):
+        self.client.force_authenticate(User.objects.create_user('staff', is_staff=True))
+        cache.clear()
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+@override_settings(PROFILING=PROFILING)
+class ProfileCommandMixinTest(TestCase):
+
+    def test_profile_option_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'slow.folded')
+
+            call_command(SlowCommand(), profile=path)
+
+            with open(path) as handle:
+                self.assertIn('handle (', handle.read())
+
+    def test_without_profile_option(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cwd = os.getcwd()
+            os.chdir(directory)
+            try:
+                call_command(SlowCommand())
+            finally:
+                os.chdir(cwd)
+            self.assertEqual(os.listdir(directory), [])
@@ -0,0 +1,232 @@
+"""Tests for utils/request_metrics.py and RequestMetricsMiddleware.
+
+Covers:
+- fingerprint() matches statements that differ only in parameters
+- record_request_metrics() counts queries, repeats and cache hits/misses
+- query_budget as decorator and context manager
+- the middleware's Server-Timing header and QUERY_BUDGETS enforcement,
+  sync and async (including queries run through sync_to_async)
+- every budgeted route stays within its QUERY_BUDGETS entry
+"""
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from utils.middleware import RequestMetricsMiddleware
+from utils.request_metrics import (
+    QueryBudgetExceeded,
+    fingerprint,
+    install_cache_instrumentation,
+    query_budget,
+    record_request_metrics,
+)
+
+
+class FingerprintTest(TestCase):
+
+    def test_parameters_and_in_list_length_ignored(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "x" WHERE "id" = 1'),
+            fingerprint('SELECT *  FROM "x" WHERE "id" = 42'),
+        )
+        self.assertEqual(
+            fingerprint('SELECT * FROM "x" WHERE "id" IN (%s, %s)'),
+            fingerprint('SELECT * FROM "x" WHERE "id" IN (%s, %s, %s, %s)'),
+        )
+        self.assertNotEqual(
+            fingerprint('SELECT * FROM "x" WHERE "id" = 1'),
+            fingerprint('SELECT * FROM "y" WHERE "id" = 1'),
+        )
+
+
+class RecordRequestMetricsTest(TestCase):
+
+    def test_counts_queries_and_repeats(self):
+        users = [User.objects.create_user(f'metrics{i}') for i in range(3)]
+
+        with record_request_metrics() as metrics:
+            for user in users:
+                User.objects.get(pk=user.pk)
+            User.objects.count()
+
+        self.assertEqual(metrics.queries, 4)
+        self.assertEqual(metrics.duplicate_queries, 2)
+        self.assertEqual(metrics.duplicates()[0][1], 3)
+        self.assertGreaterEqual(metrics.db_time_ms, 0)
+
+    def test_counts_cache_hits_and_misses(self):
+        install_cache_instrumentation()
+        cache.set('metrics:hit', 1)
+        cache.delete('metrics:miss')
+
+        with record_request_metrics() as metrics:
+            self.assertEqual(cache.get('metrics:hit'), 1)
+            self.assertEqual(cache.get('metrics:miss', 'fallback'), 'fallback')
+            cache.get_many(['metrics:hit', 'metrics:miss'])
+
+        self.assertEqual((metrics.cache_hits, metrics.cache_misses), (2, 2))
+
+
+class QueryBudgetTest(TestCase):
+
+    def test_context_manager_raises_over_budget(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'ran 2 queries (budget 1)'):
+            with query_budget(1):
+                User.objects.count()
+                User.objects.count()
+
+    def test_decorator_passes_within_budget(self):
+        @query_budget(1)
+        def count_users():
+            return User.objects.count()
+
+        self.assertEqual(count_users(), 0)
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _view(self, queries):
+        def view(request):
+            for _ in range(queries):
+                User.objects.count()
+            return HttpResponse('ok')
+        return view
+
+    def test_sets_server_timing_and_request_metrics(self):
+        request = self.factory.get('/api/anything/')
+        response = RequestMetricsMiddleware(self._view(2))(request)
+
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('2 queries', response['Server-Timing'])
+        self.assertEqual(request.request_metrics.queries, 2)
+
+    @override_settings(QUERY_BUDGETS={'/api/cart/': 1}, QUERY_BUDGETS_ENFORCED=True)
+    def test_enforced_budget_raises(self):
+        middleware = RequestMetricsMiddleware(self._view(2))
+
+        with self.assertRaises(QueryBudgetExceeded):
+            middleware(self.factory.get('/api/cart/'))
+        self.assertEqual(middleware(self.factory.get('/api/other/')).status_code, 200)
+
+    @override_settings(QUERY_BUDGETS={'/api/cart/': 1}, QUERY_BUDGETS_ENFORCED=False)
+    def test_unenforced_budget_logs_warning(self):
+        with self.assertLogs('request_metrics', level='WARNING') as logs:
+            response = RequestMetricsMiddleware(self._view(2))(self.factory.get('/api/cart/'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('query_budget_exceeded', logs.output[0])
+
+    @override_settings(REQUEST_METRICS={'enabled': False})
+    def test_disabled_passes_through(self):
+        response = RequestMetricsMiddleware(self._view(1))(self.factory.get('/api/cart/'))
+
+        self.assertNotIn('Server-Timing', response)
+
+    async def test_async_counts_queries_across_thread_hops(self):
+        async def view(request):
+            await sync_to_async(User.objects.count)()
+            await User.objects.acount()
+            return HttpResponse('ok')
+
+        request = self.factory.get('/api/anything/')
+        response = await RequestMetricsMiddleware(view)(request)
+
+        self.assertIn('2 queries', response['Server-Timing'])
+        self.assertEqual(request.request_metrics.queries, 2)
+
+    @override_settings(QUERY_BUDGETS={'/api/cart/': 1}, QUERY_BUDGETS_ENFORCED=True)
+    async def test_async_enforced_budget_raises(self):
+        async def view(request):
+            await User.objects.acount()
+            await User.objects.acount()
+            return HttpResponse('ok')
+
+        with self.assertRaises(QueryBudgetExceeded):
+            await RequestMetricsMiddleware(view)(self.factory.get('/api/cart/'))
+
+    def test_nested_block_counts_into_both(self):
+        request = self.factory.get('/api/anything/')
+
+        def view(request):
+            User.objects.count()
+            with record_request_metrics() as inner:
+                User.objects.count()
+            self.assertEqual(inner.queries, 1)
+            return HttpResponse('ok')
+
+        RequestMetricsMiddleware(view)(request)
+        self.assertEqual(request.request_metrics.queries, 2)
+
+
+@override_settings(QUERY_BUDGETS_ENFORCED=True)
+class RouteQueryBudgetTest(TestCase):
+    """Each route in settings.QUERY_BUDGETS, cold caches, stays in budget.
+
+    The middleware raises QueryBudgetExceeded when a route goes over, so
+    these fail with the repeated statements in the message.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        from cart.models import Cart, CartItem
+        from search.tests.factories import (
+            create_catalog_dependencies, create_marking_product, create_store_product,
+            create_tutorial_product,
+        )
+        from store.models import Price
+
+        deps = create_catalog_dependencies('CS2')
+        ess = deps['exam_session_subject']
+        cls.products = [
+            create_store_product(ess, deps['product'], deps['printed_variation']),
+            create_store_product(ess, deps['product'], deps['ebook_variation']),
+            create_tutorial_product(ess),
+            create_marking_product(ess),
+        ]
+        for product in cls.products:
+            Price.objects.create(product=product, price_type='standard', amount=Decimal('10.00'), currency='GBP')
+        cls.user = User.objects.create_user('budget_user', 'budget@example.com', 'x')
+        cart = Cart.objects.create(user=cls.user)
+        for product in cls.products[:2]:
+            CartItem.objects.create(cart=cart, purchasable=product.purchasable_ptr, quantity=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def _assert_within_budget(self, response, path):
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', response.content))
+        self.assertLessEqual(response.wsgi_request.request_metrics.queries, settings.QUERY_BUDGETS[path])
+
+    def test_unified_search(self):
+        for query in ('', 'cs2 materials'):
+            response = self.client.post(
+                '/api/search/unified/',
+                {'searchQuery': query, 'filters': {}, 'pagination': {'page': 1, 'page_size': 20}},
+                content_type='application/json',
+            )
+            self._assert_within_budget(response, '/api/search/unified/')
+
+    def test_cart(self):
+        self.client.force_login(self.user)
+        self._assert_within_budget(self.client.get('/api/cart/'), '/api/cart/')
+
+    def test_navigation_data(self):
+        path = '/api/catalog/navigation-data/'
+        self._assert_within_budget(self.client.get(path), path)
+
+    def test_rules_engine_execute(self):
+        path = '/api/rules/engine/execute/'
+        response = self.client.post(
+            path,
+            {'entry_point': 'product_list_mount', 'context': {}},
+            content_type='application/json',
+        )
+        self._assert_within_budget(response, path)
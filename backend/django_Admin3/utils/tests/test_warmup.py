@@ -0,0 +1,185 @@
+"""Tests for utils/warmup.py, the warm_caches command and the health-check gate.
+
+Covers:
+- run_warmers() times each warmer, reports failures instead of raising
+  and leaves the process ready
+- start_background_warmup() finishes per-process warmers before returning
+  and the shared ones in its thread
+- a shared warmer running elsewhere (lock held) is skipped
+- warm_url() serves a GET in process
+- the rules warmers fill the rule cache and the Validator's schema cache
+- warm_caches: shared warmers only by default, --only, --strict
+- /api/health/ answers 503 while the worker is warming
+"""
+import threading
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from rules_engine.models import ActedRulesFields, RuleEntryPoint
+from rules_engine.services.rule_engine import rule_engine
+from utils import warmup
+
+
+def _ok():
+    return '3 things'
+
+
+def _broken():
+    raise RuntimeError('database away')
+
+
+def _local():
+    return 'local'
+
+
+TEST_WARMERS = {
+    'test.ok': warmup.Warmer('test.ok', _ok),
+    'test.broken': warmup.Warmer('test.broken', _broken),
+    'test.local': warmup.Warmer('test.local', _local, per_process=True),
+}
+
+
+class WarmupTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Import the apps' warmers now, so they register in the real
+        # registry rather than in a patched one.
+        warmup.autodiscover()
+
+    def setUp(self):
+        cache.clear()
+        patcher = patch.dict(warmup._registry, TEST_WARMERS, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        state = patch.dict(warmup._state, {'status': warmup.COLD, 'results': []})
+        state.start()
+        self.addCleanup(state.stop)
+
+
+class RunWarmersTest(WarmupTestCase):
+
+    def test_runs_and_reports_each_warmer(self):
+        results = {result.name: result for result in warmup.run_warmers()}
+
+        self.assertTrue(results['test.ok'].ok)
+        self.assertEqual(results['test.ok'].detail, '3 things')
+        self.assertFalse(results['test.broken'].ok)
+        self.assertIn('database away', results['test.broken'].detail)
+        self.assertGreaterEqual(results['test.ok'].duration_ms, 0)
+
+        state = warmup.readiness()
+        self.assertEqual(state['status'], warmup.READY)
+        self.assertEqual(state['failed'], ['test.broken'])
+        self.assertIsNotNone(state['total_ms'])
+
+    def test_shared_warmer_locked_elsewhere_is_skipped(self):
+        cache.add('warmup:lock:test.ok', 1)
+
+        results = {result.name: result for result in warmup.run_warmers(['test.ok', 'test.local'])}
+
+        self.assertTrue(results['test.ok'].skipped)
+        self.assertFalse(results['test.local'].skipped)
+
+    def test_unknown_warmer(self):
+        with self.assertRaises(KeyError):
+            warmup.run_warmers(['test.missing'])
+
+    def test_warm_url(self):
+        self.assertEqual(warmup.warm_url('/api/utils/health/'), 200)
+
+
+class BackgroundWarmupTest(WarmupTestCase):
+
+    def test_per_process_warmers_finish_before_the_hook_returns(self):
+        shared_started = threading.Event()
+        release = threading.Event()
+
+        def shared():
+            shared_started.set()
+            release.wait(5)
+
+        local_done = []
+        warmup._registry['test.local'] = warmup.Warmer('test.local', lambda: local_done.append(True), per_process=True)
+        warmup._registry['test.shared'] = warmup.Warmer('test.shared', shared)
+        del warmup._registry['test.broken']
+
+        thread = warmup.start_background_warmup()
+        self.assertEqual(local_done, [True])
+        try:
+            shared_started.wait(5)
+            state = warmup.readiness()
+            self.assertEqual(state['status'], warmup.WARMING)
+            self.assertTrue(warmup.is_warming())
+        finally:
+            release.set()
+            thread.join(5)
+
+        state = warmup.readiness()
+        self.assertEqual(state['status'], warmup.READY)
+        self.assertEqual(
+            [result['name'] for result in state['results']],
+            ['test.local', 'test.ok', 'test.shared'],
+        )
+
+
+class RulesWarmersTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        warmup.autodiscover()
+        rule_engine.validator._schema_cache.clear()
+
+    def test_rules_warmers_fill_caches(self):
+        RuleEntryPoint.objects.create(code='checkout_terms', name='Checkout Terms')
+        ActedRulesFields.objects.create(fields_code='warm_schema_v1', name='Warm', schema={'type': 'object'})
+
+        results = warmup.run_warmers(['rules.active_rules', 'rules.schemas'], use_lock=False)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(cache.get('rules:checkout_terms'), [])
+        self.assertEqual(rule_engine.validator._schema_cache['warm_schema_v1'], {'type': 'object'})
+
+
+class WarmCachesCommandTest(WarmupTestCase):
+
+    def test_default_runs_shared_warmers(self):
+        out = StringIO()
+
+        call_command('warm_caches', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('test.ok', output)
+        self.assertNotIn('test.local', output)
+        self.assertIn('2 warmer(s)', output)
+
+    def test_only_and_strict(self):
+        call_command('warm_caches', only=['test.local'], strict=True, stdout=StringIO())
+
+        with self.assertRaisesMessage(CommandError, 'test.broken'):
+            call_command('warm_caches', only=['test.broken'], strict=True, stdout=StringIO())
+
+
+class HealthCheckGateTest(WarmupTestCase):
+
+    def test_warming_worker_answers_503(self):
+        warmup._state['status'] = warmup.WARMING
+
+        response = self.client.get('/api/health/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks']['warmup'], 'warming')
+
+    def test_ready_worker_answers_200(self):
+        warmup.run_warmers(['test.ok'])
+
+        response = self.client.get('/api/health/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['checks']['warmup'], 'ready')
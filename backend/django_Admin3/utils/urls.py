@@ -1,19 +1,28 @@
+from django.conf import settings
 from django.urls import path
-from .views import address_lookup_proxy, health_check, postcoder_address_lookup, address_retrieve
+from . import async_views, views
+from .views import health_check, profile_download
+
+# Under the ASGI deployment, upstream-bound lookups are served by their
+# async variants so they don't hold a worker thread per round-trip.
+views_module = async_views if getattr(settings, 'ASYNC_UPSTREAM_VIEWS', False) else views
 
 urlpatterns = [
     # Existing endpoint - NOW USING POSTCODER (swapped 2025-11-05)
-    path('address-lookup/', postcoder_address_lookup, name='address_lookup_proxy'),
+    path('address-lookup/', views_module.postcoder_address_lookup, name='address_lookup_proxy'),
 
     # Original getaddress.io endpoint (kept for rollback)
-    path('getaddress-lookup/', address_lookup_proxy, name='getaddress_lookup_proxy'),
+    path('getaddress-lookup/', views_module.address_lookup_proxy, name='getaddress_lookup_proxy'),
 
     # NEW Postcoder.com endpoint (dual-method architecture)
-    path('postcoder-address-lookup/', postcoder_address_lookup, name='postcoder_address_lookup'),
+    path('postcoder-address-lookup/', views_module.postcoder_address_lookup, name='postcoder_address_lookup'),
 
     # NEW Postcoder.com retrieve endpoint (get full address by ID)
-    path('address-retrieve/', address_retrieve, name='address_retrieve'),
+    path('address-retrieve/', views_module.address_retrieve, name='address_retrieve'),
 
     # Health check
     path('health/', health_check, name='health_check'),
+
+    # On-demand request profiles (utils.profiling), staff only
+    path('profiles/<str:profile_id>/', profile_download, name='profile_download'),
 ]
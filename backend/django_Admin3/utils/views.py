@@ -1,10 +1,12 @@
 import json
 import logging
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_http_methods
 from django.conf import settings
 import requests
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -686,34 +688,9 @@ def postcoder_address_lookup(request):
 
     start_time = time.time()
 
-    # Extract parameters for autocomplete search
-    query = request.GET.get('query', '').strip()  # Search text (address line)
-    postcode = request.GET.get('postcode', '').strip()  # Postcode (optional, for countries that use it)
-    country_code = request.GET.get('country', 'GB').strip().upper()  # Default to GB
-
-    # Backward compatibility: use postcode as query if query not provided
-    if not query and postcode:
-        query = postcode
-
-    if not query:
-        return JsonResponse({
-            'error': 'Missing postcode',
-            'code': 'MISSING_POSTCODE'
-        }, status=400)
-
-    # Validate postcode format (if using postcode as the query)
-    if not request.GET.get('query') and postcode:
-        clean_postcode = postcode.replace(' ', '').upper()
-        if len(clean_postcode) < 5:
-            return JsonResponse({
-                'error': 'Invalid postcode format',
-                'code': 'INVALID_POSTCODE'
-            }, status=400)
-        if len(clean_postcode) > 8:
-            return JsonResponse({
-                'error': 'Invalid postcode format',
-                'code': 'INVALID_POSTCODE'
-            }, status=400)
+    query, postcode, country_code, error_response = parse_lookup_params(request)
+    if error_response:
+        return error_response
 
     logger.info(f"🔍 Address lookup request: query='{query}', postcode='{postcode}', country={country_code}")
 
@@ -762,6 +739,56 @@ def postcoder_address_lookup(request):
     response_time_ms = int((time.time() - start_time) * 1000)
 
     # Step 2: Log analytics (non-blocking)
+    log_address_lookup(
+        logger_service, query, postcode, country_code,
+        addresses, response_time_ms, success, error_message,
+    )
+
+    # Step 3: Return response
+    return lookup_response(addresses, response_time_ms, success, error_message)
+
+
+def parse_lookup_params(request):
+    """
+    Extract and validate the address lookup query parameters.
+
+    Shared by postcoder_address_lookup and its async variant in
+    utils.async_views.
+
+    Returns:
+        tuple: (query, postcode, country_code, error_response); error_response
+        is a 400 JsonResponse when the parameters are invalid, else None.
+    """
+    # Extract parameters for autocomplete search
+    query = request.GET.get('query', '').strip()  # Search text (address line)
+    postcode = request.GET.get('postcode', '').strip()  # Postcode (optional, for countries that use it)
+    country_code = request.GET.get('country', 'GB').strip().upper()  # Default to GB
+
+    # Backward compatibility: use postcode as query if query not provided
+    if not query and postcode:
+        query = postcode
+
+    if not query:
+        return query, postcode, country_code, JsonResponse({
+            'error': 'Missing postcode',
+            'code': 'MISSING_POSTCODE'
+        }, status=400)
+
+    # Validate postcode format (if using postcode as the query)
+    if not request.GET.get('query') and postcode:
+        clean_postcode = postcode.replace(' ', '').upper()
+        if len(clean_postcode) < 5 or len(clean_postcode) > 8:
+            return query, postcode, country_code, JsonResponse({
+                'error': 'Invalid postcode format',
+                'code': 'INVALID_POSTCODE'
+            }, status=400)
+
+    return query, postcode, country_code, None
+
+
+def log_address_lookup(logger_service, query, postcode, country_code,
+                       addresses, response_time_ms, success, error_message):
+    """Record an autocomplete lookup; failures are logged, never raised."""
     try:
         result_count = len(addresses.get('addresses', []))
         logger_service.log_lookup(
@@ -778,19 +805,20 @@ def postcoder_address_lookup(request):
         # Logging failures should not break the response - log to console instead
         logger.warning(f"⚠️ Failed to log address lookup: {log_error}")
 
-    # Step 3: Return response
+
+def lookup_response(addresses, response_time_ms, success, error_message):
+    """Build the autocomplete JsonResponse."""
     if success:
         return JsonResponse({
             **addresses,
             'cache_hit': False,  # Not caching autocomplete suggestions
             'response_time_ms': response_time_ms
         })
-    else:
-        return JsonResponse({
-            'error': error_message or 'Address lookup failed',
-            'code': 'API_ERROR',
-            'addresses': []
-        }, status=500)
+    return JsonResponse({
+        'error': error_message or 'Address lookup failed',
+        'code': 'API_ERROR',
+        'addresses': []
+    }, status=500)
 
 
 @csrf_exempt
@@ -877,3 +905,21 @@ def address_retrieve(request):
             'error': error_message,
             'code': 'API_ERROR'
         }, status=500)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_download(request, profile_id):
+    """Download a profile taken by ProfilingMiddleware (staff only).
+
+    Profiles expire after PROFILING['ttl'] seconds; an expired or unknown
+    id is a 404.
+    """
+    from utils.profiling import CONTENT_TYPES, load_profile
+
+    profile = load_profile(profile_id)
+    if profile is None:
+        return JsonResponse({'error': 'Profile not found or expired'}, status=404)
+    response = HttpResponse(profile.content, content_type=CONTENT_TYPES[profile.format])
+    response['Content-Disposition'] = f'attachment; filename="{profile.filename}"'
+    return response
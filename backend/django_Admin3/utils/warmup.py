@@ -0,0 +1,250 @@
+"""
+Cache warm-up after deploys and worker restarts.
+
+Apps register warmers in a ``warmers.py`` module (found by
+``autodiscover()``, like admin.py)::
+
+    from utils.warmup import register_warmer, warm_url
+
+    @register_warmer('catalog.navigation')
+    def navigation():
+        warm_url('/api/catalog/navigation-data/')
+
+    @register_warmer('rules.schemas', per_process=True)
+    def schemas():
+        return rule_engine.validator.preload_schemas()
+
+A warmer's return value (e.g. a count) is reported as its detail. Two kinds:
+
+  - shared (default): fill the shared cache (redis in staging and
+    production). Each runs on one worker at a time: a cache lock stops
+    every worker of a fresh deploy from rebuilding the same entry at once.
+  - ``per_process=True``: fill in-process state (schema dicts, the
+    typeahead index), so they run in every worker.
+
+``run_warmers()`` runs them with timing per warmer; a failing warmer is
+logged and reported, never raised. They run from:
+
+  - ``gunicorn.conf.py`` (``post_worker_init``, via
+    ``start_background_warmup()``): each worker runs its per-process
+    warmers in the hook, so it accepts no request before they are done
+    (keep them well under gunicorn's ``--timeout``), then the shared
+    warmers in a background thread while it already serves;
+  - ``manage.py warm_caches``: on demand, or from a deploy script.
+
+``readiness()`` is this process's warm-up state. utils.health_check
+reports it, and with ``WARMUP['gate_health_check']`` answers 503 while
+the worker that happens to serve the health check is still warming. It
+says nothing about the other workers, so it holds traffic back only
+until one worker has finished.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.urls import resolve
+from django.utils.module_loading import autodiscover_modules
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'enabled': True,
+    'gate_health_check': True,
+    'lock_timeout': 120,
+}
+
+COLD, WARMING, READY = 'cold', 'warming', 'ready'
+
+_LOCK_KEY = 'warmup:lock:{}'
+
+
+@dataclass
+class Warmer:
+    name: str
+    func: Callable[[], object]
+    per_process: bool = False
+
+
+@dataclass
+class WarmResult:
+    name: str
+    ok: bool
+    duration_ms: float
+    detail: Optional[str] = None
+    skipped: bool = False
+
+    def as_dict(self) -> Dict:
+        return {
+            'name': self.name, 'ok': self.ok, 'skipped': self.skipped,
+            'duration_ms': round(self.duration_ms, 1), 'detail': self.detail,
+        }
+
+
+_registry: Dict[str, Warmer] = {}
+_state = {'status': COLD, 'started_at': None, 'finished_at': None, 'results': []}
+_state_lock = threading.Lock()
+
+
+def warmup_settings() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'WARMUP', {})}
+
+
+def register_warmer(name: str, per_process: bool = False):
+    """Decorator registering ``func`` as the warmer ``name``."""
+    def decorator(func):
+        _registry[name] = Warmer(name=name, func=func, per_process=per_process)
+        return func
+
+    return decorator
+
+
+def autodiscover() -> None:
+    """Import every installed app's ``warmers`` module."""
+    autodiscover_modules('warmers')
+
+
+def get_warmers(names: Optional[List[str]] = None) -> List[Warmer]:
+    """Registered warmers in registration order, optionally only ``names``."""
+    autodiscover()
+    if names is None:
+        return list(_registry.values())
+    unknown = [name for name in names if name not in _registry]
+    if unknown:
+        raise KeyError(f'Unknown warmer(s): {", ".join(unknown)}')
+    return [_registry[name] for name in names]
+
+
+def warm_url(path: str) -> int:
+    """GET ``path`` in process, without middleware, so the view fills its
+    cache exactly as a visitor's request would. Returns the status code;
+    an error status raises."""
+    from django.test import RequestFactory
+
+    host = next(
+        (host for host in settings.ALLOWED_HOSTS if host and host != '*' and not host.startswith('.')),
+        'localhost',
+    )
+    request = RequestFactory().get(path, HTTP_HOST=host)
+    match = resolve(request.path_info)
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code >= 400:
+        raise RuntimeError(f'GET {path} returned {response.status_code}')
+    return response.status_code
+
+
+def _run_one(warmer: Warmer, use_lock: bool) -> WarmResult:
+    lock_key = _LOCK_KEY.format(warmer.name)
+    if use_lock and not warmer.per_process:
+        if not cache.add(lock_key, 1, timeout=warmup_settings()['lock_timeout']):
+            return WarmResult(warmer.name, ok=True, duration_ms=0.0, detail='warming elsewhere', skipped=True)
+    started = time.perf_counter()
+    try:
+        detail = warmer.func()
+        return WarmResult(
+            warmer.name, ok=True, duration_ms=(time.perf_counter() - started) * 1000,
+            detail=None if detail is None else str(detail),
+        )
+    except Exception as exc:
+        logger.exception(f'Warmer {warmer.name} failed')
+        return WarmResult(
+            warmer.name, ok=False, duration_ms=(time.perf_counter() - started) * 1000,
+            detail=f'{type(exc).__name__}: {exc}',
+        )
+    finally:
+        if use_lock and not warmer.per_process:
+            cache.delete(lock_key)
+
+
+def _start() -> None:
+    with _state_lock:
+        _state.update(status=WARMING, started_at=time.time(), finished_at=None, results=[])
+
+
+def _finish(results: List[WarmResult]) -> None:
+    # A failed warmer leaves that cache cold, it doesn't make the
+    # worker unable to serve: the worker counts as ready either way.
+    with _state_lock:
+        _state.update(status=READY, finished_at=time.time(), results=[r.as_dict() for r in results])
+
+
+def _run_all(warmers: List[Warmer], use_lock: bool, results: List[WarmResult]) -> None:
+    for warmer in warmers:
+        result = _run_one(warmer, use_lock)
+        results.append(result)
+        logger.info(
+            f'warmup {result.name} {"skipped" if result.skipped else "ok" if result.ok else "failed"} '
+            f'{result.duration_ms:.0f}ms{f" ({result.detail})" if result.detail else ""}'
+        )
+
+
+def run_warmers(names: Optional[List[str]] = None, use_lock: bool = True) -> List[WarmResult]:
+    """Run the warmers (all, or ``names``) and record the readiness state.
+
+    With ``use_lock`` a shared warmer already running on another worker
+    is skipped rather than run twice.
+    """
+    warmers = get_warmers(names)
+    _start()
+    results = []
+    try:
+        _run_all(warmers, use_lock, results)
+    finally:
+        _finish(results)
+    return results
+
+
+def start_background_warmup() -> Optional[threading.Thread]:
+    """Warm this worker (gunicorn post_worker_init).
+
+    Per-process warmers run before this returns, so the worker accepts no
+    request before they are done; the shared warmers then run in the
+    returned daemon thread. None when warm-up is disabled.
+    """
+    if not warmup_settings()['enabled']:
+        return None
+    warmers = get_warmers()
+    _start()
+    results = []
+
+    def warm(per_process):
+        try:
+            _run_all([warmer for warmer in warmers if warmer.per_process == per_process], True, results)
+        finally:
+            if not per_process:
+                _finish(results)
+            # The thread's own connections, not the request threads'.
+            connections.close_all()
+
+    # A thread of its own even though we wait for it: its database
+    # connections close with it instead of idling in gunicorn's main thread.
+    local = threading.Thread(target=warm, args=(True,), name='cache-warmup-local', daemon=True)
+    local.start()
+    local.join()
+
+    thread = threading.Thread(target=warm, args=(False,), name='cache-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def readiness() -> Dict:
+    """This process's warm-up state: ``status`` is cold (never started —
+    e.g. runserver), warming or ready, with per-warmer results."""
+    with _state_lock:
+        state = dict(_state)
+    state['total_ms'] = (
+        round((state['finished_at'] - state['started_at']) * 1000, 1)
+        if state['finished_at'] and state['started_at'] else None
+    )
+    state['failed'] = [result['name'] for result in state['results'] if not result['ok']]
+    return state
+
+
+def is_warming() -> bool:
+    return readiness()['status'] == WARMING